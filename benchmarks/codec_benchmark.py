@@ -0,0 +1,100 @@
+from itertools import chain
+from typing import List, Tuple
+
+from benchmarks.late_game import build_late_game_state
+from benchmarks.save_benchmark import time_operation, ITERATIONS
+from source.foundation.models import Quad
+from source.game_management.game_state import GameState
+from source.util.codec import encode_quads, decode_quads, encode_player, decode_player, encode_quads_seen, \
+    decode_quads_seen, encode_heathens, decode_heathens
+from source.util.minifier import minify_quad, inflate_quad, minify_player, inflate_player, minify_quads_seen, \
+    inflate_quads_seen, minify_heathens, inflate_heathens
+
+"""
+Compares the minifier with the codec, encoding and decoding the game state of a large late-game save in the same chunks
+that are sent to a player joining a multiplayer game, i.e. a row of quads at a time, each player, each player's seen
+quads, and the heathens. Since saves contain the same objects, this also reflects the work done when saving and loading.
+
+Run from the root of the repository with: python -m benchmarks.codec_benchmark
+"""
+
+
+def minify_all(game_state: GameState) -> Tuple[List[str], List[str], List[str], str]:
+    """
+    Minify the given game state's quads, players, seen quads, and heathens.
+    :param game_state: The game state to minify.
+    :return: A tuple containing the minified rows of quads, players, seen quads, and heathens.
+    """
+    return ([",".join(minify_quad(quad) for quad in row) + "," for row in game_state.board.quads],
+            [minify_player(player) for player in game_state.players],
+            [minify_quads_seen(player.quads_seen) for player in game_state.players],
+            minify_heathens(game_state.heathens))
+
+
+def inflate_all(minified: Tuple[List[str], List[str], List[str], str]):
+    """
+    Inflate the given minified game state.
+    :param minified: The minified rows of quads, players, seen quads, and heathens.
+    """
+    quad_rows, players, quads_seen, heathens = minified
+    quads: List[List[Quad]] = [[inflate_quad(quad_str, (x, y)) for x, quad_str in enumerate(row.split(",")[:-1])]
+                               for y, row in enumerate(quad_rows)]
+    for player in players:
+        inflate_player(player, quads)
+    for player_quads_seen in quads_seen:
+        inflate_quads_seen(player_quads_seen)
+    inflate_heathens(heathens)
+
+
+def encode_all(game_state: GameState) -> Tuple[List[bytes], List[bytes], List[bytes], bytes]:
+    """
+    Encode the given game state's quads, players, seen quads, and heathens.
+    :param game_state: The game state to encode.
+    :return: A tuple containing the encoded rows of quads, players, seen quads, and heathens.
+    """
+    return ([encode_quads(row) for row in game_state.board.quads],
+            [encode_player(player) for player in game_state.players],
+            [encode_quads_seen(player.quads_seen) for player in game_state.players],
+            encode_heathens(game_state.heathens))
+
+
+def decode_all(encoded: Tuple[List[bytes], List[bytes], List[bytes], bytes]):
+    """
+    Decode the given encoded game state.
+    :param encoded: The encoded rows of quads, players, seen quads, and heathens.
+    """
+    quad_rows, players, quads_seen, heathens = encoded
+    quads: List[List[Quad]] = [decode_quads(row, first_idx=y * 100) for y, row in enumerate(quad_rows)]
+    for player in players:
+        decode_player(player, quads)
+    for player_quads_seen in quads_seen:
+        decode_quads_seen(player_quads_seen)
+    decode_heathens(heathens)
+
+
+def run_benchmark():
+    """
+    Run the benchmark, printing the results.
+    """
+    game_state: GameState = build_late_game_state()
+    minified = minify_all(game_state)
+    encoded = encode_all(game_state)
+    results = [
+        ("Minify", time_operation(lambda: minify_all(game_state))),
+        ("Encode", time_operation(lambda: encode_all(game_state))),
+        ("Inflate", time_operation(lambda: inflate_all(minified))),
+        ("Decode", time_operation(lambda: decode_all(encoded))),
+    ]
+    print(f"Late-game state with {len(game_state.players)} players, "
+          f"{sum(len(p.settlements) for p in game_state.players)} settlements, and "
+          f"{sum(len(p.units) for p in game_state.players)} units (median of {ITERATIONS} runs):")
+    for name, duration in results:
+        print(f"  {name:<20} {duration:8.2f} ms")
+    minified_size: int = sum(len(part.encode()) for part in chain(*minified[:3], [minified[3]]))
+    encoded_size: int = sum(len(part) for part in chain(*encoded[:3], [encoded[3]]))
+    print(f"  {'Minified size':<20} {minified_size / 1024:8.1f} KiB")
+    print(f"  {'Encoded size':<20} {encoded_size / 1024:8.1f} KiB")
+
+
+if __name__ == "__main__":
+    run_benchmark()
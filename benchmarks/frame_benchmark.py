@@ -0,0 +1,76 @@
+import os
+from typing import Callable
+from unittest.mock import patch
+
+import pyxel
+
+from benchmarks.late_game import build_late_game_state
+from benchmarks.save_benchmark import time_operation, ITERATIONS
+from source.display.image_banks import IMAGE_BANKS
+from source.display.menu import Menu
+from source.display.menu_display import display_menu
+from source.foundation.models import OverlayType
+from source.game_management.game_state import GameState
+
+"""
+Compares the time taken to draw frames of the game when the images are reloaded from their resource files every frame,
+as was previously the case, with the time taken when the images are kept resident in memory. The time taken to draw the
+game when its map layer is redrawn every frame is also compared with the time taken when it is only redrawn on changes.
+
+Run from the root of the repository with: python -m benchmarks.frame_benchmark
+Note that an SDL video driver that doesn't require a display is used by default, so the benchmark can be run headless.
+"""
+
+
+def run_benchmark():
+    """
+    Run the benchmark, printing the results.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "offscreen")
+    pyxel.init(200, 200)
+    # The game's resource files are relative to the source directory. Note that this must be done after initialising
+    # pyxel, since it changes the working directory to that of the running script.
+    os.chdir(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "source"))
+    IMAGE_BANKS.load_all()
+
+    game_state: GameState = build_late_game_state()
+    player = game_state.players[0]
+    game_state.board.overlay.current_player = player
+    game_state.board.overlay.showing.append(OverlayType.STANDARD)
+    settlement_loc = player.settlements[0].location
+    map_pos = max(settlement_loc[0] - 12, 0), max(settlement_loc[1] - 11, 0)
+    menu = Menu()
+
+    def draw_game():
+        game_state.board.draw(game_state.players, map_pos, game_state.turn, game_state.heathens, False, 5)
+
+    def draw_menu():
+        display_menu(menu)
+
+    def draw_game_with_map_redraw():
+        # Forgetting what is on the map layer forces it to be redrawn, as every quad was previously drawn every frame.
+        game_state.board.map_layer_key = None
+        draw_game()
+
+    def reload_every_frame(draw_fn: Callable[[], None]) -> Callable[[], None]:
+        def draw_with_reload():
+            with patch.object(IMAGE_BANKS, "use", pyxel.load):
+                draw_fn()
+        return draw_with_reload
+
+    results = [
+        ("Game (reloaded)", time_operation(reload_every_frame(draw_game))),
+        ("Game (resident)", time_operation(draw_game)),
+        ("Game (map redrawn)", time_operation(draw_game_with_map_redraw)),
+        ("Game (map cached)", time_operation(draw_game)),
+        ("Menu (reloaded)", time_operation(reload_every_frame(draw_menu))),
+        ("Menu (resident)", time_operation(draw_menu)),
+    ]
+
+    print(f"Drawing a frame of a late-game board and the main menu (median of {ITERATIONS} frames):")
+    for name, duration in results:
+        print(f"  {name:<20} {duration:8.2f} ms")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,76 @@
+import random
+from copy import deepcopy
+from typing import List
+
+from source.display.board import Board
+from source.foundation.catalogue import Namer, IMPROVEMENTS, UNIT_PLANS, BLESSINGS, get_heathen, get_blessing
+from source.foundation.models import GameConfig, Faction, MultiplayerStatus, Settlement, Unit, DeployerUnit, \
+    DeployerUnitPlan, Construction, ResourceCollection, OngoingBlessing, Player, Quad
+from source.game_management.game_state import GameState
+
+"""
+Utilities for building large late-game states to benchmark against, since the test saves are from early in a game and
+are far smaller than the saves that players actually accumulate.
+"""
+
+
+def build_late_game_state(player_count: int = 8,
+                          settlements_per_player: int = 10,
+                          units_per_player: int = 30,
+                          heathen_count: int = 40,
+                          seed: int = 24) -> GameState:
+    """
+    Build a game state resembling a late-game multiplayer save, with many settlements, units, and blessings.
+    :param player_count: The number of players in the game.
+    :param settlements_per_player: The number of settlements each player has.
+    :param units_per_player: The number of deployed units each player has.
+    :param heathen_count: The number of heathens roaming the board.
+    :param seed: The seed to use for random generation, so that repeated runs are comparable.
+    :return: The generated game state.
+    """
+    cfg = GameConfig(player_count, Faction.AGRICULTURISTS, True, True, True, MultiplayerStatus.GLOBAL)
+    namer = Namer()
+    game_state = GameState()
+    # Note that we have to seed after creating the game state, since it seeds itself.
+    random.seed(seed)
+    game_state.board = Board(cfg, namer, {})
+    game_state.gen_players(cfg)
+    game_state.turn = 250
+    quads: List[List[Quad]] = game_state.board.quads
+    locations = [(x, y) for y in range(90) for x in range(100)]
+    random.shuffle(locations)
+
+    player: Player
+    for player in game_state.players:
+        player.wealth = 12345.6
+        player.blessings = [get_blessing(bls.name, player.faction) for bls in BLESSINGS.values()][:18]
+        player.ongoing_blessing = OngoingBlessing(get_blessing(BLESSINGS["anc_his"].name, player.faction), 1234.5)
+        player.resources = ResourceCollection(ore=50, timber=40, magma=30, aurora=2)
+        for _ in range(settlements_per_player):
+            # Settlement names are specific to each biome, so we skip any locations with biomes that have run out.
+            loc = locations.pop()
+            while not namer.names[quads[loc[1]][loc[0]].biome]:
+                loc = locations.pop()
+            quad: Quad = quads[loc[1]][loc[0]]
+            garrison = [Unit(100.0, 3, loc, True, deepcopy(UNIT_PLANS[0])) for _ in range(2)]
+            settlement = Settlement(namer.get_settlement_name(quad.biome), loc, random.sample(IMPROVEMENTS, 12), [quad],
+                                    ResourceCollection(ore=2, timber=1), garrison, level=8, harvest_reserves=900.0,
+                                    current_work=Construction(random.choice(IMPROVEMENTS), 42.0))
+            player.settlements.append(settlement)
+            # Late in the game, players will have seen large areas around each of their settlements.
+            for x in range(loc[0] - 8, loc[0] + 9):
+                for y in range(loc[1] - 8, loc[1] + 9):
+                    if 0 <= x < 100 and 0 <= y < 90:
+                        player.quads_seen.add((x, y))
+        for _ in range(units_per_player):
+            loc = random.randint(0, 99), random.randint(0, 89)
+            plan = deepcopy(random.choice(UNIT_PLANS))
+            if isinstance(plan, DeployerUnitPlan):
+                passengers = [Unit(100.0, 3, loc, False, deepcopy(UNIT_PLANS[0]))]
+                player.units.append(DeployerUnit(plan.max_health, plan.total_stamina, loc, False, plan,
+                                                 passengers=passengers))
+            else:
+                player.units.append(Unit(plan.max_health, plan.total_stamina, loc, False, plan))
+    game_state.heathens = [get_heathen((random.randint(0, 99), random.randint(0, 89)), game_state.turn)
+                           for _ in range(heathen_count)]
+    return game_state
@@ -0,0 +1,56 @@
+import json
+import os
+from tempfile import TemporaryDirectory
+
+from benchmarks.late_game import build_late_game_state
+from benchmarks.save_benchmark import time_operation, write_json_save, write_binary, load_json, load_binary, \
+    ITERATIONS
+from source.foundation.catalogue import IMPROVEMENTS
+from source.game_management.game_state import GameState
+
+"""
+Compares the time taken to load a large late-game save in each of the ways a save can be loaded: binary saves, JSON
+saves from the current version of the game that are decoded directly, and older JSON saves that must be migrated.
+
+Run from the root of the repository with: python -m benchmarks.load_benchmark
+"""
+
+
+def run_benchmark():
+    """
+    Run the benchmark, printing the results.
+    """
+    game_state: GameState = build_late_game_state(units_per_player=60)
+    with TemporaryDirectory() as saves_dir:
+        binary_path = os.path.join(saves_dir, "save.msav")
+        json_path = os.path.join(saves_dir, "save.json")
+        old_json_path = os.path.join(saves_dir, "old-save.json")
+        write_binary(binary_path, game_state)
+        write_json_save(json_path, game_state)
+        # Removing the game version makes the save look like it's from before resources were introduced, meaning every
+        # object in it goes through the migration checks.
+        with open(json_path, "r", encoding="utf-8") as json_file:
+            old_save = json.loads(json_file.read())
+        old_save.pop("game_version")
+        with open(old_json_path, "w", encoding="utf-8") as old_json_file:
+            old_json_file.write(json.dumps(old_save))
+
+        req_resources = [imp.req_resources for imp in IMPROVEMENTS]
+        results = [
+            ("Binary", time_operation(lambda: load_binary(binary_path))),
+            ("JSON (direct)", time_operation(lambda: load_json(json_path))),
+            ("JSON (migrated)", time_operation(lambda: load_json(old_json_path))),
+        ]
+        # Loading the migrated save removes the resource requirements for improvements, so restore them.
+        for imp, req in zip(IMPROVEMENTS, req_resources):
+            imp.req_resources = req
+
+        print(f"Loading a late-game save with {len(game_state.players)} players, "
+              f"{sum(len(p.settlements) for p in game_state.players)} settlements, and "
+              f"{sum(len(p.units) for p in game_state.players)} units (median of {ITERATIONS} runs):")
+        for name, duration in results:
+            print(f"  {name:<20} {duration:8.2f} ms")
+
+
+if __name__ == "__main__":
+    run_benchmark()
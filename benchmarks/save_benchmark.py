@@ -0,0 +1,120 @@
+import json
+import os
+import statistics
+import time
+from dataclasses import asdict
+from datetime import datetime
+from itertools import chain
+from tempfile import TemporaryDirectory
+from typing import Callable, List
+
+from benchmarks.late_game import build_late_game_state
+from source.foundation.catalogue import Namer
+from source.foundation.models import SaveDetails, GameConfig
+from source.game_management.game_state import GameState
+from source.saving.save_encoder import SaveEncoder
+from source.saving.save_format import build_snapshot, write_binary_save, read_binary_save, read_save_header
+from source.saving.save_migrator import load_json_save
+from source.util.minifier import minify_quad
+
+"""
+Compares the JSON save format with the binary save format, for both saving and loading a large late-game save.
+
+Run from the root of the repository with: python -m benchmarks.save_benchmark
+"""
+
+# The number of times each operation is timed.
+ITERATIONS: int = 10
+
+
+def time_operation(operation: Callable[[], None]) -> float:
+    """
+    Time the given operation a number of times, returning the median duration.
+    :param operation: The operation to time.
+    :return: The median duration of the operation, in milliseconds.
+    """
+    durations: List[float] = []
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        operation()
+        durations.append((time.perf_counter() - start) * 1000)
+    return statistics.median(durations)
+
+
+def write_json_save(save_path: str, game_state: GameState):
+    """
+    Write the given game state to a JSON save, as the game did prior to the introduction of the binary format.
+    :param save_path: The path to write the save to.
+    :param game_state: The game state to save.
+    """
+    save = {
+        "quads": list(minify_quad(q) for q in chain.from_iterable(game_state.board.quads)),
+        "players": [asdict(p) for p in game_state.players],
+        "heathens": [asdict(h) for h in game_state.heathens],
+        "turn": game_state.turn,
+        "cfg": asdict(game_state.board.game_config),
+        "night_status": {"until": game_state.until_night, "remaining": game_state.nighttime_left},
+        "game_version": game_state.game_version
+    }
+    with open(save_path, "w", encoding="utf-8") as save_file:
+        save_file.write(json.dumps(save, separators=(",", ":"), cls=SaveEncoder))
+
+
+def write_binary(save_path: str, game_state: GameState):
+    """
+    Write the given game state to a binary save.
+    :param save_path: The path to write the save to.
+    :param game_state: The game state to save.
+    """
+    cfg: GameConfig = game_state.board.game_config
+    details = SaveDetails(datetime.now(), False, game_state.turn, cfg.player_count, None, True)
+    snapshot = build_snapshot(details, game_state.game_version, cfg, game_state.board.quads, game_state.players,
+                              game_state.heathens, game_state.turn, game_state.until_night, game_state.nighttime_left)
+    with open(save_path, "wb") as save_file:
+        write_binary_save(save_file, snapshot)
+
+
+def load_json(save_path: str):
+    """
+    Load the JSON save at the given path.
+    :param save_path: The path of the save to load.
+    """
+    with open(save_path, "r", encoding="utf-8") as save_file:
+        load_json_save(GameState(), Namer(), save_file)
+
+
+def load_binary(save_path: str):
+    """
+    Load the binary save at the given path.
+    :param save_path: The path of the save to load.
+    """
+    with open(save_path, "rb") as save_file:
+        read_binary_save(save_file, GameState(), Namer())
+
+
+def run_benchmark():
+    """
+    Run the benchmark, printing the results.
+    """
+    game_state: GameState = build_late_game_state()
+    with TemporaryDirectory() as saves_dir:
+        json_path = os.path.join(saves_dir, "save.json")
+        binary_path = os.path.join(saves_dir, "save.msav")
+        results = [
+            ("JSON save", time_operation(lambda: write_json_save(json_path, game_state))),
+            ("Binary save", time_operation(lambda: write_binary(binary_path, game_state))),
+            ("JSON load", time_operation(lambda: load_json(json_path))),
+            ("Binary load", time_operation(lambda: load_binary(binary_path))),
+            ("Binary header read", time_operation(lambda: read_save_header(binary_path))),
+        ]
+        print(f"Late-game save with {len(game_state.players)} players, "
+              f"{sum(len(p.settlements) for p in game_state.players)} settlements, and "
+              f"{sum(len(p.units) for p in game_state.players)} units (median of {ITERATIONS} runs):")
+        for name, duration in results:
+            print(f"  {name:<20} {duration:8.2f} ms")
+        print(f"  {'JSON size':<20} {os.path.getsize(json_path) / 1024:8.1f} KiB")
+        print(f"  {'Binary size':<20} {os.path.getsize(binary_path) / 1024:8.1f} KiB")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,118 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+from unittest.mock import patch
+
+from source.util.profiler import PROFILER, PROFILER_ENV_VAR
+from source.util.startup import STARTUP_SECTION_PREFIX
+
+"""
+Reports how long the game takes to start up, from the process being launched to the first frame of the main menu being
+drawn, broken down into the profiler's startup sections. The startup work deferred until after the first frame is also
+reported, as are the modules that take the longest to import.
+
+Run from the root of the repository with: python -m benchmarks.startup_benchmark
+Note that an SDL video driver that doesn't require a display is used by default, so the benchmark can be run headless.
+"""
+
+# The number of times the game is started, with the median of each measurement being reported.
+RUNS: int = 5
+# The number of modules reported when breaking down the import time.
+SLOWEST_IMPORTS: int = 10
+
+ROOT_DIR: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The game's resource files are relative to the source directory.
+SOURCE_DIR: str = os.path.join(ROOT_DIR, "source")
+
+
+def run_until_first_frame():
+    """
+    Start the game, drawing its first frame and then running the deferred startup tasks, before printing the startup
+    sections recorded by the profiler and exiting. This is run in a new process for each measurement, so that nothing
+    has already been imported.
+    """
+    # The game is only imported here, since importing it is part of what is being measured.
+    from source.game import Game  # pylint: disable=import-outside-toplevel
+
+    def run_startup(update: Callable[[], None], draw: Callable[[], None]):
+        update()
+        draw()
+        # Signal that the first frame has been drawn, so that the time taken can be measured from the parent process.
+        print(flush=True)
+        # The listener is left out, since it contacts the global game server.
+        deferred_tasks = update.__self__.deferred_startup.tasks
+        while deferred_tasks and deferred_tasks[0][0] != "listener":
+            update()
+        sections: Dict[str, float] = {}
+        for event in PROFILER.trace_events:
+            if event["name"].startswith(STARTUP_SECTION_PREFIX):
+                sections[event["name"]] = sections.get(event["name"], 0) + event["dur"] / 1000
+        print(json.dumps(sections), flush=True)
+        # Exit immediately, rather than waiting for the game's background threads.
+        os._exit(0)
+
+    with patch("pyxel.run", run_startup):
+        Game()
+
+
+def time_startup() -> Tuple[float, Dict[str, float]]:
+    """
+    Start the game in a new process, timing how long it takes for the first frame to be drawn.
+    :return: A tuple containing the time to the first frame in milliseconds, and the duration of each startup section.
+    """
+    env = {**os.environ, "PYTHONPATH": ROOT_DIR, PROFILER_ENV_VAR: "1"}
+    env.setdefault("SDL_VIDEODRIVER", "offscreen")
+    env.setdefault("SDL_AUDIODRIVER", "dummy")
+    start: float = time.perf_counter()
+    # Note that the game is started with -c rather than as a script, so that pyxel doesn't change the working directory.
+    with subprocess.Popen([sys.executable, "-c",
+                           "from benchmarks.startup_benchmark import run_until_first_frame; run_until_first_frame()"],
+                          cwd=SOURCE_DIR, env=env, stdout=subprocess.PIPE, text=True) as game_process:
+        game_process.stdout.readline()
+        first_frame_time: float = (time.perf_counter() - start) * 1000
+        sections: Dict[str, float] = json.loads(game_process.stdout.readline())
+    return first_frame_time, sections
+
+
+def profile_imports() -> List[Tuple[str, float]]:
+    """
+    Import the game in a new process, recording how long each module takes to import.
+    :return: The time taken to import the game, followed by the modules that took the longest to import themselves,
+             excluding the modules they import, with each time in milliseconds.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import source.game"], cwd=SOURCE_DIR,
+                            env={**os.environ, "PYTHONPATH": ROOT_DIR}, capture_output=True, text=True, check=True)
+    self_times: List[Tuple[str, float]] = []
+    total_time: float = 0
+    # Each line is of the form 'import time: <self us> | <cumulative us> | <module>', following a header line.
+    for line in result.stderr.splitlines()[1:]:
+        self_us, cumulative_us, module = line.removeprefix("import time:").split("|")
+        self_times.append((module.strip(), int(self_us) / 1000))
+        if module.strip() == "source.game":
+            total_time = int(cumulative_us) / 1000
+    self_times.sort(key=lambda module_time: module_time[1], reverse=True)
+    return [("source.game (total)", total_time)] + self_times[:SLOWEST_IMPORTS]
+
+
+def run_benchmark():
+    """
+    Run the benchmark, printing the results.
+    """
+    runs: List[Tuple[float, Dict[str, float]]] = [time_startup() for _ in range(RUNS)]
+
+    print(f"Starting the game (median of {RUNS} runs):")
+    print(f"  {'Time to first frame':<28} {statistics.median(run[0] for run in runs):8.2f} ms")
+    for name in runs[0][1]:
+        print(f"  {name:<28} {statistics.median(run[1].get(name, 0) for run in runs):8.2f} ms")
+
+    print("Importing the game:")
+    for module, duration in profile_imports():
+        print(f"  {module:<28} {duration:8.2f} ms")
+
+
+if __name__ == "__main__":
+    run_benchmark()
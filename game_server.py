@@ -1,6 +1,14 @@
 from source.networking.event_listener import EventListener
-from source.saving.game_save_manager import init_app_data
+from source.networking.sharding import get_shard_count, run_sharded_server
+from source.saving.game_save_manager import init_app_data, get_json_saves, convert_json_saves
 
-# The implementation for the multiplayer game server. Ensures that the app data directory exists and listens for events.
-init_app_data()
-EventListener(is_server=True).run()
+# The implementation for the multiplayer game server. Ensures that the app data directory exists, converts any JSON
+# saves to binary ones, and listens for events, either in this process alone or, if configured, across a front process
+# and several shard processes. The main guard stops each shard process from starting a game server of its own.
+if __name__ == "__main__":
+    init_app_data()
+    convert_json_saves(get_json_saves())
+    if (shard_count := get_shard_count()) is not None:
+        run_sharded_server(shard_count)
+    else:
+        EventListener(is_server=True).run()
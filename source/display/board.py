@@ -1,5 +1,4 @@
-import random
-from collections import Counter
+import time
 from enum import Enum
 from typing import List, Optional, Set, Tuple, Dict
 
@@ -8,13 +7,22 @@ import pyxel
 from source.networking.client import dispatch_event, get_identifier, DispatcherKind, EventDispatcher
 from source.networking.events import FoundSettlementEvent, EventType, UpdateAction, MoveUnitEvent, DeployUnitEvent, \
     GarrisonUnitEvent, InvestigateEvent, AttackUnitEvent, HealUnitEvent, BoardDeployerEvent, DeployerDeployEvent
-from source.util.calculator import calculate_yield_for_quad, attack, investigate_relic, heal, \
+from source.util.calculator import attack, investigate_relic, heal, \
     get_resources_for_settlement, update_player_quads_seen_around_point
+from source.util.profiler import PROFILER
+from source.util.visibility import VisibilityGrid
 from source.foundation.catalogue import get_default_unit, Namer
 from source.foundation.models import Player, Quad, Biome, Settlement, Unit, Heathen, GameConfig, InvestigationResult, \
     Faction, DeployerUnit, ResourceCollection, Location
+from source.game_management.board_state import BoardState
+from source.display.image_banks import IMAGE_BANKS
 from source.display.overlay import Overlay
 from source.display.overlay_display import display_overlay
+from source.display.redraw import REDRAW_TRACKER
+
+# The map position, whether it is night, the player index, whether all quads are shown, and the quads visible to the
+# player, which together determine what is drawn on the map layer.
+type MapLayerKey = Tuple[Location, bool, int, bool, Optional[int | VisibilityGrid]]
 
 
 class HelpOption(Enum):
@@ -28,7 +36,7 @@ class HelpOption(Enum):
     END_TURN = "ENTER: End turn"
 
 
-class Board:
+class Board(BoardState):
     """
     The class responsible for drawing everything in-game (i.e. not on menu).
     """
@@ -50,6 +58,7 @@ class Board:
                            games, but will be variable for multiplayer ones.
         :param game_name: The name of the current multiplayer game. Will be None for single-player games.
         """
+        super().__init__(cfg, namer, quads, player_idx, game_name, Overlay(cfg))
         self.current_help = HelpOption.SETTLEMENT
         self.help_time_bank = 0
         self.attack_time_bank = 0
@@ -58,30 +67,19 @@ class Board:
         self.heal_time_bank = 0
         self.player_change_time_bank = 0
 
-        self.game_config: GameConfig = cfg
-        self.namer: Namer = namer
         self.event_dispatchers: Dict[DispatcherKind, EventDispatcher] = event_dispatchers
 
-        # We allow quads to be supplied here in load game cases.
-        if quads is not None:
-            self.quads = quads
-        else:
-            self.quads: List[List[Optional[Quad]]] = [[None] * 100 for _ in range(90)]
-            random.seed()
-            self.generate_quads(cfg.biome_clustering, cfg.climatic_effects)
-
         self.quad_selected: Optional[Quad] = None
+        # The quads visible at the current map position are drawn to an off-screen image, which is then drawn to the
+        # screen each frame. It is only redrawn when something visible on it changes. Note that the image is created
+        # when first drawn, since pyxel must be initialised first.
+        self.map_layer: Optional[pyxel.Image] = None
+        self.map_layer_key: Optional[MapLayerKey] = None
+        # The relics drawn on the map layer, which require it to be redrawn once they have been investigated.
+        self.map_layer_relics: List[Quad] = []
 
-        self.overlay = Overlay(self.game_config)
-        self.selected_settlement: Optional[Settlement] = None
         self.deploying_army = False
         self.deploying_army_from_unit = False
-        self.selected_unit: Optional[Unit | Heathen] = None
-
-        self.player_idx: int = player_idx
-        self.game_name: Optional[str] = game_name
-        self.waiting_for_other_players: bool = False
-        self.checking_game_sync: bool = False
 
     def draw(self,
              players: List[Player],
@@ -99,89 +97,44 @@ class Board:
         :param is_night: Whether it is currently night.
         :param turns_until_change: The number of turns until a climatic change will occur (day -> night, or vice versa).
         """
+        # The board is drawn in layers, each of which is timed separately when profiling.
+        lap_start: float = time.perf_counter()
         # Clear the screen to black.
         pyxel.cls(0)
         pyxel.rectb(0, 0, 200, 184, pyxel.COLOR_WHITE)
 
-        pyxel.load("resources/quads.pyxres")
         selected_quad_coords: Optional[Location] = None
-        quads_to_show: Set[Location] = set()
+        quads_to_show: Set[Location] | VisibilityGrid
         # At nighttime, the player can only see a few quads around their settlements and units. However, players of the
-        # Nocturne faction have no vision impacts at nighttime. In addition to this, settlements with one or more
-        # sunstone resources have extended vision proportionate to the number of sunstone resources they have.
+        # Nocturne faction have no vision impacts at nighttime.
         if is_night and players[self.player_idx].faction != Faction.NOCTURNE:
-            for setl in players[self.player_idx].settlements:
-                vision_range = 3 * (1 + setl.resources.sunstone)
-                for setl_quad in setl.quads:
-                    for i in range(setl_quad.location[0] - vision_range, setl_quad.location[0] + vision_range + 1):
-                        for j in range(setl_quad.location[1] - vision_range, setl_quad.location[1] + vision_range + 1):
-                            quads_to_show.add((i, j))
-            for unit in players[self.player_idx].units:
-                for i in range(unit.location[0] - 3, unit.location[0] + 4):
-                    for j in range(unit.location[1] - 3, unit.location[1] + 4):
-                        quads_to_show.add((i, j))
-            # Players of the Infidels faction share vision with Heathen units.
-            if players[self.player_idx].faction == Faction.INFIDELS:
-                for heathen in heathens:
-                    for i in range(heathen.location[0] - 5, heathen.location[0] + 6):
-                        for j in range(heathen.location[1] - 5, heathen.location[1] + 6):
-                            quads_to_show.add((i, j))
+            quads_to_show = self.visibility.get_night_vision(players[self.player_idx], heathens)
         else:
             quads_to_show = players[self.player_idx].quads_seen
         fog_of_war_impacts: bool = self.game_config.fog_of_war or \
             (is_night and players[self.player_idx].faction != Faction.NOCTURNE)
-        # Draw the quads.
-        for i in range(map_pos[0], map_pos[0] + 24):
-            for j in range(map_pos[1], map_pos[1] + 22):
-                if 0 <= i <= 99 and 0 <= j <= 89:
-                    # Draw the quad if fog of war is off, or if the player has seen the quad, or we're in the tutorial.
-                    # This same logic applies to all subsequent draws.
-                    if (i, j) in quads_to_show or \
-                            len(players[self.player_idx].settlements) == 0 or \
-                            not fog_of_war_impacts:
-                        quad = self.quads[j][i]
-                        match quad.biome:
-                            case Biome.DESERT:
-                                quad_x = 0
-                            case Biome.FOREST:
-                                quad_x = 8
-                            case Biome.SEA:
-                                quad_x = 16
-                            case _:
-                                quad_x = 24
-                        match quad.resource:
-                            case ResourceCollection(ore=1):
-                                quad_y = 28
-                            case ResourceCollection(timber=1):
-                                quad_y = 36
-                            case ResourceCollection(magma=1):
-                                quad_y = 44
-                            case ResourceCollection(aurora=1):
-                                quad_y = 52
-                            case ResourceCollection(bloodstone=1):
-                                quad_y = 60
-                            case ResourceCollection(obsidian=1):
-                                quad_y = 68
-                            case ResourceCollection(sunstone=1):
-                                quad_y = 76
-                            case ResourceCollection(aquamarine=1):
-                                quad_y = 84
-                            case _:
-                                quad_y = 4
-
-                        if quad.is_relic:
-                            quad_y = 20
-
-                        if is_night:
-                            quad_x += 32
-                        pyxel.blt((i - map_pos[0]) * 8 + 4, (j - map_pos[1]) * 8 + 4, 0, quad_x, quad_y, 8, 8)
-                        if quad.selected:
-                            selected_quad_coords = i, j
-                            pyxel.rectb((i - map_pos[0]) * 8 + 4, (j - map_pos[1]) * 8 + 4, 8, 8, pyxel.COLOR_RED)
-                    elif not is_night:
-                        pyxel.blt((i - map_pos[0]) * 8 + 4, (j - map_pos[1]) * 8 + 4, 0, 0, 12, 8, 8)
-
-        pyxel.load("resources/sprites.pyxres")
+        show_all_quads: bool = len(players[self.player_idx].settlements) == 0 or not fog_of_war_impacts
+        # The map layer only needs to be redrawn when the map position, the time of day, or the visible quads change.
+        # Note that the quads a player has seen only ever increase, so the number of them is sufficient to tell whether
+        # they have changed. Similarly, the night vision grid is only replaced when the player's night vision changes.
+        visibility: Optional[int | VisibilityGrid] = None
+        if not show_all_quads:
+            visibility = len(quads_to_show) if quads_to_show is players[self.player_idx].quads_seen else quads_to_show
+        map_layer_key: MapLayerKey = map_pos, is_night, self.player_idx, show_all_quads, visibility
+        if self.map_layer_needs_redraw(map_layer_key):
+            self.redraw_map_layer(map_pos, is_night, quads_to_show, show_all_quads)
+            self.map_layer_key = map_layer_key
+        pyxel.blt(4, 4, self.map_layer, 0, 0, self.map_layer.width, self.map_layer.height)
+        # The selected quad is drawn on top of the map layer so that selecting quads doesn't require it to be redrawn.
+        if self.quad_selected is not None:
+            sel_x, sel_y = self.quad_selected.location
+            if map_pos[0] <= sel_x < map_pos[0] + 24 and map_pos[1] <= sel_y < map_pos[1] + 22 and \
+                    (show_all_quads or self.quad_selected.location in quads_to_show):
+                selected_quad_coords = self.quad_selected.location
+                pyxel.rectb((sel_x - map_pos[0]) * 8 + 4, (sel_y - map_pos[1]) * 8 + 4, 8, 8, pyxel.COLOR_RED)
+
+        lap_start = PROFILER.lap("draw.board.map", lap_start)
+        IMAGE_BANKS.use("resources/sprites.pyxres")
         # Draw the heathens.
         for heathen in heathens:
             if (not fog_of_war_impacts or heathen.location in quads_to_show) and \
@@ -367,6 +320,7 @@ class Board:
             pyxel.text(156, 155, "movable", pyxel.COLOR_WHITE)
             pyxel.text(161, 160, f"unit{pluralisation}", pyxel.COLOR_WHITE)
 
+        lap_start = PROFILER.lap("draw.board.entities", lap_start)
         pyxel.rect(0, 184, 200, 16, pyxel.COLOR_BLACK)
         # There are a few situations in which we override the default help text:
         # - If the current game has multiplayer enabled, and the player is waiting for other players to finish their
@@ -406,8 +360,81 @@ class Board:
 
         pyxel.text(165, 189, f"Turn {turn}", pyxel.COLOR_WHITE)
 
+        PROFILER.lap("draw.board.status_bar", lap_start)
         # Also display the overlay.
-        display_overlay(self.overlay, is_night)
+        with PROFILER.section("draw.overlay"):
+            display_overlay(self.overlay, is_night)
+
+    def map_layer_needs_redraw(self, map_layer_key: MapLayerKey) -> bool:
+        """
+        Determine whether the map layer needs to be redrawn before it can be drawn to the screen.
+        :param map_layer_key: The key for what should currently be drawn on the map layer.
+        :return: Whether the map layer is out of date.
+        """
+        return map_layer_key != self.map_layer_key or any(not relic.is_relic for relic in self.map_layer_relics)
+
+    def redraw_map_layer(self,
+                         map_pos: Location,
+                         is_night: bool,
+                         quads_to_show: Set[Location] | VisibilityGrid,
+                         show_all_quads: bool):  # pragma: no cover
+        """
+        Redraw the quads visible at the given map position to the map layer.
+        :param map_pos: The current map position.
+        :param is_night: Whether it is currently night.
+        :param quads_to_show: The quads that the player can currently see.
+        :param show_all_quads: Whether to show every quad, regardless of whether the player can see it.
+        """
+        if self.map_layer is None:
+            self.map_layer = pyxel.Image(192, 176)
+        self.map_layer.cls(0)
+        self.map_layer_relics = []
+        IMAGE_BANKS.use("resources/quads.pyxres")
+        for i in range(map_pos[0], map_pos[0] + 24):
+            for j in range(map_pos[1], map_pos[1] + 22):
+                if 0 <= i <= 99 and 0 <= j <= 89:
+                    # Draw the quad if fog of war is off, or if the player has seen the quad, or we're in the tutorial.
+                    # This same logic applies to all subsequent draws.
+                    if show_all_quads or (i, j) in quads_to_show:
+                        quad = self.quads[j][i]
+                        match quad.biome:
+                            case Biome.DESERT:
+                                quad_x = 0
+                            case Biome.FOREST:
+                                quad_x = 8
+                            case Biome.SEA:
+                                quad_x = 16
+                            case _:
+                                quad_x = 24
+                        match quad.resource:
+                            case ResourceCollection(ore=1):
+                                quad_y = 28
+                            case ResourceCollection(timber=1):
+                                quad_y = 36
+                            case ResourceCollection(magma=1):
+                                quad_y = 44
+                            case ResourceCollection(aurora=1):
+                                quad_y = 52
+                            case ResourceCollection(bloodstone=1):
+                                quad_y = 60
+                            case ResourceCollection(obsidian=1):
+                                quad_y = 68
+                            case ResourceCollection(sunstone=1):
+                                quad_y = 76
+                            case ResourceCollection(aquamarine=1):
+                                quad_y = 84
+                            case _:
+                                quad_y = 4
+
+                        if quad.is_relic:
+                            quad_y = 20
+                            self.map_layer_relics.append(quad)
+
+                        if is_night:
+                            quad_x += 32
+                        self.map_layer.blt((i - map_pos[0]) * 8, (j - map_pos[1]) * 8, 0, quad_x, quad_y, 8, 8)
+                    elif not is_night:
+                        self.map_layer.blt((i - map_pos[0]) * 8, (j - map_pos[1]) * 8, 0, 0, 12, 8, 8)
 
     def update(self, elapsed_time: float):
         """
@@ -429,6 +456,7 @@ class Board:
                 case HelpOption.END_TURN:
                     self.current_help = HelpOption.SETTLEMENT
             self.help_time_bank = 0
+            REDRAW_TRACKER.mark_dirty()
         # If an attack has occurred, it is similarly displayed for three seconds before disappearing.
         if self.overlay.is_attack() or self.overlay.is_setl_attack():
             self.attack_time_bank += elapsed_time
@@ -438,12 +466,14 @@ class Board:
                 else:
                     self.overlay.toggle_setl_attack(None)
                 self.attack_time_bank = 0
+                REDRAW_TRACKER.mark_dirty()
         # In the same way, if one of the player's settlements is under siege, display this for three seconds.
         if self.overlay.is_siege_notif():
             self.siege_time_bank += elapsed_time
             if self.siege_time_bank > 3:
                 self.overlay.toggle_siege_notif(None, None)
                 self.siege_time_bank = 0
+                REDRAW_TRACKER.mark_dirty()
         # If the player has selected a settlement with no active construction, rotate between the two prompts every
         # three seconds.
         if self.overlay.is_setl() and self.selected_settlement.current_work is None:
@@ -451,6 +481,7 @@ class Board:
             if self.construction_prompt_time_bank > 3:
                 self.overlay.show_auto_construction_prompt = not self.overlay.show_auto_construction_prompt
                 self.construction_prompt_time_bank = 0
+                REDRAW_TRACKER.mark_dirty()
         # If the player has healed one of their units, display the result for three seconds before disappearing, like an
         # attack alert.
         if self.overlay.is_heal():
@@ -458,6 +489,7 @@ class Board:
             if self.heal_time_bank > 3:
                 self.overlay.toggle_heal(None)
                 self.heal_time_bank = 0
+                REDRAW_TRACKER.mark_dirty()
         # If a player has left or joined the current multiplayer game, display who left/joined for three seconds before
         # disappearing, like the above alerts.
         if self.overlay.is_player_change():
@@ -465,89 +497,7 @@ class Board:
             if self.player_change_time_bank > 3:
                 self.overlay.toggle_player_change(None, None)
                 self.player_change_time_bank = 0
-
-    def generate_quads(self, biome_clustering: bool, climatic_effects: bool):
-        """
-        Generate the quads to be used for this game.
-        :param biome_clustering: Whether biome clustering is enabled or not.
-        :param climatic_effects: Whether climatic effects are enabled or not.
-        """
-        for i in range(90):
-            for j in range(100):
-                if biome_clustering:
-                    # The below block of code gets all directly adjacent quads to the one being currently generated.
-                    surrounding_biomes = []
-                    if i > 0:
-                        if j > 0:
-                            surrounding_biomes.append(self.quads[i - 1][j - 1].biome)
-                        surrounding_biomes.append(self.quads[i - 1][j].biome)
-                        if j < 99:
-                            surrounding_biomes.append(self.quads[i - 1][j + 1].biome)
-                    if j > 0:
-                        surrounding_biomes.append(self.quads[i][j - 1].biome)
-                    if len(surrounding_biomes) > 0:
-                        # Work out which biome nearby is most prevalent, and 40% of the time, choose that biome. This
-                        # 40% rate is adjustable. Note that 100% would result in the entire board having the same biome
-                        # and 0% would result in random picks.
-                        biome_ctr = Counter(surrounding_biomes)
-                        max_rate: Biome = max(biome_ctr, key=biome_ctr.get)
-                        biome: Biome
-                        rand = random.random()
-                        if rand < 0.4:
-                            biome = max_rate
-                        else:
-                            biome = random.choice(list(Biome))
-                    else:
-                        biome = random.choice(list(Biome))
-                else:
-                    # If we're not using biome clustering, just randomly choose one.
-                    biome = random.choice(list(Biome))
-                quad_yield: Tuple[int, int, int, int] = calculate_yield_for_quad(biome)
-
-                resource: Optional[ResourceCollection] = None
-                # Each quad has a 1 in 20 chance of having a core resource, and a 1 in 100 chance of having a rare
-                # resource. We combine these by saying that each quad has a 6% chance of having any resource at all.
-                resource_chance = random.randint(0, 100)
-                if resource_chance < 6:
-                    if resource_chance < 1:
-                        random_chance = random.randint(0, 100)
-                        # If climatic effects are disabled, then sunstone would have no effect. As such, sunstone is not
-                        # included in games with disabled climatic effects.
-                        if climatic_effects:
-                            if random_chance < 20:
-                                resource = ResourceCollection(aurora=1)
-                            elif random_chance < 40:
-                                resource = ResourceCollection(bloodstone=1)
-                            elif random_chance < 60:
-                                resource = ResourceCollection(obsidian=1)
-                            elif random_chance < 80:
-                                resource = ResourceCollection(sunstone=1)
-                            else:
-                                resource = ResourceCollection(aquamarine=1)
-                        else:
-                            if random_chance < 25:
-                                resource = ResourceCollection(aurora=1)
-                            elif random_chance < 50:
-                                resource = ResourceCollection(bloodstone=1)
-                            elif random_chance < 75:
-                                resource = ResourceCollection(obsidian=1)
-                            else:
-                                resource = ResourceCollection(aquamarine=1)
-                    else:
-                        random_chance = random.randint(0, 99)
-                        if random_chance < 33:
-                            resource = ResourceCollection(ore=1)
-                        elif random_chance < 66:
-                            resource = ResourceCollection(timber=1)
-                        else:
-                            resource = ResourceCollection(magma=1)
-
-                is_relic = False
-                relic_chance = random.randint(0, 100)
-                if relic_chance < 1:
-                    is_relic = True
-
-                self.quads[i][j] = Quad(biome, *quad_yield, location=(j, i), is_relic=is_relic, resource=resource)
+                REDRAW_TRACKER.mark_dirty()
 
     def process_right_click(self, mouse_x: int, mouse_y: int, map_pos: Location):
         """
@@ -1,30 +1,48 @@
+from functools import lru_cache
+from typing import Tuple
+
 import pyxel
 
 
-def draw_paragraph(x_start: int, y_start: int, text: str, line_length: int, colour: int = pyxel.COLOR_WHITE) -> None:
+@lru_cache(maxsize=512)
+def layout_paragraph(text: str, line_length: int) -> Tuple[str, ...]:
     """
-    Render text to the screen while automatically accounting for line breaks.
-    :param x_start: x of the text's starting position.
-    :param y_start: y of the text's starting position.
-    :param text: The full text to draw.
+    Split the given text into lines, breaking lines between words. Since the same text is drawn every frame, layouts are
+    memoised by text and line length so that each text only needs to be split once.
+    :param text: The full text to lay out.
     :param line_length: The maximum character length of each line.
-    :param colour: The colour of the text to draw.
+    :return: The lines of text, in order.
     """
+    lines = []
     text_to_draw = ""
 
     for word in text.split():
         # Iterate through each word and check if there's enough space on the current line to add it. Otherwise,
-        # draw what we have so far and go to the next line.
+        # finish the current line and go to the next one.
         if len(text_to_draw) + len(word) <= line_length:
             text_to_draw += word
         else:
-            pyxel.text(x_start, y_start, text_to_draw, colour)
+            lines.append(text_to_draw)
             text_to_draw = word
-            # Increment the y position of the text at the end of each line.
-            y_start += 6
 
         # Add a space after each word (so that the reader doesn't run out of breath).
         text_to_draw += " "
 
-    # Draw any remaining text to the final line.
-    pyxel.text(x_start, y_start, text_to_draw, colour)
+    # Any remaining text makes up the final line.
+    lines.append(text_to_draw)
+    return tuple(lines)
+
+
+def draw_paragraph(x_start: int, y_start: int, text: str, line_length: int, colour: int = pyxel.COLOR_WHITE) -> None:
+    """
+    Render text to the screen while automatically accounting for line breaks.
+    :param x_start: x of the text's starting position.
+    :param y_start: y of the text's starting position.
+    :param text: The full text to draw.
+    :param line_length: The maximum character length of each line.
+    :param colour: The colour of the text to draw.
+    """
+    for line in layout_paragraph(text, line_length):
+        pyxel.text(x_start, y_start, line, colour)
+        # Increment the y position of the text at the end of each line.
+        y_start += 6
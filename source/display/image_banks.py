@@ -0,0 +1,80 @@
+from typing import Dict, List, Optional, Tuple
+
+import pyxel
+
+# The resource files containing the game's images, along with the number of image banks used in each. Note that the
+# backgrounds use every bank, with each bank containing a different background.
+IMAGE_RESOURCES: Dict[str, int] = {
+    "resources/quads.pyxres": 1,
+    "resources/sprites.pyxres": 1,
+    "resources/achievements.pyxres": 1,
+    "resources/background1.pyxres": 3,
+    "resources/background2.pyxres": 3
+}
+
+
+class ImageBankManager:
+    """
+    Keeps the images from each resource file resident in memory, so that switching between resource files while drawing
+    only requires the cached images to be copied into pyxel's image banks, rather than the files being read and decoded
+    from disk again every frame.
+    """
+
+    def __init__(self):
+        """
+        Creates the manager. No resource files are loaded until required.
+        """
+        # The cached images for each resource file that has been loaded, keyed by path.
+        self.cached_images: Dict[str, List[pyxel.Image]] = {}
+        # The resource file and image index currently in each of pyxel's image banks.
+        self.resident: List[Optional[Tuple[str, int]]] = [None] * pyxel.NUM_IMAGES
+
+    def load(self, resource_path: str):
+        """
+        Load the images from the given resource file from disk and cache them.
+        :param resource_path: The path of the resource file to load.
+        """
+        pyxel.load(resource_path, exclude_tilemaps=True, exclude_sounds=True, exclude_musics=True)
+        images: List[pyxel.Image] = []
+        for bank_idx in range(IMAGE_RESOURCES[resource_path]):
+            bank: pyxel.Image = pyxel.images[bank_idx]
+            image = pyxel.Image(bank.width, bank.height)
+            image.blt(0, 0, bank, 0, 0, bank.width, bank.height)
+            images.append(image)
+        self.cached_images[resource_path] = images
+        # Loading a resource file replaces every image bank, even the ones it doesn't use.
+        self.resident = [(resource_path, bank_idx) for bank_idx in range(pyxel.NUM_IMAGES)]
+
+    def preload(self, resource_path: str):
+        """
+        Load and cache the images from the given resource file, unless they already have been. This allows resource
+        files to be loaded ahead of time, one at a time, without any file being loaded twice.
+        :param resource_path: The path of the resource file to load.
+        """
+        if resource_path not in self.cached_images:
+            self.load(resource_path)
+
+    def load_all(self):
+        """
+        Load and cache the images from every resource file that hasn't already been loaded.
+        """
+        for resource_path in IMAGE_RESOURCES:
+            self.preload(resource_path)
+
+    def use(self, resource_path: str):
+        """
+        Make the images from the given resource file available in pyxel's image banks, copying in only the images that
+        aren't already there.
+        :param resource_path: The path of the resource file whose images are about to be drawn.
+        """
+        if resource_path not in self.cached_images:
+            self.load(resource_path)
+            return
+        for bank_idx, image in enumerate(self.cached_images[resource_path]):
+            if self.resident[bank_idx] != (resource_path, bank_idx):
+                pyxel.images[bank_idx].blt(0, 0, image, 0, 0, image.width, image.height)
+                self.resident[bank_idx] = resource_path, bank_idx
+
+
+# The manager for the image banks used when drawing the game.
+IMAGE_BANKS: ImageBankManager = ImageBankManager()
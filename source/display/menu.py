@@ -112,6 +112,9 @@ class Menu:
         self.viewing_local_lobbies: bool = False
         self.multiplayer_lobbies: List[LobbyDetails] = []
         self.lobby_index: int = 0
+        # Game servers return lobbies a page at a time, with only the current page's lobbies being held.
+        self.lobby_page: int = 0
+        self.lobby_page_count: int = 1
         self.joining_game: bool = False
         self.available_multiplayer_factions: List[Tuple[Faction, int]] = []
         self.lobby_player_boundaries: Tuple[int, int] = 0, 7
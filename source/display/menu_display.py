@@ -4,6 +4,7 @@ from typing import List, Tuple
 import pyxel
 
 from source.display.display_utils import draw_paragraph
+from source.display.image_banks import IMAGE_BANKS
 from source.display.menu import MainMenuOption, Menu, SetupOption, WikiOption, WikiUnitsOption
 from source.foundation.catalogue import ACHIEVEMENTS, BLESSINGS, FACTION_COLOURS, FACTION_DETAILS, IMPROVEMENTS, \
     PROJECTS, VICTORY_TYPE_COLOURS, get_unlockable_improvements
@@ -19,23 +20,19 @@ def display_menu(menu: Menu):
     """
     # Draw the background. Based on the image bank number, we determine which resource file should be used.
     background_path = f"resources/background{ceil((menu.image_bank + 1) / 3)}.pyxres"
-    pyxel.load(background_path)
+    IMAGE_BANKS.use(background_path)
     pyxel.blt(0, 0, menu.image_bank % 3, 0, 0, 200, 200)
 
-    if menu.upnp_enabled is None:
-        pyxel.rectb(32, 80, 146, 26, pyxel.COLOR_WHITE)
-        pyxel.rect(33, 81, 144, 24, pyxel.COLOR_BLACK)
-        pyxel.text(46, 90, "Connecting to global server...", pyxel.COLOR_WHITE)
-    elif game := menu.multiplayer_game_being_loaded:
+    if game := menu.multiplayer_game_being_loaded:
         pyxel.rectb(30, 30, 140, 100, pyxel.COLOR_WHITE)
         pyxel.rect(31, 31, 138, 98, pyxel.COLOR_BLACK)
         pyxel.text(72, 35, f"Loading {menu.multiplayer_lobby.name}...", pyxel.COLOR_WHITE)
         pyxel.text(35, 50, "Quads", pyxel.COLOR_WHITE)
-        pyxel.text(140, 50, f"{int(game.quad_chunks_loaded / 90.0 * 100)}%",
-                   pyxel.COLOR_GREEN if game.quad_chunks_loaded == 90 else pyxel.COLOR_WHITE)
+        pyxel.text(140, 50, f"{int(game.quad_chunks_loaded / game.total_quad_chunks * 100)}%",
+                   pyxel.COLOR_GREEN if game.quad_chunks_loaded == game.total_quad_chunks else pyxel.COLOR_WHITE)
         pyxel.text(35, 60, "Players", pyxel.COLOR_WHITE)
-        pyxel.text(140, 60, f"{int(game.players_loaded / menu.multiplayer_lobby.cfg.player_count * 100)}%",
-                   pyxel.COLOR_GREEN if game.players_loaded == menu.multiplayer_lobby.cfg.player_count
+        pyxel.text(140, 60, f"{int(game.players_loaded / game.total_players * 100)}%",
+                   pyxel.COLOR_GREEN if game.players_loaded == game.total_players
                    else pyxel.COLOR_WHITE)
         pyxel.text(35, 70, "Quads seen", pyxel.COLOR_WHITE)
         if game.total_quads_seen:
@@ -68,7 +65,7 @@ def display_menu(menu: Menu):
             faction_offset = 50 - pow(len(pl.faction), 1.4)
             pyxel.text(100 + faction_offset, 66 + idx * 10, pl.faction, FACTION_COLOURS[pl.faction])
 
-        pyxel.load("resources/sprites.pyxres")
+        IMAGE_BANKS.use("resources/sprites.pyxres")
         if (len(menu.multiplayer_lobby.current_players) - menu.lobby_player_boundaries[1]) > 1:
             pyxel.blt(165, 130, 0, 0, 76, 8, 8)
         if menu.lobby_player_boundaries[0] != 0:
@@ -139,7 +136,7 @@ def display_menu(menu: Menu):
         pyxel.text(52, 160, "(Press SPACE to go back)", pyxel.COLOR_WHITE)
 
         if menu.showing_faction_details:
-            pyxel.load("resources/sprites.pyxres")
+            IMAGE_BANKS.use("resources/sprites.pyxres")
             pyxel.rectb(30, 30, 140, 124, pyxel.COLOR_WHITE)
             pyxel.rect(31, 31, 138, 122, pyxel.COLOR_BLACK)
             pyxel.text(70, 35, "Faction Details", pyxel.COLOR_WHITE)
@@ -162,7 +159,7 @@ def display_menu(menu: Menu):
                 pyxel.blt(148, 138, 0, (menu.faction_idx + 1) * 8, 92, 8, 8)
                 pyxel.text(158, 140, "->", pyxel.COLOR_WHITE)
     elif menu.loading_game:
-        pyxel.load("resources/sprites.pyxres")
+        IMAGE_BANKS.use("resources/sprites.pyxres")
 
         if menu.load_failed:
             pyxel.rectb(24, 75, 152, 60, pyxel.COLOR_WHITE)
@@ -224,7 +221,7 @@ def display_menu(menu: Menu):
     elif menu.in_wiki:
         match menu.wiki_showing:
             case WikiOption.VICTORIES:
-                pyxel.load("resources/sprites.pyxres")
+                IMAGE_BANKS.use("resources/sprites.pyxres")
                 pyxel.rectb(20, 20, 160, 144, pyxel.COLOR_WHITE)
                 pyxel.rect(21, 21, 158, 142, pyxel.COLOR_BLACK)
                 pyxel.text(82, 30, "Victories", pyxel.COLOR_WHITE)
@@ -316,7 +313,7 @@ def display_menu(menu: Menu):
                         pyxel.text(25, 152, "<-", pyxel.COLOR_WHITE)
                         pyxel.blt(35, 150, 0, 16, 44, 8, 8)
             case WikiOption.FACTIONS:
-                pyxel.load("resources/sprites.pyxres")
+                IMAGE_BANKS.use("resources/sprites.pyxres")
                 pyxel.rectb(20, 10, 160, 184, pyxel.COLOR_WHITE)
                 pyxel.rect(21, 11, 158, 182, pyxel.COLOR_BLACK)
                 pyxel.text(85, 15, "Factions", pyxel.COLOR_WHITE)
@@ -341,7 +338,7 @@ def display_menu(menu: Menu):
                 pyxel.text(25, 170, faction_detail.rec_victory_type,
                            VICTORY_TYPE_COLOURS[faction_detail.rec_victory_type])
             case WikiOption.RESOURCES:
-                pyxel.load("resources/quads.pyxres")
+                IMAGE_BANKS.use("resources/quads.pyxres")
                 pyxel.rectb(20, 10, 160, 184, pyxel.COLOR_WHITE)
                 pyxel.rect(21, 11, 158, 182, pyxel.COLOR_BLACK)
                 pyxel.text(83, 15, "Resources", pyxel.COLOR_WHITE)
@@ -395,7 +392,7 @@ def display_menu(menu: Menu):
 
                 pyxel.text(58, 180, "Press SPACE to go back", pyxel.COLOR_WHITE)
             case WikiOption.CLIMATE:
-                pyxel.load("resources/sprites.pyxres")
+                IMAGE_BANKS.use("resources/sprites.pyxres")
                 pyxel.rectb(20, 10, 160, 164, pyxel.COLOR_WHITE)
                 pyxel.rect(21, 11, 158, 162, pyxel.COLOR_BLACK)
                 pyxel.text(86, 15, "Climate", pyxel.COLOR_WHITE)
@@ -432,7 +429,7 @@ def display_menu(menu: Menu):
                     pyxel.blt(158, 161, 0, 8, 84, 8, 8)
                     pyxel.text(168, 162, "->", pyxel.COLOR_WHITE)
             case WikiOption.BLESSINGS:
-                pyxel.load("resources/sprites.pyxres")
+                IMAGE_BANKS.use("resources/sprites.pyxres")
                 pyxel.rectb(10, 20, 180, 154, pyxel.COLOR_WHITE)
                 pyxel.rect(11, 21, 178, 152, pyxel.COLOR_BLACK)
                 pyxel.text(82, 30, "Blessings", pyxel.COLOR_PURPLE)
@@ -462,7 +459,7 @@ def display_menu(menu: Menu):
                     draw_paragraph(152, 155, "More down!", 5)
                     pyxel.blt(172, 156, 0, 0, 76, 8, 8)
             case WikiOption.IMPROVEMENTS:
-                pyxel.load("resources/sprites.pyxres")
+                IMAGE_BANKS.use("resources/sprites.pyxres")
                 pyxel.rectb(10, 20, 180, 154, pyxel.COLOR_WHITE)
                 pyxel.rect(11, 21, 178, 152, pyxel.COLOR_BLACK)
                 pyxel.text(78, 30, "Improvements", pyxel.COLOR_ORANGE)
@@ -510,7 +507,7 @@ def display_menu(menu: Menu):
                     draw_paragraph(152, 155, "More down!", 5)
                     pyxel.blt(172, 156, 0, 0, 76, 8, 8)
             case WikiOption.PROJECTS:
-                pyxel.load("resources/sprites.pyxres")
+                IMAGE_BANKS.use("resources/sprites.pyxres")
                 pyxel.rectb(10, 20, 180, 154, pyxel.COLOR_WHITE)
                 pyxel.rect(11, 21, 178, 152, pyxel.COLOR_BLACK)
                 pyxel.text(86, 30, "Projects", pyxel.COLOR_WHITE)
@@ -529,7 +526,7 @@ def display_menu(menu: Menu):
                             pyxel.blt(166, 50 + idx * 30, 0, 24, 44, 8, 8)
                 pyxel.text(56, 162, "Press SPACE to go back", pyxel.COLOR_WHITE)
             case WikiOption.UNITS:
-                pyxel.load("resources/sprites.pyxres")
+                IMAGE_BANKS.use("resources/sprites.pyxres")
                 pyxel.rectb(10, 20, 180, 154, pyxel.COLOR_WHITE)
                 pyxel.rect(11, 21, 178, 152, pyxel.COLOR_BLACK)
                 pyxel.text(20, 40, "Name", pyxel.COLOR_WHITE)
@@ -629,7 +626,7 @@ def display_menu(menu: Menu):
 
         pyxel.text(58, 160, "Press SPACE to go back", pyxel.COLOR_WHITE)
     elif menu.viewing_achievements:
-        pyxel.load("resources/achievements.pyxres")
+        IMAGE_BANKS.use("resources/achievements.pyxres")
         pyxel.rectb(20, 20, 160, 154, pyxel.COLOR_WHITE)
         pyxel.rect(21, 21, 158, 152, pyxel.COLOR_BLACK)
         pyxel.text(77, 25, "Achievements", pyxel.COLOR_WHITE)
@@ -648,7 +645,7 @@ def display_menu(menu: Menu):
                                else pyxel.COLOR_GRAY)
 
         if menu.achievements_boundaries[1] < len(ACHIEVEMENTS) - 1:
-            pyxel.load("resources/sprites.pyxres")
+            IMAGE_BANKS.use("resources/sprites.pyxres")
             draw_paragraph(150, 150, "More down!", 5)
             pyxel.blt(170, 151, 0, 0, 76, 8, 8)
 
@@ -675,7 +672,7 @@ def display_menu(menu: Menu):
         pyxel.text(60, 115, "Press SPACE to go back", pyxel.COLOR_WHITE)
 
         if menu.showing_faction_details:
-            pyxel.load("resources/sprites.pyxres")
+            IMAGE_BANKS.use("resources/sprites.pyxres")
             pyxel.rectb(30, 30, 140, 124, pyxel.COLOR_WHITE)
             pyxel.rect(31, 31, 138, 122, pyxel.COLOR_BLACK)
             pyxel.text(70, 35, "Faction Details", pyxel.COLOR_WHITE)
@@ -703,7 +700,7 @@ def display_menu(menu: Menu):
                 pyxel.blt(148, 138, 0, next_total_faction_idx * 8, 92, 8, 8)
                 pyxel.text(158, 140, "->", pyxel.COLOR_WHITE)
     elif menu.viewing_lobbies:
-        pyxel.load("resources/sprites.pyxres")
+        IMAGE_BANKS.use("resources/sprites.pyxres")
         pyxel.rectb(20, 20, 160, 144, pyxel.COLOR_WHITE)
         pyxel.rect(21, 21, 158, 142, pyxel.COLOR_BLACK)
         if menu.viewing_local_lobbies:
@@ -724,6 +721,8 @@ def display_menu(menu: Menu):
             else:
                 pyxel.text(150, 35 + idx * 10, "Join",
                            pyxel.COLOR_RED if menu.lobby_index is idx else pyxel.COLOR_WHITE)
+        if menu.lobby_page_count > 1:
+            pyxel.text(84, 140, f"Page {menu.lobby_page + 1}/{menu.lobby_page_count}", pyxel.COLOR_WHITE)
         if menu.upnp_enabled:
             if menu.viewing_local_lobbies:
                 pyxel.text(25, 152, "<-", pyxel.COLOR_WHITE)
@@ -746,7 +745,13 @@ def display_menu(menu: Menu):
         pyxel.text(92, 165, "Wiki", menu.get_option_colour(MainMenuOption.WIKI))
         pyxel.text(92, 175, "Exit", menu.get_option_colour(MainMenuOption.EXIT))
 
-        if not menu.upnp_enabled:
+        # The menu is usable while the client's networking is brought up in the background, with global multiplayer
+        # only becoming available once it's done.
+        if menu.upnp_enabled is None:
+            pyxel.rectb(32, 10, 136, 16, pyxel.COLOR_WHITE)
+            pyxel.rect(33, 11, 134, 14, pyxel.COLOR_BLACK)
+            pyxel.text(41, 15, "Connecting to global server...", pyxel.COLOR_WHITE)
+        elif not menu.upnp_enabled:
             pyxel.rectb(12, 10, 176, 26, pyxel.COLOR_WHITE)
             pyxel.rect(13, 11, 174, 24, pyxel.COLOR_BLACK)
             pyxel.text(65, 15, "UPnP not available!", pyxel.COLOR_RED)
@@ -1,8 +1,10 @@
-from typing import List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+from source.display.redraw import REDRAW_TRACKER
 from source.foundation.models import Settlement, Player, Improvement, Unit, Blessing, CompletedConstruction, UnitPlan, \
     Heathen, AttackData, SetlAttackData, Victory, InvestigationResult, OverlayType, SettlementAttackType, PauseOption, \
     Project, ConstructionMenu, HealData, Achievement, StandardOverlayView, GameConfig
+from source.util.calculator import get_setl_totals
 
 
 class Overlay:
@@ -66,6 +68,55 @@ class Overlay:
         self.total_settlement_count: int = 0
         self.player_changing: Optional[Player] = None
         self.changed_player_is_leaving: Optional[bool] = None  # False means they're joining.
+        # Values computed from the game state for display, which are cached until the display is next marked dirty.
+        self.cached_values: Dict[str, Any] = {}
+        self.cached_values_generation: int = -1
+
+    def get_cached_value[T](self, name: str, compute: Callable[[], T]) -> T:
+        """
+        Get a value computed from the game state for display, only computing it if it hasn't been computed since the
+        display was last marked dirty. Since any change to the overlay or the game state marks the display dirty, cached
+        values are never out of date.
+        :param name: The name of the value.
+        :param compute: The function used to compute the value.
+        :return: The cached or newly-computed value.
+        """
+        if self.cached_values_generation != REDRAW_TRACKER.generation:
+            self.cached_values = {}
+            self.cached_values_generation = REDRAW_TRACKER.generation
+        if name not in self.cached_values:
+            self.cached_values[name] = compute()
+        return self.cached_values[name]
+
+    def get_wealth_per_turn(self, is_night: bool) -> float:
+        """
+        Get the wealth the current player will gain or lose at the end of the turn, accounting for unit upkeep.
+        :param is_night: Whether it is currently night.
+        :return: The change in the player's wealth per turn.
+        """
+        def calculate_wealth_per_turn() -> float:
+            wealth_per_turn: float = 0
+            for setl in self.current_player.settlements:
+                wealth_to_add, _, _, _ = get_setl_totals(self.current_player, setl, is_night, strict=True)
+                wealth_per_turn += wealth_to_add
+            for unit in self.current_player.units:
+                if not unit.garrisoned:
+                    wealth_per_turn -= unit.plan.cost / 10
+            return wealth_per_turn
+
+        return self.get_cached_value(f"wealth_per_turn_{is_night}", calculate_wealth_per_turn)
+
+    def get_victory_progress(self) -> Tuple[int, int, int]:
+        """
+        Get the current player's progress towards the victories that require counting their settlements or blessings.
+        :return: A tuple of the number of the player's settlements with 100% satisfaction, the number of their
+                 settlements at level 10, and the number of pieces of ardour blessings they have undergone.
+        """
+        return self.get_cached_value("victory_progress", lambda: (
+            sum(1 for setl in self.current_player.settlements if setl.satisfaction == 100),
+            sum(1 for setl in self.current_player.settlements if setl.level == 10),
+            sum(1 for bls in self.current_player.blessings if "Piece of" in bls.name)
+        ))
 
     """
     Note that the below methods feature some somewhat complex conditional logic in terms of which overlays may be
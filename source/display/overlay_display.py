@@ -4,6 +4,7 @@ from typing import List, Tuple
 import pyxel
 
 from source.display.display_utils import draw_paragraph
+from source.display.image_banks import IMAGE_BANKS
 from source.util.calculator import get_setl_totals, player_has_resources_for_improvement, get_player_totals
 from source.foundation.catalogue import get_all_unlockable, get_unlockable_improvements, get_unlockable_units, \
     ACHIEVEMENTS, BLESSINGS, FACTION_COLOURS
@@ -19,10 +20,10 @@ def display_overlay(overlay: Overlay, is_night: bool):
     :param overlay: The Overlay to display.
     :param is_night: Whether it is night.
     """
-    pyxel.load("resources/sprites.pyxres")
+    IMAGE_BANKS.use("resources/sprites.pyxres")
     # The achievement notification overlay displays any achievements that the player has obtained since the last turn.
     if OverlayType.ACH_NOTIF in overlay.showing:
-        pyxel.load("resources/achievements.pyxres")
+        IMAGE_BANKS.use("resources/achievements.pyxres")
         pyxel.rectb(12, 50, 176, 58, pyxel.COLOR_YELLOW)
         pyxel.rect(13, 51, 174, 56, pyxel.COLOR_BLACK)
         pyxel.text(60, 55, "Achievement unlocked!", pyxel.COLOR_YELLOW)
@@ -621,7 +622,7 @@ def display_overlay(overlay: Overlay, is_night: bool):
         # The standard overlay contains four separate views: blessings, vault (wealth and resources), settlements, and
         # victories.
         if OverlayType.STANDARD in overlay.showing:
-            pyxel.load("resources/sprites.pyxres")
+            IMAGE_BANKS.use("resources/sprites.pyxres")
             pyxel.rectb(20, 20, 160, 144, pyxel.COLOR_WHITE)
             pyxel.rect(21, 21, 158, 142, pyxel.COLOR_BLACK)
             pyxel.text(80, 30, "Game status", pyxel.COLOR_WHITE)
@@ -650,13 +651,7 @@ def display_overlay(overlay: Overlay, is_night: bool):
                 case StandardOverlayView.VAULT:
                     pyxel.text(91, 40, "Vault", pyxel.COLOR_YELLOW)
                     pyxel.text(30, 55, "Wealth", pyxel.COLOR_YELLOW)
-                    wealth_per_turn = 0
-                    for setl in overlay.current_player.settlements:
-                        wealth_to_add, _, _, _ = get_setl_totals(overlay.current_player, setl, is_night, strict=True)
-                        wealth_per_turn += wealth_to_add
-                    for unit in overlay.current_player.units:
-                        if not unit.garrisoned:
-                            wealth_per_turn -= unit.plan.cost / 10
+                    wealth_per_turn = overlay.get_wealth_per_turn(is_night)
                     sign = "+" if wealth_per_turn > 0 else "-"
                     pyxel.text(30, 65,
                                f"{round(overlay.current_player.wealth)} ({sign}{abs(round(wealth_per_turn, 2))})",
@@ -745,6 +740,7 @@ def display_overlay(overlay: Overlay, is_night: bool):
                     pyxel.text(25, 150, "<- Vault", pyxel.COLOR_YELLOW)
                     pyxel.text(128, 150, "Victories ->", pyxel.COLOR_GREEN)
                 case StandardOverlayView.VICTORIES:
+                    jubilant_setls, max_level_setls, ardour_pieces = overlay.get_victory_progress()
                     pyxel.text(83, 40, "Victories", pyxel.COLOR_GREEN)
                     pyxel.text(30, 55, "Elimination", pyxel.COLOR_RED)
                     if VictoryType.ELIMINATION in overlay.current_player.imminent_victories:
@@ -757,14 +753,14 @@ def display_overlay(overlay: Overlay, is_night: bool):
                         if VictoryType.JUBILATION in overlay.current_player.imminent_victories:
                             pyxel.blt(72, 68, 0, 16, 124, 8, 8)
                         pyxel.text(130, 70,
-                                   f"{len([s for s in overlay.current_player.settlements if s.satisfaction == 100])}/5,"
+                                   f"{jubilant_setls}/5,"
                                    f" {overlay.current_player.jubilation_ctr}/25",
                                    pyxel.COLOR_WHITE)
                         pyxel.text(30, 85, "Gluttony", pyxel.COLOR_GREEN)
                         if VictoryType.GLUTTONY in overlay.current_player.imminent_victories:
                             pyxel.blt(64, 83, 0, 16, 124, 8, 8)
                         pyxel.text(140, 85,
-                                   f"{len([s for s in overlay.current_player.settlements if s.level == 10])}/10",
+                                   f"{max_level_setls}/10",
                                    pyxel.COLOR_WHITE)
                     else:
                         pyxel.text(30, 70, "Jubilation", pyxel.COLOR_GRAY)
@@ -788,7 +784,7 @@ def display_overlay(overlay: Overlay, is_night: bool):
                     if VictoryType.SERENDIPITY in overlay.current_player.imminent_victories:
                         pyxel.blt(76, 128, 0, 16, 124, 8, 8)
                     pyxel.text(142, 130,
-                               f"{len([b for b in overlay.current_player.blessings if 'Piece of' in b.name])}/3",
+                               f"{ardour_pieces}/3",
                                pyxel.COLOR_WHITE)
                     pyxel.text(25, 150, "<- Settlements", pyxel.COLOR_LIME)
         # The settlement click overlay displays the two options available to the player when interacting with an
@@ -890,7 +886,7 @@ def display_overlay(overlay: Overlay, is_night: bool):
                        pyxel.COLOR_RED if overlay.pause_option is PauseOption.QUIT else pyxel.COLOR_WHITE)
         # The controls overlay displays the controls that are not permanent fixtures at the bottom of the screen.
         if OverlayType.CONTROLS in overlay.showing:
-            pyxel.load("resources/sprites.pyxres")
+            IMAGE_BANKS.use("resources/sprites.pyxres")
             if not overlay.show_additional_controls:
                 pyxel.rectb(10, 20, 180, 144, pyxel.COLOR_WHITE)
                 pyxel.rect(11, 21, 178, 142, pyxel.COLOR_BLACK)
@@ -0,0 +1,14 @@
+import pyxel
+
+from source.util.profiler import FrameProfiler
+
+
+def display_profiler(profiler: FrameProfiler):  # pragma: no cover
+    """
+    Draws the profiler overlay in the top-left corner of the screen, on top of everything else.
+    :param profiler: The profiler to display the summary of.
+    """
+    summary = profiler.get_summary()
+    pyxel.rect(0, 0, 4 * max(len(line) for line in summary) + 4, len(summary) * 7 + 3, pyxel.COLOR_BLACK)
+    for idx, line in enumerate(summary):
+        pyxel.text(2, 2 + idx * 7, line, pyxel.COLOR_LIME)
@@ -0,0 +1,86 @@
+import os
+import time
+from typing import Optional
+
+# The environment variable that enables the reduced-fps idle mode when set to the number of updates per second to run
+# at while idle, e.g. 5.
+IDLE_FPS_ENV_VAR: str = "MICROCOSM_IDLE_FPS"
+# The number of seconds without any changes after which the game is considered to be idle.
+IDLE_THRESHOLD: float = 2.0
+# The maximum number of seconds between redraws. This is a safeguard so that any change that isn't marked is still
+# eventually drawn.
+MAX_REDRAW_INTERVAL: float = 1.0
+
+
+def get_idle_fps() -> Optional[int]:
+    """
+    Get the number of updates per second to run at while idle, as configured in the environment.
+    :return: The configured idle FPS, or None if the idle mode is disabled or misconfigured.
+    """
+    try:
+        idle_fps: int = int(os.environ.get(IDLE_FPS_ENV_VAR, ""))
+    except ValueError:
+        return None
+    return idle_fps if idle_fps > 0 else None
+
+
+class RedrawTracker:
+    """
+    Keeps track of whether anything displayed on screen has changed since the last frame was drawn, so that unchanged
+    frames can be skipped. Input handlers, time-based updates, and the multiplayer listener thread mark the scene dirty
+    when they change something. Since pyxel keeps the contents of the screen between frames, skipping a frame simply
+    leaves the previous frame on screen.
+    """
+
+    def __init__(self, idle_fps: Optional[int] = None):
+        """
+        Creates the tracker, with the scene initially dirty so that the first frame is always drawn.
+        :param idle_fps: The number of updates per second to run at while idle. If None, the idle mode is disabled.
+        """
+        self.idle_fps: Optional[int] = idle_fps
+        self.dirty: bool = True
+        # Incremented every time the scene is marked dirty, so that values computed for display can be cached until
+        # something changes.
+        self.generation: int = 0
+        self.last_change_time: float = time.time()
+        self.last_redraw_time: float = 0.0
+
+    def mark_dirty(self):
+        """
+        Mark the scene as changed, requiring the next frame to be drawn. Note that this may be called from any thread.
+        """
+        self.dirty = True
+        self.generation += 1
+        self.last_change_time = time.time()
+
+    def should_redraw(self) -> bool:
+        """
+        Determine whether the next frame should be drawn, resetting the dirty flag if so.
+        :return: Whether the scene has changed, or the maximum time between redraws has elapsed.
+        """
+        current_time: float = time.time()
+        if self.dirty or current_time - self.last_redraw_time >= MAX_REDRAW_INTERVAL:
+            # The flag is reset before drawing so that any change made while the frame is being drawn (e.g. by the
+            # listener thread) is drawn in the following frame.
+            self.dirty = False
+            self.last_redraw_time = current_time
+            return True
+        return False
+
+    def is_idle(self) -> bool:
+        """
+        Determine whether the game is idle, i.e. nothing has changed for a while.
+        :return: Whether the scene has not been marked dirty within the idle threshold.
+        """
+        return time.time() - self.last_change_time >= IDLE_THRESHOLD
+
+    def throttle_if_idle(self):
+        """
+        If the idle mode is enabled and the game is idle, wait long enough to reduce the update rate to the idle FPS.
+        """
+        if self.idle_fps is not None and self.is_idle():
+            time.sleep(1 / self.idle_fps)
+
+
+# The tracker for the game's display.
+REDRAW_TRACKER: RedrawTracker = RedrawTracker(get_idle_fps())
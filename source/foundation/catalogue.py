@@ -1,10 +1,8 @@
 import random
-from copy import deepcopy
+from copy import copy, deepcopy
 from typing import Dict, List, Optional
 
-import pyxel
-
-from source.foundation import achievements
+from source.foundation import achievements, colours
 from source.foundation.models import FactionDetail, Player, Improvement, ImprovementType, Effect, Blessing, \
     Settlement, UnitPlan, Unit, Biome, Heathen, Faction, Project, ProjectType, VictoryType, DeployerUnitPlan, \
     Achievement, HarvestStatus, EconomicStatus, ResourceCollection, Location
@@ -335,30 +333,30 @@ UNIT_PLANS = [
 
 # A map of factions to their respective colours.
 FACTION_COLOURS: Dict[Faction, int] = {
-    Faction.AGRICULTURISTS: pyxel.COLOR_GREEN,
-    Faction.CAPITALISTS: pyxel.COLOR_YELLOW,
-    Faction.SCRUTINEERS: pyxel.COLOR_LIGHT_BLUE,
-    Faction.GODLESS: pyxel.COLOR_CYAN,
-    Faction.RAVENOUS: pyxel.COLOR_LIME,
-    Faction.FUNDAMENTALISTS: pyxel.COLOR_ORANGE,
-    Faction.ORTHODOX: pyxel.COLOR_PURPLE,
-    Faction.CONCENTRATED: pyxel.COLOR_GRAY,
-    Faction.FRONTIERSMEN: pyxel.COLOR_PEACH,
-    Faction.IMPERIALS: pyxel.COLOR_DARK_BLUE,
-    Faction.PERSISTENT: pyxel.COLOR_RED,
-    Faction.EXPLORERS: pyxel.COLOR_PINK,
-    Faction.INFIDELS: pyxel.COLOR_BROWN,
-    Faction.NOCTURNE: pyxel.COLOR_NAVY
+    Faction.AGRICULTURISTS: colours.COLOR_GREEN,
+    Faction.CAPITALISTS: colours.COLOR_YELLOW,
+    Faction.SCRUTINEERS: colours.COLOR_LIGHT_BLUE,
+    Faction.GODLESS: colours.COLOR_CYAN,
+    Faction.RAVENOUS: colours.COLOR_LIME,
+    Faction.FUNDAMENTALISTS: colours.COLOR_ORANGE,
+    Faction.ORTHODOX: colours.COLOR_PURPLE,
+    Faction.CONCENTRATED: colours.COLOR_GRAY,
+    Faction.FRONTIERSMEN: colours.COLOR_PEACH,
+    Faction.IMPERIALS: colours.COLOR_DARK_BLUE,
+    Faction.PERSISTENT: colours.COLOR_RED,
+    Faction.EXPLORERS: colours.COLOR_PINK,
+    Faction.INFIDELS: colours.COLOR_BROWN,
+    Faction.NOCTURNE: colours.COLOR_NAVY
 }
 
 # A map of victory types to their respective colours.
 VICTORY_TYPE_COLOURS: Dict[VictoryType, int] = {
-    VictoryType.ELIMINATION: pyxel.COLOR_RED,
-    VictoryType.JUBILATION: pyxel.COLOR_GREEN,
-    VictoryType.GLUTTONY: pyxel.COLOR_GREEN,
-    VictoryType.AFFLUENCE: pyxel.COLOR_YELLOW,
-    VictoryType.VIGOUR: pyxel.COLOR_ORANGE,
-    VictoryType.SERENDIPITY: pyxel.COLOR_PURPLE
+    VictoryType.ELIMINATION: colours.COLOR_RED,
+    VictoryType.JUBILATION: colours.COLOR_GREEN,
+    VictoryType.GLUTTONY: colours.COLOR_GREEN,
+    VictoryType.AFFLUENCE: colours.COLOR_YELLOW,
+    VictoryType.VIGOUR: colours.COLOR_ORANGE,
+    VictoryType.SERENDIPITY: colours.COLOR_PURPLE
 }
 
 # The list of achievements that the player can obtain.
@@ -651,8 +649,9 @@ def get_blessing(name: str, faction: Faction) -> Blessing:
     :param faction: The faction of the player retrieving the blessing.
     :return: The Blessing with the given name, with scaled attributes if necessary.
     """
-    # We need to deepcopy so that changes to one Blessing don't affect all the others as well.
-    blessing: Blessing = deepcopy(next(bls for bls in BLESSINGS.values() if bls.name == name))
+    # We need to copy so that changes to one Blessing don't affect all the others as well. Since blessings only have
+    # immutable attributes, a shallow copy is sufficient, and much cheaper than a deep one when loading large games.
+    blessing: Blessing = copy(next(bls for bls in BLESSINGS.values() if bls.name == name))
     scale_blessing_attributes(blessing, faction)
     return blessing
 
@@ -666,9 +665,11 @@ def get_unit_plan(name: str, faction: Faction, setl_resources: Optional[Resource
                            constructed in. Naturally unsupplied if the unit plan is not under construction.
     :return: The UnitPlan with the given name, with scaled attributes if necessary.
     """
-    # We need to deepcopy so that changes to one UnitPlan don't affect all the others as well.
-    unit_plan: UnitPlan = deepcopy(next(up for up in UNIT_PLANS if up.name == name))
+    # We need to copy so that changes to one UnitPlan don't affect all the others as well. The only mutable attribute of
+    # a unit plan is its prerequisite blessing, so we copy that separately rather than doing a much slower deep copy.
+    unit_plan: UnitPlan = copy(next(up for up in UNIT_PLANS if up.name == name))
     scale_unit_plan_attributes(unit_plan, faction, setl_resources)
     if unit_plan.prereq is not None:
+        unit_plan.prereq = copy(unit_plan.prereq)
         scale_blessing_attributes(unit_plan.prereq, faction)
     return unit_plan
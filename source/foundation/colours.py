@@ -0,0 +1,18 @@
+# The indices of the colours in pyxel's default palette. These are defined here rather than taken from pyxel so that
+# modules shared with the game server, which never displays anything, do not require pyxel to be loaded.
+COLOR_BLACK: int = 0
+COLOR_NAVY: int = 1
+COLOR_PURPLE: int = 2
+COLOR_GREEN: int = 3
+COLOR_BROWN: int = 4
+COLOR_DARK_BLUE: int = 5
+COLOR_LIGHT_BLUE: int = 6
+COLOR_WHITE: int = 7
+COLOR_RED: int = 8
+COLOR_ORANGE: int = 9
+COLOR_YELLOW: int = 10
+COLOR_LIME: int = 11
+COLOR_CYAN: int = 12
+COLOR_GRAY: int = 13
+COLOR_PINK: int = 14
+COLOR_PEACH: int = 15
@@ -222,6 +222,17 @@ class StandardOverlayView(Enum):
     VICTORIES = "VICTORIES"
 
 
+class ShardUpdateType(Enum):
+    """
+    The different types of updates that a sharded game server's shards send to its front.
+    """
+    PORT = "PORT"
+    LOBBY = "LOBBY"
+    CLOSE = "CLOSE"
+    JOIN = "JOIN"
+    LEAVE = "LEAVE"
+
+
 @dataclass
 class Quad:
     """
@@ -589,18 +600,59 @@ class LobbyDetails:
     current_turn: Optional[int]  # None if the game hasn't started.
 
 
+@dataclass
+class HibernatedLobby:
+    """
+    The details required to revive a multiplayer game that has been hibernated to disk by the game server because its
+    lobby was idle.
+    """
+    save_path: str
+    # The identifiers of the players who had ended their turn, since these aren't saved.
+    ready_players: Set[int]
+
+
+@dataclass
+class ShardUpdate:
+    """
+    An update sent by one of a sharded game server's shards to its front, so that the front can keep track of the
+    shard's lobbies and the clients in them.
+    """
+    type: ShardUpdateType
+    shard: int
+    # The port the shard listens on - only populated for PORT updates.
+    port: Optional[int] = None
+    # The lobby's current details - only populated for LOBBY updates.
+    lobby: Optional[LobbyDetails] = None
+    # The below are populated for CLOSE updates, as well as JOIN and LEAVE updates, which also have the client.
+    lobby_name: Optional[str] = None
+    identifier: Optional[int] = None
+
+
 @dataclass
 class LoadedMultiplayerState:
     """
     Keeps track of what game state has loaded in a multiplayer game. Used when loading or joining a multiplayer game.
     """
+    total_quad_chunks: int = 90  # The board is sent one row of 100 quads at a time.
     quad_chunks_loaded: int = 0
+    total_players: int = 0
     players_loaded: int = 0
     total_quads_seen: int = 0
     quads_seen_loaded: int = 0
+    players_with_quads_seen: int = 0
     total_heathens: int = 0
+    heathens_required: bool = False  # Heathens aren't required before turn 5 because they wouldn't have spawned yet.
     heathens_loaded: bool = False  # Only a boolean because we load all heathens at once.
 
+    def is_loaded(self) -> bool:
+        """
+        Returns whether sufficient game state has loaded for the game to be entered. This is the case once every quad
+        and player (and at least some of each player's seen quads) have loaded, along with the heathens if required.
+        :return: Whether the game can be entered.
+        """
+        return self.quad_chunks_loaded == self.total_quad_chunks and self.players_loaded == self.total_players and \
+            self.players_with_quads_seen == self.total_players and (self.heathens_loaded or not self.heathens_required)
+
 
 @dataclass
 class SaveDetails:
@@ -621,3 +673,36 @@ class SaveDetails:
         :return: The formatted name for this save.
         """
         return self.date_time.strftime("%Y-%m-%d %H:%M:%S") + (" (auto)" if self.auto else "")
+
+
+@dataclass
+class SaveHeader:
+    """
+    The fixed-size header at the start of every binary save file, which can be read without reading the rest of the
+    file.
+    """
+    details: SaveDetails
+    game_version: float
+    format_version: int
+
+
+@dataclass
+class SaveSnapshot:
+    """
+    A snapshot of a game, taken so that it can be written to a binary save file. Each section is made up of encoded
+    records, which are immutable, meaning the snapshot can be safely written on another thread while the game continues.
+    """
+    details: SaveDetails
+    game_version: float
+    # The encoded quads on the board, a row per record.
+    board: List[bytes]
+    # The encoded game state that changes every turn, i.e. the turn, configuration, heathens, and players.
+    state: List[bytes]
+
+    def get_size(self) -> int:
+        """
+        Returns the total length of the snapshot's encoded records, which is a rough but cheap measure of how much
+        memory the game takes up.
+        :return: The size of the snapshot, in bytes.
+        """
+        return sum(map(len, self.board)) + sum(map(len, self.state))
@@ -1,10 +1,9 @@
+import os
 import sys
 import time
 from threading import Thread
 
 import pyxel
-from PIL import Image
-from PIL.ImageFile import ImageFile
 
 # In cases where we're running from a pip-installed distribution, monkey patch the source module, since it'll actually
 # be under 'microcosm.source' in site-packages. We also need to disable a couple of lint rules here to account for
@@ -16,16 +15,21 @@ if "microcosm" in sys.modules:
     from microcosm import source
     sys.modules["source"] = source
 
+from source.display.image_banks import IMAGE_BANKS, IMAGE_RESOURCES
 from source.display.menu_display import display_menu
+from source.display.profiler_display import display_profiler
+from source.display.redraw import REDRAW_TRACKER
 from source.game_management.game_controller import GameController
 from source.game_management.game_input_handler import on_key_arrow_down, on_key_arrow_up, on_key_arrow_left, \
     on_key_arrow_right, on_key_return, on_mouse_button_right, on_mouse_button_left, on_key_shift, on_key_c, on_key_f, \
     on_key_d, on_key_tab, on_key_space, on_key_m, on_key_s, on_key_n, on_key_b, on_key_escape, on_key_a, on_key_j, \
     on_key_x
 from source.game_management.game_state import GameState
-from source.networking.event_listener import EventListener
-from source.saving.game_save_manager import init_app_data
+from source.saving.game_save_manager import init_app_data, get_stats_store, get_json_saves, convert_json_saves, \
+    SAVES_DIR
 from source.util.converter import convert_image_to_pyxel_icon_data
+from source.util.profiler import PROFILER
+from source.util.startup import DeferredStartup, STARTUP_SECTION_PREFIX
 
 
 class Game:
@@ -38,54 +42,111 @@ class Game:
         """
         Initialises the game, including the directories required for save data.
         """
-        init_app_data()
+        start_time: float = time.perf_counter()
+        with PROFILER.section(STARTUP_SECTION_PREFIX + "app_data"):
+            init_app_data()
+            # Load the player's statistics up front so that they can be updated in memory, and periodically flushed to
+            # disk in the background.
+            get_stats_store().start()
+
+        with PROFILER.section(STARTUP_SECTION_PREFIX + "pyxel"):
+            pyxel.init(200, 200, title="Microcosm", display_scale=5, quit_key=pyxel.KEY_NONE)
+
+        with PROFILER.section(STARTUP_SECTION_PREFIX + "state"):
+            self.game_controller = GameController()
+            self.game_state = GameState()
+
+        # Anything not required to show the main menu is deferred until the first frame has been drawn. The images for
+        # the menu's background are loaded when it is first drawn, with every other image then being loaded one file
+        # at a time, so that they never have to be read from disk while drawing later on.
+        self.deferred_startup: DeferredStartup = DeferredStartup(start_time)
+        self.deferred_startup.defer("icon", self.set_icon)
+        for resource_path in IMAGE_RESOURCES:
+            self.deferred_startup.defer("images", lambda path=resource_path: IMAGE_BANKS.preload(path))
+        self.deferred_startup.defer("listener", self.start_listener)
+        # JSON saves from before the binary format was introduced are converted one at a time, since each one has to be
+        # fully loaded to be converted. Until then, they can still be loaded as they are.
+        for json_save in get_json_saves():
+            self.deferred_startup.defer("json_saves", lambda name=json_save: convert_json_saves([name]))
 
-        pyxel.init(200, 200, title="Microcosm", display_scale=5, quit_key=pyxel.KEY_NONE)
+        pyxel.run(self.on_update, self.draw)
+
+    def set_icon(self):
+        """
+        Set the window's icon, converting it into the format pyxel requires.
+        """
+        # Pillow is only required here, so it isn't loaded until after the first frame has been drawn.
+        from PIL import Image  # pylint: disable=import-outside-toplevel
 
-        icon_image: ImageFile = Image.open("resources/icon.png")
-        # Note that the 0 argument below refers to the colour value used for transparent pixels.
-        pyxel.icon(convert_image_to_pyxel_icon_data(icon_image), 1, 0)
+        with Image.open("resources/icon.png") as icon_image:
+            # Note that the 0 argument below refers to the colour value used for transparent pixels.
+            pyxel.icon(convert_image_to_pyxel_icon_data(icon_image), 1, 0)
 
-        self.game_controller = GameController()
-        self.game_state = GameState()
+    def start_listener(self):
+        """
+        Start the multiplayer EventListener in another thread so that it doesn't block pyxel running. Since it is
+        passed references to the game state and controller, it is still able to modify them while pyxel is running,
+        which it does by enqueueing commands on the controller's command queue.
+        """
+        # The networking modules are only required once the game is running, so they aren't loaded until after the
+        # first frame has been drawn.
+        from source.networking.event_listener import EventListener  # pylint: disable=import-outside-toplevel
 
-        # Start the multiplayer EventListener in another thread so that it doesn't block pyxel running. Since it is
-        # passed references to the game state and controller, it is still able to modify them while pyxel is running.
         client_listener: EventListener = EventListener(game_states={"local": self.game_state},
                                                        game_controller=self.game_controller)
         listener_thread: Thread = Thread(target=client_listener.run)
         listener_thread.start()
 
-        pyxel.run(self.on_update, self.draw)
-
     def on_update(self):
         """
-        On every update, calculate the elapsed time, manage music, and respond to key presses.
+        On every update, calculate the elapsed time, apply multiplayer changes, manage music, and respond to key
+        presses.
         """
+        PROFILER.start_frame()
         time_elapsed = time.time() - self.game_controller.last_time
         self.game_controller.last_time = time.time()
 
-        if self.game_state.board is not None:
-            self.game_state.board.update(time_elapsed)
-
-        if self.game_state.on_menu:
-            self.game_controller.music_player.restart_menu_if_necessary()
-        elif not self.game_controller.music_player.is_playing():
-            self.game_controller.music_player.next_song()
+        # Apply any changes received by the multiplayer listener before the game's state is used.
+        with PROFILER.section("update.network"):
+            self.game_controller.command_queue.drain()
 
-        self.on_input()
+        if self.game_state.board is not None:
+            with PROFILER.section("update.board"):
+                self.game_state.board.update(time_elapsed)
+
+        with PROFILER.section("update.music"):
+            self.game_controller.music_player.update_fades()
+            if self.game_state.on_menu:
+                self.game_controller.music_player.restart_menu_if_necessary()
+            elif not self.game_controller.music_player.is_playing():
+                self.game_controller.music_player.next_song()
+
+        with PROFILER.section("update.input"):
+            self.on_input()
+        self.deferred_startup.run_next()
+        # When nothing has changed for a while, the game can optionally be run at a reduced rate to save power.
+        REDRAW_TRACKER.throttle_if_idle()
 
     def draw(self):
         """
-        Draws the game to the screen.
+        Draws the game to the screen, if anything has changed since the previous frame.
         """
+        # The profiler overlay changes every frame, so every frame is drawn while it's displayed.
+        if not REDRAW_TRACKER.should_redraw() and not PROFILER.enabled:
+            return
         if self.game_state.on_menu:
-            display_menu(self.game_controller.menu)
+            with PROFILER.section("draw.menu"):
+                display_menu(self.game_controller.menu)
         elif self.game_state.game_started:
-            self.game_state.board.draw(self.game_state.players, self.game_state.map_pos, self.game_state.turn,
-                                       self.game_state.heathens, self.game_state.nighttime_left > 0,
-                                       self.game_state.until_night if self.game_state.until_night != 0
-                                       else self.game_state.nighttime_left)
+            with PROFILER.section("draw.board"):
+                self.game_state.board.draw(self.game_state.players, self.game_state.map_pos, self.game_state.turn,
+                                           self.game_state.heathens, self.game_state.nighttime_left > 0,
+                                           self.game_state.until_night if self.game_state.until_night != 0
+                                           else self.game_state.nighttime_left)
+        if PROFILER.enabled:
+            display_profiler(PROFILER)
+            PROFILER.end_frame()
+        self.deferred_startup.mark_first_frame_drawn()
 
     def on_input(self):
         """
@@ -133,3 +194,11 @@ class Game:
             on_key_j(self.game_state)
         elif pyxel.btnp(pyxel.KEY_X):
             on_key_x(self.game_state)
+        elif pyxel.btnp(pyxel.KEY_F3):
+            PROFILER.toggle()
+        elif pyxel.btnp(pyxel.KEY_F4) and PROFILER.enabled:
+            PROFILER.dump_chrome_trace(os.path.join(SAVES_DIR, f"trace-{int(time.time())}.json"))
+        else:
+            return
+        # Any input may have changed what is displayed.
+        REDRAW_TRACKER.mark_dirty()
@@ -0,0 +1,159 @@
+import random
+from collections import Counter
+from typing import List, Optional, Tuple
+
+from source.display.overlay import Overlay
+from source.foundation.catalogue import Namer
+from source.foundation.models import GameConfig, Quad, Settlement, Unit, Heathen, Biome, ResourceCollection
+from source.util.calculator import calculate_yield_for_quad
+from source.util.visibility import VisibilityMaps
+
+
+class NullOverlay(Overlay):
+    """
+    An overlay for boards that are never displayed, such as those on the game server. Toggling any part of it does
+    nothing, so nothing is ever shown.
+    """
+
+
+def _ignore_toggle(*_args, **_kwargs):
+    """
+    Ignore a request to toggle part of a NullOverlay.
+    """
+
+
+# Every toggle is replaced, rather than each being overridden individually, so that toggles added to the overlay in
+# the future are also ignored.
+for _toggle_name in [name for name in vars(Overlay) if name.startswith("toggle_")]:
+    setattr(NullOverlay, _toggle_name, _ignore_toggle)
+
+
+class BoardState:
+    """
+    The simulation state of the board, i.e. its quads and what is selected on it, without anything required to draw it.
+    The game server uses this directly, so that it never needs to load pyxel or any display code, while clients use
+    Board, which extends it.
+    """
+
+    def __init__(self,
+                 cfg: GameConfig,
+                 namer: Namer,
+                 quads: List[List[Quad]] = None,
+                 player_idx: int = 0,
+                 game_name: Optional[str] = None,
+                 overlay: Optional[Overlay] = None):
+        """
+        Initialises the board state with the given config and quads, if supplied.
+        :param cfg: The game config.
+        :param namer: The Namer instance to use for settlement names.
+        :param quads: The quads loaded in, if we are loading a game.
+        :param player_idx: The index of the player in the overall list of players. Will always be zero for single-player
+                           games, but will be variable for multiplayer ones.
+        :param game_name: The name of the current multiplayer game. Will be None for single-player games.
+        :param overlay: The overlay to use. If None, a NullOverlay is used, since the board will not be displayed.
+        """
+        self.game_config: GameConfig = cfg
+        self.namer: Namer = namer
+
+        # We allow quads to be supplied here in load game cases.
+        if quads is not None:
+            self.quads = quads
+        else:
+            self.quads: List[List[Optional[Quad]]] = [[None] * 100 for _ in range(90)]
+            random.seed()
+            self.generate_quads(cfg.biome_clustering, cfg.climatic_effects)
+
+        # The night vision and heathen exclusion grids, which are shared between drawing and processing heathens.
+        self.visibility: VisibilityMaps = VisibilityMaps()
+
+        self.overlay: Overlay = overlay if overlay is not None else NullOverlay(cfg)
+        self.selected_settlement: Optional[Settlement] = None
+        self.selected_unit: Optional[Unit | Heathen] = None
+
+        self.player_idx: int = player_idx
+        self.game_name: Optional[str] = game_name
+        self.waiting_for_other_players: bool = False
+        self.checking_game_sync: bool = False
+
+    def generate_quads(self, biome_clustering: bool, climatic_effects: bool):
+        """
+        Generate the quads to be used for this game.
+        :param biome_clustering: Whether biome clustering is enabled or not.
+        :param climatic_effects: Whether climatic effects are enabled or not.
+        """
+        for i in range(90):
+            for j in range(100):
+                if biome_clustering:
+                    # The below block of code gets all directly adjacent quads to the one being currently generated.
+                    surrounding_biomes = []
+                    if i > 0:
+                        if j > 0:
+                            surrounding_biomes.append(self.quads[i - 1][j - 1].biome)
+                        surrounding_biomes.append(self.quads[i - 1][j].biome)
+                        if j < 99:
+                            surrounding_biomes.append(self.quads[i - 1][j + 1].biome)
+                    if j > 0:
+                        surrounding_biomes.append(self.quads[i][j - 1].biome)
+                    if len(surrounding_biomes) > 0:
+                        # Work out which biome nearby is most prevalent, and 40% of the time, choose that biome. This
+                        # 40% rate is adjustable. Note that 100% would result in the entire board having the same biome
+                        # and 0% would result in random picks.
+                        biome_ctr = Counter(surrounding_biomes)
+                        max_rate: Biome = max(biome_ctr, key=biome_ctr.get)
+                        biome: Biome
+                        rand = random.random()
+                        if rand < 0.4:
+                            biome = max_rate
+                        else:
+                            biome = random.choice(list(Biome))
+                    else:
+                        biome = random.choice(list(Biome))
+                else:
+                    # If we're not using biome clustering, just randomly choose one.
+                    biome = random.choice(list(Biome))
+                quad_yield: Tuple[int, int, int, int] = calculate_yield_for_quad(biome)
+
+                resource: Optional[ResourceCollection] = None
+                # Each quad has a 1 in 20 chance of having a core resource, and a 1 in 100 chance of having a rare
+                # resource. We combine these by saying that each quad has a 6% chance of having any resource at all.
+                resource_chance = random.randint(0, 100)
+                if resource_chance < 6:
+                    if resource_chance < 1:
+                        random_chance = random.randint(0, 100)
+                        # If climatic effects are disabled, then sunstone would have no effect. As such, sunstone is not
+                        # included in games with disabled climatic effects.
+                        if climatic_effects:
+                            if random_chance < 20:
+                                resource = ResourceCollection(aurora=1)
+                            elif random_chance < 40:
+                                resource = ResourceCollection(bloodstone=1)
+                            elif random_chance < 60:
+                                resource = ResourceCollection(obsidian=1)
+                            elif random_chance < 80:
+                                resource = ResourceCollection(sunstone=1)
+                            else:
+                                resource = ResourceCollection(aquamarine=1)
+                        else:
+                            if random_chance < 25:
+                                resource = ResourceCollection(aurora=1)
+                            elif random_chance < 50:
+                                resource = ResourceCollection(bloodstone=1)
+                            elif random_chance < 75:
+                                resource = ResourceCollection(obsidian=1)
+                            else:
+                                resource = ResourceCollection(aquamarine=1)
+                    else:
+                        random_chance = random.randint(0, 99)
+                        if random_chance < 33:
+                            resource = ResourceCollection(ore=1)
+                        elif random_chance < 66:
+                            resource = ResourceCollection(timber=1)
+                        else:
+                            resource = ResourceCollection(magma=1)
+
+                is_relic = False
+                relic_chance = random.randint(0, 100)
+                if relic_chance < 1:
+                    is_relic = True
+
+                self.quads[i][j] = Quad(biome, *quad_yield, location=(j, i), is_relic=is_relic, resource=resource)
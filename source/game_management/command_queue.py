@@ -0,0 +1,41 @@
+import time
+from collections import deque
+from typing import Callable, Deque
+
+# The maximum number of seconds spent applying commands on each update. At least one command is always applied, so that
+# the queue drains even if a single command exceeds the budget.
+APPLY_BUDGET: float = 0.005
+
+
+class CommandQueue:
+    """
+    Hands over changes to the game's state from background threads to the main thread. The multiplayer listener decodes
+    each event it receives on its own thread, and then enqueues a command to apply the event. These commands are applied
+    in order on each update, so that the game's state is never changed while it is being updated or drawn, and so that
+    no single update is held up for long by a burst of events.
+    """
+
+    def __init__(self):
+        """
+        Creates the queue with no commands. Since appending to and popping from a deque are atomic, no lock is required.
+        """
+        self.commands: Deque[Callable[[], None]] = deque()
+
+    def enqueue(self, command: Callable[[], None]):
+        """
+        Enqueue the given command to be applied on the main thread. May be called from any thread.
+        :param command: The command to apply.
+        """
+        self.commands.append(command)
+
+    def drain(self, budget: float = APPLY_BUDGET):
+        """
+        Apply the enqueued commands in order until none remain or the given budget has been used. Any remaining commands
+        are left for the next update. Should only be called from the main thread.
+        :param budget: The maximum number of seconds to spend applying commands.
+        """
+        deadline: float = time.perf_counter() + budget
+        while self.commands:
+            self.commands.popleft()()
+            if time.perf_counter() >= deadline:
+                break
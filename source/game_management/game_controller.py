@@ -2,6 +2,7 @@ import time
 
 from source.foundation.catalogue import Namer
 from source.display.menu import Menu
+from source.game_management.command_queue import CommandQueue
 from source.game_management.movemaker import MoveMaker
 from source.util.music_player import MusicPlayer
 
@@ -26,3 +27,6 @@ class GameController:
 
         self.namer = Namer()
         self.move_maker = MoveMaker(self.namer)
+
+        # Changes to the game's state from the multiplayer listener, waiting to be applied on the main thread.
+        self.command_queue = CommandQueue()
@@ -23,8 +23,22 @@ from source.foundation.models import Construction, OngoingBlessing, CompletedCon
     PlayerDetails, MultiplayerStatus, SaveDetails
 from source.game_management.movemaker import set_player_construction
 from source.display.overlay import SettlementAttackType, PauseOption
-from source.saving.game_save_manager import load_game, get_saves, save_game, save_stats_achievements, get_stats
+from source.saving.game_save_manager import load_game, get_saves, save_game, save_stats_achievements, get_stats, \
+    get_stats_store, autosave_game, SAVE_WRITER
 from source.util.minifier import minify_save_details
+from source.util.profiler import PROFILER, END_TURN_SECTION
+
+
+def query_lobby_page(game_controller: GameController, game_state: GameState, page: int):
+    """
+    Request the given page of lobbies from the game server whose lobbies are being viewed.
+    :param game_controller: The current GameController object.
+    :param game_state: The current GameState object.
+    :param page: The index of the page to request.
+    """
+    lobbies_query_event: QueryEvent = QueryEvent(EventType.QUERY, get_identifier(), page=page)
+    dispatch_event(lobbies_query_event, game_state.event_dispatchers,
+                   MultiplayerStatus.LOCAL if game_controller.menu.viewing_local_lobbies else MultiplayerStatus.GLOBAL)
 
 
 def on_key_arrow_down(game_controller: GameController, game_state: GameState, is_ctrl_key: bool):
@@ -35,7 +49,13 @@ def on_key_arrow_down(game_controller: GameController, game_state: GameState, is
     :param is_ctrl_key: Whether the CTRL key has also been pressed.
     """
     if game_state.on_menu:
-        game_controller.menu.navigate(down=True)
+        menu = game_controller.menu
+        # Moving down from the last lobby on the page moves on to the next page of lobbies, if there is one.
+        if menu.viewing_lobbies and not menu.joining_game and \
+                menu.lobby_index == len(menu.multiplayer_lobbies) - 1 and menu.lobby_page < menu.lobby_page_count - 1:
+            query_lobby_page(game_controller, game_state, menu.lobby_page + 1)
+        else:
+            menu.navigate(down=True)
     elif game_state.game_started:
         if game_state.board.overlay.is_constructing():
             game_state.board.overlay.navigate_constructions(down=True)
@@ -69,7 +89,12 @@ def on_key_arrow_up(game_controller: GameController, game_state: GameState, is_c
     :param is_ctrl_key: Whether the CTRL key has also been pressed.
     """
     if game_state.on_menu:
-        game_controller.menu.navigate(up=True)
+        menu = game_controller.menu
+        # Similarly, moving up from the first lobby on the page moves back to the previous page of lobbies.
+        if menu.viewing_lobbies and not menu.joining_game and menu.lobby_index == 0 and menu.lobby_page > 0:
+            query_lobby_page(game_controller, game_state, menu.lobby_page - 1)
+        else:
+            menu.navigate(up=True)
     elif game_state.game_started:
         if game_state.board.overlay.is_constructing():
             game_state.board.overlay.navigate_constructions(down=False)
@@ -237,7 +262,9 @@ def on_key_return(game_controller: GameController, game_state: GameState):
         elif game_controller.menu.loading_game:
             if game_controller.menu.loading_game_multiplayer_status:
                 save: SaveDetails = game_controller.menu.saves[game_controller.menu.save_idx]
-                # We need to convert the save name back to the file name before we send it to the server.
+                # We need to convert the save name back to the file name before we send it to the server. Note that we
+                # always use the JSON extension so that older game servers can find the save, while newer game servers
+                # will resolve it to the binary save instead.
                 save_file_name: str = f"{minify_save_details(save)}.json"
                 l_evt: LoadEvent = LoadEvent(EventType.LOAD, get_identifier(), save_file_name)
                 dispatch_event(l_evt,
@@ -306,6 +333,10 @@ def on_key_return(game_controller: GameController, game_state: GameState):
                 case MainMenuOption.WIKI:
                     game_controller.menu.in_wiki = True
                 case MainMenuOption.EXIT:
+                    # Make sure any statistics and autosaves that haven't been written to disk yet are flushed before
+                    # we quit.
+                    get_stats_store().shutdown()
+                    SAVE_WRITER.shutdown()
                     pyxel.quit()
     elif game_state.game_started and game_state.board.overlay.is_desync():
         menu = game_controller.menu
@@ -508,19 +539,22 @@ def on_key_return(game_controller: GameController, game_state: GameState):
                     u_evt: UnreadyEvent = UnreadyEvent(EventType.UNREADY, get_identifier(), game_state.board.game_name)
                     dispatch_event(u_evt, game_state.event_dispatchers, game_state.board.game_config.multiplayer)
         # If we are not in any of the above situations, end the turn.
-        elif game_state.end_turn():
-            # Autosave every turn, but only if the player is actually still in the game.
-            if game_state.players[game_state.player_idx].settlements:
-                save_game(game_state, auto=True)
-            # Update the playtime statistic and check if any achievements have been obtained.
-            time_elapsed = time.time() - game_controller.last_turn_time
-            game_controller.last_turn_time = time.time()
-            if new_achs := save_stats_achievements(game_state, time_elapsed):
-                game_state.board.overlay.toggle_ach_notif(new_achs)
-
-            game_state.board.overlay.total_settlement_count = sum(len(p.settlements) for p in game_state.players)
-            game_state.process_heathens()
-            game_state.process_ais(game_controller.move_maker)
+        else:
+            with PROFILER.section(END_TURN_SECTION):
+                if game_state.end_turn():
+                    # Autosave every turn, but only if the player is actually still in the game.
+                    if game_state.players[game_state.player_idx].settlements:
+                        autosave_game(game_state)
+                    # Update the playtime statistic and check if any achievements have been obtained.
+                    time_elapsed = time.time() - game_controller.last_turn_time
+                    game_controller.last_turn_time = time.time()
+                    if new_achs := save_stats_achievements(game_state, time_elapsed):
+                        game_state.board.overlay.toggle_ach_notif(new_achs)
+
+                    game_state.board.overlay.total_settlement_count = \
+                        sum(len(p.settlements) for p in game_state.players)
+                    game_state.process_heathens()
+                    game_state.process_ais(game_controller.move_maker)
 
 
 def on_key_shift(game_state: GameState):
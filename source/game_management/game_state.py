@@ -4,16 +4,17 @@ import random
 from itertools import chain
 from typing import Optional, List, Set, Tuple, Dict
 
-from source.display.board import Board
 from source.networking.client import EventDispatcher, DispatcherKind
 from source.saving.game_save_manager import save_stats_achievements
 from source.saving.save_encoder import SaveEncoder
 from source.util.calculator import clamp, attack, get_setl_totals, complete_construction, \
     get_resources_for_settlement, update_player_quads_seen_around_point
+from source.util.visibility import VisibilityGrid
 from source.foundation.catalogue import get_heathen, get_default_unit, FACTION_COLOURS, Namer
 from source.foundation.models import Heathen, Quad
 from source.foundation.models import Player, Settlement, CompletedConstruction, Unit, HarvestStatus, EconomicStatus, \
     AttackPlaystyle, GameConfig, Victory, VictoryType, AIPlaystyle, ExpansionPlaystyle, Faction, Project, Location
+from source.game_management.board_state import BoardState
 from source.game_management.movemaker import MoveMaker
 
 
@@ -26,7 +27,7 @@ class GameState:
         """
         Creates the initial game state.
         """
-        self.board: Optional[Board] = None
+        self.board: Optional[BoardState] = None
         self.players: List[Player] = []
         self.heathens: List[Heathen] = []
 
@@ -556,6 +557,9 @@ class GameState:
         Process the turns for each of the heathens.
         """
         all_units: List[Unit] = []
+        # Heathens cannot move to quads near settlements, as determined by the shared exclusion grid.
+        excluded_quads: VisibilityGrid = \
+            self.board.visibility.get_sunstone_exclusion(self.players, self.nighttime_left > 0)
         banned_quads: Set[Location] = set()
         for player in self.players:
             for unit in player.units:
@@ -565,21 +569,6 @@ class GameState:
                 # Ban heathens from all unit locations so that they don't occupy the same quad.
                 else:
                     banned_quads.add(unit.location)
-            # During nighttime, heathens cannot be within a certain number of quads of settlements with sunstone
-            # resources. For example, heathens cannot be within 6 quads of a settlement with 1 sunstone resource, and
-            # they cannot be within 9 quads of a settlement with 2 sunstone resources.
-            for setl in player.settlements:
-                for setl_quad in setl.quads:
-                    if self.nighttime_left > 0 and setl.resources.sunstone:
-                        exclusion_range = 3 * (1 + setl.resources.sunstone)
-                        for i in range(setl_quad.location[0] - exclusion_range,
-                                       setl_quad.location[0] + exclusion_range + 1):
-                            for j in range(setl_quad.location[1] - exclusion_range,
-                                           setl_quad.location[1] + exclusion_range + 1):
-                                banned_quads.add((i, j))
-                    # Ban heathens from all settlement locations so that they don't occupy the same quad.
-                    else:
-                        banned_quads.add(setl_quad.location)
         for heathen in self.heathens:
             within_range: Optional[Unit] = None
             # Check if any player unit is within range of the heathen.
@@ -621,7 +610,7 @@ class GameState:
                     y_movement = random.choice([-rem_movement, rem_movement])
                     new_loc = (clamp(heathen.location[0] + x_movement, 0, 99),
                                clamp(heathen.location[1] + y_movement, 0, 89))
-                    if new_loc not in banned_quads:
+                    if new_loc not in banned_quads and new_loc not in excluded_quads:
                         heathen.location = new_loc
                         heathen.remaining_stamina -= abs(x_movement) + abs(y_movement)
                         found_valid_loc = True
@@ -2,13 +2,17 @@ import datetime
 import json
 import os
 import platform
+import sched
 import socket
+import time
 import uuid
-from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from copy import deepcopy
 from enum import Enum
-from ipaddress import IPv4Address, IPv4Network
+from json import JSONDecodeError
 from site import getusersitepackages
-from typing import Dict
+from threading import Lock, Thread
+from typing import Callable, Deque, Dict, List, Optional
 
 # For Windows clients we need to ensure that the miniupnpc DLL is loaded before attempting to import the module.
 if platform.system() == "Windows":
@@ -29,7 +33,9 @@ if platform.system() == "Windows":
 from miniupnpc import UPnP
 
 from source.foundation.models import MultiplayerStatus
-from source.networking.events import Event, RegisterEvent, EventType
+from source.networking.client_registry import CLIENT_IDLE_TIMEOUT
+from source.networking.events import Event, RegisterEvent, EventType, UpdateEvent, MoveUnitEvent, SetBlessingEvent, \
+    SetConstructionEvent
 from source.saving.save_encoder import SaveEncoder
 
 
@@ -37,6 +43,23 @@ from source.saving.save_encoder import SaveEncoder
 GLOBAL_SERVER_HOST: str = "170.64.142.122"
 # The port at which all game servers are reachable, both global and local.
 SERVER_PORT: int = 9999
+# The name of the file in the saves directory that the results of the previous network bootstrap are cached in.
+NETWORK_CACHE_FILE_NAME: str = "network.json"
+# How long to wait when determining the client's private IP, in seconds.
+PRIVATE_IP_TIMEOUT: float = 2
+# How long to wait for UPnP devices on the network to respond to discovery, in milliseconds. If no IGD was found the
+# last time the game was run, it is unlikely that one will be found this time, so we don't wait as long.
+UPNP_DISCOVER_DELAY: int = 2000
+UPNP_UNAVAILABLE_DISCOVER_DELAY: int = 500
+# How long to spend removing old port mappings before adding the new one, in seconds.
+UPNP_MAPPING_TIMEOUT: float = 5
+# The address that local game servers are probed at. Broadcasting to this address reaches every host on the client's
+# local network, regardless of its size.
+LOCAL_SERVER_PROBE_ADDRESS: str = "255.255.255.255"
+# How often local game servers are re-probed, and how long a local game server is remembered for without responding to
+# a probe, both in seconds.
+LOCAL_SERVER_PROBE_INTERVAL: float = 30
+LOCAL_SERVER_TTL: float = 90
 
 
 class DispatcherKind(Enum):
@@ -48,27 +71,119 @@ class DispatcherKind(Enum):
     GLOBAL = "GLOBAL"
 
 
+def coalesce_events(earlier: Event, later: Event) -> Optional[Event]:
+    """
+    Combine the two given consecutive events into one, if the later event supersedes the earlier one.
+    :param earlier: The event dispatched first.
+    :param later: The event dispatched immediately after.
+    :return: The single event that has the same effect as both events, or None if they can't be combined.
+    """
+    if type(earlier) is not type(later) or not isinstance(later, UpdateEvent) or \
+            (earlier.game_name, earlier.player_faction) != (later.game_name, later.player_faction):
+        return None
+    match later:
+        # Successive moves of the same unit become a single move from its initial location to its final one. The
+        # locations in between are kept so that the quads the unit saw along the way are still revealed.
+        case MoveUnitEvent() if tuple(earlier.new_loc) == tuple(later.initial_loc):
+            return MoveUnitEvent(later.type, later.identifier, later.action, later.game_name, later.player_faction,
+                                 earlier.initial_loc, later.new_loc, later.new_stamina, later.besieging,
+                                 earlier.waypoints + [earlier.new_loc] + later.waypoints)
+        # A player can only have one blessing and each settlement one construction, so only the last one set matters.
+        # The player's resources in the later construction event already account for the earlier one.
+        case SetBlessingEvent():
+            return later
+        case SetConstructionEvent() if earlier.settlement_name == later.settlement_name:
+            return later
+    return None
+
+
 class EventDispatcher:
     """
-    Dispatches multiplayer game events to its supplied host.
+    Dispatches multiplayer game events to its supplied host. Events are encoded and sent on a separate thread using a
+    single persistent socket, so that dispatching an event never holds up the caller, e.g. the game loop.
     """
 
-    def __init__(self, host: str = GLOBAL_SERVER_HOST):
+    def __init__(self, host: str = GLOBAL_SERVER_HOST, registration: Optional[RegisterEvent] = None):
         """
         Creates the dispatcher, setting the game server host IP.
         :param host: The IP address of the game server for this dispatcher.
+        :param registration: The event that registered the client with the game server, if the client should re-register
+                             when the game server may have evicted it for being idle.
         """
         self.host: str = host
+        self.registration: Optional[RegisterEvent] = registration
+        # When the last event other than a keepalive was dispatched, as returned by time.monotonic().
+        self.last_active: float = time.monotonic()
+        self.sock: socket.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        # The events waiting to be sent, in the order they were dispatched.
+        self.pending: Deque[Event] = deque()
+        # Guards the pending events, which are added to by the caller and taken by the sending thread.
+        self.lock: Lock = Lock()
+        self.sending: bool = False
 
     def dispatch_event(self, evt: Event):
         """
-        Send a UDP packet with the JSON-encoded bytes of the supplied event to the game server.
+        Queue the supplied event to be sent to the game server, starting the sending thread if it isn't already running.
+        If the event supersedes the last event waiting to be sent, the two are combined into one.
+        :param evt: The event to send to the game server for processing.
+        """
+        # Events are encoded when they are sent, and many of them hold live game objects, e.g. the settlement just
+        # founded or the player's resources. As such, we send a copy, so that the event is sent as it was dispatched,
+        # regardless of what happens to the game in the meantime.
+        evt = deepcopy(evt)
+        with self.lock:
+            # Game servers don't count keepalives as activity, so neither do we. If the client has been idle for long
+            # enough that it may have been evicted, it re-registers before the event is sent.
+            if self.registration is not None and evt.type != EventType.KEEPALIVE:
+                now: float = time.monotonic()
+                if now - self.last_active > CLIENT_IDLE_TIMEOUT / 2:
+                    self.pending.append(self.registration)
+                self.last_active = now
+            coalesced: Optional[Event] = coalesce_events(self.pending[-1], evt) if self.pending else None
+            if coalesced is not None:
+                self.pending[-1] = coalesced
+            else:
+                self.pending.append(evt)
+            start_sending: bool = not self.sending
+            self.sending = True
+        if start_sending:
+            Thread(target=self.send_pending, daemon=True).start()
+
+    def send_pending(self):
+        """
+        Send the pending events in order until none remain.
+        """
+        try:
+            while True:
+                with self.lock:
+                    if not self.pending:
+                        return
+                    evt: Event = self.pending.popleft()
+                self.send(evt)
+        # However the sending stops, the next event dispatched must start a new sending thread, otherwise it and every
+        # event after it would never be sent.
+        finally:
+            with self.lock:
+                self.sending = False
+
+    def send(self, evt: Event):
+        """
+        Immediately send a UDP packet with the JSON-encoded bytes of the supplied event to the game server. Should only
+        be called directly when already off the main thread.
         :param evt: The event to send to the game server for processing.
         """
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        # We use SaveEncoder here too for the same custom JSON output as with game saves.
-        evt_json: str = json.dumps(evt, separators=(",", ":"), cls=SaveEncoder)
-        sock.sendto(evt_json.encode(), (self.host, SERVER_PORT))
+        try:
+            # We use SaveEncoder here too for the same custom JSON output as with game saves.
+            evt_json: str = json.dumps(evt, separators=(",", ":"), cls=SaveEncoder)
+        # Events that can't be encoded, e.g. because they hold something that isn't serialisable, can never be sent, so
+        # they are dropped rather than holding up the events after them.
+        except (TypeError, ValueError, RecursionError):
+            return
+        try:
+            self.sock.sendto(evt_json.encode(), (self.host, SERVER_PORT))
+        # Events that can't be sent, e.g. because the network is unavailable, are dropped like any other lost packet.
+        except OSError:
+            pass
 
 
 def dispatch_event(evt: Event,
@@ -105,26 +220,49 @@ def get_identifier() -> int:
     return hash((uuid.getnode(), os.getpid()))
 
 
-def initialise_upnp(private_ip: str, port: int):
+def get_private_ip(fallback_ip: Optional[str] = None) -> Optional[str]:
+    """
+    Determine the client's private IP on its local network. We do this by connecting a UDP socket to the Google DNS
+    server, which doesn't actually send anything, but allows us to see the private IP for this machine.
+    :param fallback_ip: The private IP to use if the client has no route to the internet, e.g. the one found previously.
+    :return: The client's private IP, or the fallback IP if it could not be determined.
+    """
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as ip_sock:
+            ip_sock.settimeout(PRIVATE_IP_TIMEOUT)
+            ip_sock.connect(("8.8.8.8", 80))
+            return ip_sock.getsockname()[0]
+    except OSError:
+        return fallback_ip
+
+
+def initialise_upnp(private_ip: str, port: int, upnp: Optional[UPnP] = None,
+                    discover_delay: int = UPNP_DISCOVER_DELAY):
     """
     Initialise UPnP on the client machine, removing any old port mappings and adding a new one for the current game
     session.
     :param private_ip: The client's private IP on its local network. Used to add the port mapping, forwarding traffic
                        from external sources to this client.
     :param port: The dynamic listener port on the client to forward external traffic to via UPnP.
+    :param upnp: The UPnP object to use. A new one is created if one isn't supplied.
+    :param discover_delay: How long to wait for UPnP devices to respond to discovery, in milliseconds.
     """
     # Initialise UPnP, discovering and then selecting a valid UPnP IGD device on the connected network, where IGD refers
     # to the protocol used for UPnP.
-    upnp = UPnP()
+    upnp = upnp if upnp is not None else UPnP()
+    upnp.discoverdelay = discover_delay
     upnp.discover()
     upnp.selectigd()
     mapping_idx: int = 0
     todays_date: datetime.date = datetime.date.today()
+    # Routers can have a great many port mappings, so we stop removing old ones once the time is up - any that remain
+    # will be removed the next time the game is run.
+    deadline: float = time.monotonic() + UPNP_MAPPING_TIMEOUT
     # For security reasons, we don't really want to leave these UPnP ports open permanently (even though nothing is
     # listening). As such, we check all existing port mappings on the network, and delete any mappings that were created
     # on previous days. Additionally, if a previous mapping was for this machine, we delete the old one and make a new
     # one.
-    while (port_mapping := upnp.getgenericportmapping(mapping_idx)) is not None:
+    while time.monotonic() < deadline and (port_mapping := upnp.getgenericportmapping(mapping_idx)) is not None:
         mapping_name: str = port_mapping[3]
         if mapping_name.startswith("Microcosm"):
             # Because ISO dates can be sorted alphabetically to sort them chronologically, we can just extract the date
@@ -139,27 +277,187 @@ def initialise_upnp(private_ip: str, port: int):
     upnp.addportmapping(port, "UDP", private_ip, port, f"Microcosm {todays_date}", "")
 
 
-def broadcast_to_local_network_hosts(private_ip: str, client_port: int):
+def probe_local_servers(client_port: int,
+                        address: str = LOCAL_SERVER_PROBE_ADDRESS,
+                        server_port: int = SERVER_PORT):
     """
-    Broadcast to all other IP addresses on the given private IP's local network, alerting any potential local game
-    servers of a new client.
-    :param private_ip: The client's private IP on its local network. Used to determine the IP addresses for all other
-                       hosts on the network.
+    Probe for local game servers with a single broadcast register event. Any local game servers that receive it will
+    register the client and respond to its listener, so that the client knows of them.
     :param client_port: The dynamic listener port on the client. Used for the client registration process with a game
                         server.
+    :param address: The address to send the probe to. Defaults to the broadcast address.
+    :param server_port: The port that game servers are listening on.
+    """
+    evt_json: str = json.dumps(RegisterEvent(EventType.REGISTER, get_identifier(), client_port), separators=(",", ":"),
+                               cls=SaveEncoder)
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        try:
+            sock.sendto(evt_json.encode(), (address, server_port))
+        # If the client has no network, there are no local game servers to probe.
+        except OSError:
+            pass
+
+
+class LocalServerDiscovery:
+    """
+    Keeps track of the local game servers that have responded to the client's probes. Local game servers are re-probed
+    periodically in the background, with any that have not responded within the TTL being forgotten.
+    """
+
+    def __init__(self,
+                 client_port: int,
+                 on_lost: Callable[[str], None],
+                 probe_address: str = LOCAL_SERVER_PROBE_ADDRESS,
+                 server_port: int = SERVER_PORT):
+        """
+        Creates the discovery, with no local game servers known.
+        :param client_port: The dynamic listener port on the client.
+        :param on_lost: The function to call with the host of each local game server that has not responded within the
+                        TTL. This is called from the discovery's thread on every re-probe until the server is
+                        forgotten using forget_server().
+        :param probe_address: The address to send probes to. Defaults to the broadcast address.
+        :param server_port: The port that game servers are listening on.
+        """
+        self.client_port: int = client_port
+        self.on_lost: Callable[[str], None] = on_lost
+        self.probe_address: str = probe_address
+        self.server_port: int = server_port
+        # Host -> when the local game server last responded, as returned by time.monotonic().
+        self.servers: Dict[str, float] = {}
+        # Guards the known servers, which are recorded by the listener and expired by the discovery's thread.
+        self.lock: Lock = Lock()
+
+    def record_server(self, host: str):
+        """
+        Record a response from the local game server at the given host.
+        :param host: The host of the local game server.
+        """
+        with self.lock:
+            self.servers[host] = time.monotonic()
+
+    def get_servers(self) -> List[str]:
+        """
+        Get the hosts of the local game servers that have responded within the TTL.
+        :return: The hosts of the known local game servers.
+        """
+        cutoff: float = time.monotonic() - LOCAL_SERVER_TTL
+        with self.lock:
+            return [host for host, last_seen in self.servers.items() if last_seen >= cutoff]
+
+    def get_expired_servers(self) -> List[str]:
+        """
+        Get the hosts of the local game servers that have not responded within the TTL, but have not been forgotten yet.
+        :return: The hosts of the expired local game servers.
+        """
+        cutoff: float = time.monotonic() - LOCAL_SERVER_TTL
+        with self.lock:
+            return [host for host, last_seen in self.servers.items() if last_seen < cutoff]
+
+    def forget_server(self, host: str) -> bool:
+        """
+        Forget the local game server at the given host, provided it still hasn't responded within the TTL.
+        :param host: The host of the local game server.
+        :return: Whether the local game server was forgotten.
+        """
+        cutoff: float = time.monotonic() - LOCAL_SERVER_TTL
+        with self.lock:
+            if host in self.servers and self.servers[host] < cutoff:
+                self.servers.pop(host)
+                return True
+        return False
+
+    def run(self):
+        """
+        Re-probe for local game servers every probe interval, until the process is killed. The initial probe is made by
+        the client's network bootstrap.
+        """
+        scheduler: sched.scheduler = sched.scheduler(time.time, time.sleep)
+        scheduler.enter(LOCAL_SERVER_PROBE_INTERVAL, 1, self.reprobe, (scheduler,))
+        scheduler.run()
+
+    def reprobe(self, scheduler: sched.scheduler):
+        """
+        Probe for local game servers again, reporting any that have not responded within the TTL as lost.
+        :param scheduler: The scheduler to use to run the next re-probe.
+        """
+        scheduler.enter(LOCAL_SERVER_PROBE_INTERVAL, 1, self.reprobe, (scheduler,))
+        probe_local_servers(self.client_port, self.probe_address, self.server_port)
+        # Expired servers are reported on every re-probe until they are forgotten, since the client may not be able to
+        # forget them straight away, e.g. while it's in a game on one.
+        for host in self.get_expired_servers():
+            self.on_lost(host)
+
+
+class NetworkBootstrap:
     """
-    # We need strict to be False here so that we can use the /24 subnet mask.
-    local_network: IPv4Network = IPv4Network(f"{private_ip}/24", strict=False)
+    Brings up a client's networking in stages, from the quickest to the slowest. Firstly, any local game servers are
+    probed for and the client's private IP is determined, so that LAN games are available as soon as possible. Then,
+    UPnP is initialised, after which the client can register with the global game server. Each stage is bounded by a
+    timeout, and the private IP and whether an IGD was found are cached between runs.
+    """
+
+    def __init__(self, port: int, cache_path: str, upnp_factory: Optional[Callable[[], UPnP]] = None):
+        """
+        Creates the bootstrap for the client listening on the given port.
+        :param port: The dynamic listener port on the client.
+        :param cache_path: The path to the file that the results of the bootstrap are cached in between runs.
+        :param upnp_factory: The function used to create the UPnP object. Defaults to the UPnP constructor.
+        """
+        self.port: int = port
+        self.cache_path: str = cache_path
+        self.upnp_factory: Callable[[], UPnP] = upnp_factory if upnp_factory is not None else UPnP
 
-    def ping_host(host: IPv4Address):
+    def load_cache(self) -> Dict[str, object]:
         """
-        Ping the supplied host with a register event for the client.
-        :param host: The IP address for the host to ping.
+        Load the results of the previous bootstrap.
+        :return: The cached results, or an empty dictionary if there are none or they could not be read.
         """
-        dispatcher: EventDispatcher = EventDispatcher(str(host))
-        dispatcher.dispatch_event(RegisterEvent(EventType.REGISTER, get_identifier(), client_port))
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as cache_file:
+                cache = json.load(cache_file)
+            return cache if isinstance(cache, dict) else {}
+        except (OSError, JSONDecodeError):
+            return {}
 
-    # Ping all the hosts in parallel so it doesn't take too long.
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        for h in local_network.hosts():
-            executor.submit(ping_host, h)
+    def save_cache(self, private_ip: str, igd_found: bool):
+        """
+        Cache the results of this bootstrap for the next time the game is run. Failing to do so is not worth
+        interrupting multiplayer over, so any errors are ignored.
+        :param private_ip: The client's private IP.
+        :param igd_found: Whether a UPnP IGD device was found on the client's network.
+        """
+        try:
+            with open(self.cache_path, "w", encoding="utf-8") as cache_file:
+                json.dump({"private_ip": private_ip, "igd_found": igd_found}, cache_file)
+        except OSError:
+            pass
+
+    def run(self) -> Optional[EventDispatcher]:
+        """
+        Run each stage of the bootstrap in turn. This blocks until UPnP has been initialised or has failed, so it should
+        be run in the background.
+        :return: The dispatcher for the global game server, or None if UPnP is not available for the client.
+        """
+        # Local game servers don't need UPnP or the client's private IP, so we probe for them first.
+        probe_local_servers(self.port)
+        cache: Dict[str, object] = self.load_cache()
+        private_ip: Optional[str] = get_private_ip(cache.get("private_ip"))
+        # Without a private IP, there's no network to speak of.
+        if private_ip is None:
+            return None
+        try:
+            initialise_upnp(private_ip, self.port, self.upnp_factory(),
+                            UPNP_DISCOVER_DELAY if cache.get("igd_found", True) else UPNP_UNAVAILABLE_DISCOVER_DELAY)
+        # This would be a more specific Exception, but the UPnP library that is used actually raises the base
+        # Exception. Thus, we also have to disable the lint rule for catching base Exceptions.
+        # pylint: disable=broad-exception-caught
+        except Exception:
+            self.save_cache(private_ip, False)
+            return None
+        self.save_cache(private_ip, True)
+        # Now with a port listening for external traffic, we can signal to the global game server that we're listening.
+        global_dispatcher: EventDispatcher = \
+            EventDispatcher(registration=RegisterEvent(EventType.REGISTER, get_identifier(), self.port))
+        global_dispatcher.send(global_dispatcher.registration)
+        return global_dispatcher
@@ -0,0 +1,139 @@
+import time
+from itertools import islice
+from threading import Lock
+from typing import Dict, List, Set, Tuple
+
+# How often each client is sent a keepalive, in seconds.
+KEEPALIVE_INTERVAL: float = 5
+# The number of buckets that clients are spread across. Only one bucket's clients are sent keepalives at a time, with
+# the buckets taking turns, so that keepalives are spread evenly over the interval rather than all being sent at once.
+KEEPALIVE_BUCKETS: int = 10
+# The number of keepalives in a row that a client can leave unanswered before it is considered to be no longer playing.
+KEEPALIVE_MAX_UNANSWERED: int = 6
+# How long a client that isn't in any lobby can go without sending an event other than a keepalive before it is
+# evicted, in seconds. Clients re-register with the game server if they may have been evicted.
+CLIENT_IDLE_TIMEOUT: float = 600
+# The maximum number of clients that can be registered with a game server at once.
+MAX_CLIENTS: int = 10000
+
+
+class ClientRegistry:
+    """
+    Keeps track of the clients registered with a game server, along with the lobbies that each client is in and the
+    state of their keepalives. The registry is bounded, with clients that are not in any lobby being evicted once they
+    have been idle for too long, or when room is needed for a new client.
+    """
+
+    def __init__(self, capacity: int = MAX_CLIENTS):
+        """
+        Creates the registry, with no clients registered.
+        :param capacity: The maximum number of clients that can be registered at once.
+        """
+        self.capacity: int = capacity
+        # Hash identifier -> (host, port), ordered from the least to the most recently active client.
+        self.clients: Dict[int, Tuple[str, int]] = {}
+        # Hash identifier -> when the client was last active, as returned by time.monotonic().
+        self.last_active: Dict[int, float] = {}
+        # Hash identifier -> number of keepalives sent without response.
+        self.keepalive_ctrs: Dict[int, int] = {}
+        # Hash identifier -> the names of the lobbies the client is in. Clients not in any lobby have no entry.
+        self.lobbies: Dict[int, Set[str]] = {}
+        # The identifiers of the clients in each keepalive bucket, and the bucket to send keepalives to next.
+        self.buckets: List[Set[int]] = [set() for _ in range(KEEPALIVE_BUCKETS)]
+        self.next_bucket: int = 0
+        # Guards the registry, which is updated by the listener and by the keepalive thread.
+        self.lock: Lock = Lock()
+
+    def register(self, identifier: int, address: Tuple[str, int]):
+        """
+        Register the client with the given identifier, evicting the least recently active clients that are not in any
+        lobby if the registry is full. The client being registered is never evicted, so the registry may briefly exceed
+        its capacity if every other client is in a lobby.
+        :param identifier: The client's identifier.
+        :param address: The host and port that the client is listening on.
+        """
+        with self.lock:
+            self.clients.pop(identifier, None)
+            self.clients[identifier] = address
+            self.last_active[identifier] = time.monotonic()
+            self.keepalive_ctrs[identifier] = 0
+            self.buckets[identifier % KEEPALIVE_BUCKETS].add(identifier)
+            if (excess := len(self.clients) - self.capacity) > 0:
+                evictable = (i for i in self.clients if i not in self.lobbies and i != identifier)
+                for evicted in list(islice(evictable, excess)):
+                    self._remove(evicted)
+
+    def mark_active(self, identifier: int):
+        """
+        Mark the client with the given identifier as having just sent an event, if it is registered.
+        :param identifier: The client's identifier.
+        """
+        with self.lock:
+            if identifier in self.clients:
+                self.clients[identifier] = self.clients.pop(identifier)
+                self.last_active[identifier] = time.monotonic()
+
+    def acknowledge(self, identifier: int):
+        """
+        Acknowledge a keepalive response from the client with the given identifier, if it is registered.
+        :param identifier: The client's identifier.
+        """
+        with self.lock:
+            if identifier in self.keepalive_ctrs:
+                self.keepalive_ctrs[identifier] = 0
+
+    def join_lobby(self, identifier: int, lobby_name: str):
+        """
+        Record that the client with the given identifier has joined the given lobby.
+        :param identifier: The client's identifier.
+        :param lobby_name: The name of the lobby joined.
+        """
+        with self.lock:
+            self.lobbies.setdefault(identifier, set()).add(lobby_name)
+
+    def leave_lobby(self, identifier: int, lobby_name: str):
+        """
+        Record that the client with the given identifier has left the given lobby.
+        :param identifier: The client's identifier.
+        :param lobby_name: The name of the lobby left.
+        """
+        with self.lock:
+            if (lobby_names := self.lobbies.get(identifier)) is not None:
+                lobby_names.discard(lobby_name)
+                if not lobby_names:
+                    self.lobbies.pop(identifier)
+
+    def advance(self) -> Tuple[List[Tuple[str, int]], Dict[int, Set[str]]]:
+        """
+        Advance to the next keepalive bucket, counting a keepalive for each of its clients. Clients that have left too
+        many keepalives unanswered are removed, as are idle clients that are not in any lobby.
+        :return: A tuple containing the addresses to send keepalives to, and the lobbies that each removed unresponsive
+                 client was in.
+        """
+        with self.lock:
+            bucket: Set[int] = self.buckets[self.next_bucket]
+            self.next_bucket = (self.next_bucket + 1) % KEEPALIVE_BUCKETS
+            idle_cutoff: float = time.monotonic() - CLIENT_IDLE_TIMEOUT
+            addresses: List[Tuple[str, int]] = []
+            unresponsive: Dict[int, Set[str]] = {}
+            for identifier in list(bucket):
+                self.keepalive_ctrs[identifier] += 1
+                if self.keepalive_ctrs[identifier] >= KEEPALIVE_MAX_UNANSWERED:
+                    unresponsive[identifier] = self._remove(identifier)
+                elif identifier not in self.lobbies and self.last_active[identifier] < idle_cutoff:
+                    self._remove(identifier)
+                else:
+                    addresses.append(self.clients[identifier])
+            return addresses, unresponsive
+
+    def _remove(self, identifier: int) -> Set[str]:
+        """
+        Remove the client with the given identifier. The lock must already be held.
+        :param identifier: The client's identifier.
+        :return: The names of the lobbies the client was in.
+        """
+        self.clients.pop(identifier)
+        self.last_active.pop(identifier)
+        self.keepalive_ctrs.pop(identifier)
+        self.buckets[identifier % KEEPALIVE_BUCKETS].discard(identifier)
+        return self.lobbies.pop(identifier, set())
@@ -1,4 +1,7 @@
+from __future__ import annotations
+
 import json
+import os
 import random
 import sched
 import socket
@@ -7,34 +10,54 @@ from itertools import chain, batched
 from json import JSONDecodeError
 from socketserver import BaseServer, BaseRequestHandler, UDPServer
 from threading import Thread
-from typing import Dict, List, Optional, Set, Tuple, Callable
-
-import pyxel
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Callable, Container
 
-from source.display.board import Board
-from source.display.menu import SetupOption
+from source.display.redraw import REDRAW_TRACKER
 from source.foundation.catalogue import FACTION_COLOURS, LOBBY_NAMES, PLAYER_NAMES, Namer, get_improvement, \
     get_project, get_unit_plan, get_blessing, get_heathen
 from source.foundation.models import GameConfig, Player, PlayerDetails, LobbyDetails, Quad, OngoingBlessing, \
     InvestigationResult, Settlement, Unit, Heathen, Faction, AIPlaystyle, AttackPlaystyle, ExpansionPlaystyle, \
-    LoadedMultiplayerState, HarvestStatus, EconomicStatus, MultiplayerStatus, Location
-from source.game_management.game_controller import GameController
+    HarvestStatus, EconomicStatus, MultiplayerStatus, Location, HibernatedLobby, SaveSnapshot
+from source.game_management.board_state import BoardState
 from source.game_management.game_state import GameState
 from source.game_management.movemaker import MoveMaker
-from source.networking.client import get_identifier, initialise_upnp, broadcast_to_local_network_hosts, \
-    SERVER_PORT, GLOBAL_SERVER_HOST, DispatcherKind, EventDispatcher
+from source.networking.client import get_identifier, SERVER_PORT, GLOBAL_SERVER_HOST, DispatcherKind, \
+    EventDispatcher, NetworkBootstrap, NETWORK_CACHE_FILE_NAME, LocalServerDiscovery
 from source.networking.events import Event, EventType, CreateEvent, InitEvent, UpdateEvent, UpdateAction, \
     FoundSettlementEvent, QueryEvent, LeaveEvent, JoinEvent, RegisterEvent, SetBlessingEvent, SetConstructionEvent, \
     MoveUnitEvent, DeployUnitEvent, GarrisonUnitEvent, InvestigateEvent, BesiegeSettlementEvent, \
     BuyoutConstructionEvent, DisbandUnitEvent, AttackUnitEvent, AttackSettlementEvent, EndTurnEvent, UnreadyEvent, \
     HealUnitEvent, BoardDeployerEvent, DeployerDeployEvent, AutofillEvent, SaveEvent, QuerySavesEvent, LoadEvent
-from source.saving.game_save_manager import save_stats_achievements, save_game, get_saves, load_save_file
+from source.networking.client_registry import ClientRegistry, KEEPALIVE_INTERVAL, KEEPALIVE_BUCKETS
+from source.networking.join_session import JoinSession
+from source.networking.lobby_directory import LobbyDirectory
+from source.networking.lobby_tracker import LobbyTracker
+from source.saving.game_save_manager import save_stats_achievements, save_game, get_saves, load_save_file, \
+    journal_autosave_game, close_save_journal, hibernate_game, revive_game, SAVES_DIR
 from source.saving.save_encoder import ObjectConverter, SaveEncoder
 from source.saving.save_migrator import migrate_settlement, migrate_unit
 from source.util.calculator import complete_construction, attack, attack_setl, heal, clamp, \
     update_player_quads_seen_around_point
-from source.util.minifier import minify_quad, inflate_quad, minify_player, inflate_player, minify_heathens, \
-    inflate_heathens, minify_quads_seen, inflate_quads_seen, minify_save_details
+from source.util.minifier import minify_quad, inflate_quad, minify_player, minify_heathens, minify_quads_seen, \
+    minify_save_details
+from source.util.profiler import PROFILER, END_TURN_SECTION
+if TYPE_CHECKING:
+    from source.game_management.game_controller import GameController
+
+# The keepalive sent to every client is always the same, so it only needs to be encoded once.
+KEEPALIVE_PACKET: bytes = json.dumps(Event(EventType.KEEPALIVE, None), separators=(",", ":"), cls=SaveEncoder).encode()
+
+
+def choose_lobby_name(taken: Container[str]) -> str:
+    """
+    Randomly choose a lobby name that isn't already taken.
+    :param taken: The names of the lobbies already in use.
+    :return: The chosen lobby name.
+    """
+    lobby_name: str = random.choice(LOBBY_NAMES)
+    while lobby_name in taken:
+        lobby_name = random.choice(LOBBY_NAMES)
+    return lobby_name
 
 
 class MicrocosmServer(BaseServer):
@@ -55,10 +78,18 @@ class MicrocosmServer(BaseServer):
     game_clients_ref: Dict[str, List[PlayerDetails]]
     # Game name -> GameConfig.
     lobbies_ref: Dict[str, GameConfig]
-    # Hash identifier -> (host, port).
+    # Hash identifier -> (host, port), as kept by the client registry.
     clients_ref: Dict[int, Tuple[str, int]]
-    # Hash identifier -> number sent without response.
-    keepalive_ctrs_ref: Dict[int, int]
+    # The clients registered with the server, along with their lobbies and keepalives.
+    client_registry_ref: ClientRegistry
+    # The directory of lobbies returned to clients that query them.
+    lobby_directory_ref: LobbyDirectory
+    # The activity and memory usage of each lobby, along with the lobbies whose games have been hibernated.
+    lobby_tracker_ref: LobbyTracker
+    # The session tracking the loading of the ongoing game being joined - only used by clients.
+    join_session_ref: Optional[JoinSession]
+    # The local game servers that have responded to the client's probes - only used by clients.
+    local_discovery_ref: Optional[LocalServerDiscovery]
 
 
 class RequestHandler(BaseRequestHandler):
@@ -79,11 +110,45 @@ class RequestHandler(BaseRequestHandler):
             # our ObjectConverter here so we have attribute access.
             evt: Event = json.loads(self.request[0], object_hook=ObjectConverter)
             sock: socket.socket = self.request[1]
-            self.process_event(evt, sock)
+            # Clients decode events here, but apply them on the main thread, since the game's state is updated and
+            # drawn there.
+            if self.server.is_server:
+                self._handle_server_event(evt, sock)
+            else:
+                self.server.game_controller_ref.command_queue.enqueue(lambda: self.apply_event(evt, sock))
         # Any packet that arrives at the listener that isn't syntactically valid can just be ignored.
         except (UnicodeDecodeError, JSONDecodeError):
             pass
 
+    def _handle_server_event(self, evt: Event, sock: socket.socket):
+        """
+        Handle the given decoded event on the game server, waking the lobby it is for before applying it.
+        :param evt: The event received by the game server.
+        :param sock: The socket to use to respond, or send other packets out.
+        """
+        # Keepalive responses don't count as activity, since they're sent by every client, idle or not.
+        if evt.type != EventType.KEEPALIVE:
+            self.server.client_registry_ref.mark_active(evt.identifier)
+        if self._wake_lobby(evt):
+            # Idle lobbies are checked for periodically, with the lobby the event is for having just been marked as
+            # active.
+            if self.server.lobby_tracker_ref.sweep_due():
+                self._hibernate_idle_lobbies()
+            self.apply_event(evt, sock)
+
+    def apply_event(self, evt: Event, sock: socket.socket):
+        """
+        Apply the given decoded event, processing it and marking the display as dirty if necessary.
+        :param evt: The event to apply.
+        :param sock: The socket to use to respond, or send other packets out.
+        """
+        # Events are timed when profiling, with end turns being timed as such regardless of where they're processed.
+        with PROFILER.section(END_TURN_SECTION if evt.type == EventType.END_TURN else f"listener.{evt.type}"):
+            self.process_event(evt, sock)
+        # Events received by clients may have changed what is displayed, with the exception of keepalives.
+        if not self.server.is_server and evt.type != EventType.KEEPALIVE:
+            REDRAW_TRACKER.mark_dirty()
+
     def _forward_packet(self, evt: Event, gc_key: str, sock: socket.socket,
                         gate: Callable[[PlayerDetails], bool] = lambda pd: True):
         """
@@ -99,6 +164,122 @@ class RequestHandler(BaseRequestHandler):
                 sock.sendto(json.dumps(evt, separators=(",", ":"), cls=SaveEncoder).encode(),
                             self.server.clients_ref[player.id])
 
+    def _wake_lobby(self, evt: Event) -> bool:
+        """
+        Mark the lobby that the given event is for as active, first reviving its game if it has been hibernated.
+        :param evt: The event received by the game server.
+        :return: Whether the event can be processed, which is not the case if the lobby's game could not be revived.
+        """
+        # Events for a lobby refer to it either as a game or a lobby, and many events aren't for a lobby at all.
+        lobby_name: Optional[str] = getattr(evt, "game_name", None) or getattr(evt, "lobby_name", None)
+        if lobby_name in self.server.lobby_tracker_ref.hibernated:
+            try:
+                self._revive_lobby(lobby_name)
+            # If the game can't be revived, e.g. because its save has since been deleted, then the lobby can't go on.
+            except (OSError, ValueError):
+                self._close_lobby(lobby_name)
+                return False
+        if lobby_name in self.server.lobbies_ref:
+            self.server.lobby_tracker_ref.touch(lobby_name)
+        return True
+
+    def _hibernate_idle_lobbies(self):
+        """
+        Hibernate the games in each lobby that has been idle for too long, or for long enough when the games in memory
+        exceed the memory budget. Idle lobbies without any players, such as those for loaded games that nobody joined,
+        are closed instead.
+        """
+        for lobby_name in self.server.lobby_tracker_ref.get_idle_lobbies():
+            if not self.server.game_clients_ref[lobby_name]:
+                self._close_lobby(lobby_name)
+            # Lobbies for games that haven't started yet have nothing to save, and take up very little memory anyway.
+            elif self.server.game_states_ref[lobby_name].game_started:
+                self._hibernate_lobby(lobby_name)
+
+    def _hibernate_lobby(self, lobby_name: str):
+        """
+        Hibernate the game in the given lobby, saving it to disk and removing it from memory. The lobby itself remains
+        open, with its players and directory entry kept, so that its game can be revived as soon as it is needed again.
+        :param lobby_name: The name of the lobby to hibernate.
+        """
+        gs: GameState = self.server.game_states_ref[lobby_name]
+        try:
+            save_path: str = hibernate_game(gs, lobby_name)
+        # If the game couldn't be saved, e.g. because the disk is full, then it has to stay in memory for now.
+        except OSError:
+            self.server.lobby_tracker_ref.touch(lobby_name)
+            return
+        self.server.lobby_tracker_ref.hibernate(lobby_name, HibernatedLobby(save_path, gs.ready_players))
+        self.server.game_states_ref.pop(lobby_name)
+        self.server.namers_ref.pop(lobby_name)
+        self.server.move_makers_ref.pop(lobby_name)
+        # Journaling will start again from a new checkpoint once the game is revived.
+        close_save_journal(lobby_name)
+
+    def _revive_lobby(self, lobby_name: str):
+        """
+        Revive the hibernated game in the given lobby, loading it back into memory.
+        :param lobby_name: The name of the lobby to revive.
+        """
+        hibernated_lobby: HibernatedLobby = self.server.lobby_tracker_ref.hibernated[lobby_name]
+        gs: GameState = GameState()
+        namer: Namer = Namer()
+        _, quads = revive_game(gs, namer, hibernated_lobby.save_path)
+        self.server.lobby_tracker_ref.hibernated.pop(lobby_name)
+        gs.game_started = True
+        gs.on_menu = False
+        gs.ready_players = hibernated_lobby.ready_players
+        gs.board = BoardState(self.server.lobbies_ref[lobby_name], namer, quads)
+        move_maker: MoveMaker = MoveMaker(namer)
+        move_maker.board_ref = gs.board
+        self.server.game_states_ref[lobby_name] = gs
+        self.server.namers_ref[lobby_name] = namer
+        self.server.move_makers_ref[lobby_name] = move_maker
+
+    def _close_lobby(self, lobby_name: str):
+        """
+        Close the given lobby, freeing everything kept for it.
+        :param lobby_name: The name of the lobby to close.
+        """
+        for client in self.server.game_clients_ref.pop(lobby_name):
+            self.server.client_registry_ref.leave_lobby(client.id, lobby_name)
+        self.server.lobbies_ref.pop(lobby_name)
+        # Lobbies whose games have been hibernated have no game state in memory, but do have a save on disk.
+        self.server.game_states_ref.pop(lobby_name, None)
+        self.server.namers_ref.pop(lobby_name, None)
+        self.server.move_makers_ref.pop(lobby_name, None)
+        if (hibernated_lobby := self.server.lobby_tracker_ref.hibernated.get(lobby_name)) is not None and \
+                os.path.isfile(hibernated_lobby.save_path):
+            os.remove(hibernated_lobby.save_path)
+        self.server.lobby_tracker_ref.remove(lobby_name)
+        self.server.lobby_directory_ref.remove(lobby_name)
+        close_save_journal(lobby_name)
+
+    def _choose_lobby_name(self) -> str:
+        """
+        Choose a name for a new lobby, either for a created game or a loaded one.
+        :return: A lobby name that isn't already in use on the server.
+        """
+        # Lobbies whose games have been hibernated aren't in the game states, so we check the lobbies instead.
+        return choose_lobby_name(self.server.lobbies_ref)
+
+    def _refresh_lobby(self, lobby_name: str):
+        """
+        Refresh the lobby directory's entry for the given lobby, after its players or turn have changed.
+        :param lobby_name: The name of the lobby to refresh.
+        """
+        gs: GameState = self.server.game_states_ref[lobby_name]
+        # We need to copy the game clients here because otherwise we end up adding AI players to our game clients below,
+        # which we don't want.
+        player_details: List[PlayerDetails] = list(self.server.game_clients_ref[lobby_name])
+        # Because AI players aren't stored as game clients, we need to add them separately from the game state object.
+        # We can disregard eliminated players since nobody can join as them.
+        player_details.extend(PlayerDetails(player.name, player.faction, id=None)
+                              for player in gs.players if player.ai_playstyle and not player.eliminated)
+        self.server.lobby_directory_ref.update(LobbyDetails(lobby_name, player_details,
+                                                            self.server.lobbies_ref[lobby_name],
+                                                            None if not gs.game_started else gs.turn))
+
     def process_event(self, evt: Event, sock: socket.socket):
         """
         Process the given event.
@@ -144,9 +325,7 @@ class RequestHandler(BaseRequestHandler):
         gsrs: Dict[str, GameState] = self.server.game_states_ref
         # The game server picks a lobby name, creates game state, and sends the relevant details back to the client.
         if self.server.is_server:
-            lobby_name = random.choice(LOBBY_NAMES)
-            while lobby_name in gsrs:
-                lobby_name = random.choice(LOBBY_NAMES)
+            lobby_name: str = self._choose_lobby_name()
             player_name = random.choice(PLAYER_NAMES)
             gsrs[lobby_name] = GameState()
             gsrs[lobby_name].players.append(Player(player_name, Faction(evt.cfg.player_faction),
@@ -155,7 +334,10 @@ class RequestHandler(BaseRequestHandler):
             self.server.move_makers_ref[lobby_name] = MoveMaker(self.server.namers_ref[lobby_name])
             self.server.game_clients_ref[lobby_name] = \
                 [PlayerDetails(player_name, evt.cfg.player_faction, evt.identifier)]
+            self.server.client_registry_ref.join_lobby(evt.identifier, lobby_name)
             self.server.lobbies_ref[lobby_name] = evt.cfg
+            self.server.lobby_tracker_ref.touch(lobby_name)
+            self._refresh_lobby(lobby_name)
             evt.lobby_name = lobby_name
             evt.player_details = self.server.game_clients_ref[lobby_name]
             sock.sendto(json.dumps(evt, cls=SaveEncoder).encode(), self.server.clients_ref[evt.identifier])
@@ -182,12 +364,13 @@ class RequestHandler(BaseRequestHandler):
             gsr: GameState = gsrs[evt.game_name]
             gsr.game_started = True
             gsr.turn = 1
+            self._refresh_lobby(evt.game_name)
             random.seed()
             gsr.until_night = random.randint(10, 20)
             gsr.nighttime_left = 0
             gsr.on_menu = False
             namer: Namer = self.server.namers_ref[evt.game_name]
-            gsr.board = Board(self.server.lobbies_ref[evt.game_name], namer, {})
+            gsr.board = BoardState(self.server.lobbies_ref[evt.game_name], namer)
             self.server.move_makers_ref[evt.game_name].board_ref = gsr.board
             # Rather than seeding the random number generator, we just let the AI settlements be placed randomly and
             # then forward on their details to each game client.
@@ -212,6 +395,9 @@ class RequestHandler(BaseRequestHandler):
                 self._forward_packet(resp_evt, evt.game_name, sock)
         # Each game client receives game state and quad data, and starts the game once every packet has been received.
         else:
+            # The display modules are only imported for clients, so that the game server never loads pyxel.
+            import pyxel  # pylint: disable=import-outside-toplevel
+            from source.display.board import Board  # pylint: disable=import-outside-toplevel
             gc: GameController = self.server.game_controller_ref
             # The board will only be initialised once, when the first packet is received.
             if not gsrs["local"].board:
@@ -383,6 +569,8 @@ class RequestHandler(BaseRequestHandler):
         unit = next(u for u in player.units if u.location == (evt.initial_loc[0], evt.initial_loc[1]))
         # We need to unpack the JSON array into a tuple.
         unit.location = (evt.new_loc[0], evt.new_loc[1])
+        for waypoint in evt.waypoints:
+            update_player_quads_seen_around_point(player, (waypoint[0], waypoint[1]))
         update_player_quads_seen_around_point(player, unit.location)
         unit.remaining_stamina = evt.new_stamina
         unit.besieging = evt.besieging
@@ -677,25 +865,28 @@ class RequestHandler(BaseRequestHandler):
         :param sock: The socket to use to respond to the client that sent the query.
         """
         if self.server.is_server:
-            lobbies: List[LobbyDetails] = []
-            for name, cfg in self.server.lobbies_ref.items():
-                gs: GameState = self.server.game_states_ref[name]
-                player_details: List[PlayerDetails] = []
-                # We need to use extend here rather than just set player_details to be the game clients because if we do
-                # that, then we end up adding AI players to our game clients in the loop below, which we don't want.
-                player_details.extend(self.server.game_clients_ref[name])
-                # Because AI players aren't stored as game clients, we need to add them separately from the game state
-                # object. We can disregard eliminated players since nobody can join as them.
-                for player in [p for p in gs.players if p.ai_playstyle and not p.eliminated]:
-                    player_details.append(PlayerDetails(player.name, player.faction, id=None))
-                lobbies.append(LobbyDetails(name, player_details, cfg, None if not gs.game_started else gs.turn))
-            evt.lobbies = lobbies
-            sock.sendto(json.dumps(evt, cls=SaveEncoder).encode(), self.server.clients_ref[evt.identifier])
+            # Older clients don't request a particular page, so they just get the first one.
+            sock.sendto(self.server.lobby_directory_ref.get_page(getattr(evt, "page", 0)),
+                        self.server.clients_ref[evt.identifier])
         else:
             gc: GameController = self.server.game_controller_ref
+            viewing_local_lobbies: bool = self.client_address[0] != GLOBAL_SERVER_HOST
+            # Similarly, older game servers don't page their responses.
+            page: int = getattr(evt, "page", 0)
+            # When first viewing a game server's lobbies or moving to the next page, the first lobby is selected, and
+            # when moving to the previous page, the last lobby is selected. Otherwise, the same lobby stays selected.
+            if not gc.menu.viewing_lobbies or gc.menu.viewing_local_lobbies != viewing_local_lobbies or \
+                    page > gc.menu.lobby_page:
+                gc.menu.lobby_index = 0
+            elif page < gc.menu.lobby_page:
+                gc.menu.lobby_index = max(0, len(evt.lobbies) - 1)
+            else:
+                gc.menu.lobby_index = max(0, min(gc.menu.lobby_index, len(evt.lobbies) - 1))
             gc.menu.multiplayer_lobbies = evt.lobbies
+            gc.menu.lobby_page = page
+            gc.menu.lobby_page_count = getattr(evt, "page_count", None) or 1
             gc.menu.viewing_lobbies = True
-            gc.menu.viewing_local_lobbies = self.client_address[0] != GLOBAL_SERVER_HOST
+            gc.menu.viewing_local_lobbies = viewing_local_lobbies
 
     def process_leave_event(self, evt: LeaveEvent, sock: socket.socket):
         """
@@ -708,12 +899,11 @@ class RequestHandler(BaseRequestHandler):
             client_to_remove: PlayerDetails = next(client for client in old_clients if client.id == evt.identifier)
             new_clients = [client for client in old_clients if client.id != evt.identifier]
             self.server.game_clients_ref[evt.lobby_name] = new_clients
+            self.server.client_registry_ref.leave_lobby(evt.identifier, evt.lobby_name)
             # If there aren't any clients in the game anymore, then the game is over, and we can remove all related
             # state.
             if not new_clients:
-                self.server.game_clients_ref.pop(evt.lobby_name)
-                self.server.lobbies_ref.pop(evt.lobby_name)
-                self.server.game_states_ref.pop(evt.lobby_name)
+                self._close_lobby(evt.lobby_name)
             else:
                 gs: GameState = self.server.game_states_ref[evt.lobby_name]
                 player = next(p for p in gs.players if p.faction == client_to_remove.faction)
@@ -722,6 +912,7 @@ class RequestHandler(BaseRequestHandler):
                     player.ai_playstyle = AIPlaystyle(random.choice(list(AttackPlaystyle)),
                                                       random.choice(list(ExpansionPlaystyle)))
                     evt.player_ai_playstyle = player.ai_playstyle
+                self._refresh_lobby(evt.lobby_name)
                 evt.leaving_player_faction = player.faction
                 # We need this gate because multiple players may have left at the same time, meaning that they aren't
                 # even in the game anymore to receive the packet.
@@ -780,6 +971,8 @@ class RequestHandler(BaseRequestHandler):
                                              FACTION_COLOURS[evt.player_faction]))
                 self.server.game_clients_ref[evt.lobby_name].append(PlayerDetails(player_name, evt.player_faction,
                                                                                   evt.identifier))
+            self.server.client_registry_ref.join_lobby(evt.identifier, evt.lobby_name)
+            self._refresh_lobby(evt.lobby_name)
             # We can't just combine the player details from game_clients_ref and manually make the AI players' ones
             # because order matters for this - the player joining needs to get their player index right.
             player_details: List[PlayerDetails] = []
@@ -839,14 +1032,13 @@ class RequestHandler(BaseRequestHandler):
                 evt.player_chunk = None
                 evt.player_chunk_idx = None
                 for idx, player in enumerate(gs.players):
-                    evt.player_chunk_idx = idx
-                    evt.quads_seen_chunk = None
-                    # We split the quad locations into chunks of 100 in order to keep packet sizes suitably small.
-                    for qs_chunk in batched(list(player.quads_seen), 100):
-                        # We sleep for 10ms between each chunk in order to account for slower connections. By doing
+                    # Each player's seen quads are minified compactly enough to always fit in a single packet.
+                    if player.quads_seen:
+                        # We sleep for 10ms between each player in order to account for slower connections. By doing
                         # this, we can stop these clients from being overwhelmed by packets.
                         time.sleep(0.01)
-                        evt.quads_seen_chunk = minify_quads_seen(set(qs_chunk))
+                        evt.player_chunk_idx = idx
+                        evt.quads_seen_chunk = minify_quads_seen(player.quads_seen)
                         sock.sendto(json.dumps(evt, separators=(",", ":"), cls=SaveEncoder).encode(),
                                     self.server.clients_ref[evt.identifier])
                 evt.player_chunk_idx = None
@@ -858,6 +1050,11 @@ class RequestHandler(BaseRequestHandler):
                 sock.sendto(json.dumps(evt, separators=(",", ":"), cls=SaveEncoder).encode(),
                             self.server.clients_ref[evt.identifier])
         else:
+            # The display modules are only imported for clients, so that the game server never loads pyxel.
+            import pyxel  # pylint: disable=import-outside-toplevel
+            from source.display.board import Board  # pylint: disable=import-outside-toplevel
+            from source.display.menu import SetupOption  # pylint: disable=import-outside-toplevel
+
             gc.menu.multiplayer_lobby = LobbyDetails(evt.lobby_name,
                                                      evt.lobby_details.current_players,
                                                      evt.lobby_details.cfg,
@@ -885,7 +1082,13 @@ class RequestHandler(BaseRequestHandler):
                                 gs.located_player_idx = True
                             gs.players.append(Player(player.name, Faction(player.faction),
                                                      FACTION_COLOURS[player.faction]))
-                        gc.menu.multiplayer_game_being_loaded = LoadedMultiplayerState()
+                        # We don't care about the heathens before turn 5 because they wouldn't have spawned yet.
+                        self.server.join_session_ref = \
+                            JoinSession(gs, gc.namer, len(evt.lobby_details.current_players),
+                                        heathens_required=evt.lobby_details.current_turn > 5,
+                                        on_loaded=lambda: self._enter_joined_game(evt.player_faction),
+                                        run_on_main_thread=gc.command_queue.enqueue)
+                        gc.menu.multiplayer_game_being_loaded = self.server.join_session_ref.loaded_state
                     # Initialise the board with night data if it has not been done already.
                     if not gs.board:
                         gs.until_night = evt.until_night
@@ -897,74 +1100,12 @@ class RequestHandler(BaseRequestHandler):
                                          player_idx=gs.player_idx,
                                          game_name=evt.lobby_name)
                         gc.move_maker.board_ref = gs.board
-                    if evt.quad_chunk:
-                        split_quads: List[str] = evt.quad_chunk.split(",")[:-1]
-                        # Inflate each of the 100 quads received in this packet and assign them to the correct position
-                        # on the board, using the quad chunk index supplied in the event.
-                        for j in range(100):
-                            inflated_quad: Quad = inflate_quad(split_quads[j], location=(j, evt.quad_chunk_idx))
-                            gs.board.quads[evt.quad_chunk_idx][j] = inflated_quad
-                        gc.menu.multiplayer_game_being_loaded.quad_chunks_loaded += 1
-                    if evt.player_chunk:
-                        # Inflate the player received in this packet.
-                        gs.players[evt.player_chunk_idx] = inflate_player(evt.player_chunk, gs.board.quads)
-                        # Remove the names of this player's settlements from the joining player's namer, in order to
-                        # avoid name clashes.
-                        for s in gs.players[evt.player_chunk_idx].settlements:
-                            gc.namer.remove_settlement_name(s.name, s.quads[0].biome)
-                        gc.menu.multiplayer_game_being_loaded.players_loaded += 1
-                    if evt.quads_seen_chunk:
-                        # Because these chunks could arrive after entering the game, we need to make sure the loading
-                        # screen is still being shown before updating it.
-                        if gc.menu.multiplayer_game_being_loaded:
-                            gc.menu.multiplayer_game_being_loaded.total_quads_seen = evt.total_quads_seen
-                        # Inflate each of the 100 quad locations received in this packet and assign them to the correct
-                        # player, using the player chunk index supplied in the event.
-                        inflated_quads_seen: Set[Location] = inflate_quads_seen(evt.quads_seen_chunk)
-                        gs.players[evt.player_chunk_idx].quads_seen.update(inflated_quads_seen)
-                        if gc.menu.multiplayer_game_being_loaded:
-                            gc.menu.multiplayer_game_being_loaded.quads_seen_loaded += len(inflated_quads_seen)
-                    if evt.heathens_chunk:
-                        gc.menu.multiplayer_game_being_loaded.total_heathens = evt.total_heathens
-                        # Inflate the heathens received.
-                        gs.heathens = inflate_heathens(evt.heathens_chunk)
-                        gc.menu.multiplayer_game_being_loaded.heathens_loaded = True
                     gs.turn = evt.lobby_details.current_turn
-                    # Once sufficient game state has been received, the game can start. We verify this by ensuring that
-                    # the board, every quad, every player (and at least some of their seen quads), and the heathens have
-                    # been loaded.
-                    state_populated: bool = True
-                    for i in range(90):
-                        for j in range(100):
-                            if gs.board.quads[i][j] is None:
-                                state_populated = False
-                                break
-                        if not state_populated:
-                            break
-                    for p in gs.players:
-                        if not p.quads_seen:
-                            state_populated = False
-                            break
-                    # We don't care about the heathens before turn 5 because they wouldn't have spawned yet.
-                    if gs.turn > 5 and not gs.heathens:
-                        state_populated = False
-                    # Enter the game once sufficient data has been received.
-                    if state_populated:
-                        pyxel.mouse(visible=True)
-                        gc.last_turn_time = time.time()
-                        gs.game_started = True
-                        gs.on_menu = False
-                        # Update stats to include the newly-selected faction.
-                        save_stats_achievements(gsrs["local"], faction_to_add=evt.player_faction)
-                        # Initialise the map position to the player's first settlement.
-                        gs.map_pos = (clamp(gs.players[gs.player_idx].settlements[0].location[0] - 12, -1, 77),
-                                      clamp(gs.players[gs.player_idx].settlements[0].location[1] - 11, -1, 69))
-                        gs.board.overlay.current_player = gs.players[gs.player_idx]
-                        gs.board.overlay.total_settlement_count = sum(len(p.settlements) for p in gs.players)
-                        gc.music_player.stop_menu_music()
-                        gc.music_player.play_game_music()
-                        # We can reset the loading screen's statistics as well.
-                        gc.menu.multiplayer_game_being_loaded = None
+                    # The received chunks are inflated in the background, with the game being entered once sufficient
+                    # game state has been loaded. Note that seen quad packets may still be received after entering the
+                    # game, as game state is considered to be populated as long as each player has at least some seen
+                    # quads - these are handled by the same session.
+                    self.server.join_session_ref.receive(evt)
             # If the game hasn't started yet and we're still in the lobby.
             else:
                 # If the client has not located their player index, then they must be the player that is joining, so we
@@ -985,6 +1126,33 @@ class RequestHandler(BaseRequestHandler):
                     gs.players.append(Player(new_player.name, Faction(new_player.faction),
                                              FACTION_COLOURS[new_player.faction]))
 
+    def _enter_joined_game(self, player_faction: Faction):
+        """
+        Enter the ongoing multiplayer game that the client has joined, once sufficient game state has been loaded.
+        :param player_faction: The faction the client joined as.
+        """
+        # The display modules are only imported for clients, so that the game server never loads pyxel.
+        import pyxel  # pylint: disable=import-outside-toplevel
+
+        gsrs: Dict[str, GameState] = self.server.game_states_ref
+        gc: GameController = self.server.game_controller_ref
+        gs: GameState = gsrs["local"]
+        pyxel.mouse(visible=True)
+        gc.last_turn_time = time.time()
+        gs.game_started = True
+        gs.on_menu = False
+        # Update stats to include the newly-selected faction.
+        save_stats_achievements(gs, faction_to_add=player_faction)
+        # Initialise the map position to the player's first settlement.
+        gs.map_pos = (clamp(gs.players[gs.player_idx].settlements[0].location[0] - 12, -1, 77),
+                      clamp(gs.players[gs.player_idx].settlements[0].location[1] - 11, -1, 69))
+        gs.board.overlay.current_player = gs.players[gs.player_idx]
+        gs.board.overlay.total_settlement_count = sum(len(p.settlements) for p in gs.players)
+        gc.music_player.stop_menu_music()
+        gc.music_player.play_game_music()
+        # We can reset the loading screen's statistics as well.
+        gc.menu.multiplayer_game_being_loaded = None
+
     def process_register_event(self, evt: RegisterEvent, sock: socket.socket):
         """
         Process an event to register a client with the server.
@@ -993,14 +1161,20 @@ class RequestHandler(BaseRequestHandler):
         """
         if self.server.is_server:
             # Keep track of the client's IP address and port they're listening on, so we can send them packets.
-            self.server.clients_ref[evt.identifier] = self.client_address[0], evt.port
+            self.server.client_registry_ref.register(evt.identifier, (self.client_address[0], evt.port))
             sock.sendto(json.dumps(evt, separators=(",", ":"), cls=SaveEncoder).encode(),
                         self.server.clients_ref[evt.identifier])
         else:
             if self.client_address[0] != GLOBAL_SERVER_HOST:
-                self.server.game_states_ref["local"].event_dispatchers[DispatcherKind.LOCAL] = \
-                    EventDispatcher(str(self.client_address[0]))
-                self.server.game_controller_ref.menu.has_local_dispatcher = True
+                host: str = str(self.client_address[0])
+                self.server.local_discovery_ref.record_server(host)
+                dispatchers: Dict[DispatcherKind, EventDispatcher] = \
+                    self.server.game_states_ref["local"].event_dispatchers
+                # Local game servers respond to every probe, so the dispatcher is only created for the first one to
+                # respond, and then kept until that server is no longer around.
+                if DispatcherKind.LOCAL not in dispatchers:
+                    dispatchers[DispatcherKind.LOCAL] = EventDispatcher(host)
+                    self.server.game_controller_ref.menu.has_local_dispatcher = True
 
     def _server_end_turn(self, gs: GameState, evt: EndTurnEvent, sock: socket.socket):
         """
@@ -1024,7 +1198,8 @@ class RequestHandler(BaseRequestHandler):
             gs.process_climatic_effects(reseed_random=False)
         # If no victory has been achieved, then save the game and process the turns for the heathens and AI players.
         if gs.check_for_victory() is None:
-            save_game(gs, auto=True)
+            snapshot: SaveSnapshot = journal_autosave_game(gs, evt.game_name)
+            self.server.lobby_tracker_ref.record_size(evt.game_name, snapshot.get_size())
             gs.process_heathens()
             gs.process_ais(self.server.move_makers_ref[evt.game_name])
         # Pass the hash of the server's game state to clients so that they can validate that they're still in sync with
@@ -1034,6 +1209,7 @@ class RequestHandler(BaseRequestHandler):
         self._forward_packet(evt, evt.game_name, sock)
         # Since we're in a new turn, there are no longer any players ready to end their turn.
         gs.ready_players.clear()
+        self._refresh_lobby(evt.game_name)
 
     def process_end_turn_event(self, evt: EndTurnEvent, sock: socket.socket):
         """
@@ -1133,6 +1309,7 @@ class RequestHandler(BaseRequestHandler):
                                    ai_playstyle=AIPlaystyle(random.choice(list(AttackPlaystyle)),
                                                             random.choice(list(ExpansionPlaystyle))))
                 gsrs[evt.lobby_name].players.append(ai_player)
+            self._refresh_lobby(evt.lobby_name)
             evt.players = gsrs[evt.lobby_name].players
             # Alert all players to the new AI players in the lobby.
             self._forward_packet(evt, evt.lobby_name, sock)
@@ -1188,9 +1365,7 @@ class RequestHandler(BaseRequestHandler):
         if self.server.is_server:
             gsrs: Dict[str, GameState] = self.server.game_states_ref
             # Choose a new lobby name for the saved game.
-            lobby_name = random.choice(LOBBY_NAMES)
-            while lobby_name in gsrs:
-                lobby_name = random.choice(LOBBY_NAMES)
+            lobby_name: str = self._choose_lobby_name()
             gsrs[lobby_name] = GameState()
             self.server.namers_ref[lobby_name] = Namer()
             # Load in all game state from the file.
@@ -1208,11 +1383,12 @@ class RequestHandler(BaseRequestHandler):
             self.server.lobbies_ref[lobby_name] = cfg
             gsrs[lobby_name].game_started = True
             gsrs[lobby_name].on_menu = False
-            gsrs[lobby_name].board = Board(self.server.lobbies_ref[lobby_name],
-                                           self.server.namers_ref[lobby_name],
-                                           {},
-                                           quads)
+            gsrs[lobby_name].board = BoardState(self.server.lobbies_ref[lobby_name],
+                                                self.server.namers_ref[lobby_name],
+                                                quads)
             self.server.move_makers_ref[lobby_name].board_ref = gsrs[lobby_name].board
+            self.server.lobby_tracker_ref.touch(lobby_name)
+            self._refresh_lobby(lobby_name)
             player_details: List[PlayerDetails] = []
             for player in [p for p in gsrs[lobby_name].players if not p.eliminated]:
                 player_details.append(PlayerDetails(player.name, player.faction, id=None))
@@ -1236,7 +1412,7 @@ class RequestHandler(BaseRequestHandler):
         # If the server is receiving this event, then the client responded to the initial keepalive, and we can reset
         # their counter.
         if self.server.is_server:
-            self.server.keepalive_ctrs_ref[evt.identifier] = 0
+            self.server.client_registry_ref.acknowledge(evt.identifier)
         # If a client is receiving this event, however, they need to send one back to the server to signal that they're
         # still 'alive'.
         else:
@@ -1275,97 +1451,72 @@ class EventListener:
         self.game_clients: Dict[str, List[PlayerDetails]] = {}
         # Game name -> GameConfig.
         self.lobbies: Dict[str, GameConfig] = {}
-        # Hash identifier -> (host, port).
-        self.clients: Dict[int, Tuple[str, int]] = {}
-        # Hash identifier -> number sent without response.
-        self.keepalive_ctrs: Dict[int, int] = {}
+        # The clients registered with the server, along with their lobbies and keepalives.
+        self.client_registry: ClientRegistry = ClientRegistry()
+        # The directory of lobbies returned to clients that query them.
+        self.lobby_directory: LobbyDirectory = LobbyDirectory()
+        # The activity and memory usage of each lobby, along with the lobbies whose games have been hibernated.
+        self.lobby_tracker: LobbyTracker = LobbyTracker()
+        # The local game servers that have responded to the client's probes - only used by clients.
+        self.local_discovery: Optional[LocalServerDiscovery] = None
 
+        if self.is_server:
+            self.start_keepalives()
+
+    def start_keepalives(self):
+        """
+        Start sending out regular keepalives to clients.
+        """
         # The game server needs to send out regular keepalives in another thread, since we're going to be listening for
         # events on the main one.
-        if self.is_server:
-            self.keepalive_scheduler: sched.scheduler = sched.scheduler(time.time, time.sleep)
-            keepalive_thread: Thread = Thread(target=self.run_keepalive_scheduler, daemon=True)
-            keepalive_thread.start()
+        self.keepalive_sock: socket.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.keepalive_scheduler: sched.scheduler = sched.scheduler(time.time, time.sleep)
+        keepalive_thread: Thread = Thread(target=self.run_keepalive_scheduler, daemon=True)
+        keepalive_thread.start()
 
     def run_keepalive_scheduler(self):
         """
-        Run the keepalive scheduler, which runs the keepalive every 5 seconds.
+        Run the keepalive scheduler, which sends keepalives to the next bucket of clients several times per keepalive
+        interval.
         """
-        self.keepalive_scheduler.enter(5, 1, self.run_keepalive, (self.keepalive_scheduler,))
+        self.keepalive_scheduler.enter(KEEPALIVE_INTERVAL / KEEPALIVE_BUCKETS, 1, self.run_keepalive,
+                                       (self.keepalive_scheduler,))
         self.keepalive_scheduler.run()
 
     def run_keepalive(self, scheduler: sched.scheduler):
         """
-        Runs the keepalive, ensuring all clients are still playing the game (and their connection is stable).
+        Runs the keepalive for the next bucket of clients, ensuring they are still playing the game (and their
+        connection is stable).
         :param scheduler: The scheduler to use to run the keepalive.
         """
-        # Run the keepalive again in 5 seconds.
-        scheduler.enter(5, 1, self.run_keepalive, (scheduler,))
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        evt = Event(EventType.KEEPALIVE, None)
-        clients_to_remove: List[int] = []
-        # Send the keepalive event to each client.
-        for identifier, client in self.clients.items():
-            sock.sendto(json.dumps(evt, cls=SaveEncoder).encode(), client)
-            if identifier in self.keepalive_ctrs:
-                self.keepalive_ctrs[identifier] += 1
-                # If a client has not responded to a keepalive event in the last 30 seconds, then they can be considered
-                # to be no longer playing.
-                if self.keepalive_ctrs[identifier] == 6:
-                    clients_to_remove.append(identifier)
-            else:
-                self.keepalive_ctrs[identifier] = 1
-        # Clients that are being removed are removed from their current game and then removed from the clients
-        # dictionary.
-        for identifier in clients_to_remove:
-            for lobby_name, details in self.game_clients.items():
-                for player_detail in details:
-                    if player_detail.id == identifier:
-                        # Rather than copy all the same logic as leave events, we simply send a leave event from the
-                        # server to itself with the client's details.
-                        l_evt: LeaveEvent = LeaveEvent(EventType.LEAVE, identifier, lobby_name)
-                        sock.sendto(json.dumps(l_evt, cls=SaveEncoder).encode(), ("localhost", SERVER_PORT))
-            self.clients.pop(identifier)
+        # Run the keepalive again for the bucket after this one.
+        scheduler.enter(KEEPALIVE_INTERVAL / KEEPALIVE_BUCKETS, 1, self.run_keepalive, (scheduler,))
+        addresses, unresponsive = self.client_registry.advance()
+        for address in addresses:
+            self.keepalive_sock.sendto(KEEPALIVE_PACKET, address)
+        # Clients that are no longer playing have already been removed from the registry, but still need to be removed
+        # from their current games. Rather than copy all the same logic as leave events, we simply send a leave event
+        # from the server to itself for each of the client's games.
+        for identifier, lobby_names in unresponsive.items():
+            for lobby_name in lobby_names:
+                l_evt: LeaveEvent = LeaveEvent(EventType.LEAVE, identifier, lobby_name)
+                self.keepalive_sock.sendto(json.dumps(l_evt, cls=SaveEncoder).encode(), ("localhost", SERVER_PORT))
 
-    def run(self):
+    def create_server(self) -> UDPServer:
         """
-        Run the event listener, listening forever.
+        Create the UDP server to listen with.
+        :return: The bound server.
         """
         # Bind the listener to all IP addresses on the machine. The game server listens on port 9999, while clients can
         # listen on whichever dynamic port they get assigned - since the server remembers what port each client is on,
         # it doesn't matter that it is different for each client.
-        with UDPServer(("0.0.0.0", SERVER_PORT if self.is_server else 0), RequestHandler) as server:
-            # Clients need to open up their networking and contact the server before they can start listening for
-            # events.
-            if not self.is_server:
-                # Fundamentally, UPnP works by opening up a port into your connected network, and then forwards all
-                # public traffic directed at that port to a configured private IP within the network. Because of this,
-                # we need to determine what the private IP is for this machine. We do this by connecting to the Google
-                # DNS server, which allows us to see the private IP for this machine. This private IP is also used to
-                # scan for any other LAN hosts on the client's local network.
-                ip_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-                ip_sock.connect(("8.8.8.8", 80))
-                private_ip: str = ip_sock.getsockname()[0]
-                try:
-                    # Initialise UPnP for this session.
-                    initialise_upnp(private_ip, server.server_address[1])
-                    # Now with a port listening for external traffic, we can signal to the global game server that we're
-                    # listening.
-                    global_dispatcher: EventDispatcher = EventDispatcher()
-                    global_dispatcher.dispatch_event(RegisterEvent(EventType.REGISTER, get_identifier(),
-                                                                   server.server_address[1]))
-                    self.game_states["local"].event_dispatchers[DispatcherKind.GLOBAL] = global_dispatcher
-                    # Also broadcast to any other server hosts that might be listening on the local network.
-                    broadcast_to_local_network_hosts(private_ip, server.server_address[1])
-                    self.game_controller.menu.upnp_enabled = True
-                # This would be a more specific Exception, but the UPnP library that is used actually raises the base
-                # Exception. Thus, we also have to disable the lint rule for catching base Exceptions.
-                # pylint: disable=broad-exception-caught
-                except Exception:
-                    # Even though global multiplayer games won't work, local ones might, so we broadcast to any other
-                    # server hosts that might be listening on the local network here as well.
-                    broadcast_to_local_network_hosts(private_ip, server.server_address[1])
-                    self.game_controller.menu.upnp_enabled = False
+        return UDPServer(("0.0.0.0", SERVER_PORT if self.is_server else 0), RequestHandler)
+
+    def run(self):
+        """
+        Run the event listener, listening forever.
+        """
+        with self.create_server() as server:
             # So that the request handler can access the listener's state, we set some attributes on the handler itself.
             server.game_states_ref = self.game_states
             server.namers_ref = self.namers
@@ -1374,7 +1525,80 @@ class EventListener:
             server.game_controller_ref = self.game_controller
             server.game_clients_ref = self.game_clients
             server.lobbies_ref = self.lobbies
-            server.clients_ref = self.clients
-            server.keepalive_ctrs_ref = self.keepalive_ctrs
+            server.clients_ref = self.client_registry.clients
+            server.client_registry_ref = self.client_registry
+            server.lobby_directory_ref = self.lobby_directory
+            server.lobby_tracker_ref = self.lobby_tracker
+            server.join_session_ref = None
+            server.local_discovery_ref = None
+            # Clients need to open up their networking and contact the server, but this is done in the background so
+            # that events from local game servers can be received in the meantime.
+            if not self.is_server:
+                self.local_discovery = LocalServerDiscovery(
+                    server.server_address[1],
+                    on_lost=lambda host: self.game_controller.command_queue.enqueue(
+                        lambda: self.forget_local_server(host)))
+                server.local_discovery_ref = self.local_discovery
+                bootstrap_thread: Thread = Thread(target=self.bootstrap_client, args=(server.server_address[1],),
+                                                  daemon=True)
+                bootstrap_thread.start()
             # Listen for events until the process is killed.
             server.serve_forever()
+
+    def bootstrap_client(self, port: int, upnp_factory: Optional[Callable] = None):
+        """
+        Open up the client's networking, alerting any local game servers of the client and then initialising UPnP and
+        registering with the global game server, if possible. Once done, the menu is updated on the main thread to
+        reflect whether global multiplayer is available.
+        :param port: The dynamic listener port on the client.
+        :param upnp_factory: The function used to create the UPnP object. Defaults to the UPnP constructor.
+        """
+        # Fundamentally, UPnP works by opening up a port into your connected network, and then forwards all public
+        # traffic directed at that port to a configured private IP within the network. The bootstrap probes for local
+        # game servers and then determines this private IP.
+        bootstrap: NetworkBootstrap = NetworkBootstrap(port, os.path.join(SAVES_DIR, NETWORK_CACHE_FILE_NAME),
+                                                       upnp_factory)
+        global_dispatcher: Optional[EventDispatcher] = bootstrap.run()
+        # The game state and menu are only ever modified on the main thread, so the result is applied there.
+        self.game_controller.command_queue.enqueue(lambda: self.apply_network_bootstrap(global_dispatcher))
+        # Local game servers may be started or stopped at any time, so we keep probing for them in the background.
+        discovery_thread: Thread = Thread(target=self.local_discovery.run, daemon=True)
+        discovery_thread.start()
+
+    def apply_network_bootstrap(self, global_dispatcher: Optional[EventDispatcher]):
+        """
+        Apply the result of opening up the client's networking, updating the menu to reflect whether global multiplayer
+        is available.
+        :param global_dispatcher: The dispatcher for the global game server, or None if the client couldn't register
+                                  with it.
+        """
+        if global_dispatcher is not None:
+            self.game_states["local"].event_dispatchers[DispatcherKind.GLOBAL] = global_dispatcher
+        self.game_controller.menu.upnp_enabled = global_dispatcher is not None
+        # The menu is no longer 'Connecting to global server...', so it needs to be redrawn.
+        REDRAW_TRACKER.mark_dirty()
+
+    def forget_local_server(self, host: str):
+        """
+        Forget the local game server at the given host, now that it has stopped responding to probes. If the client was
+        using it, another known local game server is used instead, if there is one. However, a local game server that
+        the client is in a lobby or game on is not forgotten until the client leaves, since there's nothing else to
+        switch to. Until then, the server remains known to the discovery, and so is reported as lost again on each
+        re-probe.
+        :param host: The host of the local game server.
+        """
+        gs: GameState = self.game_states["local"]
+        dispatcher: Optional[EventDispatcher] = gs.event_dispatchers.get(DispatcherKind.LOCAL)
+        in_use: bool = dispatcher is not None and dispatcher.host == host
+        if in_use and (gs.game_started or self.game_controller.menu.multiplayer_lobby is not None):
+            return
+        # The server may have responded again since it was reported as lost.
+        if not self.local_discovery.forget_server(host) or not in_use:
+            return
+        if other_servers := self.local_discovery.get_servers():
+            gs.event_dispatchers[DispatcherKind.LOCAL] = EventDispatcher(other_servers[0])
+        else:
+            gs.event_dispatchers.pop(DispatcherKind.LOCAL)
+            self.game_controller.menu.has_local_dispatcher = False
+            # Local multiplayer is no longer available on the menu, so it needs to be redrawn.
+            REDRAW_TRACKER.mark_dirty()
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import Optional, List
 
@@ -134,6 +134,8 @@ class MoveUnitEvent(UpdateEvent):
     # update the server and other clients with the changes.
     new_stamina: int
     besieging: bool
+    # The locations the unit moved through before reaching its new location, if several moves were sent as one.
+    waypoints: List[Location] = field(default_factory=list)
 
 
 @dataclass
@@ -249,9 +251,12 @@ class DeployerDeployEvent(UpdateEvent):
 class QueryEvent(Event):
     """
     The event containing the required data for a response to a query for the available multiplayer lobbies.
-    This event is only populated when the server responds to the client with the available lobbies.
+    The lobbies are returned a page at a time, with the lobbies and page count only populated when the server responds
+    to the client.
     """
     lobbies: Optional[List[LobbyDetails]] = None
+    page: int = 0
+    page_count: Optional[int] = None
 
 
 @dataclass
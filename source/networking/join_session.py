@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+from threading import Lock, Thread
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set, Tuple
+
+from source.foundation.models import LoadedMultiplayerState, Location, Player, Quad, Heathen
+from source.util.minifier import inflate_quad, inflate_player, inflate_quads_seen, inflate_heathens
+
+if TYPE_CHECKING:
+    from source.foundation.catalogue import Namer
+    from source.game_management.game_state import GameState
+    from source.networking.events import JoinEvent
+
+
+class JoinSession:
+    """
+    Tracks the loading of an ongoing multiplayer game that the client is joining. Each chunk of game state received is
+    counted against the totals advertised by the game server, so that whether the game has loaded can be determined in
+    constant time. The chunks themselves are inflated in batches on a separate thread, so that the listener can keep
+    receiving packets in the meantime. Each inflated batch is then handed to the main thread to be applied to the game
+    state in a single step, so that the game state is never changed while it is being updated or drawn.
+    """
+
+    def __init__(self,
+                 game_state: GameState,
+                 namer: Namer,
+                 player_count: int,
+                 heathens_required: bool,
+                 on_loaded: Callable[[], None],
+                 run_on_main_thread: Callable[[Callable[[], None]], None]):
+        """
+        Creates the session, with nothing loaded.
+        :param game_state: The game state to load the received chunks into. Its board must be initialised before any
+                           chunks are received.
+        :param namer: The joining player's namer, which the names of other players' settlements are removed from.
+        :param player_count: The number of players in the game being joined.
+        :param heathens_required: Whether the heathens must be loaded before the game can be entered.
+        :param on_loaded: The function to call once sufficient game state has loaded for the game to be entered. This is
+                          called on the main thread.
+        :param run_on_main_thread: The function to use to have each inflated batch applied on the main thread.
+        """
+        self.game_state: GameState = game_state
+        self.namer: Namer = namer
+        self.loaded_state: LoadedMultiplayerState = \
+            LoadedMultiplayerState(total_players=player_count, heathens_required=heathens_required)
+        self.on_loaded: Callable[[], None] = on_loaded
+        self.run_on_main_thread: Callable[[Callable[[], None]], None] = run_on_main_thread
+        # Chunk index -> minified chunk, for each quad and player chunk that is yet to be inflated.
+        self.pending_quad_chunks: Dict[int, str] = {}
+        self.pending_players: Dict[int, str] = {}
+        # Player index -> minified chunk, for each seen quads chunk that is yet to be inflated.
+        self.pending_quads_seen: List[Tuple[int, str]] = []
+        self.pending_heathens: Optional[str] = None
+        # Chunk index -> the inflated row of quads. Players are inflated against these rows rather than the board, since
+        # the board is only updated on the main thread.
+        self.quad_rows: Dict[int, List[Quad]] = {}
+        # The indices of the quad and player chunks that have been inflated, so that duplicate packets can be ignored.
+        self.loaded_quad_chunk_idxs: Set[int] = set()
+        self.loaded_player_idxs: Set[int] = set()
+        # Guards the pending chunks, which are added to by the listener and taken by the inflation thread.
+        self.lock: Lock = Lock()
+        self.inflating: bool = False
+        self.loaded: bool = False
+
+    def receive(self, evt: JoinEvent):
+        """
+        Queue the chunks in the given event for inflation, starting the inflation thread if it isn't already running.
+        :param evt: The JoinEvent containing the chunks.
+        """
+        with self.lock:
+            if evt.quad_chunk:
+                self.pending_quad_chunks[evt.quad_chunk_idx] = evt.quad_chunk
+            if evt.player_chunk:
+                self.pending_players[evt.player_chunk_idx] = evt.player_chunk
+            if evt.quads_seen_chunk:
+                self.loaded_state.total_quads_seen = evt.total_quads_seen
+                self.pending_quads_seen.append((evt.player_chunk_idx, evt.quads_seen_chunk))
+            # The heathens are identified by their total rather than their chunk, since the chunk is empty when there
+            # are no heathens.
+            if evt.total_heathens is not None:
+                self.loaded_state.total_heathens = evt.total_heathens
+                self.pending_heathens = evt.heathens_chunk or ""
+            start_inflating: bool = not self.inflating
+            self.inflating = True
+        if start_inflating:
+            Thread(target=self.inflate_pending, daemon=True).start()
+
+    def inflate_pending(self):
+        """
+        Inflate the pending chunks in batches until none remain that can be inflated, handing each batch to the main
+        thread to be applied.
+        """
+        while True:
+            with self.lock:
+                # Players can only be inflated once every quad has been, since their settlements refer to the board's
+                # quads. Similarly, a player's seen quads can only be inflated once the player has been, so that they
+                # are applied after the player is. Any chunks that can't be inflated yet are left for a later batch.
+                quad_chunks: Dict[int, str] = self.pending_quad_chunks
+                self.pending_quad_chunks = {}
+                players: Dict[int, str] = {}
+                if len(self.loaded_quad_chunk_idxs) == self.loaded_state.total_quad_chunks:
+                    players = self.pending_players
+                    self.pending_players = {}
+                quads_seen: List[Tuple[int, str]] = \
+                    [qs for qs in self.pending_quads_seen if qs[0] in self.loaded_player_idxs]
+                self.pending_quads_seen = \
+                    [qs for qs in self.pending_quads_seen if qs[0] not in self.loaded_player_idxs]
+                heathens: Optional[str] = self.pending_heathens
+                self.pending_heathens = None
+                if not quad_chunks and not players and not quads_seen and heathens is None:
+                    self.inflating = False
+                    return
+            self.inflate_batch(quad_chunks, players, quads_seen, heathens)
+
+    def inflate_batch(self,
+                      quad_chunks: Dict[int, str],
+                      players: Dict[int, str],
+                      quads_seen: List[Tuple[int, str]],
+                      heathens: Optional[str]):
+        """
+        Inflate the given chunks into objects detached from the game state, and then hand them to the main thread to be
+        applied.
+        :param quad_chunks: Chunk index -> minified chunk, for each quad chunk to inflate.
+        :param players: Player index -> minified player, for each player to inflate.
+        :param quads_seen: The player index and minified chunk for each seen quads chunk to inflate.
+        :param heathens: The minified heathens to inflate, if they have been received.
+        """
+        inflated_rows: Dict[int, List[Quad]] = {}
+        for chunk_idx, quad_chunk in quad_chunks.items():
+            if chunk_idx not in self.loaded_quad_chunk_idxs:
+                split_quads: List[str] = quad_chunk.split(",")[:-1]
+                # Each chunk contains a full row of the board, with the chunk index being the row's y coordinate.
+                inflated_rows[chunk_idx] = [inflate_quad(quad_str, location=(j, chunk_idx))
+                                            for j, quad_str in enumerate(split_quads)]
+                self.quad_rows[chunk_idx] = inflated_rows[chunk_idx]
+                self.loaded_quad_chunk_idxs.add(chunk_idx)
+        inflated_players: Dict[int, Player] = {}
+        if players:
+            # Since players are only inflated once every quad has been, every row is present. The same quad objects are
+            # placed on the board, so the settlements' quads are the board's quads.
+            quads: List[List[Quad]] = [self.quad_rows[y] for y in range(self.loaded_state.total_quad_chunks)]
+            for player_idx, player_chunk in players.items():
+                if player_idx not in self.loaded_player_idxs:
+                    inflated_players[player_idx] = inflate_player(player_chunk, quads)
+                    self.loaded_player_idxs.add(player_idx)
+        inflated_quads_seen: List[Tuple[int, Set[Location]]] = \
+            [(player_idx, inflate_quads_seen(quads_seen_chunk)) for player_idx, quads_seen_chunk in quads_seen]
+        inflated_heathens: Optional[List[Heathen]] = inflate_heathens(heathens) if heathens is not None else None
+        self.run_on_main_thread(
+            lambda: self.apply_batch(inflated_rows, inflated_players, inflated_quads_seen, inflated_heathens))
+
+    def apply_batch(self,
+                    quad_rows: Dict[int, List[Quad]],
+                    players: Dict[int, Player],
+                    quads_seen: List[Tuple[int, Set[Location]]],
+                    heathens: Optional[List[Heathen]]):
+        """
+        Apply the given inflated batch to the game state, updating the loaded state accordingly and calling the loaded
+        callback once sufficient game state has loaded. This is run on the main thread.
+        :param quad_rows: Chunk index -> the inflated row of quads, for each quad chunk inflated.
+        :param players: Player index -> the inflated player, for each player inflated.
+        :param quads_seen: The player index and inflated seen quads for each seen quads chunk inflated.
+        :param heathens: The inflated heathens, if they were in the batch.
+        """
+        gs: GameState = self.game_state
+        for chunk_idx, quad_row in quad_rows.items():
+            gs.board.quads[chunk_idx][:] = quad_row
+            self.loaded_state.quad_chunks_loaded += 1
+        for player_idx, player in players.items():
+            gs.players[player_idx] = player
+            # Remove the names of this player's settlements from the joining player's namer, in order to avoid name
+            # clashes.
+            for setl in player.settlements:
+                self.namer.remove_settlement_name(setl.name, setl.quads[0].biome)
+            self.loaded_state.players_loaded += 1
+        for player_idx, inflated_quads_seen in quads_seen:
+            player: Player = gs.players[player_idx]
+            if not player.quads_seen and inflated_quads_seen:
+                self.loaded_state.players_with_quads_seen += 1
+            player.quads_seen.update(inflated_quads_seen)
+            self.loaded_state.quads_seen_loaded += len(inflated_quads_seen)
+        if heathens is not None:
+            gs.heathens = heathens
+            self.loaded_state.heathens_loaded = True
+        if not self.loaded and self.loaded_state.is_loaded():
+            self.loaded = True
+            self.on_loaded()
@@ -0,0 +1,70 @@
+import json
+from itertools import islice
+from typing import Dict
+
+from source.foundation.models import LobbyDetails
+from source.networking.events import QueryEvent, EventType
+from source.saving.save_encoder import SaveEncoder
+
+# The number of lobbies in each page of a query response. This keeps each response comfortably within a single datagram,
+# and is also the number of lobbies that fit on the menu at once.
+LOBBIES_PER_PAGE: int = 10
+
+
+class LobbyDirectory:
+    """
+    The directory of a game server's lobbies, as returned to clients that query them. Each lobby's entry is updated as
+    the lobby changes, and responses are encoded a page at a time, once per change, so that the cost of a query doesn't
+    grow with the number of lobbies.
+    """
+
+    def __init__(self):
+        """
+        Creates the directory, with no lobbies.
+        """
+        # Lobby name -> LobbyDetails, in the order the lobbies were created.
+        self.lobbies: Dict[str, LobbyDetails] = {}
+        # Page -> the encoded response for that page. Cleared whenever a lobby changes.
+        self.pages: Dict[int, bytes] = {}
+
+    def update(self, lobby: LobbyDetails):
+        """
+        Add or replace the entry for the given lobby.
+        :param lobby: The lobby's current details.
+        """
+        self.lobbies[lobby.name] = lobby
+        self.pages.clear()
+
+    def remove(self, lobby_name: str):
+        """
+        Remove the entry for the lobby with the given name, if there is one.
+        :param lobby_name: The name of the lobby to remove.
+        """
+        if self.lobbies.pop(lobby_name, None) is not None:
+            self.pages.clear()
+
+    def get_page_count(self) -> int:
+        """
+        Get the number of pages of lobbies, which is always at least one, even if there are no lobbies.
+        :return: The number of pages.
+        """
+        return max(1, -(-len(self.lobbies) // LOBBIES_PER_PAGE))
+
+    def get_page(self, page: int) -> bytes:
+        """
+        Get the encoded query response for the given page of lobbies, encoding it if it hasn't been since the last
+        change. Pages outside the directory are clamped to the first or last page.
+        :param page: The index of the page to get.
+        :return: The encoded QueryEvent containing the page's lobbies.
+        """
+        page_count: int = self.get_page_count()
+        page = min(max(page, 0), page_count - 1)
+        if (encoded := self.pages.get(page)) is None:
+            start: int = page * LOBBIES_PER_PAGE
+            # The response isn't specific to the client that sent the query, so it has no identifier.
+            evt: QueryEvent = QueryEvent(EventType.QUERY, None,
+                                         list(islice(self.lobbies.values(), start, start + LOBBIES_PER_PAGE)),
+                                         page, page_count)
+            encoded = json.dumps(evt, separators=(",", ":"), cls=SaveEncoder).encode()
+            self.pages[page] = encoded
+        return encoded
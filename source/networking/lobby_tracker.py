@@ -0,0 +1,109 @@
+import time
+from typing import Dict, List
+
+from source.foundation.models import HibernatedLobby
+
+# How long a lobby can go without any of its players sending an event other than a keepalive before its game is
+# hibernated, in seconds.
+LOBBY_IDLE_TIMEOUT: float = 1800
+# The total size of the games kept in memory, as measured by the size of their most recent snapshots, above which the
+# least recently active games are hibernated early.
+LOBBY_MEMORY_BUDGET: int = 64 * 1024 * 1024
+# How long a lobby must have been idle for before its game may be hibernated early to stay within the memory budget, in
+# seconds. This stops games that are being actively played from being repeatedly hibernated and revived.
+LOBBY_MIN_IDLE: float = 60
+# How often lobbies are checked for hibernation, in seconds.
+LOBBY_SWEEP_INTERVAL: float = 60
+
+
+class LobbyTracker:
+    """
+    Keeps track of when each of a game server's lobbies was last active and how much memory its game takes up, so that
+    idle games can be hibernated to disk, along with the lobbies that have been hibernated. The tracker is only used by
+    the listener's thread, so it requires no lock.
+    """
+
+    def __init__(self):
+        """
+        Creates the tracker, with no lobbies tracked.
+        """
+        # Lobby name -> when the lobby was last active, as returned by time.monotonic(), ordered from the least to the
+        # most recently active lobby. Hibernated lobbies have no entry.
+        self.last_active: Dict[str, float] = {}
+        # Lobby name -> the size of the lobby's most recent snapshot, estimating how much memory its game takes up.
+        self.sizes: Dict[str, int] = {}
+        # Lobby name -> the details needed to revive the lobby's hibernated game.
+        self.hibernated: Dict[str, HibernatedLobby] = {}
+        self.last_sweep: float = time.monotonic()
+
+    def touch(self, lobby_name: str):
+        """
+        Mark the lobby with the given name as having just been active.
+        :param lobby_name: The name of the lobby.
+        """
+        self.last_active.pop(lobby_name, None)
+        self.last_active[lobby_name] = time.monotonic()
+
+    def record_size(self, lobby_name: str, size: int):
+        """
+        Record the current size of the game in the lobby with the given name.
+        :param lobby_name: The name of the lobby.
+        :param size: The size of the lobby's most recent snapshot.
+        """
+        self.sizes[lobby_name] = size
+
+    def get_total_size(self) -> int:
+        """
+        Get the total size of the games kept in memory.
+        :return: The sum of the sizes of the most recent snapshots of each lobby that has not been hibernated.
+        """
+        return sum(self.sizes.values())
+
+    def hibernate(self, lobby_name: str, hibernated_lobby: HibernatedLobby):
+        """
+        Record that the game in the lobby with the given name has been hibernated.
+        :param lobby_name: The name of the lobby.
+        :param hibernated_lobby: The details needed to revive the lobby's game.
+        """
+        self.last_active.pop(lobby_name, None)
+        self.sizes.pop(lobby_name, None)
+        self.hibernated[lobby_name] = hibernated_lobby
+
+    def remove(self, lobby_name: str):
+        """
+        Stop tracking the lobby with the given name, now that it has been closed.
+        :param lobby_name: The name of the lobby.
+        """
+        self.last_active.pop(lobby_name, None)
+        self.sizes.pop(lobby_name, None)
+        self.hibernated.pop(lobby_name, None)
+
+    def sweep_due(self) -> bool:
+        """
+        Determine whether lobbies are due to be checked for hibernation, resetting the timer if so.
+        :return: Whether lobbies should be checked now.
+        """
+        now: float = time.monotonic()
+        if now - self.last_sweep < LOBBY_SWEEP_INTERVAL:
+            return False
+        self.last_sweep = now
+        return True
+
+    def get_idle_lobbies(self) -> List[str]:
+        """
+        Get the lobbies whose games should be hibernated, i.e. those that have been idle for too long, as well as the
+        least recently active ones while the games in memory exceed the memory budget.
+        :return: The names of the lobbies to hibernate, from the least to the most recently active.
+        """
+        now: float = time.monotonic()
+        total_size: int = self.get_total_size()
+        idle: List[str] = []
+        for lobby_name, last_active in self.last_active.items():
+            idle_time: float = now - last_active
+            if idle_time >= LOBBY_IDLE_TIMEOUT or (total_size > LOBBY_MEMORY_BUDGET and idle_time >= LOBBY_MIN_IDLE):
+                idle.append(lobby_name)
+                total_size -= self.sizes.get(lobby_name, 0)
+            else:
+                # Since lobbies are ordered by when they were last active, no later lobby can be idle for longer.
+                break
+        return idle
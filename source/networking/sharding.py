@@ -0,0 +1,361 @@
+import json
+import multiprocessing
+import os
+import socket
+from json import JSONDecodeError
+from multiprocessing import Process
+from multiprocessing.queues import Queue
+from queue import Empty
+from socketserver import UDPServer
+from typing import Dict, List, Optional, Tuple
+
+from source.foundation.models import LobbyDetails, ShardUpdate, ShardUpdateType
+from source.networking.client import SERVER_PORT
+from source.networking.client_registry import ClientRegistry
+from source.networking.event_listener import RequestHandler, MicrocosmServer, EventListener, choose_lobby_name
+from source.networking.events import Event, EventType
+from source.networking.lobby_directory import LobbyDirectory
+from source.saving.save_encoder import ObjectConverter
+
+# The environment variable that, when set to a number of shards, runs the game server as a front process that receives
+# every event, along with that number of shard processes that each own some of the lobbies.
+SHARDS_ENV_VAR: str = "MICROCOSM_SERVER_SHARDS"
+# The host that shards listen on. Only the front forwards events to shards, so they aren't reachable from elsewhere.
+# Shards send packets to clients from a separate socket bound to all addresses, since a socket bound to the loopback
+# address can't send to other hosts.
+SHARD_HOST: str = "127.0.0.1"
+# The events that the front handles itself, since they aren't for a particular lobby.
+FRONT_EVENT_TYPES: Tuple[EventType, ...] = \
+    (EventType.REGISTER, EventType.QUERY, EventType.QUERY_SAVES, EventType.KEEPALIVE)
+
+
+def get_shard_count() -> Optional[int]:
+    """
+    Get the number of shards to run the game server with, as configured in the environment.
+    :return: The configured shard count, or None if sharding is disabled or misconfigured.
+    """
+    try:
+        shard_count: int = int(os.environ.get(SHARDS_ENV_VAR, ""))
+    except ValueError:
+        return None
+    return shard_count if shard_count > 0 else None
+
+
+class ShardRouter:
+    """
+    Keeps track of which shard of a sharded game server owns each lobby, so that the front can route events to it. New
+    lobbies are named by the router, which keeps lobby names unique across every shard.
+    """
+
+    def __init__(self, shard_count: int):
+        """
+        Creates the router, with no lobbies and no shards listening yet.
+        :param shard_count: The number of shards.
+        """
+        # Shard -> the port the shard listens on, or None if the shard hasn't started listening yet.
+        self.ports: List[Optional[int]] = [None] * shard_count
+        # Lobby name -> the shard that owns the lobby.
+        self.lobby_shards: Dict[str, int] = {}
+        # Shard -> the number of lobbies the shard owns.
+        self.loads: List[int] = [0] * shard_count
+
+    def assign_lobby(self) -> Optional[Tuple[str, int]]:
+        """
+        Assign a new lobby to the listening shard that owns the fewest lobbies.
+        :return: A tuple containing the new lobby's name and the shard it was assigned to, or None if no shard is
+                 listening yet.
+        """
+        listening: List[int] = [shard for shard, port in enumerate(self.ports) if port is not None]
+        if not listening:
+            return None
+        shard: int = min(listening, key=lambda s: self.loads[s])
+        lobby_name: str = choose_lobby_name(self.lobby_shards)
+        self.lobby_shards[lobby_name] = shard
+        self.loads[shard] += 1
+        return lobby_name, shard
+
+    def release_lobby(self, lobby_name: str):
+        """
+        Release the lobby with the given name, now that its shard has closed it.
+        :param lobby_name: The name of the lobby.
+        """
+        if (shard := self.lobby_shards.pop(lobby_name, None)) is not None:
+            self.loads[shard] -= 1
+
+
+class ShardLobbyDirectory(LobbyDirectory):
+    """
+    The lobby directory for one of a sharded game server's shards. Since clients query the front rather than the shard,
+    the shard's lobbies are passed on to the front instead of being kept here.
+    """
+
+    def __init__(self, shard: int, updates: Queue):
+        """
+        Creates the directory.
+        :param shard: The shard the directory is for.
+        :param updates: The queue of updates to send to the front.
+        """
+        super().__init__()
+        self.shard: int = shard
+        self.updates: Queue = updates
+
+    def update(self, lobby: LobbyDetails):
+        """
+        Pass on the given lobby's details to the front.
+        :param lobby: The lobby's current details.
+        """
+        self.updates.put(ShardUpdate(ShardUpdateType.LOBBY, self.shard, lobby=lobby))
+
+    def remove(self, lobby_name: str):
+        """
+        Let the front know that the lobby with the given name has been closed.
+        :param lobby_name: The name of the lobby.
+        """
+        self.updates.put(ShardUpdate(ShardUpdateType.CLOSE, self.shard, lobby_name=lobby_name))
+
+
+class ShardClientRegistry(ClientRegistry):
+    """
+    The client registry for one of a sharded game server's shards. Clients join and leave lobbies on the shard, but are
+    sent keepalives by the front, so each change in lobby is also passed on to the front.
+    """
+
+    def __init__(self, shard: int, updates: Queue):
+        """
+        Creates the registry, with no clients registered.
+        :param shard: The shard the registry is for.
+        :param updates: The queue of updates to send to the front.
+        """
+        super().__init__()
+        self.shard: int = shard
+        self.updates: Queue = updates
+
+    def join_lobby(self, identifier: int, lobby_name: str):
+        """
+        Record that the client with the given identifier has joined the given lobby, letting the front know.
+        :param identifier: The client's identifier.
+        :param lobby_name: The name of the lobby joined.
+        """
+        super().join_lobby(identifier, lobby_name)
+        self.updates.put(ShardUpdate(ShardUpdateType.JOIN, self.shard, lobby_name=lobby_name, identifier=identifier))
+
+    def leave_lobby(self, identifier: int, lobby_name: str):
+        """
+        Record that the client with the given identifier has left the given lobby, letting the front know.
+        :param identifier: The client's identifier.
+        :param lobby_name: The name of the lobby left.
+        """
+        super().leave_lobby(identifier, lobby_name)
+        self.updates.put(ShardUpdate(ShardUpdateType.LEAVE, self.shard, lobby_name=lobby_name, identifier=identifier))
+
+
+class FrontServer(UDPServer, MicrocosmServer):
+    """
+    The UDP server for the front of a sharded game server, which applies the updates sent by its shards between
+    requests.
+    """
+    # The shard that owns each lobby, and the port each shard listens on.
+    shard_router_ref: ShardRouter
+    # The queue of updates sent by the shards.
+    shard_updates_ref: Queue
+
+    def service_actions(self):
+        """
+        Apply every update that the shards have sent since this was last called. This is called by serve_forever()
+        after each request, and at least every half a second otherwise.
+        """
+        while True:
+            try:
+                update: ShardUpdate = self.shard_updates_ref.get_nowait()
+            except Empty:
+                return
+            self.apply_shard_update(update)
+
+    def apply_shard_update(self, update: ShardUpdate):
+        """
+        Apply the given update sent by one of the shards.
+        :param update: The update to apply.
+        """
+        match update.type:
+            case ShardUpdateType.PORT:
+                self.shard_router_ref.ports[update.shard] = update.port
+            case ShardUpdateType.LOBBY:
+                self.lobby_directory_ref.update(update.lobby)
+            case ShardUpdateType.CLOSE:
+                self.shard_router_ref.release_lobby(update.lobby_name)
+                self.lobby_directory_ref.remove(update.lobby_name)
+            case ShardUpdateType.JOIN:
+                # The client may have stopped responding to keepalives and been removed since joining.
+                if update.identifier in self.clients_ref:
+                    self.client_registry_ref.join_lobby(update.identifier, update.lobby_name)
+            case ShardUpdateType.LEAVE:
+                self.client_registry_ref.leave_lobby(update.identifier, update.lobby_name)
+
+
+class FrontRequestHandler(RequestHandler):
+    """
+    The handler for the events received by the front of a sharded game server. Events that aren't for a particular
+    lobby are handled by the front itself, while the rest are forwarded to the shard that owns the lobby.
+    """
+
+    def _handle_server_event(self, evt: Event, sock: socket.socket):
+        """
+        Handle the given decoded event, forwarding it to the relevant shard if it's for a lobby.
+        :param evt: The event received by the front.
+        :param sock: The socket to use to respond, or forward the event on.
+        """
+        self.server: FrontServer = self.server
+        if evt.type in FRONT_EVENT_TYPES:
+            super()._handle_server_event(evt, sock)
+            return
+        self.server.client_registry_ref.mark_active(evt.identifier)
+        router: ShardRouter = self.server.shard_router_ref
+        lobby_name: Optional[str] = None
+        # New lobbies are named by the front, but are then created on the shard they are assigned to.
+        if evt.type in (EventType.CREATE, EventType.LOAD):
+            if (assignment := router.assign_lobby()) is None:
+                return
+            lobby_name, shard = assignment
+        # Events for a lobby refer to it either as a game or a lobby, and those for lobbies that have been closed (or
+        # never existed) can just be ignored.
+        elif (shard := router.lobby_shards.get(getattr(evt, "game_name", None) or
+                                               getattr(evt, "lobby_name", None))) is None:
+            return
+        # Shards don't receive registrations, so the event is preceded by a header line containing the address of the
+        # client that sent it, along with the name of the new lobby if there is one.
+        header: Dict = {"address": self.server.clients_ref.get(evt.identifier), "lobby_name": lobby_name}
+        sock.sendto(json.dumps(header, separators=(",", ":")).encode() + b"\n" + self.request[0],
+                    (SHARD_HOST, router.ports[shard]))
+
+
+class ShardServer(UDPServer, MicrocosmServer):
+    """
+    The UDP server for one of a sharded game server's shards, which receives events from the front on the loopback
+    address and sends packets to clients from a separate socket.
+    """
+    # The socket, bound to all addresses, to use to send packets to clients.
+    reply_sock_ref: socket.socket
+
+    def server_close(self):
+        """
+        Close the server's socket, along with the socket used to send packets to clients.
+        """
+        super().server_close()
+        self.reply_sock_ref.close()
+
+
+class ShardRequestHandler(RequestHandler):
+    """
+    The handler for the events forwarded to one of a sharded game server's shards by its front.
+    """
+    # The name the front chose for the new lobby that the event being handled is for, if there is one.
+    assigned_lobby_name: Optional[str] = None
+
+    def handle(self):
+        """
+        Handle the forwarded request.
+        """
+        self.server: ShardServer = self.server
+        try:
+            header_bytes, _, packet = self.request[0].partition(b"\n")
+            header: Dict = json.loads(header_bytes)
+            evt: Event = json.loads(packet, object_hook=ObjectConverter)
+        # The front only forwards events that it was able to decode, but we may as well be safe.
+        except (UnicodeDecodeError, JSONDecodeError):
+            return
+        # Since shards send packets to clients directly, the shard needs to know where each client is listening.
+        if header["address"] is not None:
+            self.server.client_registry_ref.register(evt.identifier, tuple(header["address"]))
+        self.assigned_lobby_name = header["lobby_name"]
+        # The socket the event was received on is bound to the loopback address, so responses are sent from the reply
+        # socket instead.
+        self._handle_server_event(evt, self.server.reply_sock_ref)
+
+    def _choose_lobby_name(self) -> str:
+        """
+        Use the name that the front chose for the new lobby, which is unique across every shard.
+        :return: The assigned lobby name.
+        """
+        return self.assigned_lobby_name
+
+
+class FrontListener(EventListener):
+    """
+    Listens for multiplayer-related events on the game server's port as the front of a sharded game server.
+    """
+
+    def __init__(self, shard_count: int, updates: Queue):
+        """
+        Construct the listener.
+        :param shard_count: The number of shards.
+        :param updates: The queue of updates sent by the shards.
+        """
+        super().__init__(is_server=True)
+        self.shard_router: ShardRouter = ShardRouter(shard_count)
+        self.updates: Queue = updates
+
+    def create_server(self) -> UDPServer:
+        """
+        Create the UDP server to listen with.
+        :return: The bound server.
+        """
+        server: FrontServer = FrontServer(("0.0.0.0", SERVER_PORT), FrontRequestHandler)
+        server.shard_router_ref = self.shard_router
+        server.shard_updates_ref = self.updates
+        return server
+
+
+class ShardListener(EventListener):
+    """
+    Listens for the events forwarded to one of a sharded game server's shards by its front.
+    """
+
+    def __init__(self, shard: int, updates: Queue):
+        """
+        Construct the listener.
+        :param shard: The shard the listener is for.
+        :param updates: The queue of updates to send to the front.
+        """
+        super().__init__(is_server=True)
+        self.shard: int = shard
+        self.updates: Queue = updates
+        self.client_registry = ShardClientRegistry(shard, updates)
+        self.lobby_directory = ShardLobbyDirectory(shard, updates)
+
+    def start_keepalives(self):
+        """
+        Keepalives are sent to every client by the front, so shards don't send any.
+        """
+
+    def create_server(self) -> UDPServer:
+        """
+        Create the UDP server to listen with, letting the front know which port it is listening on.
+        :return: The bound server.
+        """
+        server: ShardServer = ShardServer((SHARD_HOST, 0), ShardRequestHandler)
+        server.reply_sock_ref = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        server.reply_sock_ref.bind(("0.0.0.0", 0))
+        self.updates.put(ShardUpdate(ShardUpdateType.PORT, self.shard, port=server.server_address[1]))
+        return server
+
+
+def run_shard(shard: int, updates: Queue):
+    """
+    Run the given shard, listening forever. This is run in each shard's process.
+    :param shard: The shard to run.
+    :param updates: The queue of updates to send to the front.
+    """
+    ShardListener(shard, updates).run()
+
+
+def run_sharded_server(shard_count: int):
+    """
+    Run the game server as a front process along with the given number of shard processes, so that the work of
+    processing events for lobbies is spread across multiple cores.
+    :param shard_count: The number of shards to run.
+    """
+    updates: Queue = multiprocessing.Queue()
+    for shard in range(shard_count):
+        # The shards are daemonic, so that they are stopped along with the front.
+        Process(target=run_shard, args=(shard, updates), daemon=True).start()
+    FrontListener(shard_count, updates).run()
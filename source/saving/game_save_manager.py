@@ -1,38 +1,43 @@
 from __future__ import annotations
 
-import json
 import os
 import pathlib
 import time
+import zlib
 from datetime import datetime
-from itertools import chain
 from json import JSONDecodeError
-from typing import TYPE_CHECKING, Optional, List, Dict, Tuple
+from threading import Lock
+from typing import TYPE_CHECKING, Dict, Optional, List, Tuple, Set
 
-from filelock import FileLock
-import pyxel
 from platformdirs import user_data_dir
 
-from source.display.board import Board
-from source.foundation.catalogue import get_blessing, get_project, get_unit_plan, get_improvement, ACHIEVEMENTS, Namer
-from source.foundation.models import Heathen, UnitPlan, VictoryType, Faction, Statistics, Achievement, GameConfig, \
-    Quad, HarvestStatus, EconomicStatus, SaveDetails
-from source.game_management.game_controller import GameController
-from source.util.minifier import minify_quad, inflate_save_details, minify_save_details
+from source.foundation.catalogue import Namer
+from source.foundation.models import VictoryType, Faction, Statistics, Achievement, GameConfig, Quad, SaveDetails, \
+    SaveSnapshot
+from source.util.minifier import inflate_save_details, minify_save_details
 if TYPE_CHECKING:
+    from source.game_management.game_controller import GameController
     from source.game_management.game_state import GameState
-from source.saving.save_encoder import SaveEncoder, ObjectConverter
-from source.saving.save_migrator import migrate_unit, migrate_player, migrate_climatic_effects, \
-    migrate_quad, migrate_settlement, migrate_game_config, migrate_game_version
+from source.saving.save_format import build_snapshot, write_binary_save, read_binary_save, read_save_header, \
+    BINARY_SAVE_EXTENSION, JSON_SAVE_EXTENSION
+from source.saving.save_journal import SaveJournal, read_journaled_save, get_journal_path, remove_journal
+from source.saving.save_writer import SaveWriter
+from source.saving.stats_store import StatisticsStore
+from source.saving.save_migrator import migrate_game_version, load_json_save, convert_json_save
 from source.util.calculator import clamp
 
 # The prefix attached to save files created by the autosave feature.
 AUTOSAVE_PREFIX = "auto"
+# The prefix attached to the save files of multiplayer games hibernated by the game server. The prefix starts with a dot
+# so that these saves are never listed.
+HIBERNATION_PREFIX = ".hibernated-"
 # The directory where save files are created and loaded from. This is a different directory depending on the operating
 # system the game is being run on. For example, on macOS, this will resolve to ~/Library/Application Support/microcosm.
 # Similarly, on Linux, it will resolve to ~/.local/share/microcosm. For more details, refer to the platformdirs
 # documentation.
 SAVES_DIR = user_data_dir("microcosm", "microcosm")
+# The in-memory store for the player's statistics. Use get_stats_store() rather than accessing this directly.
+_STATS_STORE: Optional[StatisticsStore] = None
 
 
 def init_app_data():
@@ -44,16 +49,38 @@ def init_app_data():
         pathlib.Path(SAVES_DIR).mkdir(parents=True, exist_ok=True)
 
 
-def save_game(game_state: GameState, auto: bool = False):
+def get_json_saves() -> List[str]:
     """
-    Saves the current game with the current timestamp as the file name.
-    :param game_state: The state of the game to save.
-    :param auto: Whether the save is an autosave.
+    Get the file names of the JSON saves in the saves directory, i.e. the saves from before the binary format was
+    introduced that are yet to be converted.
+    :return: The file names of the JSON saves.
+    """
+    return [f for f in os.listdir(SAVES_DIR)
+            if (f.startswith(AUTOSAVE_PREFIX) or f.startswith("save")) and f.endswith(JSON_SAVE_EXTENSION)]
+
+
+def convert_json_saves(file_names: List[str]):
+    """
+    Convert each of the given JSON saves in the saves directory to a binary save. Saves that can't be converted, e.g.
+    because they are invalid, are left as they are.
+    :param file_names: The file names of the JSON saves to convert.
+    """
+    for file_name in file_names:
+        try:
+            convert_json_save(SAVES_DIR, file_name)
+        except (JSONDecodeError, AttributeError, KeyError, StopIteration, ValueError, OSError):
+            pass
+
+
+def snapshot_game(game_state: GameState, auto: bool = False) -> Tuple[str, SaveSnapshot]:
+    """
+    Take a snapshot of the current game, capturing everything required to save it with the current timestamp as the
+    file name. The snapshot shares no mutable state with the game, so it can safely be written on another thread while
+    the game continues.
+    :param game_state: The state of the game to snapshot.
+    :param auto: Whether the snapshot is for an autosave.
+    :return: A tuple containing the full path of the save file and the snapshot of the data to write to it.
     """
-    # Only maintain 3 autosaves at a time, delete the oldest if we already have 3 before saving the next.
-    if auto and len(autosaves := list(filter(lambda fn: fn.startswith(AUTOSAVE_PREFIX), os.listdir(SAVES_DIR)))) == 3:
-        to_delete: str = min(autosaves, key=lambda autosave: os.path.getmtime(os.path.join(SAVES_DIR, autosave)))
-        os.remove(os.path.join(SAVES_DIR, to_delete))
     cfg: GameConfig = game_state.board.game_config
     save_details: SaveDetails = SaveDetails(date_time=datetime.now(),
                                             auto=auto,
@@ -61,21 +88,179 @@ def save_game(game_state: GameState, auto: bool = False):
                                             player_count=cfg.player_count,
                                             faction=None if cfg.multiplayer else cfg.player_faction,
                                             multiplayer=bool(cfg.multiplayer))
-    save_name: str = os.path.join(SAVES_DIR, f"{minify_save_details(save_details)}.json")
-    with open(save_name, "w", encoding="utf-8") as save_file:
-        # We use chain.from_iterable() here because the quads array is 2D.
-        save = {
-            "quads": list(minify_quad(q) for q in chain.from_iterable(game_state.board.quads)),
-            "players": game_state.players,
-            "heathens": game_state.heathens,
-            "turn": game_state.turn,
-            "cfg": game_state.board.game_config,
-            "night_status": {"until": game_state.until_night, "remaining": game_state.nighttime_left},
-            "game_version": game_state.game_version
-        }
-        # Note that we use the SaveEncoder here for custom encoding for some classes.
-        save_file.write(json.dumps(save, separators=(",", ":"), cls=SaveEncoder))
-    save_file.close()
+    save_name: str = os.path.join(SAVES_DIR, f"{minify_save_details(save_details)}{BINARY_SAVE_EXTENSION}")
+    snapshot: SaveSnapshot = build_snapshot(save_details, game_state.game_version, cfg, game_state.board.quads,
+                                            game_state.players, game_state.heathens, game_state.turn,
+                                            game_state.until_night, game_state.nighttime_left)
+    return save_name, snapshot
+
+
+def get_last_written_time(save_path: str) -> float:
+    """
+    Get the time the save at the given path was last written to, accounting for the journal of the save if it is a
+    checkpoint for a multiplayer game.
+    :param save_path: The full path of the save.
+    :return: The modification time of the save or its journal, whichever is more recent.
+    """
+    journal_path: str = get_journal_path(save_path)
+    return max(os.path.getmtime(save_path), os.path.getmtime(journal_path) if os.path.isfile(journal_path) else 0)
+
+
+def write_save(save_name: str, snapshot: SaveSnapshot, auto: bool):
+    """
+    Write the given game snapshot to disk. The save is written to a temporary file first and then moved into place, so
+    that a partially-written save is never visible in the saves directory.
+    :param save_name: The full path of the save file.
+    :param snapshot: The snapshot of the game to write.
+    :param auto: Whether the save is an autosave.
+    """
+    if auto:
+        # The checkpoints of lobbies whose games are still being journaled are never deleted, since they may still be
+        # journaled to for many turns after any other autosave was written.
+        with SAVE_JOURNALS_LOCK:
+            active_checkpoints: Set[str] = \
+                {os.path.basename(journal.checkpoint_path) for journal in SAVE_JOURNALS.values()
+                 if journal.checkpoint_path is not None}
+        autosaves: List[str] = [fn for fn in os.listdir(SAVES_DIR)
+                                if fn.startswith(AUTOSAVE_PREFIX) and fn not in active_checkpoints]
+        # Only maintain 3 other autosaves at a time, deleting the least recently written before saving the next.
+        while len(autosaves) >= 3:
+            to_delete: str = min(autosaves,
+                                 key=lambda autosave: get_last_written_time(os.path.join(SAVES_DIR, autosave)))
+            os.remove(os.path.join(SAVES_DIR, to_delete))
+            # The autosave may have been a checkpoint for a multiplayer game, in which case its journal is removed too.
+            remove_journal(os.path.join(SAVES_DIR, to_delete))
+            autosaves.remove(to_delete)
+    # The temporary file is prefixed with a dot so that it is never listed as a save itself.
+    temp_save_name: str = os.path.join(os.path.dirname(save_name), f".{os.path.basename(save_name)}.tmp")
+    with open(temp_save_name, "wb") as save_file:
+        write_binary_save(save_file, snapshot)
+    os.replace(temp_save_name, save_name)
+
+
+# The writer used to write autosaves to disk in the background.
+SAVE_WRITER: SaveWriter = SaveWriter(write_save)
+
+
+def save_game(game_state: GameState, auto: bool = False):
+    """
+    Saves the current game with the current timestamp as the file name.
+    :param game_state: The state of the game to save.
+    :param auto: Whether the save is an autosave.
+    """
+    write_save(*snapshot_game(game_state, auto), auto)
+
+
+def autosave_game(game_state: GameState):
+    """
+    Autosaves the current game in the background. Only a snapshot of the game is taken on the calling thread - encoding
+    and writing it to disk is done by the save writer.
+    :param game_state: The state of the game to autosave.
+    """
+    save_name, save = snapshot_game(game_state, auto=True)
+    SAVE_WRITER.submit(save_name, save, auto=True)
+
+
+def write_journal_entry(lobby_name: str, snapshot: SaveSnapshot, auto: bool):
+    """
+    Write the given snapshot of a multiplayer game to the journal for its lobby, writing a new checkpoint save if
+    required.
+    :param lobby_name: The name of the lobby the game is being played in.
+    :param snapshot: The snapshot of the game to write.
+    :param auto: Whether the save is an autosave. Always true for journaled saves.
+    """
+    # If the lobby has since been closed, there's no need to save its game anymore.
+    with SAVE_JOURNALS_LOCK:
+        journal: Optional[SaveJournal] = SAVE_JOURNALS.get(lobby_name)
+    if journal is None:
+        return
+    if journal.needs_checkpoint(snapshot):
+        save_name: str = os.path.join(SAVES_DIR, f"{minify_save_details(snapshot.details)}{BINARY_SAVE_EXTENSION}")
+        write_save(save_name, snapshot, auto)
+        journal.start(save_name, snapshot)
+    else:
+        journal.append(snapshot)
+        journal.relabel(snapshot.details.turn)
+
+
+# The journals for each multiplayer game being autosaved by this game server, keyed by lobby name. Journals are added
+# and removed by the listener as lobbies autosave and close, while the journal writer looks them up, and is the only
+# thread that writes to the journals themselves.
+SAVE_JOURNALS: Dict[str, SaveJournal] = {}
+# Guards the journals dictionary, which is accessed by both the listener and the journal writer.
+SAVE_JOURNALS_LOCK: Lock = Lock()
+# The writer used to write journal entries and checkpoints to disk in the background.
+JOURNAL_WRITER: SaveWriter = SaveWriter(write_journal_entry)
+
+
+def journal_autosave_game(game_state: GameState, lobby_name: str) -> SaveSnapshot:
+    """
+    Autosaves the multiplayer game in the given lobby in the background. Rather than a full save being written each
+    time, only the parts of the game that have changed since the previous autosave are appended to the lobby's journal,
+    with a full checkpoint save being written periodically.
+    :param game_state: The state of the game to autosave.
+    :param lobby_name: The name of the lobby the game is being played in.
+    :return: The snapshot of the game that was taken for the autosave.
+    """
+    with SAVE_JOURNALS_LOCK:
+        SAVE_JOURNALS.setdefault(lobby_name, SaveJournal())
+    _, save = snapshot_game(game_state, auto=True)
+    JOURNAL_WRITER.submit(lobby_name, save, auto=True)
+    return save
+
+
+def close_save_journal(lobby_name: str):
+    """
+    Stop journaling autosaves for the given lobby. Its most recent checkpoint and journal are left on disk so that the
+    game can be loaded later.
+    :param lobby_name: The name of the lobby that has been closed.
+    """
+    with SAVE_JOURNALS_LOCK:
+        SAVE_JOURNALS.pop(lobby_name, None)
+
+
+def hibernate_game(game_state: GameState, lobby_name: str) -> str:
+    """
+    Save the multiplayer game in the given lobby so that it can be removed from memory while its lobby is idle. Unlike
+    autosaves, the save is written immediately, and is hidden from the list of saves since it is only for reviving the
+    game.
+    :param game_state: The state of the game to hibernate.
+    :param lobby_name: The name of the lobby the game is being played in.
+    :return: The full path of the save file.
+    """
+    _, snapshot = snapshot_game(game_state)
+    save_path: str = os.path.join(SAVES_DIR, f"{HIBERNATION_PREFIX}{lobby_name}{BINARY_SAVE_EXTENSION}")
+    write_save(save_path, snapshot, auto=False)
+    return save_path
+
+
+def revive_game(game_state: GameState, namer: Namer, save_path: str) -> Tuple[GameConfig, List[List[Quad]]]:
+    """
+    Load the hibernated game at the given path into the supplied game state and namer objects, removing the save file
+    once it has been loaded.
+    :param game_state: The game state to load the hibernated game into.
+    :param namer: The namer to update with settlement details from the hibernated game.
+    :param save_path: The full path of the hibernated game's save file.
+    :return: A tuple containing the game configuration and the quads on the board.
+    """
+    with open(save_path, "rb") as save_file:
+        header, game_cfg, quads = read_binary_save(save_file, game_state, namer)
+    migrate_game_version(game_state, header)
+    os.remove(save_path)
+    return game_cfg, quads
+
+
+def get_stats_store() -> StatisticsStore:
+    """
+    Get the store holding the player's statistics in memory, creating it if this is the first time it is required.
+    :return: The statistics store for the current saves directory.
+    """
+    global _STATS_STORE  # pylint: disable=global-statement
+    stats_file_name = os.path.join(SAVES_DIR, "statistics.json")
+    # We recreate the store if the saves directory has changed, which only occurs in tests.
+    if _STATS_STORE is None or _STATS_STORE.stats_file_name != stats_file_name:
+        _STATS_STORE = StatisticsStore(stats_file_name)
+    return _STATS_STORE
 
 
 def save_stats_achievements(game_state: GameState,
@@ -85,8 +270,9 @@ def save_stats_achievements(game_state: GameState,
                             increment_defeats: bool = False,
                             faction_to_add: Optional[Faction] = None) -> List[Achievement]:
     """
-    Saves the supplied statistics to the statistics JSON file. Additionally, check if any achievements have been
-    obtained. All parameters have default values so that they may be supplied at different times.
+    Records the supplied statistics, which are written to the statistics JSON file in the background. Additionally,
+    check if any achievements have been obtained. All parameters have default values so that they may be supplied at
+    different times.
     :param game_state: The current game state object.
     :param playtime: The elapsed time since the last turn was ended.
     :param increment_turn: Whether a turn was just ended.
@@ -95,100 +281,31 @@ def save_stats_achievements(game_state: GameState,
     :param faction_to_add: A chosen faction to log, if the player is starting a new game.
     :return: Any new achievements that have been obtained by the player.
     """
-    playtime_to_write: float = playtime
-    existing_turns: int = 0
-    existing_victories: Dict[VictoryType, int] = {}
-    existing_defeats: int = 0
-    existing_factions: Dict[Faction, int] = {}
-    existing_achievements: List[str] = []
-    new_achievements: List[Achievement] = []
-
-    stats_file_name = os.path.join(SAVES_DIR, "statistics.json")
-    # Obtain the file lock for the statistics file. This is to account for an (admittedly rare) edge case where two
-    # players may be playing on the same machine in a local multiplayer game, and thus ending their turns and saving
-    # their stats at the same time. Without this, one player's turn will never end and their game will hang.
-    with FileLock(stats_file_name + ".lock"):
-        # If the player already has statistics and achievements, get those to add our new ones to.
-        if os.path.isfile(stats_file_name):
-            with open(stats_file_name, "r", encoding="utf-8") as stats_file:
-                stats_json = json.loads(stats_file.read())
-                playtime_to_write += stats_json["playtime"]
-                existing_turns = stats_json["turns_played"]
-                existing_victories = stats_json["victories"]
-                existing_defeats = stats_json["defeats"]
-                existing_factions = stats_json["factions"]
-                # Achievements were introduced after the initial statistics, so we have to make sure they are present.
-                existing_achievements = stats_json["achievements"] if "achievements" in stats_json else []
-
-        turns_to_write = existing_turns + 1 if increment_turn else existing_turns
-        defeats_to_write = existing_defeats + 1 if increment_defeats else existing_defeats
-        achievements_to_write = existing_achievements
-
-        victories_to_write = existing_victories
-        if victory_to_add:
-            # If the player has achieved this victory before, increment it, otherwise just set it to 1.
-            if victory_to_add in existing_victories:
-                existing_victories[victory_to_add] = existing_victories[victory_to_add] + 1
-            else:
-                existing_victories[victory_to_add] = 1
-
-            # Check if any achievements have been obtained that can only be verified immediately after a player victory.
-            # Note that we don't need to supply a real Statistics object for this, since all post-victory achievements
-            # only require the game state to be verified.
-            for ach in ACHIEVEMENTS:
-                if ach.name not in achievements_to_write and ach.post_victory and \
-                        ach.verification_fn(game_state, Statistics()):
-                    achievements_to_write.append(ach.name)
-                    new_achievements.append(ach)
-
-        factions_to_write = existing_factions
-        if faction_to_add:
-            # If the player has used this faction before, increment it, otherwise just set it to 1.
-            if faction_to_add in existing_factions:
-                existing_factions[faction_to_add] = existing_factions[faction_to_add] + 1
-            else:
-                existing_factions[faction_to_add] = 1
-
-        # All other achievements can be checked on every save, with the real Statistics. Note that we need to ensure
-        # that the player objects for the game have been initialised. This is because player statistics are updated with
-        # faction usage when starting a new game, and this occurs prior to the players being initialised.
-        if game_state.players:
-            for ach in ACHIEVEMENTS:
-                if ach.name not in achievements_to_write and not ach.post_victory and \
-                        ach.verification_fn(game_state, Statistics(playtime_to_write, turns_to_write,
-                                                                   victories_to_write, defeats_to_write,
-                                                                   factions_to_write)):
-                    achievements_to_write.append(ach.name)
-                    new_achievements.append(ach)
-
-        # Write the newly-updated statistics to the file.
-        with open(stats_file_name, "w", encoding="utf-8") as stats_file:
-            stats = {
-                "playtime": playtime_to_write,
-                "turns_played": turns_to_write,
-                "victories": victories_to_write,
-                "defeats": defeats_to_write,
-                "factions": factions_to_write,
-                "achievements": achievements_to_write
-            }
-            stats_file.write(json.dumps(stats))
-        stats_file.close()
-
-    return new_achievements
+    return get_stats_store().record(game_state, playtime, increment_turn, victory_to_add, increment_defeats,
+                                    faction_to_add)
 
 
 def get_stats() -> Statistics:
     """
-    Retrieve the player's statistics from the statistics JSON file, if they have one.
+    Retrieve the player's statistics, if they have any.
     :return: An object containing the player's statistics.
     """
-    stats_file_name = os.path.join(SAVES_DIR, "statistics.json")
-    if os.path.isfile(stats_file_name):
-        with open(stats_file_name, "r", encoding="utf-8") as stats_file:
-            stats_json = json.loads(stats_file.read())
-            return Statistics(**stats_json)
-    else:
-        return Statistics(0, 0, {}, 0, {}, set())
+    return get_stats_store().get_stats()
+
+
+def get_save_path(save_name: str) -> str:
+    """
+    Get the full path of the save with the given name, preferring the binary save if both a binary and JSON save exist.
+    :param save_name: The name of the save, with or without a file extension.
+    :return: The full path of the save file.
+    """
+    # Older clients and game servers always refer to saves with a .json extension, even though the save may have since
+    # been converted to a binary save.
+    base_name: str = strip_save_extension(save_name)
+    binary_path: str = os.path.join(SAVES_DIR, base_name + BINARY_SAVE_EXTENSION)
+    if os.path.isfile(binary_path):
+        return binary_path
+    return os.path.join(SAVES_DIR, base_name + JSON_SAVE_EXTENSION)
 
 
 def load_save_file(game_state: GameState,
@@ -201,82 +318,20 @@ def load_save_file(game_state: GameState,
     :param save_name: The name of the save file to load.
     :return: A tuple containing the game configuration and the quads on the board.
     """
-    game_cfg: GameConfig
-    quads: List[List[Quad]]
-    with open(os.path.join(SAVES_DIR, save_name), "r", encoding="utf-8") as save_file:
-        # Use a custom object hook when loading the JSON so that the resulting objects have attribute access.
-        save = json.loads(save_file.read(), object_hook=ObjectConverter)
-        # Load in the quads.
-        quads = [[None] * 100 for _ in range(90)]
-        for i in range(90):
-            for j in range(100):
-                quads[i][j] = migrate_quad(save.quads[i * 100 + j], (j, i))
-        migrate_game_version(game_state, save)
-        game_state.players = save.players
-        for p in game_state.players:
-            # The list of tuples that is quads_seen needs special loading, as do a few other of the same type,
-            # because tuples do not exist in JSON, so they are represented as arrays, which will clearly not work.
-            for i in range(len(p.quads_seen)):
-                p.quads_seen[i] = (p.quads_seen[i][0], p.quads_seen[i][1])
-            p.quads_seen = set(p.quads_seen)
-            for idx, u in enumerate(p.units):
-                # We can do a direct conversion to Unit and UnitPlan objects for units.
-                p.units[idx] = migrate_unit(u, p.faction)
-            for s in p.settlements:
-                # Make sure we remove the settlement's name so that we don't get duplicates.
-                namer.remove_settlement_name(s.name, s.quads[0].biome)
-                # Another tuple-array fix.
-                s.location = (s.location[0], s.location[1])
-                if s.current_work is not None:
-                    # Get the actual Improvement, Project, or UnitPlan objects for the current work. We use
-                    # hasattr() because improvements have an effect where projects do not, and projects have
-                    # a type where unit plans do not.
-                    if hasattr(s.current_work.construction, "effect"):
-                        s.current_work.construction = get_improvement(s.current_work.construction.name)
-                    elif hasattr(s.current_work.construction, "type"):
-                        s.current_work.construction = get_project(s.current_work.construction.name)
-                    else:
-                        s.current_work.construction = \
-                            get_unit_plan(s.current_work.construction.name, p.faction, s.resources)
-                for idx, imp in enumerate(s.improvements):
-                    # Do another direct conversion for improvements.
-                    s.improvements[idx] = get_improvement(imp.name)
-                # Also convert all units in garrisons to Unit objects.
-                for idx, u in enumerate(s.garrison):
-                    s.garrison[idx] = migrate_unit(u, p.faction)
-                s.harvest_status = HarvestStatus(s.harvest_status)
-                s.economic_status = EconomicStatus(s.economic_status)
-                # We also need to link the quads for each settlement to the quads on the actual board so that changes
-                # made to the quad on the board, e.g. investigating a relic that occupies the same quad as a settlement,
-                # are reflected in the settlement's quad as well.
-                for idx, q in enumerate(s.quads):
-                    s.quads[idx] = quads[q.location[1]][q.location[0]]
-                migrate_settlement(s)
-            # We also do direct conversions to Blessing objects for the ongoing one, if there is one,
-            # as well as any previously-completed ones.
-            if p.ongoing_blessing:
-                p.ongoing_blessing.blessing = get_blessing(p.ongoing_blessing.blessing.name, p.faction)
-            for idx, bls in enumerate(p.blessings):
-                p.blessings[idx] = get_blessing(bls.name, p.faction)
-            imminent_victories: List[VictoryType] = []
-            for iv in p.imminent_victories:
-                imminent_victories.append(VictoryType(iv))
-            p.imminent_victories = set(imminent_victories)
-            migrate_player(p)
-
-        game_state.heathens = []
-        for h in save.heathens:
-            # Do another direct conversion for the heathens.
-            game_state.heathens.append(Heathen(float(h.health), h.remaining_stamina, (h.location[0], h.location[1]),
-                                               UnitPlan(float(h.plan.power), float(h.plan.max_health),
-                                                        h.plan.total_stamina, h.plan.name, None, 0.0),
-                                               h.has_attacked))
-
-        game_state.turn = save.turn
-        migrate_climatic_effects(game_state, save)
-        game_cfg = migrate_game_config(save.cfg)
-    save_file.close()
-    return game_cfg, quads
+    save_path: str = get_save_path(save_name)
+    if save_path.endswith(BINARY_SAVE_EXTENSION):
+        with open(save_path, "rb") as binary_file:
+            # Autosaves of multiplayer games may have a journal with the turns since the save was written.
+            if os.path.isfile(journal_path := get_journal_path(save_path)):
+                with open(journal_path, "rb") as journal_file:
+                    header, game_cfg, quads = read_journaled_save(binary_file, journal_file, game_state, namer)
+            else:
+                header, game_cfg, quads = read_binary_save(binary_file, game_state, namer)
+        migrate_game_version(game_state, header)
+        return game_cfg, quads
+    # Saves from before the binary format was introduced are JSON, and may require migration.
+    with open(save_path, "r", encoding="utf-8") as save_file:
+        return load_json_save(game_state, namer, save_file)
 
 
 def load_game(game_state: GameState, game_controller: GameController):
@@ -285,17 +340,16 @@ def load_game(game_state: GameState, game_controller: GameController):
     :param game_controller: The current GameController object.
     :param game_state: The current GameState object.
     """
+    # The display modules are only imported here, since only clients load games this way, and the game server shares
+    # this module without ever loading pyxel.
+    import pyxel  # pylint: disable=import-outside-toplevel
+    from source.display.board import Board  # pylint: disable=import-outside-toplevel
+
     # Reset the namer so that we have our original set of names again.
     game_controller.namer.reset()
-    # Sort and reverse both the autosaves and manual saves, remembering that the (up to) 3 autosaves will be
-    # displayed first in the list.
-    autosaves = list(filter(lambda file_name: file_name.startswith(AUTOSAVE_PREFIX), os.listdir(SAVES_DIR)))
-    saves = list(
-        filter(lambda file_name: file_name.startswith("save-"),
-               [f for f in os.listdir(SAVES_DIR) if not f.startswith('.')]))
-    autosaves.sort(reverse=True)
-    saves.sort(reverse=True)
-    all_saves = autosaves + saves
+    # Note that the save files are in the same order as they are displayed on the menu, i.e. with the (up to) 3
+    # autosaves first.
+    all_saves = get_save_files()
 
     try:
         game_cfg, quads = load_save_file(game_state, game_controller.namer, all_saves[game_controller.menu.save_idx])
@@ -317,10 +371,19 @@ def load_game(game_state: GameState, game_controller: GameController):
         game_state.board.overlay.total_settlement_count = sum(len(p.settlements) for p in game_state.players)
         game_controller.music_player.stop_menu_music()
         game_controller.music_player.play_game_music()
-    except (JSONDecodeError, AttributeError, KeyError, StopIteration, ValueError):
+    except (JSONDecodeError, AttributeError, KeyError, StopIteration, ValueError, IndexError, zlib.error):
         game_controller.menu.load_failed = True
 
 
+def strip_save_extension(file_name: str) -> str:
+    """
+    Remove the file extension from the given save file name.
+    :param file_name: The name of the save file.
+    :return: The save file name without its extension.
+    """
+    return file_name.removesuffix(BINARY_SAVE_EXTENSION).removesuffix(JSON_SAVE_EXTENSION)
+
+
 def get_save_files() -> List[str]:
     """
     Get the names of each save file in the saves directory, excluding the file extension, and sort them by most recently
@@ -328,8 +391,9 @@ def get_save_files() -> List[str]:
     :return: An autosave-preferenced, sorted list of save files.
     """
     save_files: List[str] = []
-    autosaves: List[str] = [f.removesuffix(".json") for f in os.listdir(SAVES_DIR) if f.startswith(AUTOSAVE_PREFIX)]
-    saves: List[str] = [f.removesuffix(".json") for f in os.listdir(SAVES_DIR) if f.startswith("save")]
+    file_names: List[str] = os.listdir(SAVES_DIR)
+    autosaves: List[str] = [strip_save_extension(f) for f in file_names if f.startswith(AUTOSAVE_PREFIX)]
+    saves: List[str] = [strip_save_extension(f) for f in file_names if f.startswith("save")]
     autosaves.sort(reverse=True)
     saves.sort(reverse=True)
     save_files.extend(autosaves)
@@ -337,6 +401,23 @@ def get_save_files() -> List[str]:
     return save_files
 
 
+def get_local_save_details(save_name: str) -> SaveDetails:
+    """
+    Get the details for the local save with the given name. For binary saves, only the header of the file is read.
+    :param save_name: The name of the save, without its file extension.
+    :return: The details for the save.
+    """
+    save_path: str = get_save_path(save_name)
+    if save_path.endswith(BINARY_SAVE_EXTENSION):
+        try:
+            return read_save_header(save_path).details
+        # If the header can't be read, we fall back to the details in the file name, and let loading the save fail
+        # instead.
+        except (OSError, ValueError):
+            pass
+    return inflate_save_details(save_name, save_name.startswith(AUTOSAVE_PREFIX))
+
+
 def get_saves(save_files: Optional[List[str]] = None, multi: bool = False) -> List[SaveDetails]:
     """
     Get the save details for the given save files, if supplied, or alternatively the files in the local saves directory,
@@ -347,9 +428,12 @@ def get_saves(save_files: Optional[List[str]] = None, multi: bool = False) -> Li
                   whether they are for multiplayer games.
     :return: The save details for the available save files.
     """
-    save_files: List[str] = save_files if save_files else get_save_files()
-    # Note that the autosave prefix accounts for current save games and the (auto) suffix accounts for legacy save
-    # games.
-    save_details: List[SaveDetails] = \
-        [inflate_save_details(f, f.startswith(AUTOSAVE_PREFIX) or f.endswith("(auto)")) for f in save_files]
+    save_details: List[SaveDetails]
+    if save_files:
+        # Note that the autosave prefix accounts for current save games and the (auto) suffix accounts for legacy save
+        # games.
+        save_details = \
+            [inflate_save_details(f, f.startswith(AUTOSAVE_PREFIX) or f.endswith("(auto)")) for f in save_files]
+    else:
+        save_details = [get_local_save_details(f) for f in get_save_files()]
     return [s for s in save_details if s.multiplayer == multi or s.multiplayer is None]
@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import json
+import struct
+import zlib
+from datetime import datetime
+from typing import TYPE_CHECKING, BinaryIO, Iterable, Iterator, List, Optional, Tuple
+
+from source.foundation.catalogue import Namer
+from source.foundation.models import SaveDetails, SaveHeader, SaveSnapshot, GameConfig, Quad, Player, Heathen, \
+    Faction, MultiplayerStatus
+from source.saving.save_encoder import SaveEncoder
+from source.util.codec import encode_quads, encode_player, encode_quads_seen, encode_heathens, decode_quads, \
+    decode_player, decode_quads_seen, decode_heathens
+if TYPE_CHECKING:
+    from source.game_management.game_state import GameState
+
+"""
+Binary save files are laid out as follows:
+
+- A fixed-size header, containing a magic number identifying the file as a Microcosm save, the version of the binary
+  format, the version of the game the save is from, and the fields of the save's SaveDetails. As this is at the start of
+  the file and of a fixed size, the menu can display the details for each save without reading the rest of the file.
+- The board section, containing a record for each row of quads on the board, encoded with the codec.
+- The state section, containing a record with the turn, night status and game configuration as JSON, a record with the
+  encoded heathens, and then a record for each encoded player followed by a record with their encoded seen quads.
+
+Each section is a length-prefixed zlib stream of length-prefixed records, which means sections can be decompressed and
+decoded a chunk at a time as the file is read, rather than the whole file needing to be read and parsed up front.
+"""
+
+# Identifies a file as being a binary Microcosm save.
+SAVE_MAGIC: bytes = b"MCSV"
+# The version of the binary format written by this version of the game. This should be incremented whenever the layout
+# of the file changes.
+SAVE_FORMAT_VERSION: int = 1
+# The file extensions for binary saves, and the JSON saves used prior to the introduction of the binary format.
+BINARY_SAVE_EXTENSION: str = ".msav"
+JSON_SAVE_EXTENSION: str = ".json"
+# The header consists of the magic number, format version, game version, save time as seconds since the epoch, whether
+# the save is an autosave, the turn, the player count, the faction index (or -1 for multiplayer games), and whether the
+# game is multiplayer.
+HEADER_STRUCT: struct.Struct = struct.Struct("<4sHdq?IBb?")
+# Each section is prefixed with its compressed length.
+SECTION_LENGTH_STRUCT: struct.Struct = struct.Struct("<I")
+# Each record in a section is prefixed with its length.
+RECORD_LENGTH_STRUCT: struct.Struct = struct.Struct("<I")
+# The number of bytes of compressed data to read from a section at a time.
+READ_CHUNK_SIZE: int = 64 * 1024
+
+
+def build_snapshot(details: SaveDetails,
+                   game_version: float,
+                   cfg: GameConfig,
+                   quads: List[List[Quad]],
+                   players: List[Player],
+                   heathens: List[Heathen],
+                   turn: int,
+                   until_night: int,
+                   nighttime_left: int) -> SaveSnapshot:
+    """
+    Take a snapshot of the supplied game data, ready to be written to a binary save file.
+    :param details: The details of the save.
+    :param game_version: The version of the game the save is from.
+    :param cfg: The game configuration.
+    :param quads: The quads on the board.
+    :param players: The players in the game.
+    :param heathens: The heathens in the game.
+    :param turn: The game's current turn.
+    :param until_night: The number of turns until night falls.
+    :param nighttime_left: The number of turns until night ends.
+    :return: A snapshot of the game.
+    """
+    meta = {
+        "turn": turn,
+        "until_night": until_night,
+        "nighttime_left": nighttime_left,
+        # The SaveEncoder is used to encode the game configuration, since it may have been loaded from a JSON save.
+        "cfg": cfg
+    }
+    state: List[bytes] = [json.dumps(meta, separators=(",", ":"), cls=SaveEncoder).encode(), encode_heathens(heathens)]
+    for player in players:
+        state.append(encode_player(player))
+        state.append(encode_quads_seen(player.quads_seen))
+    return SaveSnapshot(details, game_version, [encode_quads(row) for row in quads], state)
+
+
+def encode_header(details: SaveDetails, game_version: float) -> bytes:
+    """
+    Encode the fixed-size header for a binary save file with the given details.
+    :param details: The details of the save.
+    :param game_version: The version of the game the save is from.
+    :return: The encoded header.
+    """
+    faction_idx: int = -1 if details.faction is None else list(Faction).index(details.faction)
+    return HEADER_STRUCT.pack(SAVE_MAGIC, SAVE_FORMAT_VERSION, game_version, int(details.date_time.timestamp()),
+                              details.auto, details.turn, details.player_count, faction_idx,
+                              bool(details.multiplayer))
+
+
+def decode_header(header_bytes: bytes) -> SaveHeader:
+    """
+    Decode the fixed-size header at the start of a binary save file.
+    :param header_bytes: The bytes at the start of the file.
+    :return: The decoded header.
+    """
+    if len(header_bytes) < HEADER_STRUCT.size:
+        raise ValueError("Save file is too short to be a binary save.")
+    magic, format_version, game_version, epoch_secs, auto, turn, player_count, faction_idx, multiplayer = \
+        HEADER_STRUCT.unpack(header_bytes[:HEADER_STRUCT.size])
+    if magic != SAVE_MAGIC:
+        raise ValueError("Save file is not a binary save.")
+    # We can't read saves from future versions of the game, since we won't know their layout.
+    if format_version > SAVE_FORMAT_VERSION:
+        raise ValueError(f"Save file uses unsupported binary format version {format_version}.")
+    faction: Optional[Faction] = None if faction_idx < 0 else list(Faction)[faction_idx]
+    details = SaveDetails(datetime.fromtimestamp(epoch_secs), auto, turn, player_count, faction, multiplayer)
+    return SaveHeader(details, game_version, format_version)
+
+
+def read_save_header(save_path: str) -> SaveHeader:
+    """
+    Read just the header of the binary save file at the given path, without reading the rest of the file.
+    :param save_path: The path to the save file.
+    :return: The save's header.
+    """
+    with open(save_path, "rb") as save_file:
+        return decode_header(save_file.read(HEADER_STRUCT.size))
+
+
+def write_binary_save(save_file: BinaryIO, snapshot: SaveSnapshot):
+    """
+    Write the given game snapshot to the supplied file in the binary save format.
+    :param save_file: The file to write to, opened in binary mode.
+    :param snapshot: The snapshot of the game to write.
+    """
+    save_file.write(encode_header(snapshot.details, snapshot.game_version))
+    for section in (snapshot.board, snapshot.state):
+        save_file.write(encode_section(section))
+
+
+def encode_section(records: Iterable[bytes]) -> bytes:
+    """
+    Encode the given records as a length-prefixed zlib stream of length-prefixed records.
+    :param records: The records to encode.
+    :return: The encoded section.
+    """
+    compressed: bytes = zlib.compress(b"".join(RECORD_LENGTH_STRUCT.pack(len(record)) + record for record in records))
+    return SECTION_LENGTH_STRUCT.pack(len(compressed)) + compressed
+
+
+def iter_section_data(save_file: BinaryIO) -> Iterator[bytes]:
+    """
+    Lazily read the next section of a binary save file, decompressing it a chunk at a time and yielding the data as it
+    becomes available.
+    :param save_file: The save file to read from, positioned at the start of a section.
+    :return: An iterator over the decompressed data in the section.
+    """
+    length_bytes: bytes = save_file.read(SECTION_LENGTH_STRUCT.size)
+    if len(length_bytes) < SECTION_LENGTH_STRUCT.size:
+        raise ValueError("Save file is truncated.")
+    remaining: int = SECTION_LENGTH_STRUCT.unpack(length_bytes)[0]
+    decompressor = zlib.decompressobj()
+    while remaining:
+        chunk: bytes = save_file.read(min(READ_CHUNK_SIZE, remaining))
+        if not chunk:
+            raise ValueError("Save file is truncated.")
+        remaining -= len(chunk)
+        yield decompressor.decompress(chunk)
+    if not decompressor.eof:
+        raise ValueError("Save file section is incomplete.")
+
+
+def iter_section_records(save_file: BinaryIO) -> Iterator[bytes]:
+    """
+    Lazily read the next section of a binary save file, yielding each record as it becomes available. Note that the
+    whole section must be consumed before the next one can be read.
+    :param save_file: The save file to read from, positioned at the start of a section.
+    :return: An iterator over the records in the section.
+    """
+    pending: bytearray = bytearray()
+    offset: int = 0
+    for data in iter_section_data(save_file):
+        # Discard the records we have already yielded, keeping the start of any record that is completed by this data.
+        del pending[:offset]
+        pending += data
+        offset = 0
+        while offset + RECORD_LENGTH_STRUCT.size <= len(pending):
+            length: int = RECORD_LENGTH_STRUCT.unpack_from(pending, offset)[0]
+            record_end: int = offset + RECORD_LENGTH_STRUCT.size + length
+            if record_end > len(pending):
+                break
+            yield bytes(pending[offset + RECORD_LENGTH_STRUCT.size:record_end])
+            offset = record_end
+    if offset != len(pending):
+        raise ValueError("Save file section is incomplete.")
+
+
+def read_binary_save(save_file: BinaryIO,
+                     game_state: GameState,
+                     namer: Namer) -> Tuple[SaveHeader, GameConfig, List[List[Quad]]]:
+    """
+    Stream the binary save in the given file into the supplied game state and namer objects.
+    :param save_file: The save file to read, opened in binary mode.
+    :param game_state: The game state to load the save data into.
+    :param namer: The namer to update with settlement details from the saved game.
+    :return: A tuple containing the save's header, the game configuration, and the quads on the board.
+    """
+    header: SaveHeader = decode_header(save_file.read(HEADER_STRUCT.size))
+    # Quads are decoded as they are decompressed, so the full board section is never held in memory at once. Note that
+    # this is safe because the board section is always fully consumed before we start reading the state section.
+    game_cfg, quads = decode_sections(iter_section_records(save_file), iter_section_records(save_file), game_state,
+                                      namer)
+    return header, game_cfg, quads
+
+
+def decode_sections(board_records: Iterable[bytes],
+                    state_records: Iterator[bytes],
+                    game_state: GameState,
+                    namer: Namer) -> Tuple[GameConfig, List[List[Quad]]]:
+    """
+    Decode the records from the board and state sections of a save into the supplied game state and namer objects.
+    :param board_records: The records from the board section, one per row of quads.
+    :param state_records: The records from the state section.
+    :param game_state: The game state to load the save data into.
+    :param namer: The namer to update with settlement details from the saved game.
+    :return: A tuple containing the game configuration and the quads on the board.
+    """
+    quads: List[List[Quad]] = [decode_quads(row, first_idx=y * 100) for y, row in enumerate(board_records)]
+    # If the board section was cut short, some of the quads will not have been loaded.
+    if len(quads) != 90 or any(len(row) != 100 for row in quads):
+        raise ValueError("Save file is missing quads.")
+
+    meta = json.loads(next(state_records))
+    heathens: List[Heathen] = decode_heathens(next(state_records))
+    players: List[Player] = []
+    for player_record in state_records:
+        player: Player = decode_player(player_record, quads)
+        player.quads_seen = decode_quads_seen(next(state_records))
+        players.append(player)
+    return load_state(meta, heathens, players, game_state, namer), quads
+
+
+def load_state(meta: dict,
+               heathens: List[Heathen],
+               players: List[Player],
+               game_state: GameState,
+               namer: Namer) -> GameConfig:
+    """
+    Load the given state read from a save into the supplied game state and namer objects.
+    :param meta: The turn, night status, and game configuration from the save.
+    :param heathens: The heathens from the save.
+    :param players: The players from the save.
+    :param game_state: The game state to load the save data into.
+    :param namer: The namer to update with settlement details from the saved game.
+    :return: The game configuration.
+    """
+    for player in players:
+        for setl in player.settlements:
+            # Make sure we remove the settlement's name so that we don't get duplicates.
+            namer.remove_settlement_name(setl.name, setl.quads[0].biome)
+    game_state.players = players
+    game_state.heathens = heathens
+    game_state.turn = meta["turn"]
+    game_state.until_night = meta["until_night"]
+    game_state.nighttime_left = meta["nighttime_left"]
+    cfg_dict = meta["cfg"]
+    game_cfg = GameConfig(cfg_dict["player_count"], Faction(cfg_dict["player_faction"]), cfg_dict["biome_clustering"],
+                          cfg_dict["fog_of_war"], cfg_dict["climatic_effects"],
+                          MultiplayerStatus(cfg_dict["multiplayer"]))
+    return game_cfg
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import os
+import struct
+from dataclasses import replace
+from io import BytesIO
+from typing import TYPE_CHECKING, BinaryIO, List, Optional, Tuple
+
+from source.foundation.catalogue import Namer
+from source.foundation.models import SaveHeader, SaveSnapshot, GameConfig, Quad, SaveDetails
+from source.saving.save_format import decode_header, encode_header, encode_section, iter_section_records, \
+    decode_sections, HEADER_STRUCT, BINARY_SAVE_EXTENSION
+from source.util.minifier import minify_save_details
+if TYPE_CHECKING:
+    from source.game_management.game_state import GameState
+
+"""
+Long multiplayer games on the game server are autosaved every turn, but the board is almost entirely static, and only a
+fraction of players, units, and settlements change each turn. As such, rather than writing a full save every turn, each
+lobby has a journal that is written alongside a full binary save, known as its checkpoint.
+
+Journals are laid out as follows:
+
+- A fixed-size header, containing a magic number identifying the file as a Microcosm save journal, and the version of
+  the journal format.
+- An entry for each turn since the checkpoint was written, each of which uses the same layout as a section in a binary
+  save. Each record in an entry is either a board record or a state record from the binary save that has changed since
+  the previous entry, prefixed with the section and index of the record.
+
+Loading a journaled save means loading its checkpoint with every entry in its journal replayed on top of it. So that
+journaled saves are listed with the turn they will be loaded at, the turn in the checkpoint's header and name is updated
+after each entry.
+"""
+
+# Identifies a file as being a Microcosm save journal.
+JOURNAL_MAGIC: bytes = b"MCJL"
+# The version of the journal format written by this version of the game.
+JOURNAL_FORMAT_VERSION: int = 1
+# The file extension for save journals.
+JOURNAL_EXTENSION: str = ".mjnl"
+# The header consists of the magic number and the format version.
+JOURNAL_HEADER_STRUCT: struct.Struct = struct.Struct("<4sH")
+# Each record in an entry is prefixed with the section it is from, i.e. b for board or s for state, and its index.
+ENTRY_RECORD_STRUCT: struct.Struct = struct.Struct("<cI")
+# The number of entries written to a journal before a new checkpoint is written instead.
+DEFAULT_CHECKPOINT_INTERVAL: int = 10
+
+
+def get_journal_path(save_path: str) -> str:
+    """
+    Get the path of the journal for the binary save at the given path.
+    :param save_path: The full path of the save.
+    :return: The full path of the journal for the save. Note that the journal may not exist.
+    """
+    # Journals are prefixed with a dot so that they are never listed as saves themselves.
+    base_name: str = os.path.splitext(os.path.basename(save_path))[0]
+    return os.path.join(os.path.dirname(save_path), f".{base_name}{JOURNAL_EXTENSION}")
+
+
+def encode_entry(old_records: List[bytes], new_records: List[bytes], section: bytes) -> List[bytes]:
+    """
+    Determine the records for a journal entry that transform one list of records from a save into another.
+    :param old_records: The records as they were at the time of the previous entry.
+    :param new_records: The current records.
+    :param section: The section the records come from, i.e. b for board or s for state.
+    :return: The journal records for each record that has changed or been added.
+    """
+    entry_records: List[bytes] = [ENTRY_RECORD_STRUCT.pack(section, idx) + new
+                                  for idx, (old, new) in enumerate(zip(old_records, new_records)) if old != new]
+    entry_records.extend(ENTRY_RECORD_STRUCT.pack(section, idx) + new
+                         for idx, new in enumerate(new_records[len(old_records):], len(old_records)))
+    return entry_records
+
+
+def replay_entry(entry_records: List[bytes], board: List[bytes], state: List[bytes]):
+    """
+    Apply the records from the given journal entry to the supplied save records.
+    :param entry_records: The records from the journal entry.
+    :param board: The records from the board section of the save, which are updated in place.
+    :param state: The records from the state section of the save, which are updated in place.
+    """
+    for entry_record in entry_records:
+        section, idx = ENTRY_RECORD_STRUCT.unpack_from(entry_record)
+        records: List[bytes] = board if section == b"b" else state
+        record: bytes = entry_record[ENTRY_RECORD_STRUCT.size:]
+        if idx < len(records):
+            records[idx] = record
+        else:
+            records.append(record)
+
+
+def read_journaled_save(save_file: BinaryIO,
+                        journal_file: BinaryIO,
+                        game_state: GameState,
+                        namer: Namer) -> Tuple[SaveHeader, GameConfig, List[List[Quad]]]:
+    """
+    Load the binary save in the given file, replaying each entry in the supplied journal on top of it, into the supplied
+    game state and namer objects. If the last entry in the journal is incomplete, e.g. because the game server stopped
+    while it was being written, it is ignored.
+    :param save_file: The checkpoint save file to read, opened in binary mode.
+    :param journal_file: The journal for the save, opened in binary mode.
+    :param game_state: The game state to load the save data into.
+    :param namer: The namer to update with settlement details from the saved game.
+    :return: A tuple containing the checkpoint's header, the game configuration, and the quads on the board.
+    """
+    header: SaveHeader = decode_header(save_file.read(HEADER_STRUCT.size))
+    journal_bytes: bytes = journal_file.read()
+    if len(journal_bytes) < JOURNAL_HEADER_STRUCT.size:
+        raise ValueError("Save journal is too short.")
+    magic, format_version = JOURNAL_HEADER_STRUCT.unpack(journal_bytes[:JOURNAL_HEADER_STRUCT.size])
+    if magic != JOURNAL_MAGIC or format_version > JOURNAL_FORMAT_VERSION:
+        raise ValueError("Save journal is not supported.")
+    board: List[bytes] = list(iter_section_records(save_file))
+    state: List[bytes] = list(iter_section_records(save_file))
+
+    # The journal is read into memory in full since it will never be larger than a few turns' worth of changes.
+    journal_data = BytesIO(journal_bytes)
+    journal_data.seek(JOURNAL_HEADER_STRUCT.size)
+    while journal_data.tell() < len(journal_bytes):
+        try:
+            # Each entry is read in full before it's applied, so that incomplete entries are never partially applied.
+            entry: List[bytes] = list(iter_section_records(journal_data))
+        except ValueError:
+            break
+        replay_entry(entry, board, state)
+
+    game_cfg, quads = decode_sections(board, iter(state), game_state, namer)
+    return header, game_cfg, quads
+
+
+class SaveJournal:
+    """
+    Keeps track of the records most recently written to a journaled save, so that each subsequent entry in its journal
+    only needs to contain the records that have changed. Journals should only be written to from a single thread.
+    """
+
+    def __init__(self, checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL):
+        """
+        Creates the journal. A checkpoint must be written before any entries can be written.
+        :param checkpoint_interval: The number of entries to write to the journal before a new checkpoint is required.
+        """
+        self.checkpoint_interval: int = checkpoint_interval
+        self.checkpoint_path: Optional[str] = None
+        self.entries_since_checkpoint: int = 0
+        # The records from the save's board and state sections, as of the most recent entry.
+        self.board: List[bytes] = []
+        self.state: List[bytes] = []
+
+    def needs_checkpoint(self, snapshot: SaveSnapshot) -> bool:
+        """
+        Determine whether the given snapshot should be written as a new checkpoint rather than as a journal entry.
+        :param snapshot: The snapshot to be written.
+        :return: Whether a new checkpoint is required.
+        """
+        return self.checkpoint_path is None or \
+            self.entries_since_checkpoint >= self.checkpoint_interval or \
+            len(snapshot.board) != len(self.board) or \
+            len(snapshot.state) < len(self.state) or \
+            not os.path.isfile(self.checkpoint_path) or \
+            not os.path.isfile(get_journal_path(self.checkpoint_path))
+
+    def start(self, checkpoint_path: str, snapshot: SaveSnapshot):
+        """
+        Start a new journal for the given snapshot, which has just been written as a checkpoint to the given path.
+        :param checkpoint_path: The full path of the checkpoint save.
+        :param snapshot: The snapshot that was written to the checkpoint.
+        """
+        with open(get_journal_path(checkpoint_path), "wb") as journal_file:
+            journal_file.write(JOURNAL_HEADER_STRUCT.pack(JOURNAL_MAGIC, JOURNAL_FORMAT_VERSION))
+        self.checkpoint_path = checkpoint_path
+        self.entries_since_checkpoint = 0
+        # Snapshots are never modified once taken, so we can keep the records without copying them.
+        self.board = snapshot.board
+        self.state = snapshot.state
+
+    def append(self, snapshot: SaveSnapshot):
+        """
+        Append an entry to the journal containing just the records from the given snapshot that have changed since the
+        previous entry.
+        :param snapshot: The snapshot to write.
+        """
+        entry_records: List[bytes] = encode_entry(self.board, snapshot.board, b"b")
+        entry_records.extend(encode_entry(self.state, snapshot.state, b"s"))
+        try:
+            # The entry is written in a single call so that it is only ever incomplete if the game server stops.
+            with open(get_journal_path(self.checkpoint_path), "ab") as journal_file:
+                journal_file.write(encode_section(entry_records))
+        except OSError:
+            # If the entry couldn't be written, the journal may now end with an incomplete entry, which would prevent
+            # any subsequent entries from being replayed. As such, we make sure the next snapshot is a new checkpoint.
+            self.checkpoint_path = None
+            raise
+        self.entries_since_checkpoint += 1
+        self.board = snapshot.board
+        self.state = snapshot.state
+
+    def relabel(self, turn: int):
+        """
+        Update the turn in the checkpoint's header and name to the given turn, moving the journal along with it, so that
+        the save is listed with the turn it will be loaded at rather than the turn the checkpoint was written at.
+        :param turn: The turn of the most recent entry in the journal.
+        """
+        with open(self.checkpoint_path, "r+b") as save_file:
+            header: SaveHeader = decode_header(save_file.read(HEADER_STRUCT.size))
+            details: SaveDetails = replace(header.details, turn=turn)
+            save_file.seek(0)
+            save_file.write(encode_header(details, header.game_version))
+        new_path: str = os.path.join(os.path.dirname(self.checkpoint_path),
+                                     f"{minify_save_details(details)}{BINARY_SAVE_EXTENSION}")
+        os.replace(get_journal_path(self.checkpoint_path), get_journal_path(new_path))
+        os.replace(self.checkpoint_path, new_path)
+        self.checkpoint_path = new_path
+
+
+def remove_journal(save_path: str):
+    """
+    Remove the journal for the binary save at the given path, if it has one.
+    :param save_path: The full path of the save.
+    """
+    journal_path: str = get_journal_path(save_path)
+    if os.path.isfile(journal_path):
+        os.remove(journal_path)
@@ -1,7 +1,16 @@
-from source.foundation.catalogue import get_blessing, FACTION_COLOURS, IMPROVEMENTS
+import json
+import os
+from types import SimpleNamespace
+from typing import Any, Callable, List, Optional, TextIO, Tuple
+
+from source.foundation.catalogue import get_blessing, FACTION_COLOURS, IMPROVEMENTS, get_improvement, get_project, \
+    get_unit_plan, Namer
 from source.foundation.models import UnitPlan, Unit, Faction, AIPlaystyle, AttackPlaystyle, ExpansionPlaystyle, Quad, \
-    Biome, GameConfig, DeployerUnitPlan, DeployerUnit, ResourceCollection, MultiplayerStatus, Location
-from source.util.minifier import inflate_quad
+    Biome, GameConfig, DeployerUnitPlan, DeployerUnit, ResourceCollection, MultiplayerStatus, Location, Heathen, \
+    HarvestStatus, EconomicStatus, VictoryType, SaveDetails, SaveSnapshot
+from source.saving.save_encoder import ObjectConverter
+from source.saving.save_format import build_snapshot, write_binary_save, BINARY_SAVE_EXTENSION, JSON_SAVE_EXTENSION
+from source.util.minifier import inflate_quad, inflate_save_details, minify_save_details
 
 """
 The following migrations have occurred during Microcosm's development:
@@ -57,6 +66,13 @@ v4.0
 v4.1
 - Local multiplayer games were introduced; GameConfig objects from previous versions have their multiplayer boolean
   field mapped from False to Disabled, and from True to Global, as Local games did not exist previously.
+
+Binary saves (game version 4.0, save format version 1)
+- Saves became binary files rather than JSON ones, with a header containing the save's details followed by compressed
+  sections for the board and the rest of the game state. JSON saves can still be loaded, and are converted to the
+  binary format shortly after the game starts, with the original JSON file being kept as a hidden backup. The game
+  version recorded in saves remains 4.0, since binary saves are told apart from JSON ones by their file extension and
+  magic number, with changes to their layout tracked by the save format version in their header instead.
 """
 
 
@@ -249,3 +265,208 @@ def get_faction_for_colour(colour: int) -> Faction:
     colours = list(FACTION_COLOURS.values())
     idx = colours.index(colour)
     return factions[idx]
+
+
+# JSON saves from this version of the game onwards have minified quads, as well as every attribute that the migrations
+# above fill in, so they can be decoded directly. Note that the game configuration is still migrated regardless, as the
+# multiplayer status changed type without the game version changing.
+DIRECT_DECODE_JSON_VERSION: float = 4.0
+
+
+def can_decode_directly(save) -> bool:
+    """
+    Determine whether the given loaded JSON save is recent enough to be decoded directly, without any migrations.
+    :param save: The loaded save data.
+    :return: Whether the save can be decoded directly.
+    """
+    return getattr(save, "game_version", 0.0) >= DIRECT_DECODE_JSON_VERSION and isinstance(save.quads[0], str)
+
+
+def decode_unit_plan(unit_plan, faction: Faction) -> UnitPlan:
+    """
+    Directly convert a loaded unit plan object from a current save into a UnitPlan.
+    :param unit_plan: The loaded unit plan object.
+    :param faction: The faction the unit plan belongs to.
+    :return: The UnitPlan representation.
+    """
+    plan_prereq = None if unit_plan.prereq is None else get_blessing(unit_plan.prereq.name, faction)
+    if hasattr(unit_plan, "max_capacity"):
+        return DeployerUnitPlan(float(unit_plan.power), float(unit_plan.max_health), unit_plan.total_stamina,
+                                unit_plan.name, plan_prereq, unit_plan.cost, unit_plan.can_settle, unit_plan.heals,
+                                unit_plan.max_capacity)
+    return UnitPlan(float(unit_plan.power), float(unit_plan.max_health), unit_plan.total_stamina, unit_plan.name,
+                    plan_prereq, unit_plan.cost, unit_plan.can_settle, unit_plan.heals)
+
+
+def decode_unit(unit, faction: Faction) -> Unit:
+    """
+    Directly convert a loaded unit object from a current save into a Unit.
+    :param unit: The loaded unit object.
+    :param faction: The faction the unit belongs to.
+    :return: The Unit representation.
+    """
+    location: Location = unit.location[0], unit.location[1]
+    if hasattr(unit, "passengers"):
+        return DeployerUnit(float(unit.health), unit.remaining_stamina, location, unit.garrisoned,
+                            decode_unit_plan(unit.plan, faction), unit.has_acted, unit.besieging,
+                            [decode_unit(p, faction) for p in unit.passengers])
+    return Unit(float(unit.health), unit.remaining_stamina, location, unit.garrisoned,
+                decode_unit_plan(unit.plan, faction), unit.has_acted, unit.besieging)
+
+
+def decode_player(player):
+    """
+    Directly convert the AI playstyle, faction, and resources for a loaded player object from a current save.
+    :param player: The loaded player object.
+    """
+    if player.ai_playstyle is not None:
+        player.ai_playstyle = AIPlaystyle(AttackPlaystyle[player.ai_playstyle.attacking],
+                                          ExpansionPlaystyle[player.ai_playstyle.expansion])
+    player.faction = Faction(player.faction)
+    res = player.resources
+    player.resources = ResourceCollection(res.ore, res.timber, res.magma,
+                                          res.aurora, res.bloodstone, res.obsidian, res.sunstone, res.aquamarine)
+
+
+def decode_settlement(settlement):
+    """
+    Directly convert the resources for a loaded settlement object from a current save.
+    :param settlement: The loaded settlement object.
+    """
+    res = settlement.resources
+    settlement.resources = ResourceCollection(res.ore, res.timber, res.magma,
+                                              res.aurora, res.bloodstone, res.obsidian, res.sunstone, res.aquamarine)
+
+
+def load_json_save(game_state, namer: Namer, save_file: TextIO) -> Tuple[GameConfig, List[List[Quad]]]:
+    """
+    Load the JSON save in the given file into the supplied game state and namer objects. Saves from the current version
+    of the game are decoded directly, and only older saves are migrated.
+    :param game_state: The game state to load the save data into.
+    :param namer: The namer to update with settlement details from the saved game.
+    :param save_file: The JSON save file to load.
+    :return: A tuple containing the game configuration and the quads on the board.
+    """
+    # Use a custom object hook when loading the JSON so that the resulting objects have attribute access.
+    save = json.loads(save_file.read(), object_hook=ObjectConverter)
+    # Determine up front whether the save needs to be migrated, so that saves from the current version of the game don't
+    # have to go through the checks for every migration for every object.
+    direct: bool = can_decode_directly(save)
+    unit_decoder: Callable[[Any, Faction], Unit] = decode_unit if direct else migrate_unit
+    # Load in the quads.
+    quads: List[List[Optional[Quad]]] = [[None] * 100 for _ in range(90)]
+    for i in range(90):
+        for j in range(100):
+            if direct:
+                quads[i][j] = inflate_quad(save.quads[i * 100 + j], (j, i))
+            else:
+                quads[i][j] = migrate_quad(save.quads[i * 100 + j], (j, i))
+    migrate_game_version(game_state, save)
+    game_state.players = save.players
+    for p in game_state.players:
+        # The list of tuples that is quads_seen needs special loading, as do a few other of the same type,
+        # because tuples do not exist in JSON, so they are represented as arrays, which will clearly not work.
+        for i in range(len(p.quads_seen)):
+            p.quads_seen[i] = (p.quads_seen[i][0], p.quads_seen[i][1])
+        p.quads_seen = set(p.quads_seen)
+        for idx, u in enumerate(p.units):
+            # We can do a direct conversion to Unit and UnitPlan objects for units.
+            p.units[idx] = unit_decoder(u, p.faction)
+        for s in p.settlements:
+            # Make sure we remove the settlement's name so that we don't get duplicates.
+            namer.remove_settlement_name(s.name, s.quads[0].biome)
+            # Another tuple-array fix.
+            s.location = (s.location[0], s.location[1])
+            if s.current_work is not None:
+                # Get the actual Improvement, Project, or UnitPlan objects for the current work. We use
+                # hasattr() because improvements have an effect where projects do not, and projects have
+                # a type where unit plans do not.
+                if hasattr(s.current_work.construction, "effect"):
+                    s.current_work.construction = get_improvement(s.current_work.construction.name)
+                elif hasattr(s.current_work.construction, "type"):
+                    s.current_work.construction = get_project(s.current_work.construction.name)
+                else:
+                    s.current_work.construction = \
+                        get_unit_plan(s.current_work.construction.name, p.faction, s.resources)
+            for idx, imp in enumerate(s.improvements):
+                # Do another direct conversion for improvements.
+                s.improvements[idx] = get_improvement(imp.name)
+            # Also convert all units in garrisons to Unit objects.
+            for idx, u in enumerate(s.garrison):
+                s.garrison[idx] = unit_decoder(u, p.faction)
+            s.harvest_status = HarvestStatus(s.harvest_status)
+            s.economic_status = EconomicStatus(s.economic_status)
+            # We also need to link the quads for each settlement to the quads on the actual board so that changes
+            # made to the quad on the board, e.g. investigating a relic that occupies the same quad as a settlement,
+            # are reflected in the settlement's quad as well.
+            for idx, q in enumerate(s.quads):
+                s.quads[idx] = quads[q.location[1]][q.location[0]]
+            if direct:
+                decode_settlement(s)
+            else:
+                migrate_settlement(s)
+        # We also do direct conversions to Blessing objects for the ongoing one, if there is one,
+        # as well as any previously-completed ones.
+        if p.ongoing_blessing:
+            p.ongoing_blessing.blessing = get_blessing(p.ongoing_blessing.blessing.name, p.faction)
+        for idx, bls in enumerate(p.blessings):
+            p.blessings[idx] = get_blessing(bls.name, p.faction)
+        imminent_victories: List[VictoryType] = []
+        for iv in p.imminent_victories:
+            imminent_victories.append(VictoryType(iv))
+        p.imminent_victories = set(imminent_victories)
+        if direct:
+            decode_player(p)
+        else:
+            migrate_player(p)
+
+    game_state.heathens = []
+    for h in save.heathens:
+        # Do another direct conversion for the heathens.
+        game_state.heathens.append(Heathen(float(h.health), h.remaining_stamina, (h.location[0], h.location[1]),
+                                           UnitPlan(float(h.plan.power), float(h.plan.max_health),
+                                                    h.plan.total_stamina, h.plan.name, None, 0.0),
+                                           h.has_attacked))
+
+    game_state.turn = save.turn
+    migrate_climatic_effects(game_state, save)
+    return migrate_game_config(save.cfg), quads
+
+
+def convert_json_save(saves_dir: str, json_save_name: str) -> str:
+    """
+    Convert the JSON save with the given name into a binary save. The original file is kept as a hidden backup.
+    :param saves_dir: The directory containing the save.
+    :param json_save_name: The file name of the JSON save to convert.
+    :return: The file name of the converted binary save.
+    """
+    # The game state can't be imported here without creating a circular import, and we only need somewhere to put the
+    # loaded data anyway.
+    loaded = SimpleNamespace()
+    # Loading a save from before resources were introduced removes the resource requirements for all improvements, which
+    # we don't want to apply to whatever game is played next, so we restore them once the save has been loaded.
+    req_resources = [imp.req_resources for imp in IMPROVEMENTS]
+    with open(os.path.join(saves_dir, json_save_name), "r", encoding="utf-8") as save_file:
+        cfg, quads = load_json_save(loaded, Namer(), save_file)
+    for imp, req in zip(IMPROVEMENTS, req_resources):
+        imp.req_resources = req
+
+    # Saves from v4.1 and prior don't have any details in their file names other than the time they were saved, but
+    # now that the save is loaded, we can fill in the rest.
+    base_name: str = json_save_name.removesuffix(JSON_SAVE_EXTENSION)
+    name_details: SaveDetails = inflate_save_details(base_name, base_name.startswith("auto"))
+    details = SaveDetails(name_details.date_time, name_details.auto, loaded.turn, cfg.player_count,
+                          None if cfg.multiplayer else cfg.player_faction, bool(cfg.multiplayer))
+    snapshot: SaveSnapshot = build_snapshot(details, loaded.game_version, cfg, quads, loaded.players, loaded.heathens,
+                                            loaded.turn, loaded.until_night, loaded.nighttime_left)
+    binary_save_name: str = minify_save_details(details) + BINARY_SAVE_EXTENSION
+    # As with regular saves, the binary save is written to a hidden temporary file first so that a partially-converted
+    # save is never visible.
+    temp_save_path: str = os.path.join(saves_dir, f".{binary_save_name}.tmp")
+    with open(temp_save_path, "wb") as binary_file:
+        write_binary_save(binary_file, snapshot)
+    os.replace(temp_save_path, os.path.join(saves_dir, binary_save_name))
+    # The original save is kept rather than deleted, in case the conversion turns out to be faulty, but prefixed with a
+    # dot so that it is no longer listed alongside the binary save.
+    os.replace(os.path.join(saves_dir, json_save_name), os.path.join(saves_dir, f".{json_save_name}"))
+    return binary_save_name
@@ -0,0 +1,85 @@
+import atexit
+from queue import Queue, Full
+from threading import Thread
+from typing import Callable, Optional, Tuple
+
+from source.foundation.models import SaveSnapshot
+
+# The maximum number of saves that may be waiting to be written at any one time.
+DEFAULT_MAX_QUEUED_SAVES: int = 8
+
+# A save waiting to be written, made up of the file name, the snapshot of the save data, and whether it is an autosave.
+type QueuedSave = Tuple[str, SaveSnapshot, bool]
+
+
+class SaveWriter:
+    """
+    Writes game saves to disk on a background thread, so that the thread taking the save (e.g. the game loop or the game
+    server's request handler) never has to wait on JSON encoding or the filesystem.
+    """
+
+    def __init__(self,
+                 write_fn: Callable[[str, SaveSnapshot, bool], None],
+                 max_queued: int = DEFAULT_MAX_QUEUED_SAVES):
+        """
+        Creates the writer. The background thread is not started until the first save is queued.
+        :param write_fn: The function to call to actually write each save, supplied with the file name, the snapshot of
+                         the save data, and whether the save is an autosave.
+        :param max_queued: The maximum number of saves that may be waiting to be written at any one time.
+        """
+        self.write_fn: Callable[[str, SaveSnapshot, bool], None] = write_fn
+        self.queue: Queue[Optional[QueuedSave]] = Queue(maxsize=max_queued)
+        self.writer_thread: Optional[Thread] = None
+        # The number of autosaves that have been dropped because the queue was full.
+        self.dropped_autosaves: int = 0
+
+    def _run(self):
+        """
+        Write each queued save in turn, until told to stop.
+        """
+        while (queued := self.queue.get()) is not None:
+            try:
+                self.write_fn(*queued)
+            # If a save can't be written, e.g. because the disk is full, we don't want to stop writing future saves, so
+            # we just move on to the next one.
+            except OSError:
+                pass
+            finally:
+                self.queue.task_done()
+        self.queue.task_done()
+
+    def submit(self, save_name: str, save: SaveSnapshot, auto: bool):
+        """
+        Queue the given save to be written in the background. If the queue is full, autosaves are dropped, since the
+        next one will supersede them anyway, but manual saves wait until there is room.
+        :param save_name: The file name for the save.
+        :param save: The snapshot of the save data to write. This must not be modified after being submitted.
+        :param auto: Whether the save is an autosave.
+        """
+        if self.writer_thread is None:
+            self.writer_thread = Thread(target=self._run, daemon=True)
+            self.writer_thread.start()
+            # Make sure that any saves still waiting to be written are written before the process exits.
+            atexit.register(self.shutdown)
+        if auto:
+            try:
+                self.queue.put_nowait((save_name, save, auto))
+            except Full:
+                self.dropped_autosaves += 1
+        else:
+            self.queue.put((save_name, save, auto))
+
+    def wait_until_written(self):
+        """
+        Block until every save that has been queued so far has been written.
+        """
+        self.queue.join()
+
+    def shutdown(self):
+        """
+        Write any remaining queued saves and stop the background thread.
+        """
+        if self.writer_thread is not None:
+            self.queue.put(None)
+            self.writer_thread.join()
+            self.writer_thread = None
@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import atexit
+import json
+import os
+from copy import deepcopy
+from threading import Event, Lock, RLock, Thread
+from typing import TYPE_CHECKING, Optional, List
+
+from filelock import FileLock
+
+from source.foundation.catalogue import ACHIEVEMENTS
+from source.foundation.models import Statistics, VictoryType, Faction, Achievement
+if TYPE_CHECKING:
+    from source.game_management.game_state import GameState
+
+# The default number of seconds between each periodic flush of statistics to disk.
+DEFAULT_FLUSH_INTERVAL: float = 10.0
+
+
+def merge_statistics(base: Statistics, delta: Statistics) -> Statistics:
+    """
+    Combine the supplied statistics with a set of changes to them, returning a new Statistics object.
+    :param base: The statistics to add the changes to.
+    :param delta: The changes to add, e.g. extra playtime or an additional victory.
+    :return: The combined statistics.
+    """
+    victories = dict(base.victories)
+    for victory, count in delta.victories.items():
+        victories[victory] = victories.get(victory, 0) + count
+    factions = dict(base.factions)
+    for faction, count in delta.factions.items():
+        factions[faction] = factions.get(faction, 0) + count
+    return Statistics(base.playtime + delta.playtime,
+                      base.turns_played + delta.turns_played,
+                      victories,
+                      base.defeats + delta.defeats,
+                      factions,
+                      set(base.achievements) | set(delta.achievements))
+
+
+class StatisticsStore:
+    """
+    An in-memory store for the player's statistics and achievements. Statistics are loaded from disk once, updated in
+    memory as the player plays, and written back to disk in the background, so that ending a turn never has to wait on
+    the filesystem.
+    """
+
+    def __init__(self, stats_file_name: str, flush_interval: float = DEFAULT_FLUSH_INTERVAL):
+        """
+        Creates the store. Note that statistics are not loaded until they are first required, or start() is called.
+        :param stats_file_name: The path to the statistics JSON file.
+        :param flush_interval: The number of seconds between each periodic flush of statistics to disk.
+        """
+        self.stats_file_name: str = stats_file_name
+        self.flush_interval: float = flush_interval
+        # The statistics as they currently stand, including any changes that have not been written to disk yet.
+        self.stats: Optional[Statistics] = None
+        # The changes that have been made since the last flush. We keep track of these separately so that they can be
+        # applied on top of whatever is on disk at the time of flushing, since another running instance of the game on
+        # the same machine may have written its own statistics in the meantime.
+        self.pending: Statistics = Statistics()
+        self.dirty: bool = False
+        # Statistics may be updated by both the main game thread and the multiplayer event listener thread.
+        self.lock: RLock = RLock()
+        # Only one flush may occur at a time, so that the in-memory statistics are always rebased in the right order.
+        self.flush_lock: Lock = Lock()
+        self.flush_requested: Event = Event()
+        self.stopping: bool = False
+        self.flusher_thread: Optional[Thread] = None
+
+    def _read_file(self) -> Statistics:
+        """
+        Read the statistics currently in the statistics JSON file, if there is one.
+        :return: The statistics from disk, or empty statistics if the player does not have any yet.
+        """
+        if os.path.isfile(self.stats_file_name):
+            with open(self.stats_file_name, "r", encoding="utf-8") as stats_file:
+                stats_json = json.loads(stats_file.read())
+                # Achievements were introduced after the initial statistics, so we have to make sure they are present.
+                return Statistics(stats_json["playtime"], stats_json["turns_played"], stats_json["victories"],
+                                  stats_json["defeats"], stats_json["factions"],
+                                  set(stats_json["achievements"]) if "achievements" in stats_json else set())
+        return Statistics(0, 0, {}, 0, {}, set())
+
+    def _get_loaded(self) -> Statistics:
+        """
+        Get the in-memory statistics, loading them from disk if this has not already been done.
+        :return: The in-memory statistics.
+        """
+        with self.lock:
+            # Since the statistics file is always replaced atomically, we don't need to obtain the file lock to read it.
+            if self.stats is None:
+                self.stats = self._read_file()
+            return self.stats
+
+    def start(self):
+        """
+        Load the player's statistics and start the background thread that periodically flushes them to disk. Any
+        unflushed statistics are also flushed when the process exits.
+        """
+        self._get_loaded()
+        if self.flusher_thread is None:
+            self.stopping = False
+            self.flusher_thread = Thread(target=self._run_flusher, daemon=True)
+            self.flusher_thread.start()
+            atexit.register(self.shutdown)
+
+    def _run_flusher(self):
+        """
+        Flush statistics to disk every flush interval, or sooner if a flush is requested, until the store is shut down.
+        """
+        while not self.stopping:
+            self.flush_requested.wait(self.flush_interval)
+            self.flush_requested.clear()
+            if not self.stopping:
+                try:
+                    self.flush()
+                # If the statistics couldn't be written, e.g. because the disk is full, they are kept in memory and
+                # written with the next flush instead.
+                except OSError:
+                    pass
+
+    def request_flush(self):
+        """
+        Signal the background thread to flush statistics to disk as soon as possible. If the background thread has not
+        been started, statistics are flushed immediately instead.
+        """
+        if self.flusher_thread is not None:
+            self.flush_requested.set()
+        else:
+            self.flush()
+
+    def shutdown(self):
+        """
+        Stop the background thread and flush any remaining statistics to disk.
+        """
+        if self.flusher_thread is not None:
+            self.stopping = True
+            self.flush_requested.set()
+            self.flusher_thread.join()
+            self.flusher_thread = None
+        self.flush()
+
+    def flush(self):
+        """
+        Write any changed statistics to the statistics JSON file. The changes are applied to the statistics on disk
+        while holding the file lock, and the file is replaced atomically, so that a crash mid-write can never leave a
+        partially-written file behind.
+        """
+        with self.flush_lock:
+            with self.lock:
+                if not self.dirty:
+                    return
+                to_write: Statistics = self.pending
+                self.pending = Statistics()
+                self.dirty = False
+            try:
+                # Obtain the file lock for the statistics file. This is to account for an (admittedly rare) edge case
+                # where two players may be playing on the same machine in a local multiplayer game, and thus ending
+                # their turns and saving their stats at the same time.
+                with FileLock(self.stats_file_name + ".lock"):
+                    merged: Statistics = merge_statistics(self._read_file(), to_write)
+                    temp_file_name: str = self.stats_file_name + ".tmp"
+                    with open(temp_file_name, "w", encoding="utf-8") as stats_file:
+                        stats = {
+                            "playtime": merged.playtime,
+                            "turns_played": merged.turns_played,
+                            "victories": merged.victories,
+                            "defeats": merged.defeats,
+                            "factions": merged.factions,
+                            "achievements": sorted(merged.achievements)
+                        }
+                        stats_file.write(json.dumps(stats))
+                    os.replace(temp_file_name, self.stats_file_name)
+            except OSError:
+                # Put the changes back so that they aren't lost, and are written with the next flush instead.
+                with self.lock:
+                    self.pending = merge_statistics(to_write, self.pending)
+                    self.dirty = True
+                raise
+            with self.lock:
+                # Rebase the in-memory statistics on what is now on disk, keeping any changes made while we were
+                # flushing.
+                self.stats = merge_statistics(merged, self.pending)
+
+    def get_stats(self) -> Statistics:
+        """
+        Retrieve a copy of the player's current statistics.
+        :return: An object containing the player's statistics.
+        """
+        with self.lock:
+            return deepcopy(self._get_loaded())
+
+    def record(self,
+               game_state: GameState,
+               playtime: float = 0,
+               increment_turn: bool = True,
+               victory_to_add: Optional[VictoryType] = None,
+               increment_defeats: bool = False,
+               faction_to_add: Optional[Faction] = None) -> List[Achievement]:
+        """
+        Update the in-memory statistics and check if any achievements have been obtained. If any have, a flush is
+        requested so that they are persisted promptly. All parameters other than the game state have default values so
+        that they may be supplied at different times.
+        :param game_state: The current game state object.
+        :param playtime: The elapsed time since the last turn was ended.
+        :param increment_turn: Whether a turn was just ended.
+        :param victory_to_add: A victory to log, if one was achieved.
+        :param increment_defeats: Whether the player just lost a game.
+        :param faction_to_add: A chosen faction to log, if the player is starting a new game.
+        :return: Any new achievements that have been obtained by the player.
+        """
+        new_achievements: List[Achievement] = []
+        with self.lock:
+            delta: Statistics = Statistics(playtime,
+                                           1 if increment_turn else 0,
+                                           {victory_to_add: 1} if victory_to_add else {},
+                                           1 if increment_defeats else 0,
+                                           {faction_to_add: 1} if faction_to_add else {})
+            self.stats = merge_statistics(self._get_loaded(), delta)
+
+            if victory_to_add:
+                # Check if any achievements have been obtained that can only be verified immediately after a player
+                # victory. Note that we don't need to supply a real Statistics object for this, since all post-victory
+                # achievements only require the game state to be verified.
+                for ach in ACHIEVEMENTS:
+                    if ach.name not in self.stats.achievements and ach.post_victory and \
+                            ach.verification_fn(game_state, Statistics()):
+                        self.stats.achievements.add(ach.name)
+                        new_achievements.append(ach)
+
+            # All other achievements can be checked on every update, with the real Statistics. Note that we need to
+            # ensure that the player objects for the game have been initialised. This is because player statistics are
+            # updated with faction usage when starting a new game, and this occurs prior to the players being
+            # initialised.
+            if game_state.players:
+                for ach in ACHIEVEMENTS:
+                    if ach.name not in self.stats.achievements and not ach.post_victory and \
+                            ach.verification_fn(game_state, self.stats):
+                        self.stats.achievements.add(ach.name)
+                        new_achievements.append(ach)
+
+            delta.achievements = {ach.name for ach in new_achievements}
+            self.pending = merge_statistics(self.pending, delta)
+            self.dirty = True
+
+        if new_achievements:
+            self.request_flush()
+        return new_achievements
@@ -193,10 +193,12 @@ class BoardTest(unittest.TestCase):
         self.assertEqual(test_game_name, board.game_name)
         self.assertFalse(board.waiting_for_other_players)
 
-    def test_update_help(self):
+    @patch("source.display.board.REDRAW_TRACKER")
+    def test_update_help(self, redraw_tracker_mock: MagicMock):
         """
         Ensure that the help time bank and text are appropriately updated when the Board object is updated with elapsed
-        time.
+        time, with the display being marked dirty whenever the text changes.
+        :param redraw_tracker_mock: The mock implementation of the REDRAW_TRACKER object.
         """
         self.assertFalse(self.board.help_time_bank)
         self.assertEqual(HelpOption.SETTLEMENT, self.board.current_help)
@@ -212,6 +214,7 @@ class BoardTest(unittest.TestCase):
         # Now, the time should be reset and the text should have changed.
         self.assertFalse(self.board.help_time_bank)
         self.assertEqual(HelpOption.UNIT, self.board.current_help)
+        redraw_tracker_mock.mark_dirty.assert_called_once()
 
         # Iterate through the remaining text options and ensure that they cycle through as expected.
         self.board.update(self.TEST_UPDATE_TIME_OVER)
@@ -375,6 +378,26 @@ class BoardTest(unittest.TestCase):
                     found_sunstone = True
         self.assertFalse(found_sunstone)
 
+    def test_map_layer_needs_redraw(self):
+        """
+        Ensure that the map layer is redrawn when what should be drawn on it changes, or when a relic drawn on it has
+        been investigated.
+        """
+        key = (0, 0), False, 0, False, 50
+        # The map layer has never been drawn, so it must be drawn initially.
+        self.assertTrue(self.board.map_layer_needs_redraw(key))
+        self.board.map_layer_key = key
+        self.board.map_layer_relics = [self.board.quads[self.relic_coords[0]][self.relic_coords[1]]]
+        self.assertFalse(self.board.map_layer_needs_redraw(key))
+        # Each change in the key should require the layer to be redrawn.
+        self.assertTrue(self.board.map_layer_needs_redraw(((1, 0), False, 0, False, 50)))
+        self.assertTrue(self.board.map_layer_needs_redraw(((0, 0), True, 0, False, {(1, 1)})))
+        self.assertTrue(self.board.map_layer_needs_redraw(((0, 0), False, 0, False, 51)))
+        self.assertTrue(self.board.map_layer_needs_redraw(((0, 0), False, 0, True, None)))
+        # Investigating the relic should also require the layer to be redrawn.
+        self.board.map_layer_relics[0].is_relic = False
+        self.assertTrue(self.board.map_layer_needs_redraw(key))
+
     def test_right_click(self):
         """
         Ensure that right-clicking quads behaves as expected.
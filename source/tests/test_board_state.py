@@ -0,0 +1,67 @@
+import os
+import subprocess
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+from source.display.overlay import Overlay
+from source.foundation.catalogue import Namer
+from source.foundation.models import GameConfig, Faction, MultiplayerStatus, Quad, Biome
+from source.game_management.board_state import BoardState, NullOverlay
+
+
+class BoardStateTest(unittest.TestCase):
+    """
+    The test class for board_state.py.
+    """
+    TEST_CONFIG = GameConfig(2, Faction.CONCENTRATED, True, True, True, MultiplayerStatus.GLOBAL)
+    TEST_NAMER = Namer()
+
+    def test_init(self):
+        """
+        Ensure that board state generates quads when none are supplied, and uses a NullOverlay unless given an overlay.
+        """
+        board_state = BoardState(self.TEST_CONFIG, self.TEST_NAMER, player_idx=1, game_name="Omega")
+        self.assertEqual(90, len(board_state.quads))
+        self.assertTrue(all(len(row) == 100 and all(row) for row in board_state.quads))
+        self.assertIsInstance(board_state.overlay, NullOverlay)
+        self.assertEqual(1, board_state.player_idx)
+        self.assertEqual("Omega", board_state.game_name)
+
+        test_quads = [[Quad(Biome.DESERT, 0, 0, 0, 0, (j, i)) for j in range(100)] for i in range(90)]
+        test_overlay = Overlay(self.TEST_CONFIG)
+        board_state = BoardState(self.TEST_CONFIG, self.TEST_NAMER, test_quads, overlay=test_overlay)
+        self.assertIs(test_quads, board_state.quads)
+        self.assertIs(test_overlay, board_state.overlay)
+
+    def test_null_overlay(self):
+        """
+        Ensure that toggling any part of a NullOverlay does nothing, while its other attributes remain usable.
+        """
+        overlay = NullOverlay(self.TEST_CONFIG)
+        overlay.toggle_standard()
+        overlay.toggle_tutorial()
+        overlay.toggle_attack(MagicMock())
+        overlay.toggle_unit(MagicMock())
+        self.assertFalse(overlay.showing)
+        self.assertIsNone(overlay.attack_data)
+        self.assertFalse(overlay.is_standard())
+        self.assertFalse(overlay.is_warning())
+        overlay.remove_warning_if_possible()
+        overlay.total_settlement_count = 3
+        self.assertEqual(3, overlay.total_settlement_count)
+
+    def test_server_does_not_load_display(self):
+        """
+        Ensure that the modules used by the game server can be imported without loading pyxel or the board display.
+        """
+        root_dir: str = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir))
+        check = "import sys; import source.networking.event_listener; " \
+                "print('pyxel' in sys.modules or 'source.display.board' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", check], cwd=root_dir, capture_output=True, text=True,
+                                check=True, env={**os.environ, "PYTHONPATH": root_dir})
+        self.assertEqual("False", result.stdout.strip())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -356,6 +356,11 @@ class CatalogueTest(unittest.TestCase):
                          get_unit_plan(test_unit_plan.name, Faction.EXPLORERS, ResourceCollection(bloodstone=1)))
         self.assertEqual(expected_scaled_unit_plan_with_prereq,
                          get_unit_plan(expected_scaled_unit_plan_with_prereq.name, Faction.GODLESS))
+        # Scaling the retrieved models should not have affected the ones in the catalogue, including the pre-requisite
+        # blessings for unit plans.
+        self.assertEqual(self.TEST_BLESSING, get_blessing(self.TEST_BLESSING.name, Faction.AGRICULTURISTS))
+        self.assertEqual(test_unit_plan, get_unit_plan(test_unit_plan.name, Faction.AGRICULTURISTS))
+        self.assertEqual(expected_scaled_unit_plan_with_prereq.prereq.cost / 1.5, UNIT_PLANS[4].prereq.cost)
 
 
 if __name__ == '__main__':
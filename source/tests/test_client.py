@@ -1,15 +1,86 @@
 import datetime
 import importlib
+import json
+import os
+import socket
 import sys
 import unittest
-from typing import Dict
-from unittest.mock import patch, MagicMock, call
+from socketserver import UDPServer
+from tempfile import TemporaryDirectory
+from threading import Thread
+from typing import Dict, List, Optional, Tuple
+from unittest.mock import patch, MagicMock
 
-from source.foundation.models import MultiplayerStatus
+from source.foundation.catalogue import BLESSINGS, IMPROVEMENTS
+from source.foundation.models import MultiplayerStatus, Location, Faction, Construction, ResourceCollection, \
+    OngoingBlessing
 from source.networking import client
 from source.networking.client import dispatch_event, GLOBAL_SERVER_HOST, SERVER_PORT, get_identifier, DispatcherKind, \
-    EventDispatcher, initialise_upnp, broadcast_to_local_network_hosts
-from source.networking.events import Event, EventType, RegisterEvent
+    EventDispatcher, initialise_upnp, probe_local_servers, get_private_ip, NetworkBootstrap, LocalServerDiscovery, \
+    PRIVATE_IP_TIMEOUT, UPNP_DISCOVER_DELAY, UPNP_UNAVAILABLE_DISCOVER_DELAY, UPNP_MAPPING_TIMEOUT, \
+    LOCAL_SERVER_PROBE_ADDRESS, LOCAL_SERVER_PROBE_INTERVAL, LOCAL_SERVER_TTL
+from source.networking.events import Event, EventType, RegisterEvent, MoveUnitEvent, UpdateAction, \
+    SetConstructionEvent, SetBlessingEvent
+from source.networking.client_registry import ClientRegistry, CLIENT_IDLE_TIMEOUT
+from source.networking.event_listener import RequestHandler
+from source.networking.lobby_tracker import LobbyTracker
+from source.saving.save_encoder import SaveEncoder
+
+
+class StubUPnP:
+    """
+    A stand-in for the miniupnpc UPnP object, simulating a network that may or may not have an IGD device with some
+    existing port mappings.
+    """
+
+    def __init__(self, igd_available: bool = True, port_mappings: Optional[List[Tuple]] = None):
+        """
+        Creates the stub.
+        :param igd_available: Whether an IGD device can be selected on the simulated network.
+        :param port_mappings: The existing port mappings on the simulated IGD device.
+        """
+        self.discoverdelay: int = 0
+        self.igd_available: bool = igd_available
+        self.port_mappings: List[Tuple] = port_mappings or []
+        self.discovered: bool = False
+        self.deleted_ports: List[int] = []
+        self.added_mappings: List[Tuple] = []
+
+    def discover(self) -> int:
+        """
+        Discover the devices on the simulated network.
+        :return: The number of devices discovered.
+        """
+        self.discovered = True
+        return 1 if self.igd_available else 0
+
+    def selectigd(self):
+        """
+        Select the IGD device, raising the base Exception if there isn't one, as miniupnpc does.
+        """
+        if not self.igd_available:
+            raise Exception("No UPnP device discovered")  # pylint: disable=broad-exception-raised
+
+    def getgenericportmapping(self, idx: int) -> Optional[Tuple]:
+        """
+        Get the port mapping at the given index.
+        :param idx: The index of the port mapping.
+        :return: The port mapping, or None if there are no more.
+        """
+        return self.port_mappings[idx] if idx < len(self.port_mappings) else None
+
+    def deleteportmapping(self, port: int, _: str):
+        """
+        Record the deletion of the port mapping for the given port.
+        :param port: The external port of the mapping.
+        """
+        self.deleted_ports.append(port)
+
+    def addportmapping(self, *args):
+        """
+        Record the addition of a port mapping with the given details.
+        """
+        self.added_mappings.append(args)
 
 
 class ClientTest(unittest.TestCase):
@@ -55,10 +126,12 @@ class ClientTest(unittest.TestCase):
         cdll_construction_mock.assert_called_with("miniupnpc.dll")
         cdll_load_mock.assert_called_with(f"{user_site_packages_path}/microcosm/source/resources/dll/miniupnpc.dll")
 
+    @patch("source.networking.client.Thread")
     @patch("source.networking.client.socket.socket")
-    def test_event_dispatcher_dispatch_event(self, socket_mock: MagicMock):
+    def test_event_dispatcher_dispatch_event(self, socket_mock: MagicMock, thread_mock: MagicMock):
         """
-        Ensure that events are serialised and dispatched correctly in an EventDispatcher.
+        Ensure that events are serialised and dispatched correctly in an EventDispatcher, being sent in the background
+        using the dispatcher's socket.
         """
         socket_mock_instance: MagicMock = socket_mock.return_value
         test_event: Event = Event(EventType.REGISTER, 123)
@@ -66,11 +139,176 @@ class ClientTest(unittest.TestCase):
 
         dispatcher: EventDispatcher = EventDispatcher(test_host)
         dispatcher.dispatch_event(test_event)
+        dispatcher.dispatch_event(test_event)
+        # Nothing should be sent until the sending thread runs, and only one thread should be started.
+        socket_mock_instance.sendto.assert_not_called()
+        thread_mock.assert_called_once_with(target=dispatcher.send_pending, daemon=True)
+        thread_mock.return_value.start.assert_called_once()
+
+        dispatcher.send_pending()
+        # Both events should have been sent, since they can't be combined.
+        self.assertEqual(2, socket_mock_instance.sendto.call_count)
         socket_mock_instance.sendto.assert_called_with(b'{"type":"REGISTER","identifier":123}',
                                                        (test_host, SERVER_PORT))
+        self.assertFalse(dispatcher.sending)
+        # The same socket should be used for every event.
+        socket_mock.assert_called_once()
+
+        # Events that can't be sent should just be dropped.
+        socket_mock_instance.sendto.side_effect = OSError()
+        dispatcher.dispatch_event(test_event)
+        dispatcher.send_pending()
+        self.assertFalse(dispatcher.pending)
+
+    @patch("source.networking.client.Thread")
+    @patch("source.networking.client.socket.socket")
+    def test_event_dispatcher_send_failures(self, socket_mock: MagicMock, thread_mock: MagicMock):
+        """
+        Ensure that events that can't be encoded are dropped without holding up later events, and that the dispatcher
+        can still send events after its sending thread has stopped unexpectedly.
+        """
+        socket_mock_instance: MagicMock = socket_mock.return_value
+        test_event: Event = Event(EventType.REGISTER, 123)
+        # An identifier that can't be encoded as JSON, since JSON object keys must be strings.
+        unencodable_event: Event = Event(EventType.REGISTER, {(1, 2): 3})
+
+        dispatcher: EventDispatcher = EventDispatcher("127.0.0.1")
+        dispatcher.dispatch_event(unencodable_event)
+        dispatcher.dispatch_event(test_event)
+        dispatcher.send_pending()
+        # Only the event that could be encoded should have been sent.
+        socket_mock_instance.sendto.assert_called_once_with(b'{"type":"REGISTER","identifier":123}',
+                                                            ("127.0.0.1", SERVER_PORT))
+        self.assertFalse(dispatcher.sending)
+
+        # Simulate the sending thread stopping with an unexpected error.
+        socket_mock_instance.sendto.side_effect = RuntimeError()
+        dispatcher.dispatch_event(test_event)
+        with self.assertRaises(RuntimeError):
+            dispatcher.send_pending()
+        self.assertFalse(dispatcher.sending)
+        # The next event dispatched should start a new sending thread, rather than waiting forever.
+        thread_mock.reset_mock()
+        dispatcher.dispatch_event(test_event)
+        thread_mock.assert_called_once_with(target=dispatcher.send_pending, daemon=True)
+
+    @patch("source.networking.client.Thread")
+    @patch("source.networking.client.socket.socket")
+    def test_event_dispatcher_copies_events(self, socket_mock: MagicMock, _thread_mock: MagicMock):
+        """
+        Ensure that events are sent as they were when dispatched, even if the game objects they hold are modified
+        before the sending thread gets to them.
+        """
+        socket_mock_instance: MagicMock = socket_mock.return_value
+        resources: ResourceCollection = ResourceCollection(ore=10)
+        test_event: SetConstructionEvent = \
+            SetConstructionEvent(EventType.UPDATE, 123, UpdateAction.SET_CONSTRUCTION, "Game", Faction.NOCTURNE,
+                                 resources, "Setl", Construction(IMPROVEMENTS[0]))
+
+        dispatcher: EventDispatcher = EventDispatcher("127.0.0.1")
+        dispatcher.dispatch_event(test_event)
+        # Simulate the player's resources changing on the main thread before the event is sent.
+        resources.ore = 20
+        dispatcher.send_pending()
+        sent_event: Dict = json.loads(socket_mock_instance.sendto.call_args[0][0])
+        self.assertEqual(10, sent_event["player_resources"]["ore"])
+
+    @patch("time.monotonic")
+    @patch("source.networking.client.Thread")
+    @patch("source.networking.client.socket.socket")
+    def test_event_dispatcher_reregister(self, _socket_mock: MagicMock, _thread_mock: MagicMock,
+                                         monotonic_mock: MagicMock):
+        """
+        Ensure that dispatchers with a registration re-register with their game server before dispatching an event
+        after being idle for long enough to have possibly been evicted, with keepalives not counting as activity.
+        """
+        registration: RegisterEvent = RegisterEvent(EventType.REGISTER, 123, 9999)
+        keepalive: Event = Event(EventType.KEEPALIVE, 123)
+        query: Event = Event(EventType.QUERY, 123)
+        monotonic_mock.return_value = 0
+        dispatcher: EventDispatcher = EventDispatcher(registration=registration)
+
+        # Responding to keepalives shouldn't prevent the client from being considered idle.
+        monotonic_mock.return_value = CLIENT_IDLE_TIMEOUT
+        dispatcher.dispatch_event(keepalive)
+        dispatcher.dispatch_event(query)
+        # Once the client has been active again, it shouldn't re-register until it has been idle for long enough again.
+        dispatcher.dispatch_event(query)
+        self.assertListEqual([keepalive, registration, query, query], list(dispatcher.pending))
+
+        # Dispatchers without a registration never re-register.
+        monotonic_mock.return_value = 0
+        local_dispatcher: EventDispatcher = EventDispatcher("127.0.0.1")
+        monotonic_mock.return_value = CLIENT_IDLE_TIMEOUT
+        local_dispatcher.dispatch_event(query)
+        self.assertListEqual([query], list(local_dispatcher.pending))
+
+    @patch("source.networking.client.Thread")
+    @patch("source.networking.client.socket.socket")
+    def test_event_dispatcher_coalesce(self, _socket_mock: MagicMock, _thread_mock: MagicMock):
+        """
+        Ensure that consecutive events that supersede each other are combined before being sent.
+        """
+        def move(initial_loc: Location, new_loc: Location, new_stamina: int) -> MoveUnitEvent:
+            """
+            Build an event to move the test player's unit.
+            :param initial_loc: The unit's location before the move.
+            :param new_loc: The unit's location after the move.
+            :param new_stamina: The unit's stamina after the move.
+            :return: The event.
+            """
+            return MoveUnitEvent(EventType.UPDATE, 123, UpdateAction.MOVE_UNIT, "Game", Faction.NOCTURNE, initial_loc,
+                                 new_loc, new_stamina, False)
+
+        def construct(settlement_name: str, construction: Construction) -> SetConstructionEvent:
+            """
+            Build an event to set the construction in one of the test player's settlements.
+            :param settlement_name: The name of the settlement.
+            :param construction: The construction to set.
+            :return: The event.
+            """
+            return SetConstructionEvent(EventType.UPDATE, 123, UpdateAction.SET_CONSTRUCTION, "Game",
+                                        Faction.NOCTURNE, ResourceCollection(), settlement_name, construction)
+
+        dispatcher: EventDispatcher = EventDispatcher()
+        # Three successive moves of the same unit should become one, keeping the locations passed through.
+        dispatcher.dispatch_event(move((1, 1), (2, 2), 4))
+        dispatcher.dispatch_event(move((2, 2), (3, 3), 3))
+        dispatcher.dispatch_event(move((3, 3), (4, 4), 2))
+        self.assertListEqual([MoveUnitEvent(EventType.UPDATE, 123, UpdateAction.MOVE_UNIT, "Game", Faction.NOCTURNE,
+                                            (1, 1), (4, 4), 2, False, [(2, 2), (3, 3)])], list(dispatcher.pending))
+        # However, moving a different unit, or the same unit after another event, should not be combined.
+        dispatcher.dispatch_event(move((9, 9), (8, 8), 1))
+        dispatcher.dispatch_event(Event(EventType.KEEPALIVE, 123))
+        dispatcher.dispatch_event(move((8, 8), (7, 7), 0))
+        self.assertEqual(4, len(dispatcher.pending))
+        dispatcher.pending.clear()
+
+        # Only the last construction set for a settlement should be sent.
+        dispatcher.dispatch_event(construct("Setl", Construction(IMPROVEMENTS[0])))
+        dispatcher.dispatch_event(construct("Setl", Construction(IMPROVEMENTS[1])))
+        dispatcher.dispatch_event(construct("Other", Construction(IMPROVEMENTS[1])))
+        self.assertListEqual([construct("Setl", Construction(IMPROVEMENTS[1])),
+                              construct("Other", Construction(IMPROVEMENTS[1]))], list(dispatcher.pending))
+        dispatcher.pending.clear()
 
+        # Similarly, only the last blessing set should be sent.
+        first_blessing = SetBlessingEvent(EventType.UPDATE, 123, UpdateAction.SET_BLESSING, "Game", Faction.NOCTURNE,
+                                          OngoingBlessing(BLESSINGS["beg_spl"]))
+        second_blessing = SetBlessingEvent(EventType.UPDATE, 123, UpdateAction.SET_BLESSING, "Game", Faction.NOCTURNE,
+                                           OngoingBlessing(BLESSINGS["div_arc"]))
+        dispatcher.dispatch_event(first_blessing)
+        dispatcher.dispatch_event(second_blessing)
+        self.assertListEqual([second_blessing], list(dispatcher.pending))
+        # Events from other games should never be combined.
+        other_game_blessing = SetBlessingEvent(EventType.UPDATE, 123, UpdateAction.SET_BLESSING, "Other",
+                                               Faction.NOCTURNE, OngoingBlessing(BLESSINGS["div_arc"]))
+        dispatcher.dispatch_event(other_game_blessing)
+        self.assertListEqual([second_blessing, other_game_blessing], list(dispatcher.pending))
+
+    @patch("source.networking.client.Thread")
     @patch("source.networking.client.socket.socket")
-    def test_dispatch_event(self, socket_mock: MagicMock):
+    def test_dispatch_event(self, socket_mock: MagicMock, _: MagicMock):
         """
         Ensure that events are serialised and dispatched correctly, based on the given dispatchers and multiplayer
         status.
@@ -85,6 +323,7 @@ class ClientTest(unittest.TestCase):
 
         # For the first part of this test, we dispatch an event in a global multiplayer game.
         dispatch_event(test_event, test_dispatchers, MultiplayerStatus.GLOBAL)
+        test_dispatchers[DispatcherKind.GLOBAL].send_pending()
         # The serialised event should have been sent to the global game server.
         socket_mock_instance.sendto.assert_called_with(b'{"type":"REGISTER","identifier":123}',
                                                        (GLOBAL_SERVER_HOST, SERVER_PORT))
@@ -93,6 +332,7 @@ class ClientTest(unittest.TestCase):
 
         # For the second part of this test, we dispatch an event in a local multiplayer game.
         dispatch_event(test_event, test_dispatchers, MultiplayerStatus.LOCAL)
+        test_dispatchers[DispatcherKind.LOCAL].send_pending()
         # The serialised event should have been sent to the local game server with the custom host.
         socket_mock_instance.sendto.assert_called_with(b'{"type":"REGISTER","identifier":123}',
                                                        (test_local_host, SERVER_PORT))
@@ -103,7 +343,8 @@ class ClientTest(unittest.TestCase):
         # For what it's worth, this should never happen.
         dispatch_event(test_event, test_dispatchers, MultiplayerStatus.DISABLED)
         # Naturally, no event should have been dispatched.
-        socket_mock_instance.sendto.assert_not_called()
+        self.assertFalse(test_dispatchers[DispatcherKind.GLOBAL].pending)
+        self.assertFalse(test_dispatchers[DispatcherKind.LOCAL].pending)
 
     @patch("uuid.getnode")
     @patch("os.getpid")
@@ -136,6 +377,7 @@ class ClientTest(unittest.TestCase):
 
         # We expect the correct UPnP setup to have occurred, discovering and selecting from the available UPnP devices
         # on the network.
+        self.assertEqual(UPNP_DISCOVER_DELAY, upnp_mock_instance.discoverdelay)
         upnp_mock_instance.discover.assert_called()
         upnp_mock_instance.selectigd.assert_called()
         # Because our mocked-out UPnP port mapping was from 1970, and because it was for the local machine, we expect it
@@ -145,24 +387,249 @@ class ClientTest(unittest.TestCase):
         upnp_mock_instance.addportmapping.assert_called_with(test_port, "UDP", test_private_ip,
                                                              test_port, f"Microcosm {datetime.date.today()}", "")
 
-    @patch("source.networking.client.get_identifier")
+    @patch("time.monotonic")
+    def test_initialise_upnp_timeout(self, monotonic_mock: MagicMock):
+        """
+        Ensure that old port mappings stop being removed once the time is up, with the new mapping still being added.
+        """
+        test_port: int = 9999
+        test_private_ip: str = "127.0.0.1"
+        old_mappings: List[Tuple] = [(port, "UDP", (test_private_ip, port), "Microcosm 1970-01-01", "1", "", 0)
+                                     for port in range(1, 4)]
+        stub_upnp: StubUPnP = StubUPnP(port_mappings=old_mappings)
+        # The first port mapping is examined before the time is up, but the second is not.
+        monotonic_mock.side_effect = [0, 0, UPNP_MAPPING_TIMEOUT]
+
+        initialise_upnp(test_private_ip, test_port, stub_upnp, UPNP_UNAVAILABLE_DISCOVER_DELAY)
+
+        self.assertEqual(UPNP_UNAVAILABLE_DISCOVER_DELAY, stub_upnp.discoverdelay)
+        self.assertListEqual([1], stub_upnp.deleted_ports)
+        self.assertListEqual([(test_port, "UDP", test_private_ip, test_port, f"Microcosm {datetime.date.today()}", "")],
+                             stub_upnp.added_mappings)
+
+    @patch("source.networking.client.socket.socket")
+    def test_get_private_ip(self, socket_mock: MagicMock):
+        """
+        Ensure that the client's private IP is correctly determined, falling back to the supplied IP if there is no
+        route to the internet.
+        """
+        test_private_ip: str = "192.168.0.2"
+        test_fallback_ip: str = "192.168.0.3"
+        entered_socket_mock: MagicMock = socket_mock.return_value.__enter__.return_value
+        entered_socket_mock.getsockname.return_value = (test_private_ip, 12345)
+
+        self.assertEqual(test_private_ip, get_private_ip(test_fallback_ip))
+        # Determining the private IP shouldn't be able to hang the bootstrap.
+        entered_socket_mock.settimeout.assert_called_with(PRIVATE_IP_TIMEOUT)
+        entered_socket_mock.connect.assert_called_with(("8.8.8.8", 80))
+
+        entered_socket_mock.connect.side_effect = OSError()
+        self.assertEqual(test_fallback_ip, get_private_ip(test_fallback_ip))
+        self.assertIsNone(get_private_ip())
+
+    @patch("source.networking.client.get_identifier", return_value=123)
     @patch("source.networking.client.EventDispatcher")
-    def test_broadcast_to_local_network_hosts(self, dispatcher_mock: MagicMock, identifier_mock: MagicMock):
+    @patch("source.networking.client.probe_local_servers")
+    @patch("source.networking.client.get_private_ip")
+    def test_network_bootstrap_with_igd(self,
+                                        private_ip_mock: MagicMock,
+                                        probe_mock: MagicMock,
+                                        dispatcher_mock: MagicMock,
+                                        _: MagicMock):
+        """
+        Ensure that the network bootstrap probes for local game servers before initialising UPnP, and then registers
+        with the global game server, caching its results.
+        """
+        test_port: int = 12345
+        test_private_ip: str = "192.168.0.2"
+        private_ip_mock.return_value = test_private_ip
+        stub_upnp: StubUPnP = StubUPnP()
+        # Record whether UPnP discovery had occurred when local game servers were probed for.
+        discovered_before_probe: List[bool] = []
+        probe_mock.side_effect = lambda *args: discovered_before_probe.append(stub_upnp.discovered)
+
+        with TemporaryDirectory() as cache_dir:
+            cache_path: str = os.path.join(cache_dir, "network.json")
+            bootstrap: NetworkBootstrap = NetworkBootstrap(test_port, cache_path, lambda: stub_upnp)
+            self.assertEqual(dispatcher_mock.return_value, bootstrap.run())
+            self.assertDictEqual({"private_ip": test_private_ip, "igd_found": True}, bootstrap.load_cache())
+
+        # With nothing cached, there is no IP to fall back on.
+        private_ip_mock.assert_called_with(None)
+        probe_mock.assert_called_with(test_port)
+        self.assertListEqual([False], discovered_before_probe)
+        self.assertEqual(UPNP_DISCOVER_DELAY, stub_upnp.discoverdelay)
+        self.assertEqual(1, len(stub_upnp.added_mappings))
+        # The client should also have registered with the global game server, re-registering if it may be evicted.
+        dispatcher_mock.assert_called_with(registration=RegisterEvent(EventType.REGISTER, 123, test_port))
+        dispatcher_mock.return_value.send.assert_called_with(dispatcher_mock.return_value.registration)
+
+    @patch("source.networking.client.EventDispatcher")
+    @patch("source.networking.client.probe_local_servers")
+    @patch("source.networking.client.get_private_ip")
+    def test_network_bootstrap_without_igd(self,
+                                           private_ip_mock: MagicMock,
+                                           probe_mock: MagicMock,
+                                           dispatcher_mock: MagicMock):
+        """
+        Ensure that the network bootstrap still probes for local game servers when there is no IGD on the client's
+        network, and uses its cached results the next time it is run.
+        """
+        test_port: int = 12345
+        test_private_ip: str = "192.168.0.2"
+        private_ip_mock.return_value = test_private_ip
+
+        with TemporaryDirectory() as cache_dir:
+            cache_path: str = os.path.join(cache_dir, "network.json")
+            self.assertIsNone(NetworkBootstrap(test_port, cache_path, lambda: StubUPnP(igd_available=False)).run())
+            probe_mock.assert_called_with(test_port)
+            dispatcher_mock.assert_not_called()
+
+            # Running the bootstrap again should make use of the cached private IP and not wait as long for discovery,
+            # since no IGD was found last time.
+            stub_upnp: StubUPnP = StubUPnP(igd_available=False)
+            self.assertIsNone(NetworkBootstrap(test_port, cache_path, lambda: stub_upnp).run())
+            private_ip_mock.assert_called_with(test_private_ip)
+            self.assertEqual(UPNP_UNAVAILABLE_DISCOVER_DELAY, stub_upnp.discoverdelay)
+
+    @patch("source.networking.client.probe_local_servers")
+    @patch("source.networking.client.get_private_ip", return_value=None)
+    def test_network_bootstrap_without_private_ip(self, _: MagicMock, probe_mock: MagicMock):
+        """
+        Ensure that the network bootstrap stops early if the client's private IP cannot be determined, having still
+        probed for local game servers.
+        """
+        upnp_factory_mock: MagicMock = MagicMock()
+
+        self.assertIsNone(NetworkBootstrap(12345, "/nonexistent/network.json", upnp_factory_mock).run())
+        probe_mock.assert_called_with(12345)
+        upnp_factory_mock.assert_not_called()
+
+    def test_network_bootstrap_cache(self):
         """
-        Ensure that any hosts on the local network are pinged to see if they are hosting a local game server.
+        Ensure that invalid or unavailable network caches are ignored.
+        """
+        with TemporaryDirectory() as cache_dir:
+            cache_path: str = os.path.join(cache_dir, "network.json")
+            bootstrap: NetworkBootstrap = NetworkBootstrap(12345, cache_path)
+            # There's no cache to begin with.
+            self.assertDictEqual({}, bootstrap.load_cache())
+            with open(cache_path, "w", encoding="utf-8") as cache_file:
+                cache_file.write("{invalid")
+            self.assertDictEqual({}, bootstrap.load_cache())
+            with open(cache_path, "w", encoding="utf-8") as cache_file:
+                json.dump(["192.168.0.2"], cache_file)
+            self.assertDictEqual({}, bootstrap.load_cache())
+
+        # Failing to write the cache shouldn't raise an error either, since the cache directory no longer exists.
+        bootstrap.save_cache("192.168.0.2", True)
+        self.assertDictEqual({}, bootstrap.load_cache())
+
+    @patch("source.networking.client.get_identifier", return_value=1234)
+    @patch("socket.socket")
+    def test_probe_local_servers(self, socket_mock: MagicMock, _: MagicMock):
+        """
+        Ensure that local game servers are probed for with a single broadcast register event, and that failing to send
+        the probe is ignored.
         """
-        test_identifier: int = 1234
         test_port: int = 11111
-        identifier_mock.return_value = test_identifier
+        entered_socket_mock: MagicMock = socket_mock.return_value.__enter__.return_value
+
+        probe_local_servers(test_port)
+
+        entered_socket_mock.setsockopt.assert_called_with(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        expected_probe: bytes = json.dumps(RegisterEvent(EventType.REGISTER, 1234, test_port), separators=(",", ":"),
+                                           cls=SaveEncoder).encode()
+        entered_socket_mock.sendto.assert_called_once_with(expected_probe,
+                                                           (LOCAL_SERVER_PROBE_ADDRESS, SERVER_PORT))
+
+        # Networks without broadcast support shouldn't cause an error.
+        entered_socket_mock.sendto.side_effect = OSError()
+        probe_local_servers(test_port)
+
+    def test_probe_local_servers_loopback(self):
+        """
+        Ensure that a real local game server responds to a probe by registering the client and alerting it in return.
+        """
+        # Start a real game server, listening on an ephemeral port.
+        server: UDPServer = UDPServer(("127.0.0.1", 0), RequestHandler)
+        server.game_states_ref = {}
+        server.namers_ref = {}
+        server.move_makers_ref = {}
+        server.is_server = True
+        server.client_registry_ref = ClientRegistry()
+        server.clients_ref = server.client_registry_ref.clients
+        server.lobbies_ref = {}
+        server.lobby_tracker_ref = LobbyTracker()
+        server_thread: Thread = Thread(target=server.serve_forever, daemon=True)
+        server_thread.start()
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as receiver:
+            receiver.bind(("127.0.0.1", 0))
+            receiver.settimeout(5)
+            receiver_port: int = receiver.getsockname()[1]
+
+            probe_local_servers(receiver_port, "127.0.0.1", server.server_address[1])
+
+            response: Dict = json.loads(receiver.recv(1024))
+        server.shutdown()
+        server.server_close()
+        self.assertEqual(EventType.REGISTER, response["type"])
+        self.assertEqual(receiver_port, server.clients_ref[get_identifier()][1])
+
+    @patch("time.monotonic")
+    def test_local_server_discovery(self, monotonic_mock: MagicMock):
+        """
+        Ensure that local game servers are only known until they have not responded within the TTL.
+        """
+        discovery: LocalServerDiscovery = LocalServerDiscovery(11111, MagicMock())
+        monotonic_mock.return_value = 100
+        discovery.record_server("192.168.0.2")
+        monotonic_mock.return_value = 150
+        discovery.record_server("192.168.0.3")
+        self.assertListEqual(["192.168.0.2", "192.168.0.3"], discovery.get_servers())
+        self.assertListEqual([], discovery.get_expired_servers())
+
+        # Once the TTL has passed for the first server, only the second should remain, with the first being remembered
+        # as expired until it is forgotten.
+        monotonic_mock.return_value = 100 + LOCAL_SERVER_TTL + 1
+        self.assertListEqual(["192.168.0.3"], discovery.get_servers())
+        self.assertListEqual(["192.168.0.2"], discovery.get_expired_servers())
+        self.assertListEqual(["192.168.0.2"], discovery.get_expired_servers())
+        # Servers that haven't expired, or that aren't known, can't be forgotten.
+        self.assertFalse(discovery.forget_server("192.168.0.3"))
+        self.assertFalse(discovery.forget_server("192.168.0.4"))
+        self.assertTrue(discovery.forget_server("192.168.0.2"))
+        self.assertDictEqual({"192.168.0.3": 150}, discovery.servers)
+        self.assertListEqual([], discovery.get_expired_servers())
+
+    @patch("source.networking.client.probe_local_servers")
+    @patch("sched.scheduler")
+    def test_local_server_discovery_reprobe(self, scheduler_mock: MagicMock, probe_mock: MagicMock):
+        """
+        Ensure that local game servers are periodically re-probed for, with any expired servers being reported as lost
+        on each re-probe until they are forgotten.
+        """
+        on_lost_mock: MagicMock = MagicMock()
+        discovery: LocalServerDiscovery = LocalServerDiscovery(11111, on_lost_mock, "127.0.0.1", 22222)
+        discovery.servers["192.168.0.2"] = 0
+
+        discovery.run()
+        scheduler_mock.return_value.enter.assert_called_with(LOCAL_SERVER_PROBE_INTERVAL, 1, discovery.reprobe,
+                                                             (scheduler_mock.return_value,))
+        scheduler_mock.return_value.run.assert_called_once()
 
-        broadcast_to_local_network_hosts("127.0.0.1", test_port)
+        with patch("time.monotonic", return_value=LOCAL_SERVER_TTL + 1):
+            discovery.reprobe(scheduler_mock.return_value)
+        self.assertEqual(2, scheduler_mock.return_value.enter.call_count)
+        probe_mock.assert_called_with(11111, "127.0.0.1", 22222)
+        on_lost_mock.assert_called_once_with("192.168.0.2")
 
-        # We expect each theoretical host to have been pinged with a register event containing the correct identifier
-        # and port.
-        for octet in range(1, 255):
-            self.assertTrue(call(f"127.0.0.{octet}") in dispatcher_mock.mock_calls)
-            self.assertTrue(call().dispatch_event(RegisterEvent(EventType.REGISTER, test_identifier, test_port))
-                            in dispatcher_mock.mock_calls)
+        with patch("time.monotonic", return_value=LOCAL_SERVER_TTL + 1):
+            discovery.reprobe(scheduler_mock.return_value)
+            self.assertEqual(2, on_lost_mock.call_count)
+            discovery.forget_server("192.168.0.2")
+            discovery.reprobe(scheduler_mock.return_value)
+        self.assertEqual(2, on_lost_mock.call_count)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,128 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from source.networking.client_registry import ClientRegistry, KEEPALIVE_BUCKETS, KEEPALIVE_MAX_UNANSWERED, \
+    CLIENT_IDLE_TIMEOUT
+
+
+class ClientRegistryTest(unittest.TestCase):
+    """
+    The test class for client_registry.py.
+    """
+    TEST_ADDRESS = ("127.0.0.1", 9876)
+
+    def setUp(self) -> None:
+        """
+        Instantiate an empty ClientRegistry with room for three clients before each test.
+        """
+        self.registry = ClientRegistry(capacity=3)
+
+    def test_register(self):
+        """
+        Ensure that clients are registered in the bucket for their identifier, with re-registering clients having their
+        address updated and keepalive counter reset.
+        """
+        self.registry.register(1, self.TEST_ADDRESS)
+        self.registry.register(1 + KEEPALIVE_BUCKETS, self.TEST_ADDRESS)
+        self.registry.keepalive_ctrs[1] = 3
+        self.registry.register(1, ("127.0.0.2", 1234))
+
+        self.assertDictEqual({1 + KEEPALIVE_BUCKETS: self.TEST_ADDRESS, 1: ("127.0.0.2", 1234)}, self.registry.clients)
+        self.assertSetEqual({1, 1 + KEEPALIVE_BUCKETS}, self.registry.buckets[1])
+        self.assertDictEqual({1: 0, 1 + KEEPALIVE_BUCKETS: 0}, self.registry.keepalive_ctrs)
+
+    def test_register_full(self):
+        """
+        Ensure that registering a client when the registry is full evicts the least recently active client that is not
+        in any lobby.
+        """
+        for identifier in range(3):
+            self.registry.register(identifier, self.TEST_ADDRESS)
+        self.registry.join_lobby(0, "Lobby")
+        # Client 1 is now the least recently active client, but client 0 is in a lobby.
+        self.registry.mark_active(2)
+        self.registry.register(3, self.TEST_ADDRESS)
+
+        self.assertListEqual([0, 2, 3], list(self.registry.clients))
+        self.assertNotIn(1, self.registry.last_active)
+        self.assertNotIn(1, self.registry.keepalive_ctrs)
+        self.assertNotIn(1, self.registry.buckets[1])
+
+    def test_register_full_all_in_lobbies(self):
+        """
+        Ensure that registering a client when the registry is full of clients in lobbies never evicts the client being
+        registered, and that it is evicted in favour of the next client instead.
+        """
+        for identifier in range(3):
+            self.registry.register(identifier, self.TEST_ADDRESS)
+            self.registry.join_lobby(identifier, "Lobby")
+        self.registry.register(3, self.TEST_ADDRESS)
+        self.assertListEqual([0, 1, 2, 3], list(self.registry.clients))
+        self.assertEqual(self.TEST_ADDRESS, self.registry.clients[3])
+
+        self.registry.register(4, self.TEST_ADDRESS)
+        self.assertListEqual([0, 1, 2, 4], list(self.registry.clients))
+        self.assertNotIn(3, self.registry.keepalive_ctrs)
+
+    def test_mark_active_and_acknowledge(self):
+        """
+        Ensure that activity and keepalive responses are only recorded for registered clients.
+        """
+        self.registry.register(1, self.TEST_ADDRESS)
+        self.registry.keepalive_ctrs[1] = 3
+        self.registry.acknowledge(1)
+        self.registry.acknowledge(2)
+        self.registry.mark_active(2)
+
+        self.assertDictEqual({1: 0}, self.registry.keepalive_ctrs)
+        self.assertListEqual([1], list(self.registry.last_active))
+
+    def test_lobbies(self):
+        """
+        Ensure that the lobbies each client is in are tracked, with clients not in any lobby having no entry.
+        """
+        self.registry.join_lobby(1, "Lobby")
+        self.registry.join_lobby(1, "Other")
+        self.registry.leave_lobby(1, "Lobby")
+        self.assertDictEqual({1: {"Other"}}, self.registry.lobbies)
+        self.registry.leave_lobby(1, "Other")
+        # Leaving a lobby that the client isn't in shouldn't do anything.
+        self.registry.leave_lobby(2, "Other")
+        self.assertDictEqual({}, self.registry.lobbies)
+
+    @patch("time.monotonic")
+    def test_advance(self, monotonic_mock: MagicMock):
+        """
+        Ensure that each advance only sends keepalives to the clients in the next bucket, removing those that are
+        unresponsive or idle.
+        """
+        monotonic_mock.return_value = 0
+        self.registry.register(0, self.TEST_ADDRESS)
+        self.registry.register(1, ("127.0.0.2", 1234))
+        self.registry.register(1 + KEEPALIVE_BUCKETS, ("127.0.0.3", 1234))
+        self.registry.join_lobby(1, "Lobby")
+
+        # Only the first bucket's client should be sent a keepalive.
+        self.assertTupleEqual(([self.TEST_ADDRESS], {}), self.registry.advance())
+        self.assertEqual(1, self.registry.next_bucket)
+
+        # Once the idle timeout has passed, the idle client in the next bucket should be removed, while the client in
+        # the lobby is kept. Once the client in the lobby has left too many keepalives unanswered, it should be removed
+        # along with its lobbies.
+        monotonic_mock.return_value = CLIENT_IDLE_TIMEOUT + 1
+        self.registry.keepalive_ctrs[1] = KEEPALIVE_MAX_UNANSWERED - 2
+        self.assertTupleEqual(([("127.0.0.2", 1234)], {}), self.registry.advance())
+        self.assertListEqual([0, 1], list(self.registry.clients))
+        self.registry.next_bucket = 1
+        self.assertTupleEqual(([], {1: {"Lobby"}}), self.registry.advance())
+        self.assertListEqual([0], list(self.registry.clients))
+        self.assertDictEqual({}, self.registry.lobbies)
+
+        # The buckets should wrap around.
+        self.registry.next_bucket = KEEPALIVE_BUCKETS - 1
+        self.registry.advance()
+        self.assertEqual(0, self.registry.next_bucket)
+
+
+if __name__ == '__main__':
+    unittest.main()
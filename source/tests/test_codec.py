@@ -0,0 +1,180 @@
+import unittest
+from typing import Dict, List, Set
+
+from source.foundation.catalogue import BLESSINGS, IMPROVEMENTS, PROJECTS, FACTION_COLOURS, get_unit_plan
+from source.foundation.models import ResourceCollection, Quad, Biome, UnitPlan, Unit, DeployerUnit, Settlement, \
+    HarvestStatus, EconomicStatus, Construction, Player, Faction, VictoryType, OngoingBlessing, AIPlaystyle, \
+    AttackPlaystyle, ExpansionPlaystyle, Heathen, Location
+from source.util import codec
+from source.util.codec import encode_quads, decode_quads, encode_player, decode_player, encode_quads_seen, \
+    decode_quads_seen, encode_heathens, decode_heathens
+from source.util.minifier import minify_quad, inflate_quad, minify_player, inflate_player, minify_quads_seen, \
+    inflate_quads_seen, minify_heathens, inflate_heathens
+
+
+class CodecTest(unittest.TestCase):
+    """
+    The test class for codec.py.
+    """
+
+    TEST_RESOURCE_COLLECTION: ResourceCollection = \
+        ResourceCollection(ore=1, timber=2, magma=3, aurora=4, bloodstone=5, obsidian=6, sunstone=7, aquamarine=8)
+    TEST_HEATHENS: List[Heathen] = [Heathen(50.0, 60, (70, 80), UnitPlan(10.0, 20.0, 30, "Forty", None, 0.0), True),
+                                    Heathen(1.5, 2, (3, 4), UnitPlan(5.5, 6.5, 7, "Eight", None, 0.0), False)]
+
+    def setUp(self):
+        """
+        Set up a small board, along with a player that has settlements, units, and blessings, each of which uses every
+        optional part of its encoding.
+        """
+        self.quads: List[List[Quad]] = [[Quad(Biome.FOREST, 1, 2, 3, 4, (x, y)) for x in range(100)] for y in range(2)]
+        self.quads[1][5] = Quad(Biome.MOUNTAIN, 0, 1, 2, 3, (5, 1), resource=ResourceCollection(sunstone=1),
+                                is_relic=True)
+        faction: Faction = Faction.AGRICULTURISTS
+        warrior: UnitPlan = get_unit_plan("Warrior", faction)
+        # Adjust the plan's attributes, as if it had been scaled by a settlement's resources.
+        warrior.power = 123.5
+        warrior.cost = 45.5
+        unit: Unit = Unit(10.5, 2, (30, 40), False, warrior, has_acted=True, besieging=True)
+        deployer: DeployerUnit = DeployerUnit(50.0, 6, (7, 8), False, get_unit_plan("Trojan Horse", faction),
+                                              passengers=[Unit(1.0, 2, (7, 8), False, warrior)])
+        settlements: List[Settlement] = [
+            Settlement("Setl", (5, 1), [IMPROVEMENTS[0], IMPROVEMENTS[-1]], [self.quads[1][5], self.quads[0][5]],
+                       self.TEST_RESOURCE_COLLECTION, [Unit(3.0, 4, (5, 1), True, warrior)], 150.0, 200.0, 60.0,
+                       Construction(IMPROVEMENTS[3], 1.1), 10, 1.5, HarvestStatus.PLENTIFUL, EconomicStatus.BOOM,
+                       False, True),
+            Settlement("Proj", (0, 0), [], [self.quads[0][0]], ResourceCollection(), [], 100.0, 100.0, 50.0,
+                       Construction(PROJECTS[1], 2.2)),
+            Settlement("Plan", (1, 0), [], [self.quads[0][1]], self.TEST_RESOURCE_COLLECTION, [], 100.0, 100.0, 50.0,
+                       Construction(get_unit_plan("Warrior", faction, self.TEST_RESOURCE_COLLECTION), 3.3)),
+            Settlement("Idle", (2, 0), [], [self.quads[0][2]], ResourceCollection(), [], 100.0, 100.0, 50.0, None)
+        ]
+        self.player: Player = Player("Ace", faction, 3, 1.5, settlements, [unit, deployer],
+                                     [BLESSINGS["beg_spl"], BLESSINGS["div_arc"]], self.TEST_RESOURCE_COLLECTION,
+                                     set(), {VictoryType.ELIMINATION, VictoryType.AFFLUENCE},
+                                     OngoingBlessing(BLESSINGS["inh_luc"], 3.4),
+                                     AIPlaystyle(AttackPlaystyle.AGGRESSIVE, ExpansionPlaystyle.HERMIT), 4, 8.9, False)
+
+    def test_quads(self):
+        """
+        Ensure that quads are decoded to the same quads that the minifier inflates, with their locations determined by
+        their position on the board.
+        """
+        board_quads: List[Quad] = self.quads[0] + self.quads[1]
+        decoded: List[Quad] = decode_quads(encode_quads(board_quads))
+        self.assertListEqual(board_quads, decoded)
+        self.assertListEqual([inflate_quad(minify_quad(quad), quad.location) for quad in board_quads], decoded)
+        # Decoding a single row should give each quad the location for that row.
+        self.assertListEqual(self.quads[1], decode_quads(encode_quads(self.quads[1]), first_idx=100))
+
+    def test_player(self):
+        """
+        Ensure that players are decoded to the same players that the minifier inflates, including each of their
+        settlements' constructions, deployer units and passengers, blessings, victories, and AI playstyle.
+        """
+        decoded: Player = decode_player(encode_player(self.player), self.quads)
+        self.assertEqual(inflate_player(minify_player(self.player), self.quads), decoded)
+        self.assertEqual(self.player.units[0], decoded.units[0])
+        self.assertIsInstance(decoded.units[1], DeployerUnit)
+        self.assertTrue(decoded.settlements[0].garrison[0].garrisoned)
+        # Settlement quads should refer to the board's quads rather than copies.
+        self.assertIs(self.quads[1][5], decoded.settlements[0].quads[0])
+
+    def test_player_minimal(self):
+        """
+        Ensure that players without settlements, units, blessings, or any optional details are also decoded correctly.
+        """
+        player: Player = Player("Bob", Faction.GODLESS, FACTION_COLOURS[Faction.GODLESS], 0.0, [], [], [],
+                                ResourceCollection(), set())
+        decoded: Player = decode_player(encode_player(player), self.quads)
+        self.assertEqual(player, decoded)
+        self.assertEqual(inflate_player(minify_player(player), self.quads), decoded)
+
+    def test_decoded_player_is_independent(self):
+        """
+        Ensure that the blessings and unit plans decoded for one player are not shared with another, since they may be
+        modified independently.
+        """
+        first: Player = decode_player(encode_player(self.player), self.quads)
+        second: Player = decode_player(encode_player(self.player), self.quads)
+        self.assertIsNot(first.blessings[0], second.blessings[0])
+        self.assertIsNot(first.units[0].plan, second.units[0].plan)
+        first.units[0].plan.power = 1.0
+        self.assertEqual(123.5, second.units[0].plan.power)
+
+    def test_quads_seen(self):
+        """
+        Ensure that seen quads are decoded to the same locations that the minifier inflates, excluding any with negative
+        coordinates.
+        """
+        quads_seen: Set[Location] = {(1, 2), (3, 4), (99, 89), (-1, 7), (8, -1)}
+        decoded: Set[Location] = decode_quads_seen(encode_quads_seen(quads_seen))
+        self.assertSetEqual({(1, 2), (3, 4), (99, 89)}, decoded)
+        self.assertSetEqual(inflate_quads_seen(minify_quads_seen(quads_seen)), decoded)
+
+    def test_heathens(self):
+        """
+        Ensure that heathens are decoded to the same heathens that the minifier inflates.
+        """
+        decoded: List[Heathen] = decode_heathens(encode_heathens(self.TEST_HEATHENS))
+        self.assertListEqual(self.TEST_HEATHENS, decoded)
+        self.assertListEqual(inflate_heathens(minify_heathens(self.TEST_HEATHENS)), decoded)
+        self.assertListEqual([], decode_heathens(encode_heathens([])))
+
+    def test_ids_are_stable(self):
+        """
+        Ensure that the IDs for each catalogue entry and enum member are the ones recorded in existing saves. Since the
+        IDs are indices, entries may only be appended; if this test fails, an entry has been reordered or removed, and
+        saves would be decoded incorrectly.
+        """
+        pinned_ids: Dict[str, List[str]] = {
+            "BIOMES": ["DESERT", "FOREST", "SEA", "MOUNTAIN"],
+            "FACTIONS": ["AGRICULTURISTS", "CAPITALISTS", "SCRUTINEERS", "GODLESS", "RAVENOUS", "FUNDAMENTALISTS",
+                         "ORTHODOX", "CONCENTRATED", "FRONTIERSMEN", "IMPERIALS", "PERSISTENT", "EXPLORERS", "INFIDELS",
+                         "NOCTURNE"],
+            "HARVEST_STATUSES": ["POOR", "STANDARD", "PLENTIFUL"],
+            "ECONOMIC_STATUSES": ["RECESSION", "STANDARD", "BOOM"],
+            "VICTORY_TYPES": ["ELIMINATION", "JUBILATION", "GLUTTONY", "AFFLUENCE", "VIGOUR", "SERENDIPITY"],
+            "ATTACK_PLAYSTYLES": ["AGGRESSIVE", "DEFENSIVE", "NEUTRAL"],
+            "EXPANSION_PLAYSTYLES": ["EXPANSIONIST", "NEUTRAL", "HERMIT"],
+            "IMPROVEMENT_IDS": ["Melting Pot", "Haunted Forest", "Occult Bartering", "Ancient Shrine",
+                                "Dimensional imagery", "Fortune Distillery", "Local Forge", "Weapons Factory",
+                                "Enslaved Workforce", "Automated Production", "Lab-grown Workers", "Endless Mine",
+                                "City Market", "State Bank", "Harvest Levy", "National Mint", "Federal Museum",
+                                "Planned Economy", "Collectivised Farms", "Supermarket Chains", "Distributed Rations",
+                                "Sunken Greenhouses", "Impenetrable Stores", "Genetic Clinics", "Insurmountable Walls",
+                                "Intelligence Academy", "Minefields", "CCTV Cameras", "Cult of Personality",
+                                "Omniscient Police", "Aqueduct", "Soup Kitchen", "Puppet Shows", "Common Chief Yield",
+                                "Infinite Disport", "Free Expression", "Holy Sanctum"],
+            "PROJECT_IDS": ["Call of the Fields", "Inflation by Design", "The Holy Epiphany"],
+            "BLESSING_IDS": ["Beginner Spells", "Divine Architecture", "Inherent Luck", "Rudimentary Explosives",
+                             "Robotic Experiments", "Resource Replenishment", "Advanced Trading",
+                             "Self-locking Vaults", "Economic Movements", "Profitable Necessities",
+                             "Hollow Photosynthesis", "Metabolic Alterations", "Torture Techniques",
+                             "Aperture Refinement", "Psychic Supervision", "The Greater Good", "Reformist Principles",
+                             "Broad Fanaticism", "Ancient History", "Piece of Strength", "Piece of Passion",
+                             "Piece of Divinity"],
+            "UNIT_PLAN_IDS": ["Warrior", "Bowman", "Shielder", "Settler", "Mage", "Locksmith", "Shaman", "Grenadier",
+                              "Flagellant", "Trojan Horse", "Sniper", "MediBot", "Drone", "Narcotician", "Golden Van",
+                              "Herculeum", "Haruspex", "Fanatic"]
+        }
+        for table_name, pinned_names in pinned_ids.items():
+            table = getattr(codec, table_name)
+            # Enum tables are lists of members, and catalogue tables map each entry's name to its ID.
+            names: List[str] = [member.name for member in table] if isinstance(table, list) else \
+                sorted(table, key=table.get)
+            self.assertListEqual(pinned_names, names[:len(pinned_names)], table_name)
+
+    def test_legacy_round_trip(self):
+        """
+        Ensure that objects inflated from the minifier's strings can be encoded and decoded without any changes, so that
+        existing data can be converted to the new format.
+        """
+        inflated: Player = inflate_player(minify_player(self.player), self.quads)
+        self.assertEqual(inflated, decode_player(encode_player(inflated), self.quads))
+        inflated_heathens: List[Heathen] = inflate_heathens(minify_heathens(self.TEST_HEATHENS))
+        self.assertListEqual(inflated_heathens, decode_heathens(encode_heathens(inflated_heathens)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,24 @@
+import unittest
+
+import pyxel
+
+from source.foundation import colours
+
+
+class ColoursTest(unittest.TestCase):
+    """
+    The test class for colours.py.
+    """
+
+    def test_colours_match_pyxel(self):
+        """
+        Ensure that every colour matches its index in pyxel's palette.
+        """
+        colour_names = [name for name in vars(colours) if name.startswith("COLOR_")]
+        self.assertEqual(16, len(colour_names))
+        for name in colour_names:
+            self.assertEqual(getattr(pyxel, name), getattr(colours, name), name)
+
+
+if __name__ == '__main__':
+    unittest.main()
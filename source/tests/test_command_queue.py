@@ -0,0 +1,58 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from source.game_management.command_queue import CommandQueue
+
+
+class CommandQueueTest(unittest.TestCase):
+    """
+    The test class for command_queue.py.
+    """
+
+    def setUp(self) -> None:
+        """
+        Instantiate an empty CommandQueue before each test.
+        """
+        self.command_queue = CommandQueue()
+
+    def test_drain(self):
+        """
+        Ensure that draining the queue applies every enqueued command in order, when within budget.
+        """
+        applied = []
+        self.command_queue.enqueue(lambda: applied.append(1))
+        self.command_queue.enqueue(lambda: applied.append(2))
+        self.command_queue.drain()
+        self.assertListEqual([1, 2], applied)
+        self.assertFalse(self.command_queue.commands)
+        # Draining an empty queue should do nothing.
+        self.command_queue.drain()
+        self.assertListEqual([1, 2], applied)
+
+    @patch("time.perf_counter")
+    def test_drain_budget(self, perf_counter_mock: MagicMock):
+        """
+        Ensure that draining the queue stops once the budget has been used, leaving the remaining commands for the next
+        drain, but always applies at least one command.
+        :param perf_counter_mock: The mock implementation of time.perf_counter().
+        """
+        first_command = MagicMock()
+        second_command = MagicMock()
+        third_command = MagicMock()
+        self.command_queue.enqueue(first_command)
+        self.command_queue.enqueue(second_command)
+        self.command_queue.enqueue(third_command)
+        # Each command takes longer than the budget.
+        perf_counter_mock.side_effect = [0, 1, 2, 3]
+
+        self.command_queue.drain(budget=0.5)
+        first_command.assert_called_once()
+        second_command.assert_not_called()
+        self.command_queue.drain(budget=0.5)
+        second_command.assert_called_once()
+        third_command.assert_not_called()
+        self.assertEqual(1, len(self.command_queue.commands))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,28 @@
+import unittest
+
+from source.display.display_utils import layout_paragraph
+
+
+class DisplayUtilsTest(unittest.TestCase):
+    """
+    The test class for display_utils.py.
+    """
+
+    def test_layout_paragraph(self):
+        """
+        Ensure that text is split into lines between words, and that layouts are memoised.
+        """
+        text = """The quick brown fox
+                  jumps over the lazy dog."""
+        layout = layout_paragraph(text, 10)
+        self.assertTupleEqual(("The quick ", "brown fox ", "jumps over ", "the lazy ", "dog. "), layout)
+        # Laying out the same text again should reuse the existing layout.
+        self.assertIs(layout, layout_paragraph(text, 10))
+        # A different line length is a different layout.
+        self.assertTupleEqual(("The quick brown fox jumps ", "over the lazy dog. "), layout_paragraph(text, 25))
+        # Words that are longer than a line are given a line of their own.
+        self.assertTupleEqual(("", "Supercalifragilistic ", "a "), layout_paragraph("Supercalifragilistic a", 5))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,11 @@
 import json
+import os
 import sched
 import socket
 import unittest
-from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 from datetime import date, datetime, timezone
+from tempfile import TemporaryDirectory
 from threading import Thread
 from typing import List, Dict, Tuple
 from unittest.mock import MagicMock, call, patch
@@ -17,12 +18,18 @@ from source.foundation.catalogue import LOBBY_NAMES, PLAYER_NAMES, FACTION_COLOU
 from source.foundation.models import PlayerDetails, Faction, GameConfig, Player, Settlement, ResourceCollection, \
     OngoingBlessing, Construction, InvestigationResult, Unit, DeployerUnit, Quad, Biome, AIPlaystyle, \
     ExpansionPlaystyle, AttackPlaystyle, LobbyDetails, Heathen, Victory, VictoryType, MultiplayerStatus, SaveDetails, \
-    Location
+    Location, HibernatedLobby
+from source.game_management.board_state import BoardState
 from source.game_management.game_controller import GameController
 from source.game_management.game_state import GameState
 from source.game_management.movemaker import MoveMaker
-from source.networking.client import GLOBAL_SERVER_HOST, SERVER_PORT, EventDispatcher, DispatcherKind
+from source.networking.client import GLOBAL_SERVER_HOST, SERVER_PORT, EventDispatcher, DispatcherKind, \
+    NETWORK_CACHE_FILE_NAME, LOCAL_SERVER_PROBE_ADDRESS, LOCAL_SERVER_TTL, LocalServerDiscovery
+from source.networking.client_registry import ClientRegistry, KEEPALIVE_INTERVAL, KEEPALIVE_BUCKETS, \
+    KEEPALIVE_MAX_UNANSWERED
 from source.networking.event_listener import RequestHandler, MicrocosmServer, EventListener
+from source.networking.lobby_directory import LobbyDirectory, LOBBIES_PER_PAGE
+from source.networking.lobby_tracker import LobbyTracker, LOBBY_SWEEP_INTERVAL
 from source.networking.events import EventType, RegisterEvent, Event, CreateEvent, InitEvent, UpdateEvent, \
     UpdateAction, QueryEvent, LeaveEvent, JoinEvent, EndTurnEvent, UnreadyEvent, AutofillEvent, SaveEvent, \
     QuerySavesEvent, LoadEvent, FoundSettlementEvent, SetBlessingEvent, SetConstructionEvent, MoveUnitEvent, \
@@ -85,10 +92,12 @@ class EventListenerTest(unittest.TestCase):
             self.TEST_GAME_NAME: [PlayerDetails("Uno", Faction.AGRICULTURISTS, self.TEST_IDENTIFIER),
                                   PlayerDetails("Dos", Faction.FRONTIERSMEN, self.TEST_IDENTIFIER_2)]
         }
-        self.mock_server.clients_ref = {
-            self.TEST_IDENTIFIER: (self.TEST_HOST, self.TEST_PORT),
-            self.TEST_IDENTIFIER_2: (self.TEST_HOST_2, self.TEST_PORT_2)
-        }
+        self.mock_server.client_registry_ref = ClientRegistry()
+        self.mock_server.client_registry_ref.register(self.TEST_IDENTIFIER, (self.TEST_HOST, self.TEST_PORT))
+        self.mock_server.client_registry_ref.register(self.TEST_IDENTIFIER_2, (self.TEST_HOST_2, self.TEST_PORT_2))
+        self.mock_server.clients_ref = self.mock_server.client_registry_ref.clients
+        self.mock_server.lobby_directory_ref = LobbyDirectory()
+        self.mock_server.lobby_tracker_ref = LobbyTracker()
         self.mock_server.namers_ref = {}
         self.mock_server.move_makers_ref = {}
         self.mock_server.lobbies_ref = {
@@ -96,13 +105,16 @@ class EventListenerTest(unittest.TestCase):
         }
         self.mock_server.game_states_ref = {}
         self.mock_server.game_controller_ref = self.TEST_GAME_CONTROLLER
-        self.mock_server.keepalive_ctrs_ref = {}
+        self.mock_server.join_session_ref = None
+        self.mock_server.local_discovery_ref = MagicMock()
         self.request_handler: RequestHandler = RequestHandler((self.TEST_EVENT_BYTES, self.mock_socket),
                                                               (self.TEST_HOST, self.TEST_PORT), self.mock_server)
 
-    def test_handle(self):
+    @patch("source.networking.event_listener.REDRAW_TRACKER")
+    def test_handle(self, redraw_tracker_mock: MagicMock):
         """
-        Ensure that requests are handled correctly.
+        Ensure that requests are handled correctly, with clients marking the display as dirty.
+        :param redraw_tracker_mock: The mock implementation of the REDRAW_TRACKER object.
         """
         self.request_handler.process_event = MagicMock()
         self.request_handler.handle()
@@ -113,6 +125,29 @@ class EventListenerTest(unittest.TestCase):
         self.assertEqual(self.TEST_EVENT.type, event_processed.type)
         self.assertEqual(self.TEST_EVENT.identifier, event_processed.identifier)
         self.assertEqual(self.mock_socket, socket_processed)
+        # The game server has no display, so nothing should be marked dirty.
+        redraw_tracker_mock.mark_dirty.assert_not_called()
+        # Since the test event is a keepalive, it shouldn't have counted as activity, but any other event should.
+        self.assertEqual(self.TEST_IDENTIFIER_2, list(self.mock_server.clients_ref)[-1])
+        self.request_handler.request = json.dumps(Event(EventType.QUERY, self.TEST_IDENTIFIER),
+                                                  cls=SaveEncoder).encode(), self.mock_socket
+        self.request_handler.handle()
+        self.assertEqual(self.TEST_IDENTIFIER, list(self.mock_server.clients_ref)[-1])
+        self.request_handler.request = self.TEST_EVENT_BYTES, self.mock_socket
+        # Clients should only process events once they are applied on the main thread.
+        self.mock_server.is_server = False
+        self.request_handler.process_event.reset_mock()
+        self.request_handler.handle()
+        self.request_handler.process_event.assert_not_called()
+        self.TEST_GAME_CONTROLLER.command_queue.drain()
+        self.assertEqual(self.TEST_EVENT.type, self.request_handler.process_event.call_args[0][0].type)
+        # Clients should also not mark the display as dirty for keepalives, but should for any other event.
+        redraw_tracker_mock.mark_dirty.assert_not_called()
+        self.request_handler.request = json.dumps(Event(EventType.QUERY, self.TEST_IDENTIFIER),
+                                                  cls=SaveEncoder).encode(), self.mock_socket
+        self.request_handler.handle()
+        self.TEST_GAME_CONTROLLER.command_queue.drain()
+        redraw_tracker_mock.mark_dirty.assert_called_once()
 
     def test_handle_syntactically_incorrect(self):
         """
@@ -130,6 +165,166 @@ class EventListenerTest(unittest.TestCase):
         self.request_handler.handle()
         self.request_handler.process_event.assert_not_called()
 
+    def test_handle_hibernated_lobby(self):
+        """
+        Ensure that the game in an idle lobby can be hibernated, with the lobby itself remaining open, and that the game
+        is revived when an event for the lobby is received.
+        """
+        # We need to disable the pylint rule against protected access since we're going to be testing internal methods
+        # in this test.
+        # pylint: disable=protected-access
+        self.mock_server.is_server = True
+        namer: Namer = Namer()
+        self.TEST_GAME_STATE.game_started = True
+        self.TEST_GAME_STATE.turn = 12
+        self.TEST_GAME_STATE.board = BoardState(self.TEST_GAME_CONFIG, namer)
+        self.TEST_GAME_STATE.ready_players = {self.TEST_IDENTIFIER, self.TEST_IDENTIFIER_2}
+        # Our test settlements don't have names from the Namer, so they can't be loaded back in from a save.
+        for player in self.TEST_GAME_STATE.players:
+            player.settlements = []
+        self.mock_server.game_states_ref[self.TEST_GAME_NAME] = self.TEST_GAME_STATE
+        self.mock_server.namers_ref[self.TEST_GAME_NAME] = namer
+        self.mock_server.move_makers_ref[self.TEST_GAME_NAME] = MoveMaker(namer)
+        self.request_handler._refresh_lobby(self.TEST_GAME_NAME)
+        self.mock_server.lobby_tracker_ref.touch(self.TEST_GAME_NAME)
+
+        with TemporaryDirectory() as saves_dir, patch("source.saving.game_save_manager.SAVES_DIR", saves_dir), \
+                patch("source.networking.event_listener.close_save_journal") as close_save_journal_mock:
+            self.request_handler._hibernate_lobby(self.TEST_GAME_NAME)
+
+            # The game should have been saved to disk and removed from memory, along with its journal.
+            hibernated_lobby: HibernatedLobby = self.mock_server.lobby_tracker_ref.hibernated[self.TEST_GAME_NAME]
+            self.assertTrue(os.path.isfile(hibernated_lobby.save_path))
+            self.assertNotIn(self.TEST_GAME_NAME, self.mock_server.game_states_ref)
+            self.assertNotIn(self.TEST_GAME_NAME, self.mock_server.namers_ref)
+            self.assertNotIn(self.TEST_GAME_NAME, self.mock_server.move_makers_ref)
+            self.assertNotIn(self.TEST_GAME_NAME, self.mock_server.lobby_tracker_ref.last_active)
+            close_save_journal_mock.assert_called_with(self.TEST_GAME_NAME)
+            # However, the lobby itself should still be open and listed.
+            self.assertIn(self.TEST_GAME_NAME, self.mock_server.game_clients_ref)
+            self.assertIn(self.TEST_GAME_NAME, self.mock_server.lobbies_ref)
+            self.assertIn(self.TEST_GAME_NAME, self.mock_server.lobby_directory_ref.lobbies)
+
+            # When a player next sends an event for the lobby, its game should be revived before the event is processed.
+            self.request_handler.request = json.dumps(UnreadyEvent(EventType.UNREADY, self.TEST_IDENTIFIER,
+                                                                   self.TEST_GAME_NAME),
+                                                      cls=SaveEncoder).encode(), self.mock_socket
+            self.request_handler.handle()
+
+            revived_state: GameState = self.mock_server.game_states_ref[self.TEST_GAME_NAME]
+            self.assertTrue(revived_state.game_started)
+            self.assertFalse(revived_state.on_menu)
+            self.assertEqual(12, revived_state.turn)
+            self.assertListEqual([p.name for p in self.TEST_GAME_STATE.players],
+                                 [p.name for p in revived_state.players])
+            self.assertEqual(self.TEST_GAME_STATE.board.quads, revived_state.board.quads)
+            self.assertIs(revived_state.board,
+                          self.mock_server.move_makers_ref[self.TEST_GAME_NAME].board_ref)
+            self.assertIn(self.TEST_GAME_NAME, self.mock_server.namers_ref)
+            # The players that had ended their turn should have been restored too, with the event then being processed.
+            self.assertSetEqual({self.TEST_IDENTIFIER_2}, revived_state.ready_players)
+            # Once revived, the hibernated save should have been removed, with the lobby being active again.
+            self.assertFalse(os.path.isfile(hibernated_lobby.save_path))
+            self.assertNotIn(self.TEST_GAME_NAME, self.mock_server.lobby_tracker_ref.hibernated)
+            self.assertIn(self.TEST_GAME_NAME, self.mock_server.lobby_tracker_ref.last_active)
+
+    @patch("source.networking.event_listener.close_save_journal")
+    def test_handle_hibernated_lobby_not_revived(self, close_save_journal_mock: MagicMock):
+        """
+        Ensure that when the game in a hibernated lobby can't be revived, the lobby is closed and the event is not
+        processed.
+        :param close_save_journal_mock: The mock implementation of the close_save_journal() function.
+        """
+        self.mock_server.is_server = True
+        self.mock_server.client_registry_ref.join_lobby(self.TEST_IDENTIFIER, self.TEST_GAME_NAME)
+        self.mock_server.lobby_tracker_ref.hibernated[self.TEST_GAME_NAME] = \
+            HibernatedLobby(os.path.join("nonexistent", "save.msav"), set())
+        self.request_handler.process_event = MagicMock()
+        self.request_handler.request = json.dumps(UnreadyEvent(EventType.UNREADY, self.TEST_IDENTIFIER,
+                                                               self.TEST_GAME_NAME),
+                                                  cls=SaveEncoder).encode(), self.mock_socket
+        self.request_handler.handle()
+
+        self.request_handler.process_event.assert_not_called()
+        self.assertNotIn(self.TEST_GAME_NAME, self.mock_server.game_clients_ref)
+        self.assertNotIn(self.TEST_GAME_NAME, self.mock_server.lobbies_ref)
+        self.assertNotIn(self.TEST_GAME_NAME, self.mock_server.lobby_tracker_ref.hibernated)
+        self.assertNotIn(self.TEST_IDENTIFIER, self.mock_server.client_registry_ref.lobbies)
+        close_save_journal_mock.assert_called_with(self.TEST_GAME_NAME)
+
+    @patch("source.networking.event_listener.close_save_journal")
+    def test_close_hibernated_lobby(self, _: MagicMock):
+        """
+        Ensure that when a lobby whose game has been hibernated is closed, the game's save is removed too.
+        :param _: The unused mock implementation of the close_save_journal() function.
+        """
+        # We need to disable the pylint rule against protected access since we're going to be testing an internal method
+        # in this test.
+        # pylint: disable=protected-access
+        with TemporaryDirectory() as saves_dir:
+            save_path: str = os.path.join(saves_dir, "hibernated.msav")
+            with open(save_path, "wb"):
+                pass
+            self.mock_server.lobby_tracker_ref.hibernated[self.TEST_GAME_NAME] = HibernatedLobby(save_path, set())
+            self.request_handler._close_lobby(self.TEST_GAME_NAME)
+            self.assertFalse(os.path.isfile(save_path))
+            self.assertNotIn(self.TEST_GAME_NAME, self.mock_server.lobby_tracker_ref.hibernated)
+            self.assertNotIn(self.TEST_GAME_NAME, self.mock_server.lobbies_ref)
+
+    def test_hibernate_idle_lobbies(self):
+        """
+        Ensure that when the game server checks for idle lobbies, the games in lobbies that have started are hibernated,
+        and lobbies without any players are closed, but lobbies that have yet to start are left as they are.
+        """
+        # We need to disable the pylint rule against protected access since we're going to be testing internal methods
+        # in this test.
+        # pylint: disable=protected-access
+        self.mock_server.is_server = True
+        empty_lobby_name: str = "Empty"
+        waiting_lobby_name: str = "Waiting"
+        self.TEST_GAME_STATE.game_started = True
+        self.mock_server.game_states_ref = {self.TEST_GAME_NAME: self.TEST_GAME_STATE,
+                                            empty_lobby_name: GameState(),
+                                            waiting_lobby_name: GameState()}
+        self.mock_server.game_clients_ref[empty_lobby_name] = []
+        self.mock_server.game_clients_ref[waiting_lobby_name] = [PlayerDetails("Tres", Faction.GODLESS, 789)]
+        self.mock_server.lobbies_ref[empty_lobby_name] = self.TEST_GAME_CONFIG
+        self.mock_server.lobbies_ref[waiting_lobby_name] = self.TEST_GAME_CONFIG
+        self.mock_server.lobby_tracker_ref.get_idle_lobbies = \
+            MagicMock(return_value=[self.TEST_GAME_NAME, empty_lobby_name, waiting_lobby_name])
+        self.request_handler._hibernate_lobby = MagicMock()
+        # The lobbies should be checked on the first event since the check is due.
+        self.mock_server.lobby_tracker_ref.last_sweep = -LOBBY_SWEEP_INTERVAL
+        self.request_handler.process_event = MagicMock()
+
+        with patch("source.networking.event_listener.close_save_journal"):
+            self.request_handler.handle()
+
+        self.request_handler._hibernate_lobby.assert_called_once_with(self.TEST_GAME_NAME)
+        self.assertNotIn(empty_lobby_name, self.mock_server.lobbies_ref)
+        self.assertIn(waiting_lobby_name, self.mock_server.game_states_ref)
+        self.request_handler.process_event.assert_called_once()
+
+        # The lobbies shouldn't be checked again until the next check is due.
+        self.request_handler.handle()
+        self.request_handler._hibernate_lobby.assert_called_once()
+
+    @patch("source.networking.event_listener.hibernate_game", side_effect=OSError)
+    def test_hibernate_lobby_not_saved(self, _: MagicMock):
+        """
+        Ensure that when the game in a lobby can't be saved, it is kept in memory and marked as active so that it isn't
+        immediately hibernated again.
+        :param _: The unused mock implementation of the hibernate_game() function.
+        """
+        # We need to disable the pylint rule against protected access since we're going to be testing an internal method
+        # in this test.
+        # pylint: disable=protected-access
+        self.mock_server.game_states_ref[self.TEST_GAME_NAME] = self.TEST_GAME_STATE
+        self.request_handler._hibernate_lobby(self.TEST_GAME_NAME)
+        self.assertIs(self.TEST_GAME_STATE, self.mock_server.game_states_ref[self.TEST_GAME_NAME])
+        self.assertNotIn(self.TEST_GAME_NAME, self.mock_server.lobby_tracker_ref.hibernated)
+        self.assertIn(self.TEST_GAME_NAME, self.mock_server.lobby_tracker_ref.last_active)
+
     def test_forward_packet(self):
         """
         Ensure that packets are correctly forwarded to the correct clients under the correct conditions.
@@ -212,8 +407,9 @@ class EventListenerTest(unittest.TestCase):
         test_lobby_name: str = LOBBY_NAMES[1]
         test_player_name: str = PLAYER_NAMES[0]
         self.mock_server.is_server = True
-        # Add in an extra game state so we can see the lobby name iteration process.
-        self.mock_server.game_states_ref = {taken_lobby_name: GameState()}
+        # Add in an extra lobby so we can see the lobby name iteration process. The lobby's game has been hibernated, so
+        # it has no game state, but its name should still be taken.
+        self.mock_server.lobbies_ref[taken_lobby_name] = self.TEST_GAME_CONFIG
         # There are two different calls to random.choice() when processing create events as the server. Firstly, the
         # lobby name is chosen, and subsequently the player's name is chosen. We mock the method to initially return a
         # lobby name that's already been taken, thus covering the case where another lobby name needs to be randomly
@@ -234,9 +430,12 @@ class EventListenerTest(unittest.TestCase):
         self.assertIn(test_lobby_name, self.mock_server.game_clients_ref)
         self.assertListEqual([PlayerDetails(test_player_name, test_faction, test_event.identifier)],
                              self.mock_server.game_clients_ref[test_lobby_name])
+        self.assertSetEqual({test_lobby_name}, self.mock_server.client_registry_ref.lobbies[test_event.identifier])
         # The game's config should have been saved under the lobby name.
         self.assertIn(test_lobby_name, self.mock_server.lobbies_ref)
         self.assertEqual(test_event.cfg, self.mock_server.lobbies_ref[test_lobby_name])
+        # The lobby should also be tracked as having just been active.
+        self.assertIn(test_lobby_name, self.mock_server.lobby_tracker_ref.last_active)
         # We also expect the event itself to have been added to, with the additional information required for the client
         # to handle the response.
         self.assertEqual(test_lobby_name, test_event.lobby_name)
@@ -738,8 +937,10 @@ class EventListenerTest(unittest.TestCase):
         """
         player: Player = self.TEST_GAME_STATE.players[0]
         unit: Unit = player.units[0]
+        # The unit passes through a distant location on its way, as if several moves were sent as one.
         test_event: MoveUnitEvent = MoveUnitEvent(EventType.UPDATE, self.TEST_IDENTIFIER, UpdateAction.MOVE_UNIT,
-                                                  self.TEST_GAME_NAME, player.faction, unit.location, (6, 6), 0, True)
+                                                  self.TEST_GAME_NAME, player.faction, unit.location, (6, 6), 0, True,
+                                                  waypoints=[(40, 40)])
         self.mock_server.is_server = False
         self.mock_server.game_states_ref["local"] = self.TEST_GAME_STATE
 
@@ -754,8 +955,9 @@ class EventListenerTest(unittest.TestCase):
         self.assertTupleEqual(test_event.new_loc, unit.location)
         self.assertEqual(test_event.new_stamina, unit.remaining_stamina)
         self.assertEqual(test_event.besieging, unit.besieging)
-        # The player should now also have some seen quads.
+        # The player should now also have some seen quads, including those around the location passed through.
         self.assertTrue(player.quads_seen)
+        self.assertIn((40, 40), player.quads_seen)
         # Since this is a client, no packets should have been forwarded.
         self.mock_socket.sendto.assert_not_called()
 
@@ -1774,8 +1976,12 @@ class EventListenerTest(unittest.TestCase):
 
     def test_process_query_event_server(self):
         """
-        Ensure that the game server correctly processes query events.
+        Ensure that the game server correctly processes query events, responding with the requested page of lobbies
+        from its lobby directory.
         """
+        # We need to disable the pylint rule against protected access since we're going to be testing an internal method
+        # in this test.
+        # pylint: disable=protected-access
         # Add an AI player to the game so we can see how their details are included as well.
         ai_player: Player = Player("Mr. Roboto", Faction.FUNDAMENTALISTS, 2,
                                    ai_playstyle=AIPlaystyle(AttackPlaystyle.NEUTRAL, ExpansionPlaystyle.NEUTRAL))
@@ -1786,13 +1992,12 @@ class EventListenerTest(unittest.TestCase):
         # Use a different GameConfig that allows for three players.
         three_player_conf: GameConfig = \
             GameConfig(3, Faction.AGRICULTURISTS, True, True, True, MultiplayerStatus.GLOBAL)
-        test_event: QueryEvent = QueryEvent(EventType.QUERY, self.TEST_IDENTIFIER)
         self.mock_server.is_server = True
         self.mock_server.game_states_ref[self.TEST_GAME_NAME] = self.TEST_GAME_STATE
         self.mock_server.lobbies_ref[self.TEST_GAME_NAME] = three_player_conf
 
-        # Process our test event.
-        self.request_handler.process_query_event(test_event, self.mock_socket)
+        # Refresh the lobby's directory entry, as is done whenever the lobby changes.
+        self.request_handler._refresh_lobby(self.TEST_GAME_NAME)
 
         # Extract out our expected data into a couple of variables since this logic is a little more complicated.
         expected_player_details: List[PlayerDetails] = []
@@ -1801,16 +2006,29 @@ class EventListenerTest(unittest.TestCase):
         expected_player_details.extend(self.mock_server.game_clients_ref[self.TEST_GAME_NAME])
         # However, the AI player should have had their details manually added.
         expected_player_details.append(PlayerDetails(ai_player.name, ai_player.faction, id=None))
-        # The lobby returned should have the correct name, config, turn, and player details.
+        # The lobby should have the correct name, config, turn, and player details.
         expected_lobby: LobbyDetails = LobbyDetails(self.TEST_GAME_NAME, expected_player_details,
                                                     three_player_conf, self.TEST_GAME_STATE.turn)
-
-        # Ensure the lobby is returned as expected.
-        self.assertListEqual([expected_lobby], test_event.lobbies)
-        # We also expect the server to have sent a packet containing a JSON representation of the event to the client
-        # that originally dispatched the query event.
-        self.mock_socket.sendto.assert_called_with(json.dumps(test_event, cls=SaveEncoder).encode(),
-                                                   (self.TEST_HOST, self.TEST_PORT))
+        self.assertDictEqual({self.TEST_GAME_NAME: expected_lobby}, self.mock_server.lobby_directory_ref.lobbies)
+        # Refreshing the lobby shouldn't have changed the game clients themselves.
+        self.assertEqual(2, len(self.mock_server.game_clients_ref[self.TEST_GAME_NAME]))
+
+        # Process a query event, and then one from an older client that doesn't request a particular page.
+        self.request_handler.process_query_event(QueryEvent(EventType.QUERY, self.TEST_IDENTIFIER, page=1),
+                                                 self.mock_socket)
+        self.request_handler.process_query_event(ObjectConverter({"type": EventType.QUERY,
+                                                                  "identifier": self.TEST_IDENTIFIER}),
+                                                 self.mock_socket)
+
+        # We expect the server to have responded to the client that originally dispatched each query event with the
+        # only page of lobbies.
+        expected_response: bytes = self.mock_server.lobby_directory_ref.get_page(0)
+        self.mock_socket.sendto.assert_has_calls([call(expected_response, (self.TEST_HOST, self.TEST_PORT))] * 2)
+        response: QueryEvent = json.loads(expected_response, object_hook=ObjectConverter)
+        self.assertEqual(0, response.page)
+        self.assertEqual(1, response.page_count)
+        self.assertEqual(self.TEST_GAME_NAME, response.lobbies[0].name)
+        self.assertEqual(10, response.lobbies[0].current_turn)
 
     def test_process_query_event_client(self):
         """
@@ -1851,8 +2069,50 @@ class EventListenerTest(unittest.TestCase):
         self.assertTrue(menu.viewing_local_lobbies)
         # Since this is a client, no packets should have been forwarded.
         self.mock_socket.sendto.assert_not_called()
+        # Without any paging information, we expect the lobbies to be treated as the only page.
+        self.assertEqual(0, menu.lobby_page)
+        self.assertEqual(1, menu.lobby_page_count)
+
+    def test_process_query_event_client_paging(self):
+        """
+        Ensure that game clients correctly process paged query events, selecting the appropriate lobby as the pages
+        change.
+        """
+        test_lobbies: List[LobbyDetails] = [LobbyDetails(f"Lobby {i}", [], self.TEST_GAME_CONFIG, None)
+                                            for i in range(LOBBIES_PER_PAGE)]
+        self.mock_server.is_server = False
+        self.request_handler.client_address = (GLOBAL_SERVER_HOST,)
+        menu: Menu = self.mock_server.game_controller_ref.menu
 
-    def test_process_leave_event_server(self):
+        # Viewing the first of three pages should select the first lobby.
+        menu.lobby_index = 5
+        self.request_handler.process_query_event(QueryEvent(EventType.QUERY, None, test_lobbies, 0, 3),
+                                                 self.mock_socket)
+        self.assertEqual(0, menu.lobby_index)
+        self.assertEqual(0, menu.lobby_page)
+        self.assertEqual(3, menu.lobby_page_count)
+
+        # Moving to the next page should also select the first lobby.
+        menu.lobby_index = LOBBIES_PER_PAGE - 1
+        self.request_handler.process_query_event(QueryEvent(EventType.QUERY, None, test_lobbies, 1, 3),
+                                                 self.mock_socket)
+        self.assertEqual(0, menu.lobby_index)
+        self.assertEqual(1, menu.lobby_page)
+
+        # Moving back to the previous page should select the last lobby.
+        self.request_handler.process_query_event(QueryEvent(EventType.QUERY, None, test_lobbies, 0, 3),
+                                                 self.mock_socket)
+        self.assertEqual(LOBBIES_PER_PAGE - 1, menu.lobby_index)
+        self.assertEqual(0, menu.lobby_page)
+
+        # Refreshing the same page with fewer lobbies than before should keep the selection within the page.
+        self.request_handler.process_query_event(QueryEvent(EventType.QUERY, None, test_lobbies[:3], 0, 3),
+                                                 self.mock_socket)
+        self.assertEqual(2, menu.lobby_index)
+        self.assertListEqual(test_lobbies[:3], menu.multiplayer_lobbies)
+
+    @patch("source.networking.event_listener.close_save_journal")
+    def test_process_leave_event_server(self, close_save_journal_mock: MagicMock):
         """
         Ensure that the game server correctly processes leave events.
         """
@@ -1866,17 +2126,27 @@ class EventListenerTest(unittest.TestCase):
         test_event: LeaveEvent = LeaveEvent(EventType.LEAVE, self.TEST_IDENTIFIER, self.TEST_GAME_NAME)
         self.mock_server.is_server = True
         self.mock_server.game_states_ref[self.TEST_GAME_NAME] = self.TEST_GAME_STATE
+        test_namer: Namer = Namer()
+        self.mock_server.namers_ref[self.TEST_GAME_NAME] = test_namer
+        self.mock_server.move_makers_ref[self.TEST_GAME_NAME] = MoveMaker(test_namer)
+        self.mock_server.lobby_tracker_ref.touch(self.TEST_GAME_NAME)
         leaving_player: Player = self.TEST_GAME_STATE.players[0]
         other_player_details: PlayerDetails = self.mock_server.game_clients_ref[self.TEST_GAME_NAME][1]
         # Mock out the end turn function since there's really no need to test it here.
         self.request_handler._server_end_turn = MagicMock()
 
+        self.mock_server.client_registry_ref.join_lobby(self.TEST_IDENTIFIER, self.TEST_GAME_NAME)
+
         # The player that is leaving should obviously have no AI playstyle initially.
         self.assertIsNone(leaving_player.ai_playstyle)
         # Process our test event.
         self.request_handler.process_leave_event(test_event, self.mock_socket)
-        # There should now only be the other player as a game client.
+        # There should now only be the other player as a game client, and the player that left should no longer be
+        # recorded as being in the game.
         self.assertDictEqual({self.TEST_GAME_NAME: [other_player_details]}, self.mock_server.game_clients_ref)
+        self.assertNotIn(self.TEST_IDENTIFIER, self.mock_server.client_registry_ref.lobbies)
+        self.assertEqual([other_player_details, PlayerDetails(leaving_player.name, leaving_player.faction, id=None)],
+                         self.mock_server.lobby_directory_ref.lobbies[self.TEST_GAME_NAME].current_players)
         # The player that left should now have an AI playstyle, which, along with their faction, should have been
         # forwarded on just once to the remaining player.
         self.assertIsNotNone(leaving_player.ai_playstyle)
@@ -1896,6 +2166,12 @@ class EventListenerTest(unittest.TestCase):
         self.assertNotIn(self.TEST_GAME_NAME, self.mock_server.game_clients_ref)
         self.assertNotIn(self.TEST_GAME_NAME, self.mock_server.lobbies_ref)
         self.assertNotIn(self.TEST_GAME_NAME, self.mock_server.game_states_ref)
+        self.assertNotIn(self.TEST_GAME_NAME, self.mock_server.namers_ref)
+        self.assertNotIn(self.TEST_GAME_NAME, self.mock_server.move_makers_ref)
+        self.assertNotIn(self.TEST_GAME_NAME, self.mock_server.lobby_directory_ref.lobbies)
+        self.assertNotIn(self.TEST_GAME_NAME, self.mock_server.lobby_tracker_ref.last_active)
+        # Autosaves for the game should also no longer be journaled.
+        close_save_journal_mock.assert_called_once_with(self.TEST_GAME_NAME)
         # No further packets should have been forwarded, nor turns ended.
         self.mock_socket.sendto.assert_called_once()
         self.request_handler._server_end_turn.assert_called_once()
@@ -1998,6 +2274,8 @@ class EventListenerTest(unittest.TestCase):
         # The game clients for this lobby should now consist of both the original client and the new joining one.
         self.assertListEqual([other_client_details, expected_new_player_details],
                              self.mock_server.game_clients_ref[test_event.lobby_name])
+        self.assertSetEqual({test_event.lobby_name},
+                            self.mock_server.client_registry_ref.lobbies[test_event.identifier])
         self.assertEqual(expected_lobby_details, test_event.lobby_details)
 
         # We expect both clients to have been notified that the player joined the lobby successfully.
@@ -2425,11 +2703,16 @@ class EventListenerTest(unittest.TestCase):
         # A new player representing the joining player should have been added to the client's game state.
         self.assertIn(joining_player, gs.players)
 
+    @patch("source.networking.join_session.Thread")
     @patch("source.networking.event_listener.save_stats_achievements")
     @patch("pyxel.mouse")
-    def test_process_join_event_client_joining_game(self, pyxel_mouse_mock: MagicMock, achievements_mock: MagicMock):
+    def test_process_join_event_client_joining_game(self,
+                                                    pyxel_mouse_mock: MagicMock,
+                                                    achievements_mock: MagicMock,
+                                                    thread_mock: MagicMock):
         """
-        Ensure that game clients process join events correctly when the client is joining an ongoing game.
+        Ensure that game clients process join events correctly when the client is joining an ongoing game, inflating
+        the received game state in the background.
         """
         test_lobby_details: LobbyDetails = LobbyDetails(self.TEST_GAME_NAME,
                                                         self.mock_server.game_clients_ref[self.TEST_GAME_NAME],
@@ -2485,8 +2768,20 @@ class EventListenerTest(unittest.TestCase):
         self.assertIsNone(gs.board)
         self.assertIsNone(gc.move_maker.board_ref)
 
+        def process_join_event():
+            """
+            Process the test event, and then inflate the received game state as the join session's thread would,
+            applying any resulting commands as the main thread would.
+            """
+            self.request_handler.process_join_event(test_event, self.mock_socket)
+            self.mock_server.join_session_ref.inflate_pending()
+            gc.command_queue.drain()
+
         # Process our first test event.
-        self.request_handler.process_join_event(test_event, self.mock_socket)
+        process_join_event()
+        # The received game state should be inflated in the background.
+        thread_mock.assert_called_with(target=self.mock_server.join_session_ref.inflate_pending, daemon=True)
+        thread_mock.return_value.start.assert_called()
 
         # Not that it's currently being shown, but the client should now have the lobby from the test event on their
         # hidden menu.
@@ -2519,7 +2814,7 @@ class EventListenerTest(unittest.TestCase):
         # for testing purposes, it doesn't matter that every quad will be the same.
         for i in range(1, 90):
             test_event.quad_chunk_idx = i
-            self.request_handler.process_join_event(test_event, self.mock_socket)
+            process_join_event()
         # All quad chunks should now be loaded.
         self.assertEqual(90, gc.menu.multiplayer_game_being_loaded.quad_chunks_loaded)
         # We can even make sure that the correct quad was assigned for all of the board's quads.
@@ -2536,7 +2831,7 @@ class EventListenerTest(unittest.TestCase):
         # Process the next event with the first player's details.
         test_event.player_chunk = minify_player(original_first_player)
         test_event.player_chunk_idx = 0
-        self.request_handler.process_join_event(test_event, self.mock_socket)
+        process_join_event()
         # The first player should have been loaded in correctly, with their settlement name also being removed.
         self.assertEqual(original_first_player, gs.players[0])
         gc.namer.remove_settlement_name.assert_called_with(original_first_player.settlements[0].name,
@@ -2549,7 +2844,7 @@ class EventListenerTest(unittest.TestCase):
         # Process the next event with the second player's details.
         test_event.player_chunk = minify_player(original_second_player)
         test_event.player_chunk_idx = 1
-        self.request_handler.process_join_event(test_event, self.mock_socket)
+        process_join_event()
         # The second player should have been loaded in correctly, with their settlement name also being removed.
         self.assertEqual(original_second_player, gs.players[1])
         gc.namer.remove_settlement_name.assert_called_with(original_second_player.settlements[0].name,
@@ -2568,7 +2863,7 @@ class EventListenerTest(unittest.TestCase):
         test_event.player_chunk_idx = 0
         test_event.quads_seen_chunk = minify_quads_seen(set(test_seen_quads))
         test_event.total_quads_seen = len(test_seen_quads) * 2
-        self.request_handler.process_join_event(test_event, self.mock_socket)
+        process_join_event()
         # The seen quads for the first player should have been loaded in correctly, with the multiplayer game being
         # loaded being updated as well.
         self.assertEqual(test_event.total_quads_seen, gc.menu.multiplayer_game_being_loaded.total_quads_seen)
@@ -2581,7 +2876,7 @@ class EventListenerTest(unittest.TestCase):
         # Process the next event with the seen quads for the second player. Note that the actual chunk and the total are
         # unchanged for this event, for reasons described above.
         test_event.player_chunk_idx = 1
-        self.request_handler.process_join_event(test_event, self.mock_socket)
+        process_join_event()
         # The seen quads for the second player should have been loaded in correctly, with the multiplayer game being
         # loaded being updated as well.
         self.assertEqual(set(test_seen_quads), gs.players[1].quads_seen)
@@ -2598,6 +2893,10 @@ class EventListenerTest(unittest.TestCase):
         test_event.heathens_chunk = minify_heathens([self.TEST_HEATHEN])
         test_event.total_heathens = 1
         self.request_handler.process_join_event(test_event, self.mock_socket)
+        self.mock_server.join_session_ref.inflate_pending()
+        # The game should only be entered on the main thread, once the enqueued command has been applied.
+        self.assertFalse(gs.game_started)
+        gc.command_queue.drain()
         # The heathens should have been loaded in correctly.
         self.assertListEqual([self.TEST_HEATHEN], gs.heathens)
         # Note that we can't test the total heathens or heathens loaded attributes here because the game being loaded is
@@ -2672,7 +2971,8 @@ class EventListenerTest(unittest.TestCase):
         """
         self.mock_server.is_server = True
         # Clear our clients so we can have a clean slate for our test.
-        self.mock_server.clients_ref = {}
+        self.mock_server.client_registry_ref = ClientRegistry()
+        self.mock_server.clients_ref = self.mock_server.client_registry_ref.clients
         test_event: RegisterEvent = RegisterEvent(EventType.REGISTER, self.TEST_IDENTIFIER, port=9876)
         # Process our test event.
         self.request_handler.process_register_event(test_event, self.mock_socket)
@@ -2707,17 +3007,26 @@ class EventListenerTest(unittest.TestCase):
         self.request_handler.client_address = (test_local_server_host,)
         self.request_handler.process_register_event(test_event, self.mock_socket)
 
-        # This time, we expect a local dispatcher to have been added.
+        # This time, we expect a local dispatcher to have been added, and the local game server to have been recorded.
         self.assertTrue(DispatcherKind.LOCAL in self.TEST_GAME_STATE.event_dispatchers)
-        self.assertEqual(test_local_server_host, self.TEST_GAME_STATE.event_dispatchers[DispatcherKind.LOCAL].host)
+        local_dispatcher: EventDispatcher = self.TEST_GAME_STATE.event_dispatchers[DispatcherKind.LOCAL]
+        self.assertEqual(test_local_server_host, local_dispatcher.host)
         self.assertTrue(self.mock_server.game_controller_ref.menu.has_local_dispatcher)
+        self.mock_server.local_discovery_ref.record_server.assert_called_with(test_local_server_host)
+
+        # Responses to later probes, whether from the same or another local game server, should keep the existing
+        # dispatcher.
+        self.request_handler.client_address = ("127.0.0.2",)
+        self.request_handler.process_register_event(test_event, self.mock_socket)
+        self.assertIs(local_dispatcher, self.TEST_GAME_STATE.event_dispatchers[DispatcherKind.LOCAL])
+        self.mock_server.local_discovery_ref.record_server.assert_called_with("127.0.0.2")
 
     @patch.object(GameState, "__hash__")
-    @patch("source.networking.event_listener.save_game")
+    @patch("source.networking.event_listener.journal_autosave_game")
     @patch("random.seed")
     def test_process_end_turn_event_server(self,
                                            random_seed_mock: MagicMock,
-                                           save_game_mock: MagicMock,
+                                           autosave_game_mock: MagicMock,
                                            game_state_hash_mock: MagicMock):
         """
         Ensure that the game server correctly processes end turn events.
@@ -2741,6 +3050,7 @@ class EventListenerTest(unittest.TestCase):
         self.TEST_GAME_STATE.players[1].settlements = [self.TEST_SETTLEMENT_2]
         # Set the turn to 5 so that a heathen will be spawned.
         self.TEST_GAME_STATE.turn = 5
+        self.TEST_GAME_STATE.game_started = True
         # Simulate a situation in which one player has already ended their turn.
         self.TEST_GAME_STATE.ready_players = {self.TEST_IDENTIFIER_2}
         test_event: EndTurnEvent = EndTurnEvent(EventType.END_TURN, self.TEST_IDENTIFIER, self.TEST_GAME_NAME)
@@ -2766,10 +3076,14 @@ class EventListenerTest(unittest.TestCase):
         # The turn should also be incremented and climatic effects processed, since our test game configuration has them
         # enabled.
         self.assertEqual(6, self.TEST_GAME_STATE.turn)
+        self.assertEqual(6, self.mock_server.lobby_directory_ref.lobbies[self.TEST_GAME_NAME].current_turn)
         self.TEST_GAME_STATE.process_climatic_effects.assert_called_with(reseed_random=False)
-        # Since no victory was achieved, we expect the game to have been autosaved, with heathens and AI players also
-        # processed.
-        save_game_mock.assert_called_with(self.TEST_GAME_STATE, auto=True)
+        # Since no victory was achieved, we expect the game to have been autosaved to its lobby's journal, with heathens
+        # and AI players also processed.
+        autosave_game_mock.assert_called_with(self.TEST_GAME_STATE, self.TEST_GAME_NAME)
+        # The size of the autosave's snapshot should have been recorded as the size of the game.
+        self.assertEqual(autosave_game_mock.return_value.get_size.return_value,
+                         self.mock_server.lobby_tracker_ref.sizes[self.TEST_GAME_NAME])
         self.TEST_GAME_STATE.process_heathens.assert_called()
         self.TEST_GAME_STATE.process_ais.assert_called_with(test_movemaker)
         # We also expect the game state hash to have been set to our mocked hash value from the server's side, to be
@@ -3120,6 +3434,9 @@ class EventListenerTest(unittest.TestCase):
         self.assertEqual(3, len(self.TEST_GAME_STATE.players))
         self.assertEqual(expected_ai_player, self.TEST_GAME_STATE.players[2])
         self.assertListEqual(self.TEST_GAME_STATE.players, test_event.players)
+        # The AI player should also be listed in the lobby directory.
+        self.assertEqual(PlayerDetails(ai_player_name, ai_faction, id=None),
+                         self.mock_server.lobby_directory_ref.lobbies[self.TEST_GAME_NAME].current_players[-1])
         # We also expect these details to have been forwarded to all game clients, not just clients other than the one
         # that dispatched the event.
         self.assertEqual(2, len(self.mock_socket.sendto.mock_calls))
@@ -3250,8 +3567,9 @@ class EventListenerTest(unittest.TestCase):
         self.mock_server.is_server = True
         taken_lobby_name: str = LOBBY_NAMES[0]
         test_lobby_name: str = LOBBY_NAMES[1]
-        # Add in an extra game state so we can see the lobby name iteration process.
+        # Add in an extra lobby so we can see the lobby name iteration process.
         self.mock_server.game_states_ref = {taken_lobby_name: GameState()}
+        self.mock_server.lobbies_ref[taken_lobby_name] = self.TEST_GAME_CONFIG
         # We mock the method to initially return a lobby name that's already been taken, thus covering the case where
         # another lobby name needs to be randomly selected.
         random_choice_mock.side_effect = [taken_lobby_name, test_lobby_name]
@@ -3300,6 +3618,7 @@ class EventListenerTest(unittest.TestCase):
         self.assertFalse(self.mock_server.game_clients_ref[test_lobby_name])
         self.assertIn(test_lobby_name, self.mock_server.move_makers_ref)
         self.assertEqual(self.TEST_GAME_CONFIG, self.mock_server.lobbies_ref[test_lobby_name])
+        self.assertIn(test_lobby_name, self.mock_server.lobby_tracker_ref.last_active)
         # The loaded game should also be initialised.
         self.assertTrue(new_game_state.game_started)
         self.assertFalse(new_game_state.on_menu)
@@ -3345,11 +3664,11 @@ class EventListenerTest(unittest.TestCase):
         test_event: Event = Event(EventType.KEEPALIVE, self.TEST_IDENTIFIER)
         self.mock_server.is_server = True
         # Pretend that there is one outstanding keepalive packet for this identifier.
-        self.mock_server.keepalive_ctrs_ref[self.TEST_IDENTIFIER] = 1
+        self.mock_server.client_registry_ref.keepalive_ctrs[self.TEST_IDENTIFIER] = 1
         # Process our test event.
         self.request_handler.process_keepalive_event(test_event)
         # The keepalive counter for this identifier should now have been reset to zero.
-        self.assertFalse(self.mock_server.keepalive_ctrs_ref[self.TEST_IDENTIFIER])
+        self.assertFalse(self.mock_server.client_registry_ref.keepalive_ctrs[self.TEST_IDENTIFIER])
 
     @patch("source.networking.event_listener.get_identifier", return_value=TEST_IDENTIFIER)
     @patch.object(EventDispatcher, "dispatch_event")
@@ -3393,8 +3712,7 @@ class EventListenerTest(unittest.TestCase):
         self.assertIsNone(server_listener.game_controller)
         self.assertFalse(server_listener.game_clients)
         self.assertFalse(server_listener.lobbies)
-        self.assertFalse(server_listener.clients)
-        self.assertFalse(server_listener.keepalive_ctrs)
+        self.assertFalse(server_listener.client_registry.clients)
 
         # Since this is the game server, we also expect the keepalive thread to have been started.
         thread_start_mock.assert_called()
@@ -3418,8 +3736,7 @@ class EventListenerTest(unittest.TestCase):
         self.assertEqual(self.TEST_GAME_CONTROLLER, client_listener.game_controller)
         self.assertFalse(client_listener.game_clients)
         self.assertFalse(client_listener.lobbies)
-        self.assertFalse(client_listener.clients)
-        self.assertFalse(client_listener.keepalive_ctrs)
+        self.assertFalse(client_listener.client_registry.clients)
 
         # Since this is a client, we don't expect it to start a new thread to manage keepalives.
         thread_start_mock.assert_not_called()
@@ -3437,44 +3754,53 @@ class EventListenerTest(unittest.TestCase):
         server_listener.run_keepalive_scheduler()
 
         # Our mocked scheduler functions should have been called with the appropriate arguments.
-        scheduler.enter.assert_called_with(5, 1, server_listener.run_keepalive, (scheduler,))
+        scheduler.enter.assert_called_with(KEEPALIVE_INTERVAL / KEEPALIVE_BUCKETS, 1, server_listener.run_keepalive,
+                                           (scheduler,))
         scheduler.run.assert_called()
 
     @patch.object(Thread, "start", lambda *args: None)
     @patch("source.networking.event_listener.socket.socket")
     def test_event_listener_run_keepalive(self, socket_mock: MagicMock):
         """
-        Ensure that the keepalive is correctly run on the game server.
+        Ensure that the keepalive is correctly run on the game server, sending the same pre-encoded packet to each
+        client in the next bucket, and removing unresponsive clients from their games.
         """
         server_listener: EventListener = EventListener(is_server=True)
         scheduler: sched.scheduler = server_listener.keepalive_scheduler
         scheduler.enter = MagicMock()
         socket_mock_instance: MagicMock = socket_mock.return_value
-        # Simulate two clients.
-        server_listener.clients = self.mock_server.clients_ref
-        # One client hasn't responded to their last five keepalives, and one is a new client that has no counter.
-        server_listener.keepalive_ctrs = {self.TEST_IDENTIFIER: 5}
-        server_listener.game_clients = self.mock_server.game_clients_ref
+        # Simulate two clients in the same bucket, the first of which is in a game.
+        registry: ClientRegistry = server_listener.client_registry
+        test_identifier_2: int = self.TEST_IDENTIFIER + KEEPALIVE_BUCKETS
+        registry.register(self.TEST_IDENTIFIER, (self.TEST_HOST, self.TEST_PORT))
+        registry.register(test_identifier_2, (self.TEST_HOST_2, self.TEST_PORT_2))
+        registry.join_lobby(self.TEST_IDENTIFIER, self.TEST_GAME_NAME)
+        # The first client hasn't responded to their last five keepalives.
+        registry.keepalive_ctrs[self.TEST_IDENTIFIER] = KEEPALIVE_MAX_UNANSWERED - 1
+        registry.next_bucket = self.TEST_IDENTIFIER % KEEPALIVE_BUCKETS
 
         # Run the keepalive.
         server_listener.run_keepalive(scheduler)
 
-        expected_keepalive_event_bytes: bytes = b'{"type": "KEEPALIVE", "identifier": null}'
+        # The keepalive should run again for the next bucket.
+        scheduler.enter.assert_called_with(KEEPALIVE_INTERVAL / KEEPALIVE_BUCKETS, 1, server_listener.run_keepalive,
+                                           (scheduler,))
         expected_leave_event_bytes: bytes = (b'{"type": "LEAVE", "identifier": 123, "lobby_name": "My favourite game", '
                                              b'"leaving_player_faction": null, "player_ai_playstyle": null}')
         expected_calls = [
-            # We expect a keepalive event packet to have been sent to each client.
-            call(expected_keepalive_event_bytes, (self.TEST_HOST, self.TEST_PORT)),
-            call(expected_keepalive_event_bytes, (self.TEST_HOST_2, self.TEST_PORT_2)),
-            # Subsequently, since the first client has thus not responded to their last six keepalives, we expect the
-            # event listener to have sent a leave event to itself to remove the player who has lost connection.
+            # We expect a keepalive event packet to have been sent to the responsive client.
+            call(b'{"type":"KEEPALIVE","identifier":null}', (self.TEST_HOST_2, self.TEST_PORT_2)),
+            # Since the first client has thus not responded to their last six keepalives, we expect the event listener
+            # to have sent a leave event to itself to remove the player who has lost connection.
             call(expected_leave_event_bytes, ("localhost", 9999))
         ]
         self.assertEqual(expected_calls, socket_mock_instance.sendto.mock_calls)
-        # Both keepalive counters should have been incremented.
-        self.assertDictEqual({self.TEST_IDENTIFIER: 6, self.TEST_IDENTIFIER_2: 1}, server_listener.keepalive_ctrs)
-        # The client that lost connection should also have been removed.
-        self.assertNotIn(self.TEST_IDENTIFIER, server_listener.clients)
+        # The same socket should be used for every keepalive.
+        socket_mock.assert_called_once()
+        # The second client's keepalive counter should have been incremented, and the client that lost connection should
+        # have been removed.
+        self.assertDictEqual({test_identifier_2: 1}, registry.keepalive_ctrs)
+        self.assertNotIn(self.TEST_IDENTIFIER, registry.clients)
 
     @patch.object(Thread, "start", lambda *args: None)
     @patch("source.networking.event_listener.UDPServer")
@@ -3503,36 +3829,78 @@ class EventListenerTest(unittest.TestCase):
         self.assertFalse(mock_entered_server.game_clients_ref)
         self.assertFalse(mock_entered_server.lobbies_ref)
         self.assertFalse(mock_entered_server.clients_ref)
-        self.assertFalse(mock_entered_server.keepalive_ctrs_ref)
+        self.assertEqual(server_listener.client_registry, mock_entered_server.client_registry_ref)
+        self.assertIsNone(mock_entered_server.local_discovery_ref)
         # The UDP server should serve forever after it receives the state references.
         mock_entered_server.serve_forever.assert_called()
 
-    @patch.object(Thread, "start", lambda *args: None)
-    @patch.object(ThreadPoolExecutor, "submit", lambda *args: None)
-    @patch("source.networking.event_listener.get_identifier", return_value=TEST_IDENTIFIER)
-    @patch("socket.socket")
-    @patch("source.networking.client.UPnP")
+    @patch("source.networking.event_listener.Thread")
     @patch("source.networking.event_listener.UDPServer")
-    def test_event_listener_run_client_with_upnp(self,
-                                                 udp_server_mock: MagicMock,
-                                                 upnp_mock: MagicMock,
-                                                 socket_mock: MagicMock,
-                                                 _: MagicMock):
+    def test_event_listener_run_client(self, udp_server_mock: MagicMock, thread_mock: MagicMock):
         """
-        Ensure that event listeners are correctly run for clients with UPnP available, serving forever.
+        Ensure that event listeners are correctly run for clients, bringing up their networking in the background and
+        serving forever in the meantime.
         """
-        # Set up a few test networking constants.
-        test_port: int = 9999
-        test_private_ip: str = "127.0.0.1"
-        test_mapping_number: int = 1
+        test_port: int = 12345
         udp_server_mock_instance: MagicMock = udp_server_mock.return_value
         mock_entered_server: MagicMock = MagicMock()
-        # Set the local listener's server address so that the UPnP mapping can be added correctly.
-        mock_entered_server.server_address = test_private_ip, test_port
+        mock_entered_server.server_address = "0.0.0.0", test_port
         # Because the created UDPServer is used within a context manager, we need to mock what the with statement
         # returns. In this case, it is simply a mock object that will have attributes set and then called to serve
         # forever.
         udp_server_mock_instance.__enter__.return_value = mock_entered_server
+        # Pass through the test game state and controller, as we do for client listeners.
+        test_game_states: Dict[str, GameState] = {"local": self.TEST_GAME_STATE}
+        client_listener: EventListener = EventListener(is_server=False,
+                                                       game_states=test_game_states,
+                                                       game_controller=self.TEST_GAME_CONTROLLER)
+
+        # Run the event listener.
+        client_listener.run()
+
+        # We expect the UDP server itself to have been created with the correct port.
+        udp_server_mock.assert_called_with(("0.0.0.0", 0), RequestHandler)
+        # The client's networking should be brought up in a background thread.
+        thread_mock.assert_called_with(target=client_listener.bootstrap_client, args=(test_port,), daemon=True)
+        thread_mock.return_value.start.assert_called()
+        # Since the bootstrap hasn't finished, the menu should still say that it's 'Connecting to global server...'.
+        self.assertIsNone(self.TEST_GAME_CONTROLLER.menu.upnp_enabled)
+        # The expected state variables for the client listener should have been passed down as references to the UDP
+        # server.
+        self.assertEqual(test_game_states, mock_entered_server.game_states_ref)
+        self.assertFalse(mock_entered_server.namers_ref)
+        self.assertFalse(mock_entered_server.move_makers_ref)
+        self.assertFalse(mock_entered_server.is_server)
+        self.assertEqual(self.TEST_GAME_CONTROLLER, mock_entered_server.game_controller_ref)
+        self.assertFalse(mock_entered_server.game_clients_ref)
+        self.assertFalse(mock_entered_server.lobbies_ref)
+        self.assertFalse(mock_entered_server.clients_ref)
+        self.assertEqual(client_listener.client_registry, mock_entered_server.client_registry_ref)
+        # The client should also keep track of the local game servers it discovers, on its listener port.
+        self.assertEqual(client_listener.local_discovery, mock_entered_server.local_discovery_ref)
+        self.assertEqual(test_port, client_listener.local_discovery.client_port)
+        # Lastly, the UDP server should serve forever without waiting for the bootstrap.
+        mock_entered_server.serve_forever.assert_called()
+
+    @patch("source.networking.event_listener.REDRAW_TRACKER")
+    @patch("source.networking.event_listener.Thread")
+    @patch("source.networking.client.get_identifier", return_value=TEST_IDENTIFIER)
+    @patch("socket.socket")
+    @patch("source.networking.client.UPnP")
+    def test_bootstrap_client_with_upnp(self,
+                                        upnp_mock: MagicMock,
+                                        socket_mock: MagicMock,
+                                        _: MagicMock,
+                                        thread_mock: MagicMock,
+                                        redraw_tracker_mock: MagicMock):
+        """
+        Ensure that clients with UPnP available are registered with the global game server once their networking has
+        been brought up, with the menu being updated on the main thread.
+        """
+        # Set up a few test networking constants.
+        test_port: int = 9999
+        test_private_ip: str = "127.0.0.1"
+        test_mapping_number: int = 1
         upnp_mock_instance: MagicMock = upnp_mock.return_value
         # Mock out the existing UPnP port mappings to have just one. Note that the date used will always be prior to the
         # current date.
@@ -3541,21 +3909,24 @@ class EventListenerTest(unittest.TestCase):
                                     "Microcosm 1970-01-01", "1", "", test_port), None])
         socket_mock_instance: MagicMock = socket_mock.return_value
         # Mock out the call to retrieve the client's private IP.
-        socket_mock_instance.getsockname = MagicMock(return_value=(test_private_ip,))
+        socket_mock_instance.__enter__.return_value.getsockname.return_value = (test_private_ip,)
         # Pass through the test game state and controller, as we do for client listeners.
         test_game_states: Dict[str, GameState] = {"local": self.TEST_GAME_STATE}
         client_listener: EventListener = EventListener(is_server=False,
                                                        game_states=test_game_states,
                                                        game_controller=self.TEST_GAME_CONTROLLER)
 
-        # Before the listener is run, the menu should still say that it's 'Connecting to server...'.
+        client_listener.local_discovery = LocalServerDiscovery(test_port, MagicMock())
+
+        # Before the bootstrap is run, the menu should still say that it's 'Connecting to global server...'.
         self.assertIsNone(self.TEST_GAME_CONTROLLER.menu.upnp_enabled)
 
-        # Run the event listener.
-        client_listener.run()
+        with TemporaryDirectory() as saves_dir, patch("source.networking.event_listener.SAVES_DIR", saves_dir):
+            client_listener.bootstrap_client(test_port)
+            # The results of the bootstrap should also have been cached for next time.
+            with open(os.path.join(saves_dir, NETWORK_CACHE_FILE_NAME), "r", encoding="utf-8") as cache_file:
+                self.assertDictEqual({"private_ip": test_private_ip, "igd_found": True}, json.load(cache_file))
 
-        # We expect the UDP server itself to have been created with the correct port.
-        udp_server_mock.assert_called_with(("0.0.0.0", 0), RequestHandler)
         # We expect the correct UPnP setup to have occurred, discovering and selecting from the available UPnP devices
         # on the network.
         upnp_mock_instance.discover.assert_called()
@@ -3570,61 +3941,47 @@ class EventListenerTest(unittest.TestCase):
         # client will be sending more requests.
         socket_mock_instance.sendto.assert_called_with(b'{"type":"REGISTER","identifier":123,"port":9999}',
                                                        (GLOBAL_SERVER_HOST, SERVER_PORT))
-        # The main menu should also now be shown.
+        # Nothing should be changed for the game until the main thread applies the result of the bootstrap.
+        self.assertNotIn(DispatcherKind.GLOBAL, self.TEST_GAME_STATE.event_dispatchers)
+        self.assertIsNone(self.TEST_GAME_CONTROLLER.menu.upnp_enabled)
+        self.TEST_GAME_CONTROLLER.command_queue.drain()
+        self.assertEqual(GLOBAL_SERVER_HOST,
+                         self.TEST_GAME_STATE.event_dispatchers[DispatcherKind.GLOBAL].host)
+        # The menu should also now show that global multiplayer is available, and be redrawn to do so.
         self.assertTrue(self.TEST_GAME_CONTROLLER.menu.upnp_enabled)
-        # The expected state variables for the client listener should have been passed down as references to the UDP
-        # server.
-        self.assertEqual(test_game_states, mock_entered_server.game_states_ref)
-        self.assertFalse(mock_entered_server.namers_ref)
-        self.assertFalse(mock_entered_server.move_makers_ref)
-        self.assertFalse(mock_entered_server.is_server)
-        self.assertEqual(self.TEST_GAME_CONTROLLER, mock_entered_server.game_controller_ref)
-        self.assertFalse(mock_entered_server.game_clients_ref)
-        self.assertFalse(mock_entered_server.lobbies_ref)
-        self.assertFalse(mock_entered_server.clients_ref)
-        self.assertFalse(mock_entered_server.keepalive_ctrs_ref)
-        # Lastly, the UDP server should serve forever after it receives the state references.
-        mock_entered_server.serve_forever.assert_called()
-
-    @patch.object(Thread, "start", lambda *args: None)
-    @patch.object(ThreadPoolExecutor, "submit", lambda *args: None)
+        redraw_tracker_mock.mark_dirty.assert_called()
+        # Local game servers should have been probed for first, and then periodically re-probed for in the background.
+        socket_mock_instance.__enter__.return_value.sendto.assert_any_call(
+            b'{"type":"REGISTER","identifier":123,"port":9999}', (LOCAL_SERVER_PROBE_ADDRESS, SERVER_PORT))
+        thread_mock.assert_called_with(target=client_listener.local_discovery.run, daemon=True)
+        thread_mock.return_value.start.assert_called()
+
+    @patch("source.networking.event_listener.REDRAW_TRACKER")
+    @patch("source.networking.event_listener.Thread")
     @patch("socket.socket")
     @patch("source.networking.client.UPnP")
-    @patch("source.networking.event_listener.UDPServer")
-    def test_event_listener_run_client_without_upnp(self,
-                                                    udp_server_mock: MagicMock,
-                                                    upnp_mock: MagicMock,
-                                                    socket_mock: MagicMock):
+    def test_bootstrap_client_without_upnp(self, upnp_mock: MagicMock, socket_mock: MagicMock, _: MagicMock,
+                                           redraw_tracker_mock: MagicMock):
         """
-        Ensure that event listeners are correctly run for clients with UPnP unavailable, not serving at all.
+        Ensure that clients with UPnP unavailable are not registered with the global game server.
         """
-        udp_server_mock_instance: MagicMock = udp_server_mock.return_value
-        mock_entered_server: MagicMock = MagicMock()
-        # Because the created UDPServer is used within a context manager, we need to mock what the with statement
-        # returns. In this case, it is simply a mock object that will be unmodified since UPnP is unavailable.
-        udp_server_mock_instance.__enter__.return_value = mock_entered_server
         upnp_mock_instance: MagicMock = upnp_mock.return_value
         # When there are no available UPnP devices on the client's network, then the selectigd() function will raise an
         # Exception - we mock that here.
         upnp_mock_instance.selectigd.side_effect = Exception()
         socket_mock_instance: MagicMock = socket_mock.return_value
-        # We also need to mock out the private IP returned by the socket for when the client broadcasts to other hosts
-        # on its local network.
-        socket_mock_instance.getsockname.return_value = ["127.0.0.1"]
+        # We also need to mock out the private IP returned by the socket.
+        socket_mock_instance.__enter__.return_value.getsockname.return_value = ["127.0.0.1"]
         # Pass through the test game state and controller, as we do for client listeners.
         test_game_states: Dict[str, GameState] = {"local": self.TEST_GAME_STATE}
         client_listener: EventListener = EventListener(is_server=False,
                                                        game_states=test_game_states,
                                                        game_controller=self.TEST_GAME_CONTROLLER)
+        client_listener.local_discovery = LocalServerDiscovery(9999, MagicMock())
 
-        # Before the listener is run, the menu should still say that it's 'Connecting to server...'.
-        self.assertIsNone(self.TEST_GAME_CONTROLLER.menu.upnp_enabled)
-
-        # Run the event listener.
-        client_listener.run()
+        with TemporaryDirectory() as saves_dir, patch("source.networking.event_listener.SAVES_DIR", saves_dir):
+            client_listener.bootstrap_client(9999)
 
-        # We expect the UDP server itself to have been created with the correct port.
-        udp_server_mock.assert_called_with(("0.0.0.0", 0), RequestHandler)
         # We expect UPnP setup to have been attempted, however in our simulation, no devices were discovered and so an
         # Exception was raised.
         upnp_mock_instance.discover.assert_called()
@@ -3635,9 +3992,89 @@ class EventListenerTest(unittest.TestCase):
         # Similarly, the client should not have sent a packet to the game server since it will not be able to receive
         # any.
         socket_mock_instance.sendto.assert_not_called()
+        self.TEST_GAME_CONTROLLER.command_queue.drain()
+        self.assertNotIn(DispatcherKind.GLOBAL, self.TEST_GAME_STATE.event_dispatchers)
         # Thus, we expect the menu to now be displayed, but with multiplayer features disabled.
         self.assertFalse(self.TEST_GAME_CONTROLLER.menu.upnp_enabled)
+        redraw_tracker_mock.mark_dirty.assert_called()
 
+    @patch("source.networking.event_listener.REDRAW_TRACKER")
+    @patch("time.monotonic", MagicMock(return_value=LOCAL_SERVER_TTL + 1))
+    def test_forget_local_server(self, redraw_tracker_mock: MagicMock):
+        """
+        Ensure that local game servers that are no longer around are forgotten by clients, unless they are in a lobby or
+        game on that server, with another known local game server being used instead if there is one.
+        """
+        test_host: str = "192.168.0.2"
+        test_other_host: str = "192.168.0.3"
+        client_listener: EventListener = EventListener(is_server=False,
+                                                       game_states={"local": self.TEST_GAME_STATE},
+                                                       game_controller=self.TEST_GAME_CONTROLLER)
+        client_listener.local_discovery = LocalServerDiscovery(9999, MagicMock())
+        # Both servers last responded before the TTL.
+        client_listener.local_discovery.servers = {test_host: 0, test_other_host: 0}
+        dispatchers: Dict[DispatcherKind, EventDispatcher] = self.TEST_GAME_STATE.event_dispatchers
+        dispatchers[DispatcherKind.LOCAL] = EventDispatcher(test_host)
+        self.TEST_GAME_CONTROLLER.menu.has_local_dispatcher = True
+
+        # Servers that the client isn't using should be forgotten straight away.
+        client_listener.forget_local_server(test_other_host)
+        self.assertListEqual([test_host], client_listener.local_discovery.get_expired_servers())
+        # The server that the client is in a lobby or game on shouldn't be forgotten, with it remaining known to the
+        # discovery so that it is reported as lost again later.
+        self.TEST_GAME_CONTROLLER.menu.multiplayer_lobby = \
+            LobbyDetails(self.TEST_GAME_NAME, [], self.TEST_GAME_CONFIG, None)
+        client_listener.forget_local_server(test_host)
+        self.TEST_GAME_CONTROLLER.menu.multiplayer_lobby = None
+        self.TEST_GAME_STATE.game_started = True
+        client_listener.forget_local_server(test_host)
+        self.assertEqual(test_host, dispatchers[DispatcherKind.LOCAL].host)
+        self.assertListEqual([test_host], client_listener.local_discovery.get_expired_servers())
+        self.TEST_GAME_STATE.game_started = False
+
+        # Servers that have responded again since they were reported as lost shouldn't be forgotten either.
+        client_listener.local_discovery.record_server(test_host)
+        client_listener.forget_local_server(test_host)
+        self.assertEqual(test_host, dispatchers[DispatcherKind.LOCAL].host)
+
+        # Once the client has left the game, if another local game server is known, it should be switched to.
+        client_listener.local_discovery.servers[test_host] = 0
+        client_listener.local_discovery.record_server(test_other_host)
+        client_listener.forget_local_server(test_host)
+        self.assertEqual(test_other_host, dispatchers[DispatcherKind.LOCAL].host)
+        self.assertTrue(self.TEST_GAME_CONTROLLER.menu.has_local_dispatcher)
+        self.assertListEqual([test_other_host], list(client_listener.local_discovery.servers))
+        redraw_tracker_mock.mark_dirty.assert_not_called()
+
+        # Otherwise, there should no longer be a local dispatcher.
+        client_listener.local_discovery.servers[test_other_host] = 0
+        client_listener.forget_local_server(test_other_host)
+        self.assertNotIn(DispatcherKind.LOCAL, dispatchers)
+        self.assertFalse(self.TEST_GAME_CONTROLLER.menu.has_local_dispatcher)
+        self.assertDictEqual({}, client_listener.local_discovery.servers)
+        # The menu should be redrawn to show that local multiplayer is no longer available.
+        redraw_tracker_mock.mark_dirty.assert_called_once()
+
+    def test_local_server_lost(self):
+        """
+        Ensure that clients forget lost local game servers on the main thread.
+        """
+        self.TEST_GAME_CONTROLLER.command_queue.commands.clear()
+        mock_entered_server: MagicMock = MagicMock()
+        mock_entered_server.server_address = "0.0.0.0", 12345
+        client_listener: EventListener = EventListener(is_server=False,
+                                                       game_states={"local": self.TEST_GAME_STATE},
+                                                       game_controller=self.TEST_GAME_CONTROLLER)
+        with patch("source.networking.event_listener.UDPServer") as udp_server_mock, \
+                patch("source.networking.event_listener.Thread"):
+            udp_server_mock.return_value.__enter__.return_value = mock_entered_server
+            client_listener.run()
+
+        with patch.object(client_listener, "forget_local_server") as forget_mock:
+            client_listener.local_discovery.on_lost("192.168.0.2")
+            forget_mock.assert_not_called()
+            self.TEST_GAME_CONTROLLER.command_queue.drain()
+            forget_mock.assert_called_with("192.168.0.2")
 
 if __name__ == '__main__':
     unittest.main()
@@ -73,6 +73,34 @@ class GameInputHandlerTest(unittest.TestCase):
         on_key_arrow_down(self.game_controller, self.game_state, False)
         self.game_controller.menu.navigate.assert_called_with(down=True)
 
+    @patch("source.game_management.game_input_handler.get_identifier", return_value=TEST_IDENTIFIER)
+    @patch("source.game_management.game_input_handler.dispatch_event")
+    def test_arrow_down_menu_next_lobby_page(self, dispatch_mock: MagicMock, _: MagicMock):
+        """
+        Ensure that the next page of lobbies is requested when pressing the down arrow key on the last lobby of a page,
+        but only if there is a next page.
+        """
+        self.game_state.on_menu = True
+        self.game_controller.menu.viewing_lobbies = True
+        self.game_controller.menu.viewing_local_lobbies = True
+        self.game_controller.menu.multiplayer_lobbies = [MagicMock(), MagicMock()]
+        self.game_controller.menu.lobby_index = 1
+        self.game_controller.menu.lobby_page_count = 2
+        self.game_controller.menu.navigate = MagicMock()
+
+        on_key_arrow_down(self.game_controller, self.game_state, False)
+        # Since we're viewing local lobbies, we expect the next page to have been requested from the local game server.
+        dispatch_mock.assert_called_with(QueryEvent(EventType.QUERY, self.TEST_IDENTIFIER, page=1),
+                                         self.TEST_EVENT_DISPATCHERS, MultiplayerStatus.LOCAL)
+        self.game_controller.menu.navigate.assert_not_called()
+
+        # On the last page, the menu should just be navigated as normal.
+        dispatch_mock.reset_mock()
+        self.game_controller.menu.lobby_page = 1
+        on_key_arrow_down(self.game_controller, self.game_state, False)
+        dispatch_mock.assert_not_called()
+        self.game_controller.menu.navigate.assert_called_with(down=True)
+
     def test_arrow_down_construction(self):
         """
         Ensure that the correct method is called when pressing the down arrow key while viewing the construction
@@ -179,6 +207,34 @@ class GameInputHandlerTest(unittest.TestCase):
         on_key_arrow_up(self.game_controller, self.game_state, False)
         self.game_controller.menu.navigate.assert_called_with(up=True)
 
+    @patch("source.game_management.game_input_handler.get_identifier", return_value=TEST_IDENTIFIER)
+    @patch("source.game_management.game_input_handler.dispatch_event")
+    def test_arrow_up_menu_previous_lobby_page(self, dispatch_mock: MagicMock, _: MagicMock):
+        """
+        Ensure that the previous page of lobbies is requested when pressing the up arrow key on the first lobby of a
+        page, but only if there is a previous page.
+        """
+        self.game_state.on_menu = True
+        self.game_controller.menu.viewing_lobbies = True
+        self.game_controller.menu.multiplayer_lobbies = [MagicMock(), MagicMock()]
+        self.game_controller.menu.lobby_page = 1
+        self.game_controller.menu.lobby_page_count = 2
+        self.game_controller.menu.navigate = MagicMock()
+
+        on_key_arrow_up(self.game_controller, self.game_state, False)
+        # Since we're viewing global lobbies, we expect the previous page to have been requested from the global game
+        # server.
+        dispatch_mock.assert_called_with(QueryEvent(EventType.QUERY, self.TEST_IDENTIFIER, page=0),
+                                         self.TEST_EVENT_DISPATCHERS, MultiplayerStatus.GLOBAL)
+        self.game_controller.menu.navigate.assert_not_called()
+
+        # On the first page, the menu should just be navigated as normal.
+        dispatch_mock.reset_mock()
+        self.game_controller.menu.lobby_page = 0
+        on_key_arrow_up(self.game_controller, self.game_state, False)
+        dispatch_mock.assert_not_called()
+        self.game_controller.menu.navigate.assert_called_with(up=True)
+
     def test_arrow_up_construction(self):
         """
         Ensure that the correct method is called when pressing the up arrow key while viewing the construction
@@ -932,15 +988,25 @@ class GameInputHandlerTest(unittest.TestCase):
         on_key_return(self.game_controller, self.game_state)
         self.assertTrue(self.game_controller.menu.in_wiki)
 
+    @patch("source.game_management.game_input_handler.SAVE_WRITER")
+    @patch("source.game_management.game_input_handler.get_stats_store")
     @patch("pyxel.quit")
-    def test_return_select_main_menu_option_exit(self, quit_mock: MagicMock):
+    def test_return_select_main_menu_option_exit(self,
+                                                 quit_mock: MagicMock,
+                                                 get_stats_store_mock: MagicMock,
+                                                 save_writer_mock: MagicMock):
         """
         Ensure that the game is exited after pressing the return key on the main menu with the Exit option selected.
         :param quit_mock: The mock implementation of pyxel.quit().
+        :param get_stats_store_mock: The mock implementation of the get_stats_store() function.
+        :param save_writer_mock: The mock representation of the save writer.
         """
         self.game_state.on_menu = True
         self.game_controller.menu.main_menu_option = MainMenuOption.EXIT
         on_key_return(self.game_controller, self.game_state)
+        # Any unflushed statistics and autosaves should have been written before quitting.
+        get_stats_store_mock.return_value.shutdown.assert_called()
+        save_writer_mock.shutdown.assert_called()
         quit_mock.assert_called()
 
     @patch("source.game_management.game_input_handler.get_identifier", return_value=TEST_IDENTIFIER)
@@ -1567,11 +1633,11 @@ class GameInputHandlerTest(unittest.TestCase):
                                          self.TEST_MULTIPLAYER_CONFIG.multiplayer)
 
     @patch("source.game_management.game_input_handler.save_stats_achievements")
-    @patch("source.game_management.game_input_handler.save_game")
-    def test_return_end_turn(self, save_mock: MagicMock, save_stats_achievements_mock: MagicMock):
+    @patch("source.game_management.game_input_handler.autosave_game")
+    def test_return_end_turn(self, autosave_mock: MagicMock, save_stats_achievements_mock: MagicMock):
         """
         Ensure that the correct state updates occur when pressing the return key to end a turn.
-        :param save_mock: The mock implementation of the save_game() function.
+        :param autosave_mock: The mock implementation of the autosave_game() function.
         :param save_stats_achievements_mock: The mock implementation of the save_stats_achievements() function.
         """
         self.game_state.game_started = True
@@ -1587,7 +1653,7 @@ class GameInputHandlerTest(unittest.TestCase):
         self.game_state.board.overlay.total_settlement_count = 2
 
         on_key_return(self.game_controller, self.game_state)
-        save_mock.assert_called_with(self.game_state, auto=True)
+        autosave_mock.assert_called_with(self.game_state)
         self.assertTrue(self.game_controller.last_turn_time)
         save_stats_achievements_mock.assert_called()
         self.game_state.board.overlay.toggle_ach_notif.assert_called_with(ACHIEVEMENTS[0:2])
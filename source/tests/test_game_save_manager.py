@@ -1,10 +1,13 @@
 import json
 import os
 import pathlib
+import shutil
 import unittest
 from datetime import datetime, timezone
+from io import BytesIO
 from itertools import chain
 from typing import List
+from tempfile import TemporaryDirectory
 from unittest.mock import patch, MagicMock, mock_open
 
 from source.display.board import Board
@@ -15,9 +18,12 @@ from source.foundation.models import GameConfig, Faction, Heathen, Project, Unit
 from source.game_management.game_controller import GameController
 from source.game_management.game_state import GameState
 from source.saving.game_save_manager import save_game, SAVES_DIR, get_saves, load_game, save_stats_achievements, \
-    get_stats, init_app_data, load_save_file, get_save_files
-from source.saving.save_encoder import SaveEncoder
-from source.util.minifier import minify_quad
+    get_stats, init_app_data, load_save_file, get_save_files, get_stats_store, snapshot_game, autosave_game, \
+    get_save_path, write_journal_entry, journal_autosave_game, close_save_journal, SAVE_JOURNALS, write_save, \
+    hibernate_game, revive_game, get_json_saves, convert_json_saves
+from source.saving.save_format import write_binary_save, build_snapshot, encode_header
+from source.saving.save_journal import SaveJournal, get_journal_path
+from source.util.codec import decode_player, decode_heathens
 
 
 class GameSaveManagerTest(unittest.TestCase):
@@ -51,6 +57,7 @@ class GameSaveManagerTest(unittest.TestCase):
         mkdir_mock.assert_called_with(parents=True, exist_ok=True)
 
     @patch("source.saving.game_save_manager.datetime")
+    @patch("os.replace")
     @patch("os.remove")
     @patch("os.path.getmtime")
     @patch("os.listdir")
@@ -60,6 +67,7 @@ class GameSaveManagerTest(unittest.TestCase):
                        listdir_mock: MagicMock,
                        getmtime_mock: MagicMock,
                        remove_mock: MagicMock,
+                       replace_mock: MagicMock,
                        datetime_mock: MagicMock):
         """
         Ensure that when saving a game state, the correct autosave modifications occur, and the correct data is written.
@@ -69,6 +77,7 @@ class GameSaveManagerTest(unittest.TestCase):
         :param getmtime_mock: The mock representation of os.path.getmtime(), which is used to check the file
                               modification times for previous autosaves.
         :param remove_mock: The mock representation of os.remove(), which is used to delete old autosaves.
+        :param replace_mock: The mock representation of os.replace(), which is used to move the written save into place.
         :param datetime_mock: The mock representation of datetime.datetime, which is used to retrieve the current time.
         """
         test_saves = [
@@ -96,29 +105,57 @@ class GameSaveManagerTest(unittest.TestCase):
         cfg: GameConfig = gs.board.game_config
         expected_save_name = os.path.join(
             SAVES_DIR,
-            f"autosave_{timestamp}_{gs.turn}_{cfg.player_count}_{list(Faction).index(cfg.player_faction)}.json"
+            f"autosave_{timestamp}_{gs.turn}_{cfg.player_count}_{list(Faction).index(cfg.player_faction)}.msav"
         )
         # Also determine the data we expect to be saved.
-        expected_save_data = {
-            "quads": list(minify_quad(q) for q in chain.from_iterable(gs.board.quads)),
-            "players": gs.players,
-            "heathens": gs.heathens,
-            "turn": gs.turn,
-            "cfg": cfg,
-            "night_status": {"until": gs.until_night, "remaining": gs.nighttime_left},
-            "game_version": gs.game_version
-        }
-        expected_save_json = json.dumps(expected_save_data, separators=(",", ":"), cls=SaveEncoder)
+        expected_details = SaveDetails(test_time, True, gs.turn, cfg.player_count, cfg.player_faction, False)
+        expected_save_data = BytesIO()
+        write_binary_save(expected_save_data,
+                          build_snapshot(expected_details, gs.game_version, cfg, gs.board.quads, gs.players,
+                                         gs.heathens, gs.turn, gs.until_night, gs.nighttime_left))
 
         save_game(gs, auto=True)
-        # After saving, we expect the oldest autosave to have been deleted, a new save with the correct name to have
-        # been created, and the correct data to have been written to said save.
+        # After saving, we expect the oldest autosave to have been deleted, the correct data to have been written to a
+        # temporary file, and that file to have then been moved into place with the correct name.
         remove_mock.assert_called_with(expected_deleted_autosave)
-        self.assertEqual(expected_save_name, open_mock.call_args[0][0])
-        open_mock.return_value.write.assert_called_with(expected_save_json)
-        open_mock.return_value.close.assert_called()
+        expected_temp_save_name = os.path.join(SAVES_DIR, f".{os.path.basename(expected_save_name)}.tmp")
+        self.assertEqual(expected_temp_save_name, open_mock.call_args[0][0])
+        self.assertEqual("wb", open_mock.call_args[0][1])
+        written = b"".join(c.args[0] for c in open_mock.return_value.write.call_args_list)
+        self.assertEqual(expected_save_data.getvalue(), written)
+        replace_mock.assert_called_with(expected_temp_save_name, expected_save_name)
+
+    def test_snapshot_game(self):
+        """
+        Ensure that a game snapshot is unaffected by changes made to the game after the snapshot has been taken.
+        """
+        self.game_state.players[0].wealth = 10
+        _, snapshot = snapshot_game(self.game_state)
+        self.game_state.players[0].wealth = 20
+        self.game_state.players[0].quads_seen.add((1, 2))
+        self.game_state.heathens[0].health = 50
+        # The first two records of the state section are the metadata and the heathens, followed by the first player
+        # and their seen quads.
+        self.assertEqual(10, decode_player(snapshot.state[2], self.game_state.board.quads).wealth)
+        self.assertFalse(snapshot.state[3])
+        self.assertEqual(1.0, decode_heathens(snapshot.state[1])[0].health)
+        # The board is made up of a record for each row of quads.
+        self.assertEqual(90, len(snapshot.board))
+
+    @patch("source.saving.game_save_manager.SAVE_WRITER")
+    @patch("source.saving.game_save_manager.snapshot_game")
+    def test_autosave_game(self, snapshot_mock: MagicMock, save_writer_mock: MagicMock):
+        """
+        Ensure that autosaving a game takes a snapshot and submits it to the save writer rather than writing it
+        directly.
+        :param snapshot_mock: The mock implementation of the snapshot_game() function.
+        :param save_writer_mock: The mock representation of the save writer.
+        """
+        snapshot_mock.return_value = "autosave.json", {"turn": 1}
+        autosave_game(self.game_state)
+        snapshot_mock.assert_called_with(self.game_state, auto=True)
+        save_writer_mock.submit.assert_called_with("autosave.json", {"turn": 1}, auto=True)
 
-    @patch("os.path.isfile", lambda *args: True)
     def test_save_stats_achievements(self):
         """
         Ensure that the correct statistics and achievements are saved when the method is called.
@@ -150,18 +187,20 @@ class GameSaveManagerTest(unittest.TestCase):
             "factions": {
                 added_faction: 1
             },
-            "achievements": [
+            "achievements": sorted([
                 # Shine In The Dark - because we are simulating winning a game with The Nocturne.
                 ACHIEVEMENTS[23].name,
                 # Chicken Dinner - because we are simulating winning a game.
                 ACHIEVEMENTS[0].name,
                 # Last One Standing - because we are simulating winning an elimination game.
                 ACHIEVEMENTS[4].name
-            ]
+            ])
         }
 
-        # We have to use a context manager for this patch so that we can pass the read_data param to mock_open().
-        with patch("source.saving.game_save_manager.open", mock_open(read_data=sample_stats)) as open_mock:
+        with TemporaryDirectory() as saves_dir, patch("source.saving.game_save_manager.SAVES_DIR", saves_dir):
+            stats_file_name = os.path.join(saves_dir, "statistics.json")
+            with open(stats_file_name, "w", encoding="utf-8") as stats_file:
+                stats_file.write(sample_stats)
             # This method will never be called in this way, with every parameter at once, but it illustrates the same
             # functionality.
             new_achs = save_stats_achievements(self.game_state,
@@ -172,12 +211,11 @@ class GameSaveManagerTest(unittest.TestCase):
                                                faction_to_add=added_faction)
             # We expect the correct new achievements to be returned.
             self.assertEqual([ACHIEVEMENTS[23], ACHIEVEMENTS[0], ACHIEVEMENTS[4]], new_achs)
-            # We expect open() to be called twice - once for reading in the previous values, and once for saving the new
-            # values.
-            self.assertEqual(2, open_mock.call_count)
-            open_mock.return_value.write.assert_called_with(json.dumps(expected_new_stats))
+            # Because new achievements were obtained, we also expect the new values to have been flushed to the file
+            # straight away.
+            with open(stats_file_name, "r", encoding="utf-8") as stats_file:
+                self.assertEqual(expected_new_stats, json.loads(stats_file.read()))
 
-    @patch("os.path.isfile", lambda *args: True)
     def test_save_stats_achievements_existing_victory_faction(self):
         """
         Ensure that the correct statistics and achievements are saved when the method is called and pre-existing
@@ -211,18 +249,20 @@ class GameSaveManagerTest(unittest.TestCase):
             "factions": {
                 faction: 2
             },
-            "achievements": [
+            "achievements": sorted([
                 # Shine In The Dark - because we are simulating winning a game with The Nocturne.
                 ACHIEVEMENTS[23].name,
                 # Chicken Dinner - because we are simulating winning a game.
                 ACHIEVEMENTS[0].name,
                 # Last One Standing - because we are simulating winning an elimination game.
                 ACHIEVEMENTS[4].name
-            ]
+            ])
         }
 
-        # We have to use a context manager for this patch so that we can pass the read_data param to mock_open().
-        with patch("source.saving.game_save_manager.open", mock_open(read_data=sample_stats)) as open_mock:
+        with TemporaryDirectory() as saves_dir, patch("source.saving.game_save_manager.SAVES_DIR", saves_dir):
+            stats_file_name = os.path.join(saves_dir, "statistics.json")
+            with open(stats_file_name, "w", encoding="utf-8") as stats_file:
+                stats_file.write(sample_stats)
             # This method will never be called in this way, with every parameter at once, but it illustrates the same
             # functionality.
             new_achs = save_stats_achievements(self.game_state,
@@ -231,12 +271,9 @@ class GameSaveManagerTest(unittest.TestCase):
                                                faction_to_add=faction)
             # We expect the correct new achievements to be returned.
             self.assertEqual([ACHIEVEMENTS[23], ACHIEVEMENTS[0], ACHIEVEMENTS[4]], new_achs)
-            # We expect open() to be called twice - once for reading in the previous values, and once for saving the new
-            # values.
-            self.assertEqual(2, open_mock.call_count)
-            open_mock.return_value.write.assert_called_with(json.dumps(expected_new_stats))
+            with open(stats_file_name, "r", encoding="utf-8") as stats_file:
+                self.assertEqual(expected_new_stats, json.loads(stats_file.read()))
 
-    @patch("os.path.isfile", lambda *args: True)
     def test_get_stats(self):
         """
         Ensure that the correct statistic values are parsed when the method is called.
@@ -263,8 +300,9 @@ class GameSaveManagerTest(unittest.TestCase):
         }}
         """
 
-        # We have to use a context manager for this patch so that we can pass the read_data param to mock_open().
-        with patch("source.saving.game_save_manager.open", mock_open(read_data=sample_stats)):
+        with TemporaryDirectory() as saves_dir, patch("source.saving.game_save_manager.SAVES_DIR", saves_dir):
+            with open(os.path.join(saves_dir, "statistics.json"), "w", encoding="utf-8") as stats_file:
+                stats_file.write(sample_stats)
             retrieved_stats = get_stats()
             # Each statistic should have been set correctly.
             self.assertEqual(playtime, retrieved_stats.playtime)
@@ -275,6 +313,18 @@ class GameSaveManagerTest(unittest.TestCase):
             self.assertIn(faction, retrieved_stats.factions)
             self.assertEqual(faction_count, retrieved_stats.factions[faction])
 
+    def test_get_stats_store(self):
+        """
+        Ensure that the same statistics store is returned each time, unless the saves directory changes.
+        """
+        with patch("source.saving.game_save_manager.SAVES_DIR", "a"):
+            store = get_stats_store()
+            self.assertEqual(os.path.join("a", "statistics.json"), store.stats_file_name)
+            self.assertIs(store, get_stats_store())
+        with patch("source.saving.game_save_manager.SAVES_DIR", "b"):
+            self.assertIsNot(store, get_stats_store())
+            self.assertEqual(os.path.join("b", "statistics.json"), get_stats_store().stats_file_name)
+
     @patch("source.saving.game_save_manager.SAVES_DIR", "/")
     def test_get_stats_no_file(self):
         """
@@ -755,13 +805,13 @@ class GameSaveManagerTest(unittest.TestCase):
             ".secret_file",
             "save-2023-01-07T13.36.00.json",
             "autosave-2023-01-07T13.37.00.json",
-            "save_1756556735_6_2_1.json",
+            "save_1756556735_6_2_1.msav",
             "autosave_1756556733_6_2_M.json"
         ]
         listdir_mock.return_value = test_saves
-        # We expect the README and the dotfile to be filtered out, and the remaining to have had the .json suffix
-        # removed. Additionally, the save files should have been sorted into autosaves and manual saves, with ordering
-        # by save time in each section.
+        # We expect the README and the dotfile to be filtered out, and the remaining to have had the .json and .msav
+        # suffixes removed. Additionally, the save files should have been sorted into autosaves and manual saves, with
+        # ordering by save time in each section.
         expected_saves: List[str] = [
             "autosave_1756556733_6_2_M",
             "autosave-2023-01-07T13.37.00",
@@ -829,6 +879,209 @@ class GameSaveManagerTest(unittest.TestCase):
 
         self.assertListEqual(expected_saves, get_saves(save_files=test_saves, multi=True))
 
+    def test_get_saves_binary(self):
+        """
+        Ensure that the details for local binary saves are read from their headers, falling back to their file names if
+        the header can't be read.
+        """
+        header_details = SaveDetails(datetime(2025, 8, 30, 12, 0, 0), False, 12, 3, Faction.NOCTURNE, False)
+        with TemporaryDirectory() as saves_dir, patch("source.saving.game_save_manager.SAVES_DIR", saves_dir):
+            # The header deliberately has different details to the file name, to show that it is being used.
+            with open(os.path.join(saves_dir, "save_1756556735_6_2_1.msav"), "wb") as save_file:
+                save_file.write(encode_header(header_details, 4.0))
+            with open(os.path.join(saves_dir, "save_1756546735_6_2_4.msav"), "wb") as save_file:
+                save_file.write(b"corrupt")
+            self.assertListEqual([
+                header_details,
+                SaveDetails(datetime.fromtimestamp(1756546735), auto=False,
+                            turn=6, player_count=2, faction=Faction.RAVENOUS, multiplayer=False)
+            ], get_saves())
+
+    def test_get_save_path(self):
+        """
+        Ensure that binary saves are preferred over JSON saves with the same name, regardless of the extension used to
+        refer to the save.
+        """
+        with TemporaryDirectory() as saves_dir, patch("source.saving.game_save_manager.SAVES_DIR", saves_dir):
+            self.assertEqual(os.path.join(saves_dir, "save_1.json"), get_save_path("save_1.json"))
+            self.assertEqual(os.path.join(saves_dir, "save_1.json"), get_save_path("save_1"))
+            pathlib.Path(os.path.join(saves_dir, "save_1.msav")).touch()
+            self.assertEqual(os.path.join(saves_dir, "save_1.msav"), get_save_path("save_1.json"))
+            self.assertEqual(os.path.join(saves_dir, "save_1.msav"), get_save_path("save_1"))
+
+    def test_save_and_load_binary(self):
+        """
+        Ensure that a saved game can be loaded back in from its binary save file.
+        """
+        self.game_state.turn = 15
+        self.game_state.until_night = 3
+        with TemporaryDirectory() as saves_dir, patch("source.saving.game_save_manager.SAVES_DIR", saves_dir):
+            save_game(self.game_state)
+            save_name: str = os.listdir(saves_dir)[0]
+            self.assertTrue(save_name.endswith(".msav"))
+
+            loaded_state = GameState()
+            # Older clients refer to saves with a JSON extension, so we do the same here.
+            cfg, quads = load_save_file(loaded_state, Namer(), save_name.replace(".msav", ".json"))
+            self.assertEqual(self.TEST_CONFIG, cfg)
+            self.assertEqual(self.game_state.board.quads, quads)
+            self.assertEqual(15, loaded_state.turn)
+            self.assertEqual(3, loaded_state.until_night)
+            self.assertEqual(self.game_state.game_version, loaded_state.game_version)
+            self.assertListEqual([p.name for p in self.game_state.players], [p.name for p in loaded_state.players])
+            self.assertEqual(self.game_state.heathens, loaded_state.heathens)
+
+    @patch("source.saving.game_save_manager.JOURNAL_WRITER")
+    @patch("source.saving.game_save_manager.snapshot_game")
+    def test_journal_autosave_game(self, snapshot_mock: MagicMock, journal_writer_mock: MagicMock):
+        """
+        Ensure that journaled autosaves are submitted to the journal writer, with a journal being kept for the lobby
+        until it is closed.
+        :param snapshot_mock: The mock implementation of the snapshot_game() function.
+        :param journal_writer_mock: The mock representation of the journal writer.
+        """
+        snapshot_mock.return_value = "autosave.msav", {"turn": 1}
+        # The snapshot should be returned so that the game server can keep track of the game's size.
+        self.assertDictEqual({"turn": 1}, journal_autosave_game(self.game_state, "Lobby"))
+        snapshot_mock.assert_called_with(self.game_state, auto=True)
+        journal_writer_mock.submit.assert_called_with("Lobby", {"turn": 1}, auto=True)
+        journal: SaveJournal = SAVE_JOURNALS["Lobby"]
+        # The same journal should be used for subsequent autosaves.
+        journal_autosave_game(self.game_state, "Lobby")
+        self.assertIs(journal, SAVE_JOURNALS["Lobby"])
+        close_save_journal("Lobby")
+        self.assertNotIn("Lobby", SAVE_JOURNALS)
+
+    def test_write_journal_entry(self):
+        """
+        Ensure that the first journaled autosave for a lobby is written as a checkpoint, with subsequent autosaves being
+        appended to its journal, and that the game is loaded with the journal replayed.
+        """
+        self.game_state.turn = 15
+        with TemporaryDirectory() as saves_dir, patch("source.saving.game_save_manager.SAVES_DIR", saves_dir):
+            # Nothing should be written for lobbies without a journal.
+            write_journal_entry("Lobby", snapshot_game(self.game_state, auto=True)[1], True)
+            self.assertFalse(os.listdir(saves_dir))
+
+            SAVE_JOURNALS["Lobby"] = SaveJournal()
+            write_journal_entry("Lobby", snapshot_game(self.game_state, auto=True)[1], True)
+            checkpoint_name: str = next(f for f in os.listdir(saves_dir) if f.endswith(".msav"))
+            checkpoint_size: int = os.path.getsize(os.path.join(saves_dir, checkpoint_name))
+            self.game_state.turn = 16
+            self.game_state.players[0].wealth = 50
+            write_journal_entry("Lobby", snapshot_game(self.game_state, auto=True)[1], True)
+            close_save_journal("Lobby")
+
+            # The checkpoint should not have been rewritten, but should have been relabelled with the latest journaled
+            # turn, and the journal should not be listed as a save.
+            relabelled_name: str = checkpoint_name.replace("_15_", "_16_")
+            self.assertEqual(checkpoint_size, os.path.getsize(os.path.join(saves_dir, relabelled_name)))
+            self.assertListEqual([relabelled_name.removesuffix(".msav")], get_save_files())
+            self.assertEqual(16, get_saves()[0].turn)
+            self.assertFalse(os.path.isfile(get_journal_path(os.path.join(saves_dir, checkpoint_name))))
+            loaded_state = GameState()
+            load_save_file(loaded_state, Namer(), relabelled_name)
+            self.assertEqual(16, loaded_state.turn)
+            self.assertEqual(50, loaded_state.players[0].wealth)
+
+    def test_hibernate_and_revive_game(self):
+        """
+        Ensure that a hibernated game is saved where it won't be listed, and that it can be revived, with its save being
+        removed once it has been.
+        """
+        self.game_state.turn = 20
+        with TemporaryDirectory() as saves_dir, patch("source.saving.game_save_manager.SAVES_DIR", saves_dir):
+            save_path: str = hibernate_game(self.game_state, "Lobby")
+            self.assertEqual(os.path.join(saves_dir, ".hibernated-Lobby.msav"), save_path)
+            self.assertTrue(os.path.isfile(save_path))
+            self.assertListEqual([], get_save_files())
+
+            revived_state = GameState()
+            cfg, quads = revive_game(revived_state, Namer(), save_path)
+            self.assertEqual(self.TEST_CONFIG, cfg)
+            self.assertEqual(self.game_state.board.quads, quads)
+            self.assertEqual(20, revived_state.turn)
+            self.assertListEqual([p.name for p in self.game_state.players], [p.name for p in revived_state.players])
+            self.assertFalse(os.path.isfile(save_path))
+
+    def test_write_save_removes_journal(self):
+        """
+        Ensure that when the oldest autosave is deleted to make room for a new one, its journal is deleted too.
+        """
+        with TemporaryDirectory() as saves_dir, patch("source.saving.game_save_manager.SAVES_DIR", saves_dir):
+            for idx in range(3):
+                _, snapshot = snapshot_game(self.game_state, auto=True)
+                save_name: str = os.path.join(saves_dir, f"autosave_{idx}_1_4_3.msav")
+                write_save(save_name, snapshot, auto=True)
+                os.utime(save_name, (idx, idx))
+            journal_path: str = get_journal_path(os.path.join(saves_dir, "autosave_0_1_4_3.msav"))
+            pathlib.Path(journal_path).touch()
+            os.utime(journal_path, (0, 0))
+            write_save(os.path.join(saves_dir, "autosave_3_1_4_3.msav"), snapshot, auto=True)
+            self.assertSetEqual({"autosave_1_1_4_3.msav", "autosave_2_1_4_3.msav", "autosave_3_1_4_3.msav"},
+                                set(os.listdir(saves_dir)))
+
+    def test_write_save_keeps_active_checkpoints(self):
+        """
+        Ensure that when making room for a new autosave, the checkpoints of lobbies that are still being journaled are
+        never deleted, and that checkpoints are ranked by the time their journal was last written to.
+        """
+        with TemporaryDirectory() as saves_dir, patch("source.saving.game_save_manager.SAVES_DIR", saves_dir):
+            _, snapshot = snapshot_game(self.game_state, auto=True)
+            # The oldest checkpoint belongs to a lobby that is still active, and the next oldest belongs to a lobby
+            # that was closed, but journaled to more recently than the single player autosaves.
+            save_names: List[str] = ["autosave_0_1_4_M.msav", "autosave_1_1_4_M.msav",
+                                     "autosave_2_1_4_3.msav", "autosave_3_1_4_3.msav"]
+            for idx, save_name in enumerate(save_names):
+                write_save(os.path.join(saves_dir, save_name), snapshot, auto=False)
+                os.utime(os.path.join(saves_dir, save_name), (idx, idx))
+            for idx, save_name in enumerate(save_names[:2]):
+                journal_path: str = get_journal_path(os.path.join(saves_dir, save_name))
+                pathlib.Path(journal_path).touch()
+                os.utime(journal_path, (10 + idx, 10 + idx))
+            SAVE_JOURNALS["Active"] = SaveJournal()
+            SAVE_JOURNALS["Active"].checkpoint_path = os.path.join(saves_dir, save_names[0])
+            SAVE_JOURNALS["Unstarted"] = SaveJournal()
+
+            write_save(os.path.join(saves_dir, "autosave_4_1_4_3.msav"), snapshot, auto=True)
+            close_save_journal("Active")
+            close_save_journal("Unstarted")
+            # The oldest single player autosave should have been deleted, leaving the active checkpoint and the more
+            # recently journaled checkpoint alone.
+            self.assertSetEqual({"autosave_0_1_4_M.msav", ".autosave_0_1_4_M.mjnl", "autosave_1_1_4_M.msav",
+                                 ".autosave_1_1_4_M.mjnl", "autosave_3_1_4_3.msav", "autosave_4_1_4_3.msav"},
+                                set(os.listdir(saves_dir)))
+
+            # Once the lobby has been closed, its checkpoint is rotated like any other autosave, with the extra
+            # autosaves left over from while it was active being deleted too.
+            write_save(os.path.join(saves_dir, "autosave_5_1_4_3.msav"), snapshot, auto=True)
+            self.assertSetEqual({"autosave_1_1_4_M.msav", ".autosave_1_1_4_M.mjnl",
+                                 "autosave_4_1_4_3.msav", "autosave_5_1_4_3.msav"},
+                                set(os.listdir(saves_dir)))
+
+    def test_convert_json_saves(self):
+        """
+        Ensure that only JSON saves are found for conversion, and that valid ones are converted to binary saves, with
+        the originals kept as hidden backups.
+        """
+        with TemporaryDirectory() as saves_dir, patch("source.saving.game_save_manager.SAVES_DIR", saves_dir):
+            shutil.copy("source/tests/resources/save-test.json", os.path.join(saves_dir, "save_1756556735_6_2_1.json"))
+            shutil.copy("source/tests/resources/save-invalid.json", os.path.join(saves_dir, "save-invalid.json"))
+            pathlib.Path(os.path.join(saves_dir, "statistics.json")).touch()
+            pathlib.Path(os.path.join(saves_dir, "autosave_1_2_3_4.msav")).touch()
+            # Creating the directories should never convert saves, since that would hold up the game starting.
+            init_app_data()
+            self.assertEqual(4, len(os.listdir(saves_dir)))
+
+            json_saves: List[str] = get_json_saves()
+            self.assertSetEqual({"save_1756556735_6_2_1.json", "save-invalid.json"}, set(json_saves))
+            convert_json_saves(json_saves)
+            # The valid save should have been converted, and given the correct turn and faction in its name, while the
+            # invalid save and everything else should have been left alone.
+            self.assertSetEqual({"save_1756556735_26_2_5.msav", ".save_1756556735_6_2_1.json", "save-invalid.json",
+                                 "statistics.json", "autosave_1_2_3_4.msav"}, set(os.listdir(saves_dir)))
+            # Only the invalid save should be left to convert next time.
+            self.assertListEqual(["save-invalid.json"], get_json_saves())
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+from unittest.mock import MagicMock, patch, call
+
+from source.display.image_banks import ImageBankManager, IMAGE_RESOURCES
+
+
+@patch("pyxel.Image", MagicMock())
+@patch("pyxel.images", [MagicMock(), MagicMock(), MagicMock()])
+class ImageBankManagerTest(unittest.TestCase):
+    """
+    The test class for image_banks.py.
+    """
+
+    def setUp(self) -> None:
+        """
+        Initialise a manager with nothing loaded.
+        """
+        self.manager = ImageBankManager()
+
+    @patch("pyxel.load")
+    def test_load_all(self, load_mock: MagicMock):
+        """
+        Ensure that every resource file is loaded and cached, with just the banks each file uses being cached.
+        :param load_mock: The mock implementation of pyxel.load().
+        """
+        self.manager.load_all()
+        load_mock.assert_has_calls([call(path, exclude_tilemaps=True, exclude_sounds=True, exclude_musics=True)
+                                    for path in IMAGE_RESOURCES])
+        self.assertEqual(1, len(self.manager.cached_images["resources/sprites.pyxres"]))
+        self.assertEqual(3, len(self.manager.cached_images["resources/background2.pyxres"]))
+        # Every bank should now contain the images from the last file that was loaded.
+        self.assertListEqual([("resources/background2.pyxres", idx) for idx in range(3)], self.manager.resident)
+
+    @patch("pyxel.load")
+    def test_preload(self, load_mock: MagicMock):
+        """
+        Ensure that preloading a resource file only loads it if it hasn't been loaded before, including by load_all().
+        :param load_mock: The mock implementation of pyxel.load().
+        """
+        self.manager.preload("resources/sprites.pyxres")
+        self.manager.preload("resources/sprites.pyxres")
+        load_mock.assert_called_once()
+        self.manager.load_all()
+        self.assertEqual(len(IMAGE_RESOURCES), load_mock.call_count)
+
+    @patch("pyxel.load")
+    def test_use(self, load_mock: MagicMock):
+        """
+        Ensure that using a resource file loads it if it hasn't been loaded before, and otherwise only copies the cached
+        images that aren't already in pyxel's image banks.
+        :param load_mock: The mock implementation of pyxel.load().
+        """
+        self.manager.use("resources/sprites.pyxres")
+        load_mock.assert_called_once()
+        self.manager.use("resources/background1.pyxres")
+        self.manager.use("resources/sprites.pyxres")
+        self.assertEqual(2, load_mock.call_count)
+
+        with patch("pyxel.images", [MagicMock(), MagicMock(), MagicMock()]) as images:
+            # Using the background again should only require the first bank to be copied in, since the sprites don't
+            # use the others.
+            self.manager.use("resources/background1.pyxres")
+            images[0].blt.assert_called_once()
+            images[1].blt.assert_not_called()
+            images[2].blt.assert_not_called()
+            # Using the background another time should do nothing at all.
+            self.manager.use("resources/background1.pyxres")
+            images[0].blt.assert_called_once()
+        # Neither file should have been loaded from disk again.
+        self.assertEqual(2, load_mock.call_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
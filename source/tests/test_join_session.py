@@ -0,0 +1,142 @@
+import unittest
+from typing import Callable, List
+from unittest.mock import MagicMock, patch
+
+from source.foundation.catalogue import FACTION_COLOURS, get_heathen_plan
+from source.foundation.models import Quad, Biome, Player, Faction, Settlement, ResourceCollection, Heathen
+from source.game_management.game_state import GameState
+from source.networking.events import JoinEvent, EventType
+from source.networking.join_session import JoinSession
+from source.util.minifier import minify_quad, minify_player, minify_quads_seen, minify_heathens
+
+
+class JoinSessionTest(unittest.TestCase):
+    """
+    The test class for join_session.py.
+    """
+    TEST_QUAD: Quad = Quad(Biome.FOREST, 0, 0, 0, 0, (0, 0))
+    TEST_HEATHEN: Heathen = Heathen(40.0, 3, (9, 9), get_heathen_plan(0))
+
+    def setUp(self) -> None:
+        """
+        Set up a game state with an empty board and two players yet to be loaded, along with a session to load them.
+        """
+        self.game_state: GameState = GameState()
+        self.game_state.board = MagicMock()
+        self.game_state.board.quads = [[None] * 100 for _ in range(90)]
+        self.game_state.players = [Player("Uno", Faction.AGRICULTURISTS, FACTION_COLOURS[Faction.AGRICULTURISTS]),
+                                   Player("Dos", Faction.FRONTIERSMEN, FACTION_COLOURS[Faction.FRONTIERSMEN])]
+        self.namer: MagicMock = MagicMock()
+        self.on_loaded: MagicMock = MagicMock()
+        # The commands handed to the main thread, which are only applied when the test runs them.
+        self.main_thread_commands: List[Callable[[], None]] = []
+        self.session: JoinSession = JoinSession(self.game_state, self.namer, player_count=2, heathens_required=True,
+                                                on_loaded=self.on_loaded,
+                                                run_on_main_thread=self.main_thread_commands.append)
+        self.quad_chunk: str = (minify_quad(self.TEST_QUAD) + ",") * 100
+
+    def build_event(self, **chunk) -> JoinEvent:
+        """
+        Build a join event containing the given chunk of game state.
+        :param chunk: The chunk attributes to populate in the event.
+        :return: The join event.
+        """
+        return JoinEvent(EventType.JOIN, 123, "Lobby", Faction.FRONTIERSMEN, **chunk)
+
+    def run_main_thread_commands(self):
+        """
+        Run the commands handed to the main thread, in order.
+        """
+        for command in self.main_thread_commands:
+            command()
+        self.main_thread_commands.clear()
+
+    @patch("source.networking.join_session.Thread")
+    def test_receive(self, thread_mock: MagicMock):
+        """
+        Ensure that received chunks are queued for inflation, with the inflation thread only being started if it isn't
+        already running.
+        """
+        self.session.receive(self.build_event(quad_chunk=self.quad_chunk, quad_chunk_idx=4))
+        self.session.receive(self.build_event(player_chunk="player", player_chunk_idx=1))
+        self.session.receive(self.build_event(quads_seen_chunk="1-1", total_quads_seen=10, player_chunk_idx=0))
+        # Even though there are no heathens, their chunk should still be queued.
+        self.session.receive(self.build_event(heathens_chunk="", total_heathens=0))
+
+        self.assertDictEqual({4: self.quad_chunk}, self.session.pending_quad_chunks)
+        self.assertDictEqual({1: "player"}, self.session.pending_players)
+        self.assertListEqual([(0, "1-1")], self.session.pending_quads_seen)
+        self.assertEqual("", self.session.pending_heathens)
+        self.assertEqual(10, self.session.loaded_state.total_quads_seen)
+        self.assertEqual(0, self.session.loaded_state.total_heathens)
+        thread_mock.assert_called_once_with(target=self.session.inflate_pending, daemon=True)
+        thread_mock.return_value.start.assert_called_once()
+
+    @patch("source.networking.join_session.Thread")
+    def test_inflate_pending_out_of_order(self, _: MagicMock):
+        """
+        Ensure that chunks received out of order or more than once are inflated correctly, with the game only being
+        considered loaded once sufficient game state has been inflated.
+        """
+        first_player: Player = Player("Uno", Faction.AGRICULTURISTS, FACTION_COLOURS[Faction.AGRICULTURISTS],
+                                      settlements=[Settlement("Testville", (0, 0), [], [self.TEST_QUAD],
+                                                              ResourceCollection(), [])])
+        second_player: Player = Player("Dos", Faction.FRONTIERSMEN, FACTION_COLOURS[Faction.FRONTIERSMEN])
+
+        # The heathens and seen quads arrive first, followed by the players and then the quads.
+        self.session.receive(self.build_event(heathens_chunk=minify_heathens([self.TEST_HEATHEN]), total_heathens=1))
+        for player_idx in range(2):
+            self.session.receive(self.build_event(quads_seen_chunk=minify_quads_seen({(1, 1)}), total_quads_seen=2,
+                                                  player_chunk_idx=player_idx))
+        self.session.receive(self.build_event(player_chunk=minify_player(first_player), player_chunk_idx=0))
+        self.session.receive(self.build_event(player_chunk=minify_player(second_player), player_chunk_idx=1))
+        for chunk_idx in range(89):
+            self.session.receive(self.build_event(quad_chunk=self.quad_chunk, quad_chunk_idx=chunk_idx))
+        # The first chunk is received twice.
+        self.session.receive(self.build_event(quad_chunk=self.quad_chunk, quad_chunk_idx=0))
+        self.session.inflate_pending()
+
+        # Nothing should be applied to the game state until the main thread applies the inflated batch.
+        self.assertListEqual([], self.game_state.heathens)
+        self.assertIsNone(self.game_state.board.quads[0][0])
+        self.assertEqual(0, self.session.loaded_state.quad_chunks_loaded)
+        self.assertEqual(1, len(self.main_thread_commands))
+        self.run_main_thread_commands()
+
+        # Only the heathens and quads could be inflated, since the last quad chunk is yet to be received.
+        self.assertListEqual([self.TEST_HEATHEN], self.game_state.heathens)
+        self.assertEqual(89, self.session.loaded_state.quad_chunks_loaded)
+        self.assertEqual(0, self.session.loaded_state.players_loaded)
+        self.assertFalse(self.session.inflating)
+        self.on_loaded.assert_not_called()
+
+        self.session.receive(self.build_event(quad_chunk=self.quad_chunk, quad_chunk_idx=89))
+        self.session.inflate_pending()
+        self.on_loaded.assert_not_called()
+        self.run_main_thread_commands()
+
+        # Now that every quad has been inflated, the players and their seen quads should have been as well.
+        self.assertEqual(90, self.session.loaded_state.quad_chunks_loaded)
+        self.assertTrue(all(quad is not None for row in self.game_state.board.quads for quad in row))
+        self.assertEqual((5, 89), self.game_state.board.quads[89][5].location)
+        self.assertEqual(2, self.session.loaded_state.players_loaded)
+        self.assertEqual("Testville", self.game_state.players[0].settlements[0].name)
+        self.namer.remove_settlement_name.assert_called_with("Testville", Biome.FOREST)
+        self.assertSetEqual({(1, 1)}, self.game_state.players[1].quads_seen)
+        self.assertEqual(2, self.session.loaded_state.quads_seen_loaded)
+        self.assertEqual(2, self.session.loaded_state.players_with_quads_seen)
+        self.assertTrue(self.session.loaded)
+        self.on_loaded.assert_called_once()
+
+        # Seen quads received after the game has loaded should still be inflated, without the game being entered again.
+        self.session.receive(self.build_event(quads_seen_chunk=minify_quads_seen({(2, 2)}), total_quads_seen=3,
+                                              player_chunk_idx=1))
+        self.session.inflate_pending()
+        self.run_main_thread_commands()
+        self.assertSetEqual({(1, 1), (2, 2)}, self.game_state.players[1].quads_seen)
+        self.assertEqual(2, self.session.loaded_state.players_with_quads_seen)
+        self.on_loaded.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import json
+import unittest
+
+from source.foundation.models import LobbyDetails, GameConfig, Faction, MultiplayerStatus, PlayerDetails
+from source.networking.lobby_directory import LobbyDirectory, LOBBIES_PER_PAGE
+
+
+class LobbyDirectoryTest(unittest.TestCase):
+    """
+    The test class for lobby_directory.py.
+    """
+    TEST_CONFIG = GameConfig(2, Faction.AGRICULTURISTS, True, True, True, MultiplayerStatus.GLOBAL)
+
+    def setUp(self) -> None:
+        """
+        Instantiate an empty LobbyDirectory before each test.
+        """
+        self.directory = LobbyDirectory()
+
+    def _add_lobbies(self, count: int):
+        """
+        Add the given number of lobbies to the directory, named by their index.
+        :param count: The number of lobbies to add.
+        """
+        for i in range(count):
+            self.directory.update(LobbyDetails(f"Lobby {i}", [], self.TEST_CONFIG, None))
+
+    def test_update_and_remove(self):
+        """
+        Ensure that lobbies are added, replaced, and removed correctly, keeping the order in which they were added.
+        """
+        self._add_lobbies(2)
+        updated: LobbyDetails = LobbyDetails("Lobby 0", [PlayerDetails("Tester", Faction.GODLESS, 123)],
+                                             self.TEST_CONFIG, 3)
+        self.directory.update(updated)
+        self.assertListEqual(["Lobby 0", "Lobby 1"], list(self.directory.lobbies))
+        self.assertIs(updated, self.directory.lobbies["Lobby 0"])
+
+        self.directory.remove("Lobby 0")
+        # Removing a lobby that isn't in the directory should do nothing.
+        self.directory.remove("Lobby 0")
+        self.assertListEqual(["Lobby 1"], list(self.directory.lobbies))
+
+    def test_get_page_count(self):
+        """
+        Ensure that the page count reflects the number of lobbies, and that there is always at least one page.
+        """
+        self.assertEqual(1, self.directory.get_page_count())
+        self._add_lobbies(LOBBIES_PER_PAGE)
+        self.assertEqual(1, self.directory.get_page_count())
+        self._add_lobbies(LOBBIES_PER_PAGE * 2)
+        self.assertEqual(2, self.directory.get_page_count())
+        self.directory.update(LobbyDetails("Extra", [], self.TEST_CONFIG, None))
+        self.assertEqual(3, self.directory.get_page_count())
+
+    def test_get_page(self):
+        """
+        Ensure that each page contains the correct lobbies, with pages outside the directory being clamped.
+        """
+        self._add_lobbies(LOBBIES_PER_PAGE + 3)
+
+        first_page = json.loads(self.directory.get_page(0))
+        self.assertIsNone(first_page["identifier"])
+        self.assertEqual(0, first_page["page"])
+        self.assertEqual(2, first_page["page_count"])
+        self.assertListEqual([f"Lobby {i}" for i in range(LOBBIES_PER_PAGE)],
+                             [lobby["name"] for lobby in first_page["lobbies"]])
+
+        last_page = json.loads(self.directory.get_page(1))
+        self.assertEqual(1, last_page["page"])
+        self.assertListEqual([f"Lobby {i}" for i in range(LOBBIES_PER_PAGE, LOBBIES_PER_PAGE + 3)],
+                             [lobby["name"] for lobby in last_page["lobbies"]])
+
+        self.assertEqual(self.directory.get_page(1), self.directory.get_page(5))
+        self.assertEqual(self.directory.get_page(0), self.directory.get_page(-1))
+
+    def test_get_page_empty(self):
+        """
+        Ensure that an empty directory still has a page, albeit one with no lobbies.
+        """
+        page = json.loads(self.directory.get_page(0))
+        self.assertEqual(0, page["page"])
+        self.assertEqual(1, page["page_count"])
+        self.assertListEqual([], page["lobbies"])
+
+    def test_get_page_cached(self):
+        """
+        Ensure that pages are only encoded once until a lobby changes.
+        """
+        self._add_lobbies(2)
+        encoded: bytes = self.directory.get_page(0)
+        self.assertIs(encoded, self.directory.get_page(0))
+
+        # Updating a lobby should invalidate the cached page.
+        self.directory.update(LobbyDetails("Lobby 1", [], self.TEST_CONFIG, 2))
+        self.assertFalse(self.directory.pages)
+        updated: bytes = self.directory.get_page(0)
+        self.assertNotEqual(encoded, updated)
+        self.assertEqual(2, json.loads(updated)["lobbies"][1]["current_turn"])
+
+        # As should removing one.
+        self.directory.remove("Lobby 0")
+        self.assertFalse(self.directory.pages)
+        self.assertEqual(1, len(json.loads(self.directory.get_page(0))["lobbies"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from source.foundation.models import HibernatedLobby
+from source.networking.lobby_tracker import LobbyTracker, LOBBY_IDLE_TIMEOUT, LOBBY_MEMORY_BUDGET, LOBBY_MIN_IDLE, \
+    LOBBY_SWEEP_INTERVAL
+
+
+class LobbyTrackerTest(unittest.TestCase):
+    """
+    The test class for lobby_tracker.py.
+    """
+    TEST_HIBERNATED_LOBBY = HibernatedLobby("hibernated.msav", {123})
+
+    @patch("time.monotonic", return_value=0)
+    def setUp(self, _: MagicMock) -> None:
+        """
+        Instantiate an empty LobbyTracker before each test.
+        :param _: The unused mock implementation of time.monotonic().
+        """
+        self.tracker = LobbyTracker()
+
+    def test_touch(self):
+        """
+        Ensure that lobbies are ordered from the least to the most recently active.
+        """
+        self.tracker.touch("Alpha")
+        self.tracker.touch("Beta")
+        self.tracker.touch("Alpha")
+        self.assertListEqual(["Beta", "Alpha"], list(self.tracker.last_active))
+
+    def test_sizes(self):
+        """
+        Ensure that the total size only includes the games that haven't been hibernated or closed.
+        """
+        self.tracker.record_size("Alpha", 100)
+        self.tracker.record_size("Beta", 200)
+        self.tracker.record_size("Gamma", 400)
+        self.assertEqual(700, self.tracker.get_total_size())
+
+        self.tracker.hibernate("Beta", self.TEST_HIBERNATED_LOBBY)
+        self.tracker.remove("Gamma")
+        self.assertEqual(100, self.tracker.get_total_size())
+
+    def test_hibernate_and_remove(self):
+        """
+        Ensure that hibernated lobbies are no longer tracked as active, and that closed lobbies are no longer tracked at
+        all.
+        """
+        self.tracker.touch("Alpha")
+        self.tracker.hibernate("Alpha", self.TEST_HIBERNATED_LOBBY)
+        self.assertDictEqual({}, self.tracker.last_active)
+        self.assertDictEqual({"Alpha": self.TEST_HIBERNATED_LOBBY}, self.tracker.hibernated)
+
+        self.tracker.remove("Alpha")
+        # Removing a lobby that isn't tracked shouldn't do anything.
+        self.tracker.remove("Alpha")
+        self.assertDictEqual({}, self.tracker.hibernated)
+
+    @patch("time.monotonic")
+    def test_sweep_due(self, monotonic_mock: MagicMock):
+        """
+        Ensure that lobbies are only due to be checked once per sweep interval.
+        :param monotonic_mock: The mock implementation of time.monotonic().
+        """
+        monotonic_mock.return_value = LOBBY_SWEEP_INTERVAL - 1
+        self.assertFalse(self.tracker.sweep_due())
+        monotonic_mock.return_value = LOBBY_SWEEP_INTERVAL
+        self.assertTrue(self.tracker.sweep_due())
+        self.assertFalse(self.tracker.sweep_due())
+
+    @patch("time.monotonic")
+    def test_get_idle_lobbies(self, monotonic_mock: MagicMock):
+        """
+        Ensure that lobbies are considered idle once the idle timeout has passed.
+        :param monotonic_mock: The mock implementation of time.monotonic().
+        """
+        monotonic_mock.return_value = 0
+        self.tracker.touch("Alpha")
+        monotonic_mock.return_value = 10
+        self.tracker.touch("Beta")
+
+        monotonic_mock.return_value = LOBBY_IDLE_TIMEOUT
+        self.assertListEqual(["Alpha"], self.tracker.get_idle_lobbies())
+        monotonic_mock.return_value = LOBBY_IDLE_TIMEOUT + 10
+        self.assertListEqual(["Alpha", "Beta"], self.tracker.get_idle_lobbies())
+
+    @patch("time.monotonic")
+    def test_get_idle_lobbies_over_budget(self, monotonic_mock: MagicMock):
+        """
+        Ensure that when the games in memory exceed the memory budget, the least recently active lobbies are considered
+        idle until the budget is met, as long as they have been idle for the minimum time.
+        :param monotonic_mock: The mock implementation of time.monotonic().
+        """
+        monotonic_mock.return_value = 0
+        self.tracker.touch("Alpha")
+        self.tracker.touch("Beta")
+        self.tracker.touch("Gamma")
+        self.tracker.record_size("Alpha", LOBBY_MEMORY_BUDGET // 2)
+        self.tracker.record_size("Beta", LOBBY_MEMORY_BUDGET // 2)
+        self.tracker.record_size("Gamma", LOBBY_MEMORY_BUDGET // 2)
+
+        # None of the lobbies have been idle for long enough yet.
+        monotonic_mock.return_value = LOBBY_MIN_IDLE - 1
+        self.assertListEqual([], self.tracker.get_idle_lobbies())
+        # Hibernating the least recently active lobby should be enough to get back within the budget.
+        monotonic_mock.return_value = LOBBY_MIN_IDLE
+        self.assertListEqual(["Alpha"], self.tracker.get_idle_lobbies())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -164,6 +164,25 @@ class MinifierTest(unittest.TestCase):
         expected_minification: str = "1-2,3-4,5-6"
         self.assertEqual(expected_minification, minify_quads_seen(test_quads_seen))
 
+    def test_minify_quads_seen_runs(self):
+        """
+        Ensure that contiguous areas of seen quads are minified as runs of unseen and seen quads.
+        """
+        # Ten quads in each of the first two rows, as well as one quad outside the board which should be excluded.
+        test_quads_seen: Set[Location] = {(x, y) for x in range(10, 20) for y in range(2)} | {(100, 0)}
+        # We expect 10 unseen quads, then 10 seen ones, then the 90 unseen quads until the same spot in the next row,
+        # followed by 10 more seen ones.
+        self.assertEqual("R10.10.90.10", minify_quads_seen(test_quads_seen))
+
+    def test_minify_quads_seen_bitmap(self):
+        """
+        Ensure that large scattered sets of seen quads are minified as a bitmap that fits in a single packet.
+        """
+        test_quads_seen: Set[Location] = {(x, y) for x in range(0, 100, 2) for y in range(90)}
+        minified: str = minify_quads_seen(test_quads_seen)
+        self.assertTrue(minified.startswith("B"))
+        self.assertEqual(1501, len(minified))
+
     def test_minify_heathens(self):
         """
         Ensure that heathens are correctly minified.
@@ -290,6 +309,16 @@ class MinifierTest(unittest.TestCase):
         expected_quads_seen: Set[Location] = {(1, 2), (3, 4), (5, 6)}
         self.assertSetEqual(expected_quads_seen, inflate_quads_seen(test_minified_quads_seen))
 
+    def test_inflate_quads_seen_compact(self):
+        """
+        Ensure that seen quads minified as runs or as a bitmap are correctly inflated.
+        """
+        self.assertSetEqual({(x, y) for x in range(10, 20) for y in range(2)}, inflate_quads_seen("R10.10.90.10"))
+        # Runs starting with a seen quad, as well as seen quads extending across rows, should also be inflated.
+        self.assertSetEqual({(0, 0), (1, 0), (99, 0), (0, 1)}, inflate_quads_seen("R0.2.97.2"))
+        test_quads_seen: Set[Location] = {(x, y) for x in range(0, 100, 2) for y in range(90)} | {(99, 89)}
+        self.assertSetEqual(test_quads_seen, inflate_quads_seen(minify_quads_seen(test_quads_seen)))
+
     def test_inflate_heathens(self):
         """
         Ensure that heathens are correctly inflated.
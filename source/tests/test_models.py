@@ -1,7 +1,7 @@
 import unittest
 from datetime import datetime
 
-from source.foundation.models import SaveDetails
+from source.foundation.models import SaveDetails, LoadedMultiplayerState, SaveSnapshot
 
 
 class ModelsTest(unittest.TestCase):
@@ -18,6 +18,33 @@ class ModelsTest(unittest.TestCase):
         self.assertEqual("1970-01-02 03:04:05", save.get_formatted_name())
         self.assertEqual("1980-02-03 04:05:06 (auto)", autosave.get_formatted_name())
 
+    def test_loaded_multiplayer_state_is_loaded(self):
+        """
+        Ensure that a multiplayer game is only considered loaded once every quad chunk and player, some seen quads for
+        each player, and the heathens if required, have been loaded.
+        """
+        loaded_state: LoadedMultiplayerState = LoadedMultiplayerState(total_players=2, heathens_required=True)
+        self.assertFalse(loaded_state.is_loaded())
+        loaded_state.quad_chunks_loaded = 90
+        loaded_state.players_loaded = 2
+        self.assertFalse(loaded_state.is_loaded())
+        loaded_state.players_with_quads_seen = 2
+        self.assertFalse(loaded_state.is_loaded())
+        loaded_state.heathens_loaded = True
+        self.assertTrue(loaded_state.is_loaded())
+        # The heathens don't matter if they're not required.
+        loaded_state.heathens_loaded = False
+        loaded_state.heathens_required = False
+        self.assertTrue(loaded_state.is_loaded())
+
+    def test_save_snapshot_size(self):
+        """
+        Ensure that the size of a save snapshot is the total length of its lines.
+        """
+        snapshot: SaveSnapshot = SaveSnapshot(SaveDetails(datetime(1970, 1, 2), auto=True), 4.0,
+                                              board=["abc", "de"], state=["fghi"])
+        self.assertEqual(9, snapshot.get_size())
+
 
 if __name__ == '__main__':
     unittest.main()
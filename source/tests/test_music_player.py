@@ -1,7 +1,7 @@
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
-from source.util.music_player import MusicPlayer
+from source.util.music_player import MusicPlayer, VOLUME, FADE_STEP_INTERVAL
 
 
 class MusicPlayerTest(unittest.TestCase):
@@ -15,77 +15,122 @@ class MusicPlayerTest(unittest.TestCase):
         """
         self.music_player = MusicPlayer()
 
+    def test_init(self):
+        """
+        Ensure that every in-game track is shuffled, but none are opened until required.
+        """
+        self.assertEqual(8, len(self.music_player.game_tracks))
+        self.assertEqual(8, len(set(self.music_player.game_tracks)))
+        self.assertFalse(self.music_player.game_players)
+        self.assertFalse(self.music_player.is_playing())
+
     def test_play_menu(self):
         """
-        Ensure that playing the menu music sets the volume and plays the menu player accordingly.
+        Ensure that playing the menu music sets the volume and plays the menu player accordingly, cancelling any fade.
         """
         self.music_player.menu_player.audio_set_volume = MagicMock()
         self.music_player.menu_player.play = MagicMock()
+        self.music_player.stop_menu_music()
 
         self.music_player.play_menu_music()
-        self.music_player.menu_player.audio_set_volume.assert_called_with(70)
+        self.music_player.menu_player.audio_set_volume.assert_called_with(VOLUME)
         self.music_player.menu_player.play.assert_called()
+        self.assertFalse(self.music_player.fades)
 
-    def test_stop_menu(self):
+    @patch("time.time")
+    def test_stop_menu(self, time_mock: MagicMock):
         """
-        Ensure that stopping the menu music gradually reduces the volume and pauses the menu player.
+        Ensure that stopping the menu music gradually reduces the volume and pauses the menu player, without blocking.
+        :param time_mock: The mock implementation of time.time().
         """
         self.music_player.menu_player.audio_set_volume = MagicMock()
         self.music_player.menu_player.pause = MagicMock()
+        time_mock.return_value = 100
 
         self.music_player.stop_menu_music()
-        # 7 is the number of steps before the player is paused.
+        self.music_player.menu_player.pause.assert_not_called()
+        # 7 is the number of steps before the player is paused. Note that each update is slightly after each step.
+        for step in range(7):
+            time_mock.return_value = 100 + step * FADE_STEP_INTERVAL + 0.01
+            self.music_player.update_fades()
         self.assertEqual(7, self.music_player.menu_player.audio_set_volume.call_count)
+        self.music_player.menu_player.audio_set_volume.assert_called_with(10)
+        self.music_player.menu_player.pause.assert_not_called()
+        time_mock.return_value = 100 + 7 * FADE_STEP_INTERVAL + 0.01
+        self.music_player.update_fades()
         self.music_player.menu_player.pause.assert_called()
+        self.assertFalse(self.music_player.fades)
 
     def test_play_game(self):
         """
-        Ensure that playing the game music sets the volume and plays the correct game player.
+        Ensure that playing the game music opens the current track, sets its volume and plays it, and also opens the
+        next track.
         """
         test_idx = 3
         self.music_player.current_idx = test_idx
-        self.music_player.game_players[self.music_player.current_idx].audio_set_volume = MagicMock()
-        self.music_player.game_players[self.music_player.current_idx].play = MagicMock()
+        game_player = self.music_player.get_game_player(test_idx)
+        game_player.audio_set_volume = MagicMock()
+        game_player.play = MagicMock()
 
         self.music_player.play_game_music()
-        self.music_player.game_players[test_idx].audio_set_volume.assert_called_with(70)
-        self.music_player.game_players[test_idx].play.assert_called()
+        game_player.audio_set_volume.assert_called_with(VOLUME)
+        game_player.play.assert_called()
+        self.assertListEqual([test_idx, test_idx + 1], list(self.music_player.game_players))
 
-    def test_stop_game(self):
+        # The first track should be opened next once the last track is played.
+        self.music_player.current_idx = 7
+        self.music_player.play_game_music()
+        self.assertIn(0, self.music_player.game_players)
+
+    @patch("time.time")
+    def test_stop_game(self, time_mock: MagicMock):
         """
-        Ensure that stopping the game music gradually reduces the volume of and pauses the current game player.
+        Ensure that stopping the game music gradually reduces the volume of and pauses the current game player, and
+        that nothing happens if no game music has been played.
+        :param time_mock: The mock implementation of time.time().
         """
+        self.music_player.stop_game_music()
+        self.assertFalse(self.music_player.fades)
+
         test_idx = 4
         self.music_player.current_idx = test_idx
-        self.music_player.game_players[self.music_player.current_idx].audio_set_volume = MagicMock()
-        self.music_player.game_players[self.music_player.current_idx].pause = MagicMock()
+        game_player = self.music_player.get_game_player(test_idx)
+        game_player.audio_set_volume = MagicMock()
+        game_player.pause = MagicMock()
+        time_mock.return_value = 100
 
         self.music_player.stop_game_music()
-        self.assertEqual(7, self.music_player.game_players[test_idx].audio_set_volume.call_count)
-        self.music_player.game_players[test_idx].pause.assert_called()
+        time_mock.return_value = 100 + 3 * FADE_STEP_INTERVAL + 0.01
+        self.music_player.update_fades()
+        game_player.audio_set_volume.assert_called_with(VOLUME - 30)
+        game_player.pause.assert_not_called()
+        time_mock.return_value = 200
+        self.music_player.update_fades()
+        game_player.pause.assert_called()
 
     def test_next_song(self):
         """
-        Ensure that going to the next song stops the current one, adjusts the index, and plays the next song.
+        Ensure that going to the next song stops and closes the current one, adjusts the index, and plays the next song.
         """
         test_idx = 2
         self.music_player.current_idx = test_idx
-        self.music_player.game_players[self.music_player.current_idx].stop = MagicMock()
+        game_player = self.music_player.get_game_player(test_idx)
+        game_player.stop = MagicMock()
+        game_player.release = MagicMock()
         self.music_player.play_game_music = MagicMock()
 
         self.music_player.next_song()
-        self.music_player.game_players[test_idx].stop.assert_called()
+        game_player.stop.assert_called()
+        game_player.release.assert_called()
+        self.assertNotIn(test_idx, self.music_player.game_players)
         # Because our current game player is somewhere in the middle of the list, the current index should just be
         # incremented.
         self.assertEqual(test_idx + 1, self.music_player.current_idx)
         self.music_player.play_game_music.assert_called()
 
-        # Now set the current index to the last game player.
-        self.music_player.current_idx = len(self.music_player.game_players) - 1
-        self.music_player.game_players[self.music_player.current_idx].stop = MagicMock()
-
+        # Now set the current index to the last track.
+        self.music_player.current_idx = len(self.music_player.game_tracks) - 1
         self.music_player.next_song()
-        self.music_player.game_players[len(self.music_player.game_players) - 1].stop.assert_called()
         # The current index should now be reset to 0, rather than incremented.
         self.assertEqual(0, self.music_player.current_idx)
         self.music_player.play_game_music.assert_called()
@@ -94,8 +139,9 @@ class MusicPlayerTest(unittest.TestCase):
         """
         Ensure that the music player correctly reports if any of the game players are playing.
         """
+        self.music_player.get_game_player(3).is_playing = MagicMock(return_value=False)
         self.assertFalse(self.music_player.is_playing())
-        self.music_player.game_players[3].is_playing = MagicMock(return_value=True)
+        self.music_player.get_game_player(3).is_playing = MagicMock(return_value=True)
         self.assertTrue(self.music_player.is_playing())
 
     def test_restart(self):
@@ -1,7 +1,9 @@
 import typing
 import unittest
+from unittest.mock import MagicMock, patch
 
 from source.display.overlay import Overlay
+from source.display.redraw import REDRAW_TRACKER
 from source.foundation.catalogue import UNIT_PLANS, ACHIEVEMENTS
 from source.foundation.models import OverlayType, Settlement, Player, Faction, ConstructionMenu, Project, ProjectType, \
     Improvement, Effect, ImprovementType, UnitPlan, Blessing, Unit, CompletedConstruction, AttackData, HealData, \
@@ -34,6 +36,42 @@ class OverlayTest(unittest.TestCase):
         self.TEST_UNIT_PLAN = UnitPlan(0, 0, 1, "Weakling", None, 0)
         self.TEST_UNIT_PLAN_2 = UnitPlan(999, 999, 999, "Strongman", None, 0)
 
+    def test_get_cached_value(self):
+        """
+        Ensure that cached values are only computed once until the display is marked dirty.
+        """
+        compute_mock = MagicMock(return_value=5)
+        self.assertEqual(5, self.overlay.get_cached_value("test", compute_mock))
+        self.assertEqual(5, self.overlay.get_cached_value("test", compute_mock))
+        compute_mock.assert_called_once()
+        REDRAW_TRACKER.mark_dirty()
+        self.assertEqual(5, self.overlay.get_cached_value("test", compute_mock))
+        self.assertEqual(2, compute_mock.call_count)
+
+    @patch("source.display.overlay.get_setl_totals")
+    def test_get_wealth_per_turn(self, get_setl_totals_mock: MagicMock):
+        """
+        Ensure that the wealth per turn accounts for both settlement wealth and the upkeep of non-garrisoned units.
+        :param get_setl_totals_mock: The mock implementation of the get_setl_totals() function.
+        """
+        get_setl_totals_mock.return_value = 10, 0, 0, 0
+        self.TEST_UNIT_2.garrisoned = True
+        self.TEST_PLAYER.units = [self.TEST_UNIT, self.TEST_UNIT_2]
+        self.overlay.current_player = self.TEST_PLAYER
+        self.assertEqual(10 - self.TEST_UNIT.plan.cost / 10, self.overlay.get_wealth_per_turn(False))
+        get_setl_totals_mock.assert_called_with(self.TEST_PLAYER, self.TEST_SETTLEMENT, False, strict=True)
+
+    def test_get_victory_progress(self):
+        """
+        Ensure that the current player's victory progress is correctly counted.
+        """
+        self.TEST_SETTLEMENT.satisfaction = 100
+        self.TEST_SETTLEMENT.level = 10
+        self.TEST_PLAYER.settlements.append(Settlement("Dullville", (1, 1), [], [], ResourceCollection(), []))
+        self.TEST_PLAYER.blessings = [Blessing("Piece of Strength", "Ardour", 0), self.TEST_BLESSING]
+        self.overlay.current_player = self.TEST_PLAYER
+        self.assertTupleEqual((1, 1, 1), self.overlay.get_victory_progress())
+
     def test_toggle_standard(self):
         """
         Ensure that the overlay correctly toggles the Standard overlay.
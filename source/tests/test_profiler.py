@@ -0,0 +1,111 @@
+import json
+import os
+import threading
+import unittest
+from tempfile import TemporaryDirectory
+from unittest.mock import MagicMock, patch
+
+from source.util.profiler import FrameProfiler, END_TURN_SECTION
+
+
+class FrameProfilerTest(unittest.TestCase):
+    """
+    The test class for profiler.py.
+    """
+
+    def setUp(self) -> None:
+        """
+        Initialise an enabled profiler before each test.
+        """
+        self.profiler = FrameProfiler(enabled=True)
+
+    @patch("time.perf_counter")
+    def test_frame(self, perf_counter_mock: MagicMock):
+        """
+        Ensure that the sections recorded during a frame are totalled, and made available once the frame has ended.
+        :param perf_counter_mock: The mock implementation of time.perf_counter().
+        """
+        # The frame starts at 10s, the two board sections take 2ms and 1ms, and the frame ends at 10.005s.
+        perf_counter_mock.side_effect = [10, 10.001, 10.003, 10.003, 10.004, 10.005]
+        self.profiler.start_frame()
+        with self.profiler.section("draw.board"):
+            pass
+        with self.profiler.section("draw.board"):
+            pass
+        self.assertFalse(self.profiler.last_sections)
+        self.profiler.end_frame()
+
+        self.assertAlmostEqual(0.003, self.profiler.last_sections["draw.board"])
+        self.assertFalse(self.profiler.current_sections)
+        self.assertAlmostEqual(0.005, self.profiler.frame_times[0])
+        # Each section and the frame itself should have been recorded for the trace.
+        self.assertEqual(3, len(self.profiler.trace_events))
+        self.assertEqual({"name": "frame", "ph": "X", "pid": os.getpid(), "tid": threading.get_ident(),
+                          "ts": 10_000_000, "dur": 5000}, self.profiler.trace_events[-1])
+
+    @patch("time.perf_counter")
+    def test_lap(self, perf_counter_mock: MagicMock):
+        """
+        Ensure that laps record the time since the previous lap, and return the time to start the next lap from.
+        :param perf_counter_mock: The mock implementation of time.perf_counter().
+        """
+        perf_counter_mock.return_value = 5.5
+        self.assertEqual(5.5, self.profiler.lap("draw.board.map", 5))
+        self.assertEqual(0.5, self.profiler.current_sections["draw.board.map"])
+
+        # When disabled, nothing should be recorded, but the time should still be returned.
+        self.profiler.toggle()
+        self.assertEqual(5.5, self.profiler.lap("draw.board.entities", 5))
+        self.assertFalse(self.profiler.current_sections)
+
+    def test_disabled(self):
+        """
+        Ensure that nothing is recorded while the profiler is disabled.
+        """
+        self.profiler.toggle()
+        self.profiler.start_frame()
+        with self.profiler.section("draw.menu"):
+            pass
+        self.profiler.end_frame()
+        self.assertFalse(self.profiler.frame_times)
+        self.assertFalse(self.profiler.trace_events)
+        # Toggling the profiler back on should not record a frame until one has started.
+        self.profiler.toggle()
+        self.profiler.end_frame()
+        self.assertFalse(self.profiler.frame_times)
+
+    def test_summary(self):
+        """
+        Ensure that the summary contains the FPS, 99th-percentile frame time, the sections from the last frame, and the
+        time taken by the last end turn.
+        """
+        self.assertListEqual(["FPS 0.0, p99 0.00ms"], self.profiler.get_summary())
+
+        # 100 frames are recorded 1/30th of a second apart, with one slow frame.
+        self.profiler.frame_starts.extend(i / 30 for i in range(100))
+        self.profiler.frame_times.extend([0.002] * 98 + [0.004, 0.050])
+        self.profiler.record("draw.menu", 0, 0.0015)
+        self.profiler.record(END_TURN_SECTION, 0, 0.25)
+        self.profiler.last_sections = self.profiler.current_sections
+        self.assertListEqual(["FPS 30.0, p99 4.00ms", "draw.menu 1.50ms", "end_turn 250.00ms",
+                              "Last end turn 250.00ms"], self.profiler.get_summary())
+
+    def test_dump_chrome_trace(self):
+        """
+        Ensure that recorded sections are written to a file in the Chrome trace event format.
+        """
+        self.profiler.record("listener.QUERY", 1, 0.002)
+        with TemporaryDirectory() as trace_dir:
+            trace_path: str = os.path.join(trace_dir, "trace.json")
+            self.profiler.dump_chrome_trace(trace_path)
+            with open(trace_path, "r", encoding="utf-8") as trace_file:
+                trace = json.load(trace_file)
+        self.assertEqual("ms", trace["displayTimeUnit"])
+        self.assertEqual(1, len(trace["traceEvents"]))
+        self.assertEqual("listener.QUERY", trace["traceEvents"][0]["name"])
+        self.assertEqual(1_000_000, trace["traceEvents"][0]["ts"])
+        self.assertEqual(2000, trace["traceEvents"][0]["dur"])
+
+
+if __name__ == '__main__':
+    unittest.main()
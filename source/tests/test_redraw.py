@@ -0,0 +1,77 @@
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+
+from source.display.redraw import RedrawTracker, get_idle_fps, IDLE_FPS_ENV_VAR, IDLE_THRESHOLD, MAX_REDRAW_INTERVAL
+
+
+class RedrawTest(unittest.TestCase):
+    """
+    The test class for redraw.py.
+    """
+
+    def test_get_idle_fps(self):
+        """
+        Ensure that the idle FPS is only enabled when configured with a positive number.
+        """
+        with patch.dict(os.environ, clear=True):
+            self.assertIsNone(get_idle_fps())
+        for invalid_value in ("slow", "0", "-5"):
+            with patch.dict(os.environ, {IDLE_FPS_ENV_VAR: invalid_value}):
+                self.assertIsNone(get_idle_fps())
+        with patch.dict(os.environ, {IDLE_FPS_ENV_VAR: "5"}):
+            self.assertEqual(5, get_idle_fps())
+
+    @patch("time.time")
+    def test_should_redraw(self, time_mock: MagicMock):
+        """
+        Ensure that frames are only redrawn when the scene has been marked dirty, or when too long has passed since the
+        last redraw.
+        :param time_mock: The mock implementation of time.time().
+        """
+        time_mock.return_value = 100
+        tracker = RedrawTracker()
+        # The first frame should always be drawn, but not the ones following it.
+        self.assertTrue(tracker.should_redraw())
+        self.assertFalse(tracker.should_redraw())
+        tracker.mark_dirty()
+        self.assertEqual(1, tracker.generation)
+        self.assertTrue(tracker.should_redraw())
+        self.assertFalse(tracker.should_redraw())
+        # Even without changes, the scene should eventually be redrawn.
+        time_mock.return_value = 100 + MAX_REDRAW_INTERVAL
+        self.assertTrue(tracker.should_redraw())
+        self.assertFalse(tracker.should_redraw())
+
+    @patch("time.sleep")
+    @patch("time.time")
+    def test_throttle_if_idle(self, time_mock: MagicMock, sleep_mock: MagicMock):
+        """
+        Ensure that the update rate is only reduced when the idle mode is enabled and the game has been idle for long
+        enough.
+        :param time_mock: The mock implementation of time.time().
+        :param sleep_mock: The mock implementation of time.sleep().
+        """
+        time_mock.return_value = 100
+        tracker = RedrawTracker(idle_fps=4)
+        tracker.throttle_if_idle()
+        sleep_mock.assert_not_called()
+        time_mock.return_value = 100 + IDLE_THRESHOLD
+        self.assertTrue(tracker.is_idle())
+        tracker.throttle_if_idle()
+        sleep_mock.assert_called_once_with(0.25)
+        # Any change should immediately end the idle period.
+        tracker.mark_dirty()
+        self.assertFalse(tracker.is_idle())
+        tracker.throttle_if_idle()
+        sleep_mock.assert_called_once()
+
+        # Without an idle FPS, the update rate should never be reduced.
+        tracker = RedrawTracker()
+        time_mock.return_value = 200 + IDLE_THRESHOLD
+        tracker.throttle_if_idle()
+        sleep_mock.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,180 @@
+import json
+import unittest
+import zlib
+from datetime import datetime
+from io import BytesIO
+from tempfile import TemporaryDirectory
+from typing import List
+from unittest.mock import MagicMock, patch
+
+from source.foundation.catalogue import Namer
+from source.foundation.models import SaveDetails, Faction, SaveHeader, SaveSnapshot, MultiplayerStatus, GameConfig
+from source.game_management.game_state import GameState
+from source.saving.save_format import encode_header, decode_header, read_save_header, write_binary_save, \
+    read_binary_save, build_snapshot, iter_section_records, HEADER_STRUCT, SAVE_FORMAT_VERSION, \
+    SECTION_LENGTH_STRUCT, RECORD_LENGTH_STRUCT
+from source.saving.save_migrator import load_json_save
+from source.util.codec import decode_quads_seen
+
+
+class SaveFormatTest(unittest.TestCase):
+    """
+    The test class for save_format.py.
+    """
+    TEST_DETAILS = SaveDetails(datetime(2025, 8, 30, 12, 0, 0), True, 26, 2, Faction.FUNDAMENTALISTS, False)
+
+    def _load_test_snapshot(self) -> SaveSnapshot:
+        """
+        Load the pre-defined JSON test save and take a snapshot of it.
+        :return: A snapshot of the test save.
+        """
+        game_state = GameState()
+        with open("source/tests/resources/save-test.json", "r", encoding="utf-8") as save_file:
+            cfg, quads = load_json_save(game_state, Namer(), save_file)
+        return build_snapshot(self.TEST_DETAILS, game_state.game_version, cfg, quads, game_state.players,
+                              game_state.heathens, game_state.turn, game_state.until_night, game_state.nighttime_left)
+
+    def test_header(self):
+        """
+        Ensure that save headers are correctly encoded and decoded, for both single-player and multiplayer games.
+        """
+        header_bytes: bytes = encode_header(self.TEST_DETAILS, 4.0)
+        self.assertEqual(HEADER_STRUCT.size, len(header_bytes))
+        self.assertEqual(SaveHeader(self.TEST_DETAILS, 4.0, SAVE_FORMAT_VERSION), decode_header(header_bytes))
+
+        multiplayer_details = SaveDetails(datetime(2025, 8, 30, 12, 0, 0), False, 5, 4, None, True)
+        self.assertEqual(multiplayer_details, decode_header(encode_header(multiplayer_details, 4.0)).details)
+
+    def test_header_invalid(self):
+        """
+        Ensure that headers that are too short, not for binary saves, or from a future version of the binary format are
+        rejected.
+        """
+        header_bytes: bytes = encode_header(self.TEST_DETAILS, 4.0)
+        with self.assertRaises(ValueError):
+            decode_header(header_bytes[:-1])
+        with self.assertRaises(ValueError):
+            decode_header(b"{\"quads\"" + header_bytes[8:])
+        future_header: bytes = header_bytes[:4] + (SAVE_FORMAT_VERSION + 1).to_bytes(2, "little") + header_bytes[6:]
+        with self.assertRaises(ValueError):
+            decode_header(future_header)
+
+    def test_read_save_header(self):
+        """
+        Ensure that the header can be read from a save file on disk without reading the rest of the file.
+        """
+        with TemporaryDirectory() as saves_dir:
+            save_path = f"{saves_dir}/save.msav"
+            with open(save_path, "wb") as save_file:
+                # The body of the file is deliberately invalid, to show that it isn't read.
+                save_file.write(encode_header(self.TEST_DETAILS, 3.0) + b"garbage")
+            self.assertEqual(SaveHeader(self.TEST_DETAILS, 3.0, SAVE_FORMAT_VERSION), read_save_header(save_path))
+
+    def test_round_trip(self):
+        """
+        Ensure that a game written in the binary format is read back identically.
+        """
+        snapshot: SaveSnapshot = self._load_test_snapshot()
+        save_data = BytesIO()
+        write_binary_save(save_data, snapshot)
+        save_data.seek(0)
+
+        game_state = GameState()
+        namer = Namer()
+        namer.remove_settlement_name = MagicMock()
+        header, cfg, quads = read_binary_save(save_data, game_state, namer)
+
+        self.assertEqual(SaveHeader(self.TEST_DETAILS, 4.0, SAVE_FORMAT_VERSION), header)
+        self.assertEqual(GameConfig(2, Faction.FUNDAMENTALISTS, True, True, True, MultiplayerStatus.DISABLED), cfg)
+        self.assertEqual(26, game_state.turn)
+        self.assertEqual(7, game_state.until_night)
+        self.assertEqual(3, namer.remove_settlement_name.call_count)
+        # Settlement quads should be linked to the quads on the board.
+        self.assertIs(quads[game_state.players[0].settlements[0].location[1]]
+                      [game_state.players[0].settlements[0].location[0]],
+                      game_state.players[0].settlements[0].quads[0])
+        # Taking a snapshot of the loaded game should give us exactly what we wrote, noting that the order of seen quads
+        # is not guaranteed since they are a set.
+        reloaded: SaveSnapshot = build_snapshot(self.TEST_DETAILS, header.game_version, cfg, quads, game_state.players,
+                                                game_state.heathens, game_state.turn, game_state.until_night,
+                                                game_state.nighttime_left)
+        self.assertListEqual(snapshot.board, reloaded.board)
+        self.assertListEqual(snapshot.state[:3], reloaded.state[:3])
+        self.assertEqual(snapshot.state[4], reloaded.state[4])
+        self.assertSetEqual(decode_quads_seen(snapshot.state[3]), decode_quads_seen(reloaded.state[3]))
+        self.assertSetEqual(decode_quads_seen(snapshot.state[5]), decode_quads_seen(reloaded.state[5]))
+
+    def test_round_trip_no_quads_seen(self):
+        """
+        Ensure that players without any seen quads are read back correctly.
+        """
+        snapshot: SaveSnapshot = self._load_test_snapshot()
+        snapshot.state[3] = b""
+        save_data = BytesIO()
+        write_binary_save(save_data, snapshot)
+        save_data.seek(0)
+        game_state = GameState()
+        read_binary_save(save_data, game_state, Namer())
+        self.assertSetEqual(set(), game_state.players[0].quads_seen)
+
+    def test_read_truncated(self):
+        """
+        Ensure that save files that have been cut short are rejected rather than partially loaded.
+        """
+        snapshot: SaveSnapshot = self._load_test_snapshot()
+        save_data = BytesIO()
+        write_binary_save(save_data, snapshot)
+        full_save: bytes = save_data.getvalue()
+
+        # Cut off midway through the state section.
+        with self.assertRaises(ValueError):
+            read_binary_save(BytesIO(full_save[:-10]), GameState(), Namer())
+        # Cut off before the state section.
+        board_length: int = SECTION_LENGTH_STRUCT.unpack(
+            full_save[HEADER_STRUCT.size:HEADER_STRUCT.size + SECTION_LENGTH_STRUCT.size])[0]
+        with self.assertRaises(ValueError):
+            read_binary_save(BytesIO(full_save[:HEADER_STRUCT.size + SECTION_LENGTH_STRUCT.size + board_length]),
+                             GameState(), Namer())
+
+    def test_read_missing_quads(self):
+        """
+        Ensure that save files with an incomplete board are rejected.
+        """
+        snapshot: SaveSnapshot = self._load_test_snapshot()
+        snapshot.board = snapshot.board[:-1]
+        save_data = BytesIO()
+        write_binary_save(save_data, snapshot)
+        save_data.seek(0)
+        with self.assertRaises(ValueError):
+            read_binary_save(save_data, GameState(), Namer())
+
+    def test_iter_section_records(self):
+        """
+        Ensure that records are read from sections regardless of where the chunks of compressed data end, and that
+        sections whose compressed data does not end with a complete record are rejected.
+        """
+        records: List[bytes] = [b"first", b"", bytes(range(256)) * 100, b"last"]
+        data: bytes = b"".join(RECORD_LENGTH_STRUCT.pack(len(record)) + record for record in records)
+        compressed: bytes = zlib.compress(data)
+        with patch("source.saving.save_format.READ_CHUNK_SIZE", 7):
+            section = BytesIO(SECTION_LENGTH_STRUCT.pack(len(compressed)) + compressed)
+            self.assertListEqual(records, list(iter_section_records(section)))
+
+        compressed = zlib.compress(data[:-1])
+        section = BytesIO(SECTION_LENGTH_STRUCT.pack(len(compressed)) + compressed)
+        section_records = iter_section_records(section)
+        self.assertEqual(b"first", next(section_records))
+        with self.assertRaises(ValueError):
+            list(section_records)
+
+        # Sections whose compressed data has been cut short should also be rejected, even if it ends on a record
+        # boundary.
+        compressed = zlib.compress(RECORD_LENGTH_STRUCT.pack(5) + b"first")[:-4]
+        section = BytesIO(SECTION_LENGTH_STRUCT.pack(len(compressed)) + compressed)
+        with self.assertRaises(ValueError):
+            list(iter_section_records(section))
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+import json
+import os
+import unittest
+from datetime import datetime
+from io import BytesIO
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from source.foundation.catalogue import Namer
+from source.foundation.models import SaveDetails, Faction, SaveSnapshot, SaveHeader
+from source.game_management.game_state import GameState
+from source.saving.save_format import build_snapshot, write_binary_save, encode_section, SAVE_FORMAT_VERSION
+from source.saving.save_journal import SaveJournal, get_journal_path, encode_entry, replay_entry, \
+    read_journaled_save, remove_journal, JOURNAL_HEADER_STRUCT, JOURNAL_MAGIC, JOURNAL_FORMAT_VERSION, \
+    ENTRY_RECORD_STRUCT
+from source.saving.save_migrator import load_json_save
+
+
+class SaveJournalTest(unittest.TestCase):
+    """
+    The test class for save_journal.py.
+    """
+    TEST_DETAILS = SaveDetails(datetime(2025, 8, 30, 12, 0, 0), True, 26, 2, Faction.FUNDAMENTALISTS, False)
+
+    def setUp(self) -> None:
+        """
+        Load the pre-defined JSON test save and take a snapshot of it, as well as a snapshot of the following turn, in
+        which the first quad on the board and the first player have changed.
+        """
+        game_state = GameState()
+        with open("source/tests/resources/save-test.json", "r", encoding="utf-8") as save_file:
+            cfg, quads = load_json_save(game_state, Namer(), save_file)
+        self.snapshot: SaveSnapshot = build_snapshot(self.TEST_DETAILS, game_state.game_version, cfg, quads,
+                                                     game_state.players, game_state.heathens, game_state.turn,
+                                                     game_state.until_night, game_state.nighttime_left)
+        quads[0][0].is_relic = not quads[0][0].is_relic
+        game_state.players[0].wealth += 100
+        self.next_snapshot: SaveSnapshot = build_snapshot(self.TEST_DETAILS, game_state.game_version, cfg, quads,
+                                                          game_state.players, game_state.heathens, game_state.turn + 1,
+                                                          game_state.until_night - 1, game_state.nighttime_left)
+
+    def _write_checkpoint(self, journal: SaveJournal, saves_dir: str) -> str:
+        """
+        Write the test snapshot as a checkpoint in the given directory, and start the given journal with it.
+        :param journal: The journal to start.
+        :param saves_dir: The directory to write the checkpoint to.
+        :return: The full path of the checkpoint.
+        """
+        checkpoint_path: str = os.path.join(saves_dir, "autosave_1756555200_26_2_5.msav")
+        with open(checkpoint_path, "wb") as checkpoint_file:
+            write_binary_save(checkpoint_file, self.snapshot)
+        journal.start(checkpoint_path, self.snapshot)
+        return checkpoint_path
+
+    def test_get_journal_path(self):
+        """
+        Ensure that journals are hidden files in the same directory as their checkpoint.
+        """
+        self.assertEqual(os.path.join("saves", ".autosave_1_2_3_M.mjnl"),
+                         get_journal_path(os.path.join("saves", "autosave_1_2_3_M.msav")))
+
+    def test_encode_replay_entry(self):
+        """
+        Ensure that journal entries only contain the records that have changed, and that replaying them recreates the
+        new records.
+        """
+        old_board = [b"row 0", b"row 1", b"row 2"]
+        old_state = [b"meta", b"heathens"]
+        new_board = [b"row 0", b"new row 1", b"row 2"]
+        new_state = [b"new meta", b"heathens", b"player"]
+
+        entry_records = encode_entry(old_board, new_board, b"b") + encode_entry(old_state, new_state, b"s")
+        self.assertListEqual([ENTRY_RECORD_STRUCT.pack(b"b", 1) + b"new row 1",
+                              ENTRY_RECORD_STRUCT.pack(b"s", 0) + b"new meta",
+                              ENTRY_RECORD_STRUCT.pack(b"s", 2) + b"player"], entry_records)
+        replay_entry(entry_records, old_board, old_state)
+        self.assertListEqual(new_board, old_board)
+        self.assertListEqual(new_state, old_state)
+
+    def test_round_trip(self):
+        """
+        Ensure that a checkpoint with a journal is loaded with each entry in the journal replayed on top of it.
+        """
+        journal = SaveJournal()
+        with TemporaryDirectory() as saves_dir:
+            checkpoint_path: str = self._write_checkpoint(journal, saves_dir)
+            checkpoint_size: int = os.path.getsize(checkpoint_path)
+            self.assertFalse(journal.needs_checkpoint(self.next_snapshot))
+            journal.append(self.next_snapshot)
+            self.assertEqual(1, journal.entries_since_checkpoint)
+            # Since only a few things changed, the journal should be far smaller than the checkpoint.
+            self.assertLess(os.path.getsize(get_journal_path(checkpoint_path)) * 10, checkpoint_size)
+
+            game_state = GameState()
+            with open(checkpoint_path, "rb") as save_file, \
+                    open(get_journal_path(checkpoint_path), "rb") as journal_file:
+                header, cfg, quads = read_journaled_save(save_file, journal_file, game_state, Namer())
+
+        self.assertEqual(SaveHeader(self.TEST_DETAILS, 4.0, SAVE_FORMAT_VERSION), header)
+        self.assertEqual(27, game_state.turn)
+        self.assertEqual(6, game_state.until_night)
+        reloaded: SaveSnapshot = build_snapshot(self.TEST_DETAILS, header.game_version, cfg, quads, game_state.players,
+                                                game_state.heathens, game_state.turn, game_state.until_night,
+                                                game_state.nighttime_left)
+        self.assertListEqual(self.next_snapshot.board, reloaded.board)
+        self.assertListEqual(self.next_snapshot.state[:3], reloaded.state[:3])
+
+    def test_read_incomplete_entry(self):
+        """
+        Ensure that an incomplete entry at the end of a journal is ignored, with the entries before it still replayed.
+        """
+        journal_data = BytesIO()
+        journal_data.write(JOURNAL_HEADER_STRUCT.pack(JOURNAL_MAGIC, JOURNAL_FORMAT_VERSION))
+        journal_data.write(encode_section(encode_entry(self.snapshot.state, self.next_snapshot.state, b"s")))
+        journal_data.write(encode_section([ENTRY_RECORD_STRUCT.pack(b"b", 0) + b"garbage",
+                                           ENTRY_RECORD_STRUCT.pack(b"s", 0) + b"garbage"])[:-3])
+        journal_data.seek(0)
+        save_data = BytesIO()
+        write_binary_save(save_data, self.snapshot)
+        save_data.seek(0)
+
+        game_state = GameState()
+        _, _, quads = read_journaled_save(save_data, journal_data, game_state, Namer())
+        # The complete entry should have been replayed, but not the incomplete one.
+        self.assertEqual(27, game_state.turn)
+        self.assertEqual(4, quads[0][0].wealth)
+
+    def test_read_invalid_journal(self):
+        """
+        Ensure that journals that are too short, not journals at all, or from future versions of the game are rejected.
+        """
+        for journal_bytes in (b"MC", json.dumps({"quads": []}).encode(),
+                              JOURNAL_HEADER_STRUCT.pack(JOURNAL_MAGIC, JOURNAL_FORMAT_VERSION + 1)):
+            save_data = BytesIO()
+            write_binary_save(save_data, self.snapshot)
+            save_data.seek(0)
+            with self.assertRaises(ValueError):
+                read_journaled_save(save_data, BytesIO(journal_bytes), GameState(), Namer())
+
+    def test_needs_checkpoint(self):
+        """
+        Ensure that a new checkpoint is required when a journal has not been started, when enough entries have been
+        written, when the shape of the save has changed, or when the checkpoint or journal no longer exist.
+        """
+        journal = SaveJournal(checkpoint_interval=1)
+        self.assertTrue(journal.needs_checkpoint(self.snapshot))
+        with TemporaryDirectory() as saves_dir:
+            checkpoint_path: str = self._write_checkpoint(journal, saves_dir)
+            self.assertFalse(journal.needs_checkpoint(self.next_snapshot))
+            shrunk_snapshot = SaveSnapshot(self.TEST_DETAILS, 4.0, self.snapshot.board, self.snapshot.state[:-2])
+            self.assertTrue(journal.needs_checkpoint(shrunk_snapshot))
+            journal.append(self.next_snapshot)
+            self.assertTrue(journal.needs_checkpoint(self.next_snapshot))
+
+            journal.entries_since_checkpoint = 0
+            remove_journal(checkpoint_path)
+            self.assertFalse(os.path.exists(get_journal_path(checkpoint_path)))
+            self.assertTrue(journal.needs_checkpoint(self.next_snapshot))
+            # Removing a journal that doesn't exist should do nothing.
+            remove_journal(checkpoint_path)
+
+    def test_append_failure(self):
+        """
+        Ensure that when an entry fails to be written, the next snapshot is written as a new checkpoint instead.
+        """
+        journal = SaveJournal()
+        with TemporaryDirectory() as saves_dir:
+            self._write_checkpoint(journal, saves_dir)
+            with patch("source.saving.save_journal.open", side_effect=OSError()), self.assertRaises(OSError):
+                journal.append(self.next_snapshot)
+        self.assertEqual(0, journal.entries_since_checkpoint)
+        self.assertTrue(journal.needs_checkpoint(self.next_snapshot))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,14 +1,21 @@
+import json
+import os
 import unittest
+from datetime import datetime
+from tempfile import TemporaryDirectory
 
 import pyxel
 
-from source.foundation.catalogue import UNIT_PLANS, IMPROVEMENTS
+from source.foundation.catalogue import UNIT_PLANS, IMPROVEMENTS, get_unit_plan
 from source.foundation.models import UnitPlan, Unit, AttackPlaystyle, ExpansionPlaystyle, VictoryType, Faction, \
-    Settlement, Biome, Quad, GameConfig, DeployerUnitPlan, DeployerUnit, ResourceCollection, MultiplayerStatus
+    Settlement, Biome, Quad, GameConfig, DeployerUnitPlan, DeployerUnit, ResourceCollection, MultiplayerStatus, \
+    SaveDetails, AIPlaystyle
 from source.game_management.game_state import GameState
-from source.saving.save_encoder import ObjectConverter
+from source.saving.save_encoder import ObjectConverter, SaveEncoder
 from source.saving.save_migrator import migrate_unit_plan, migrate_unit, migrate_player, migrate_climatic_effects, \
-    migrate_quad, migrate_settlement, migrate_game_config, migrate_game_version
+    migrate_quad, migrate_settlement, migrate_game_config, migrate_game_version, convert_json_save, \
+    can_decode_directly, decode_unit, decode_player, decode_settlement
+from source.saving.save_format import read_save_header
 
 
 class SaveMigratorTest(unittest.TestCase):
@@ -588,6 +595,117 @@ class SaveMigratorTest(unittest.TestCase):
         self.assertTrue(all(imp.req_resources is None for imp in IMPROVEMENTS))
         self.assertEqual(test_game_state.game_version, test_old_version)
 
+    def test_convert_json_save(self):
+        """
+        Ensure that JSON saves are correctly converted to binary saves, with the details that were missing from legacy
+        save names being filled in.
+        """
+        with open("source/tests/resources/save-legacy.json", "r", encoding="utf-8") as legacy_file:
+            legacy_save = json.loads(legacy_file.read())
+        # Remove the game version to simulate a save from before resources were introduced.
+        legacy_save.pop("game_version")
+        req_resources = [imp.req_resources for imp in IMPROVEMENTS]
+
+        with TemporaryDirectory() as saves_dir:
+            with open(os.path.join(saves_dir, "autosave-2023-01-07T13.37.00.json"), "w", encoding="utf-8") as json_file:
+                json_file.write(json.dumps(legacy_save))
+            binary_save_name: str = convert_json_save(saves_dir, "autosave-2023-01-07T13.37.00.json")
+
+            # The JSON save should have been replaced with the binary one, with the original kept as a hidden backup.
+            self.assertSetEqual({binary_save_name, ".autosave-2023-01-07T13.37.00.json"}, set(os.listdir(saves_dir)))
+            expected_details = SaveDetails(datetime(2023, 1, 7, 13, 37, 0), True, legacy_save["turn"], 2,
+                                           Faction.NOCTURNE, False)
+            header = read_save_header(os.path.join(saves_dir, binary_save_name))
+            self.assertEqual(expected_details, header.details)
+            # The converted save should remember that it is from before resources were introduced, but the resource
+            # requirements for improvements should not have been removed for subsequent games.
+            self.assertEqual(0.0, header.game_version)
+            self.assertListEqual(req_resources, [imp.req_resources for imp in IMPROVEMENTS])
+
+    def test_can_decode_directly(self):
+        """
+        Ensure that only JSON saves from v4.0 onwards with minified quads are decoded directly.
+        """
+        self.assertTrue(can_decode_directly(ObjectConverter({"game_version": 4.0, "quads": ["F1234"]})))
+        self.assertTrue(can_decode_directly(ObjectConverter({"game_version": 4.1, "quads": ["F1234"]})))
+        # Saves from before v4.0, or without a version at all, need to be migrated.
+        self.assertFalse(can_decode_directly(ObjectConverter({"game_version": 3.0, "quads": ["F1234"]})))
+        self.assertFalse(can_decode_directly(ObjectConverter({"quads": ["F1234"]})))
+        # Saves with quads that aren't minified also need to be migrated.
+        self.assertFalse(can_decode_directly(ObjectConverter({"game_version": 4.0, "quads": [ObjectConverter({})]})))
+
+    def test_decode_unit(self):
+        """
+        Ensure that units, deployer units, and their plans from current saves are decoded directly.
+        """
+        test_plan: DeployerUnitPlan = UNIT_PLANS[-4]
+        # Round-trip the units through JSON to simulate them being loaded from a save.
+        test_loaded_unit: ObjectConverter = json.loads(json.dumps({
+            "health": 300,
+            "remaining_stamina": 3,
+            "location": [1, 2],
+            "garrisoned": False,
+            "plan": test_plan,
+            "has_acted": True,
+            "besieging": False,
+            "passengers": [Unit(600, 4, (3, 4), False, UNIT_PLANS[4])]
+        }, cls=SaveEncoder), object_hook=ObjectConverter)
+
+        decoded_unit: Unit = decode_unit(test_loaded_unit, Faction.GODLESS)
+
+        self.assertTrue(isinstance(decoded_unit, DeployerUnit))
+        self.assertEqual(300.0, decoded_unit.health)
+        self.assertEqual(3, decoded_unit.remaining_stamina)
+        self.assertTupleEqual((1, 2), decoded_unit.location)
+        self.assertFalse(decoded_unit.garrisoned)
+        # The Godless only have the costs of blessings scaled, so the pre-requisite should be the only difference.
+        self.assertEqual(get_unit_plan(test_plan.name, Faction.GODLESS), decoded_unit.plan)
+        self.assertNotEqual(test_plan.prereq, decoded_unit.plan.prereq)
+        self.assertTrue(decoded_unit.has_acted)
+        self.assertFalse(decoded_unit.besieging)
+        # The passenger should have been decoded too, with its plan's pre-requisite blessing scaled for the faction.
+        decoded_passenger: Unit = decoded_unit.passengers[0]
+        self.assertEqual(Unit(600.0, 4, (3, 4), False, get_unit_plan(UNIT_PLANS[4].name, Faction.GODLESS)),
+                         decoded_passenger)
+
+    def test_decode_player(self):
+        """
+        Ensure that the AI playstyle, faction, and resources for players from current saves are decoded directly.
+        """
+        test_loaded_player: ObjectConverter = ObjectConverter({
+            "ai_playstyle": ObjectConverter({
+                "attacking": AttackPlaystyle.AGGRESSIVE.value,
+                "expansion": ExpansionPlaystyle.HERMIT.value
+            }),
+            "faction": Faction.FUNDAMENTALISTS.value,
+            "resources": ObjectConverter(ResourceCollection(ore=1, sunstone=7).__dict__)
+        })
+
+        decode_player(test_loaded_player)
+
+        self.assertEqual(AIPlaystyle(AttackPlaystyle.AGGRESSIVE, ExpansionPlaystyle.HERMIT),
+                         test_loaded_player.ai_playstyle)
+        self.assertEqual(Faction.FUNDAMENTALISTS, test_loaded_player.faction)
+        self.assertEqual(ResourceCollection(ore=1, sunstone=7), test_loaded_player.resources)
+
+        # Human players don't have an AI playstyle.
+        test_loaded_player.ai_playstyle = None
+        test_loaded_player.faction = Faction.FUNDAMENTALISTS.value
+        decode_player(test_loaded_player)
+        self.assertIsNone(test_loaded_player.ai_playstyle)
+
+    def test_decode_settlement(self):
+        """
+        Ensure that the resources for settlements from current saves are decoded directly.
+        """
+        test_loaded_settlement: ObjectConverter = ObjectConverter({
+            "resources": ObjectConverter(ResourceCollection(magma=3, aquamarine=8).__dict__)
+        })
+
+        decode_settlement(test_loaded_settlement)
+
+        self.assertEqual(ResourceCollection(magma=3, aquamarine=8), test_loaded_settlement.resources)
+
 
 if __name__ == '__main__':
     unittest.main()
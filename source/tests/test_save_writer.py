@@ -0,0 +1,81 @@
+import unittest
+from threading import Event
+from unittest.mock import MagicMock, patch
+
+from source.saving.save_writer import SaveWriter
+
+
+@patch("source.saving.save_writer.atexit.register", MagicMock())
+class SaveWriterTest(unittest.TestCase):
+    """
+    The test class for save_writer.py.
+    """
+
+    def setUp(self) -> None:
+        """
+        Initialise a writer with a mock write function.
+        """
+        self.write_mock = MagicMock()
+        self.writer = SaveWriter(self.write_mock, max_queued=2)
+
+    def tearDown(self) -> None:
+        """
+        Stop the writer's background thread if it was started.
+        """
+        self.writer.shutdown()
+
+    def test_submit(self):
+        """
+        Ensure that submitted saves are written on the background thread.
+        """
+        self.writer.submit("save.json", {"turn": 1}, auto=False)
+        self.writer.submit("autosave.json", {"turn": 2}, auto=True)
+        self.writer.wait_until_written()
+        self.write_mock.assert_any_call("save.json", {"turn": 1}, False)
+        self.write_mock.assert_called_with("autosave.json", {"turn": 2}, True)
+        self.assertTrue(self.writer.writer_thread.is_alive())
+
+    def test_submit_write_failure(self):
+        """
+        Ensure that a save failing to be written does not prevent subsequent saves from being written.
+        """
+        self.write_mock.side_effect = [OSError(), None]
+        self.writer.submit("first.json", {}, auto=True)
+        self.writer.submit("second.json", {}, auto=True)
+        self.writer.wait_until_written()
+        self.assertEqual(2, self.write_mock.call_count)
+        self.write_mock.assert_called_with("second.json", {}, True)
+
+    def test_submit_queue_full(self):
+        """
+        Ensure that autosaves are dropped when the queue is full, rather than blocking the thread submitting them.
+        """
+        blocker = Event()
+        # Block the background thread on the first save so that the queue fills up behind it.
+        self.write_mock.side_effect = lambda *_: blocker.wait()
+        self.writer.submit("first.json", {}, auto=True)
+        # Wait for the first save to be picked up by the background thread.
+        while self.write_mock.call_count == 0:
+            blocker.wait(0.01)
+        self.writer.submit("second.json", {}, auto=True)
+        self.writer.submit("third.json", {}, auto=True)
+        self.writer.submit("fourth.json", {}, auto=True)
+        self.assertEqual(1, self.writer.dropped_autosaves)
+        blocker.set()
+        self.writer.wait_until_written()
+        self.assertEqual(3, self.write_mock.call_count)
+
+    def test_shutdown(self):
+        """
+        Ensure that shutting down the writer writes any remaining saves and stops the background thread.
+        """
+        self.writer.submit("save.json", {}, auto=False)
+        self.writer.shutdown()
+        self.write_mock.assert_called_with("save.json", {}, False)
+        self.assertIsNone(self.writer.writer_thread)
+        # Shutting down again should be a no-op.
+        self.writer.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,362 @@
+import json
+import os
+import pickle
+import unittest
+from queue import Queue
+from unittest.mock import MagicMock, patch
+
+from source.foundation.catalogue import LOBBY_NAMES
+from source.foundation.models import GameConfig, Faction, MultiplayerStatus, LobbyDetails, ShardUpdate, \
+    ShardUpdateType, PlayerDetails
+from source.networking.client_registry import ClientRegistry
+from source.networking.events import Event, EventType, CreateEvent, LoadEvent, JoinEvent, EndTurnEvent, RegisterEvent, \
+    UnreadyEvent
+from source.networking.lobby_directory import LobbyDirectory
+from source.networking.lobby_tracker import LobbyTracker
+from source.networking.sharding import get_shard_count, SHARDS_ENV_VAR, SHARD_HOST, ShardRouter, \
+    ShardLobbyDirectory, ShardClientRegistry, FrontServer, FrontRequestHandler, ShardRequestHandler, FrontListener, \
+    ShardListener, ShardServer, run_shard, run_sharded_server
+from source.saving.save_encoder import SaveEncoder, ObjectConverter
+
+
+class ShardingTest(unittest.TestCase):
+    """
+    The test class for sharding.py.
+    """
+    TEST_IDENTIFIER: int = 123
+    TEST_HOST: str = "192.168.0.1"
+    TEST_PORT: int = 8888
+    TEST_SHARD_PORT: int = 7777
+    TEST_LOBBY_NAME: str = "Shardville"
+    TEST_GAME_CONFIG: GameConfig = GameConfig(2, Faction.AGRICULTURISTS, True, True, True, MultiplayerStatus.GLOBAL)
+
+    def setUp(self) -> None:
+        """
+        Set up a front server with two shards, the second of which is listening, and a registered client. The server
+        isn't bound, so that no port is actually taken up.
+        """
+        self.updates: Queue = Queue()
+        self.mock_socket: MagicMock = MagicMock()
+        self.front_server: FrontServer = FrontServer(("0.0.0.0", 0), FrontRequestHandler, bind_and_activate=False)
+        self.front_server.shard_router_ref = ShardRouter(2)
+        self.front_server.shard_router_ref.ports[1] = self.TEST_SHARD_PORT
+        self.front_server.shard_updates_ref = self.updates
+        self.front_server.is_server = True
+        self.front_server.client_registry_ref = ClientRegistry()
+        self.front_server.client_registry_ref.register(self.TEST_IDENTIFIER, (self.TEST_HOST, self.TEST_PORT))
+        self.front_server.clients_ref = self.front_server.client_registry_ref.clients
+        self.front_server.lobby_directory_ref = LobbyDirectory()
+        self.front_server.lobby_tracker_ref = LobbyTracker()
+        self.front_server.lobbies_ref = {}
+
+    def tearDown(self) -> None:
+        """
+        Close the front server's socket after each test.
+        """
+        self.front_server.server_close()
+
+    def _handle_on_front(self, evt: Event) -> FrontRequestHandler:
+        """
+        Handle the given event on the front server, noting that the handler's constructor handles the request.
+        :param evt: The event to handle.
+        :return: The handler that handled the event.
+        """
+        packet: bytes = json.dumps(evt, separators=(",", ":"), cls=SaveEncoder).encode()
+        return FrontRequestHandler((packet, self.mock_socket), (self.TEST_HOST, self.TEST_PORT), self.front_server)
+
+    def _assert_forwarded(self, evt: Event, lobby_name: str | None):
+        """
+        Assert that the given event was forwarded to the listening shard, with the expected header.
+        :param evt: The event that should have been forwarded.
+        :param lobby_name: The name of the new lobby that should be in the header, if there is one.
+        """
+        packet, address = self.mock_socket.sendto.call_args[0]
+        header_bytes, _, forwarded = packet.partition(b"\n")
+        self.assertEqual((SHARD_HOST, self.TEST_SHARD_PORT), address)
+        self.assertDictEqual({"address": [self.TEST_HOST, self.TEST_PORT], "lobby_name": lobby_name},
+                             json.loads(header_bytes))
+        self.assertEqual(json.dumps(evt, separators=(",", ":"), cls=SaveEncoder).encode(), forwarded)
+
+    def test_get_shard_count(self):
+        """
+        Ensure that the shard count is only returned when it is configured with a positive number.
+        """
+        with patch.dict(os.environ, clear=True):
+            self.assertIsNone(get_shard_count())
+        for invalid_value in ["", "lots", "0", "-2"]:
+            with patch.dict(os.environ, {SHARDS_ENV_VAR: invalid_value}):
+                self.assertIsNone(get_shard_count())
+        with patch.dict(os.environ, {SHARDS_ENV_VAR: "4"}):
+            self.assertEqual(4, get_shard_count())
+
+    @patch("random.choice")
+    def test_router(self, random_choice_mock: MagicMock):
+        """
+        Ensure that new lobbies are given unique names and assigned to the listening shard with the fewest lobbies, and
+        that closed lobbies are released.
+        :param random_choice_mock: The mock implementation of random.choice().
+        """
+        router: ShardRouter = ShardRouter(3)
+        # No lobbies can be assigned until a shard is listening.
+        self.assertIsNone(router.assign_lobby())
+
+        router.ports[0] = self.TEST_SHARD_PORT
+        router.ports[2] = self.TEST_SHARD_PORT + 1
+        # The second lobby's name is initially already taken by the first.
+        random_choice_mock.side_effect = [LOBBY_NAMES[0], LOBBY_NAMES[0], LOBBY_NAMES[1], LOBBY_NAMES[2]]
+        self.assertTupleEqual((LOBBY_NAMES[0], 0), router.assign_lobby())
+        self.assertTupleEqual((LOBBY_NAMES[1], 2), router.assign_lobby())
+        router.release_lobby(LOBBY_NAMES[0])
+        # Releasing a lobby that isn't routed shouldn't do anything.
+        router.release_lobby(LOBBY_NAMES[0])
+        # Now that the first shard has no lobbies again, it should be assigned the next lobby.
+        self.assertTupleEqual((LOBBY_NAMES[2], 0), router.assign_lobby())
+        self.assertDictEqual({LOBBY_NAMES[1]: 2, LOBBY_NAMES[2]: 0}, router.lobby_shards)
+        self.assertListEqual([1, 0, 1], router.loads)
+
+    def test_shard_lobby_directory(self):
+        """
+        Ensure that a shard's lobby directory passes its changes on to the front rather than keeping them itself.
+        """
+        directory: ShardLobbyDirectory = ShardLobbyDirectory(1, self.updates)
+        lobby: LobbyDetails = LobbyDetails(self.TEST_LOBBY_NAME, [], self.TEST_GAME_CONFIG, None)
+        directory.update(lobby)
+        directory.remove(self.TEST_LOBBY_NAME)
+        self.assertEqual(ShardUpdate(ShardUpdateType.LOBBY, 1, lobby=lobby), self.updates.get_nowait())
+        self.assertEqual(ShardUpdate(ShardUpdateType.CLOSE, 1, lobby_name=self.TEST_LOBBY_NAME),
+                         self.updates.get_nowait())
+        self.assertFalse(directory.lobbies)
+
+    def test_shard_client_registry(self):
+        """
+        Ensure that a shard's client registry records the lobbies joined and left, letting the front know of each.
+        """
+        registry: ShardClientRegistry = ShardClientRegistry(1, self.updates)
+        registry.join_lobby(self.TEST_IDENTIFIER, self.TEST_LOBBY_NAME)
+        self.assertSetEqual({self.TEST_LOBBY_NAME}, registry.lobbies[self.TEST_IDENTIFIER])
+        registry.leave_lobby(self.TEST_IDENTIFIER, self.TEST_LOBBY_NAME)
+        self.assertFalse(registry.lobbies)
+        self.assertEqual(ShardUpdate(ShardUpdateType.JOIN, 1, lobby_name=self.TEST_LOBBY_NAME,
+                                     identifier=self.TEST_IDENTIFIER), self.updates.get_nowait())
+        self.assertEqual(ShardUpdate(ShardUpdateType.LEAVE, 1, lobby_name=self.TEST_LOBBY_NAME,
+                                     identifier=self.TEST_IDENTIFIER), self.updates.get_nowait())
+
+    def test_service_actions(self):
+        """
+        Ensure that the front applies every update sent by its shards, keeping its router, directory, and registry up to
+        date.
+        """
+        router: ShardRouter = self.front_server.shard_router_ref
+        router.lobby_shards[self.TEST_LOBBY_NAME] = 1
+        router.loads[1] = 1
+        lobby: LobbyDetails = LobbyDetails(self.TEST_LOBBY_NAME, [], self.TEST_GAME_CONFIG, None)
+        unregistered_identifier: int = 456
+        self.updates.put(ShardUpdate(ShardUpdateType.PORT, 0, port=self.TEST_SHARD_PORT + 1))
+        self.updates.put(ShardUpdate(ShardUpdateType.LOBBY, 1, lobby=lobby))
+        self.updates.put(ShardUpdate(ShardUpdateType.JOIN, 1, lobby_name=self.TEST_LOBBY_NAME,
+                                     identifier=self.TEST_IDENTIFIER))
+        # Clients that have since been removed from the front's registry shouldn't be added back.
+        self.updates.put(ShardUpdate(ShardUpdateType.JOIN, 1, lobby_name=self.TEST_LOBBY_NAME,
+                                     identifier=unregistered_identifier))
+
+        self.front_server.service_actions()
+
+        self.assertListEqual([self.TEST_SHARD_PORT + 1, self.TEST_SHARD_PORT], router.ports)
+        self.assertIs(lobby, self.front_server.lobby_directory_ref.lobbies[self.TEST_LOBBY_NAME])
+        self.assertDictEqual({self.TEST_IDENTIFIER: {self.TEST_LOBBY_NAME}},
+                             self.front_server.client_registry_ref.lobbies)
+        self.assertTrue(self.updates.empty())
+
+        self.updates.put(ShardUpdate(ShardUpdateType.LEAVE, 1, lobby_name=self.TEST_LOBBY_NAME,
+                                     identifier=self.TEST_IDENTIFIER))
+        self.updates.put(ShardUpdate(ShardUpdateType.CLOSE, 1, lobby_name=self.TEST_LOBBY_NAME))
+
+        self.front_server.service_actions()
+
+        # Once closed, the lobby's name should be free to be used again.
+        self.assertFalse(self.front_server.client_registry_ref.lobbies)
+        self.assertFalse(self.front_server.lobby_directory_ref.lobbies)
+        self.assertFalse(router.lobby_shards)
+        self.assertListEqual([0, 0], router.loads)
+
+    def test_front_handles_non_lobby_events(self):
+        """
+        Ensure that the front handles events that aren't for a particular lobby itself.
+        """
+        self._handle_on_front(RegisterEvent(EventType.REGISTER, self.TEST_IDENTIFIER, self.TEST_PORT + 1))
+        # The client should have been registered with the front, and sent a response.
+        self.assertEqual((self.TEST_HOST, self.TEST_PORT + 1), self.front_server.clients_ref[self.TEST_IDENTIFIER])
+        self.assertEqual((self.TEST_HOST, self.TEST_PORT + 1), self.mock_socket.sendto.call_args[0][1])
+
+    @patch("random.choice")
+    def test_front_forwards_new_lobbies(self, random_choice_mock: MagicMock):
+        """
+        Ensure that the front names new lobbies and forwards the events creating them to their assigned shard.
+        :param random_choice_mock: The mock implementation of random.choice().
+        """
+        random_choice_mock.side_effect = [LOBBY_NAMES[0], LOBBY_NAMES[1]]
+        create_event: CreateEvent = CreateEvent(EventType.CREATE, self.TEST_IDENTIFIER, self.TEST_GAME_CONFIG)
+        self._handle_on_front(create_event)
+        self._assert_forwarded(create_event, LOBBY_NAMES[0])
+
+        load_event: LoadEvent = LoadEvent(EventType.LOAD, self.TEST_IDENTIFIER, "autosave.msav")
+        self._handle_on_front(load_event)
+        self._assert_forwarded(load_event, LOBBY_NAMES[1])
+
+        self.assertDictEqual({LOBBY_NAMES[0]: 1, LOBBY_NAMES[1]: 1}, self.front_server.shard_router_ref.lobby_shards)
+
+    def test_front_new_lobby_no_shards(self):
+        """
+        Ensure that the front drops events creating new lobbies when no shard is listening yet.
+        """
+        self.front_server.shard_router_ref.ports[1] = None
+        self._handle_on_front(CreateEvent(EventType.CREATE, self.TEST_IDENTIFIER, self.TEST_GAME_CONFIG))
+        self.mock_socket.sendto.assert_not_called()
+        self.assertFalse(self.front_server.shard_router_ref.lobby_shards)
+
+    def test_front_forwards_lobby_events(self):
+        """
+        Ensure that the front forwards events for a lobby to the shard that owns it, marking the client as active, and
+        ignores events for lobbies that aren't routed.
+        """
+        self.front_server.client_registry_ref.register(456, (self.TEST_HOST, self.TEST_PORT + 1))
+        self.front_server.shard_router_ref.lobby_shards[self.TEST_LOBBY_NAME] = 1
+
+        # Events may refer to the lobby as a lobby.
+        join_event: JoinEvent = JoinEvent(EventType.JOIN, self.TEST_IDENTIFIER, self.TEST_LOBBY_NAME,
+                                          Faction.FRONTIERSMEN)
+        self._handle_on_front(join_event)
+        self._assert_forwarded(join_event, None)
+        self.assertEqual(self.TEST_IDENTIFIER, list(self.front_server.clients_ref)[-1])
+
+        # Or as a game.
+        end_turn_event: EndTurnEvent = EndTurnEvent(EventType.END_TURN, self.TEST_IDENTIFIER, self.TEST_LOBBY_NAME)
+        self._handle_on_front(end_turn_event)
+        self._assert_forwarded(end_turn_event, None)
+
+        self.mock_socket.reset_mock()
+        self._handle_on_front(EndTurnEvent(EventType.END_TURN, self.TEST_IDENTIFIER, "Unknown"))
+        self.mock_socket.sendto.assert_not_called()
+
+    def test_shard_handles_forwarded_events(self):
+        """
+        Ensure that shards register the client that sent each forwarded event, and use the lobby name the front chose
+        when creating a lobby.
+        """
+        mock_server: ShardServer = MagicMock()
+        # The shard should only ever send packets to clients from its reply socket.
+        mock_server.reply_sock_ref = self.mock_socket
+        mock_server.client_registry_ref = ClientRegistry()
+        mock_server.clients_ref = mock_server.client_registry_ref.clients
+        mock_server.lobby_tracker_ref = LobbyTracker()
+        mock_server.lobby_directory_ref = LobbyDirectory()
+        mock_server.game_states_ref = {}
+        mock_server.namers_ref = {}
+        mock_server.move_makers_ref = {}
+        mock_server.game_clients_ref = {}
+        mock_server.lobbies_ref = {}
+        mock_server.is_server = True
+        header: bytes = json.dumps({"address": [self.TEST_HOST, self.TEST_PORT],
+                                    "lobby_name": self.TEST_LOBBY_NAME}).encode()
+        packet: bytes = json.dumps(CreateEvent(EventType.CREATE, self.TEST_IDENTIFIER, self.TEST_GAME_CONFIG),
+                                   cls=SaveEncoder).encode()
+
+        ShardRequestHandler((header + b"\n" + packet, MagicMock()), (SHARD_HOST, 9999), mock_server)
+
+        self.assertEqual((self.TEST_HOST, self.TEST_PORT), mock_server.clients_ref[self.TEST_IDENTIFIER])
+        self.assertIn(self.TEST_LOBBY_NAME, mock_server.lobbies_ref)
+        self.assertListEqual([self.TEST_IDENTIFIER],
+                             [player.id for player in mock_server.game_clients_ref[self.TEST_LOBBY_NAME]])
+        # The shard should have responded to the client directly.
+        self.assertEqual((self.TEST_HOST, self.TEST_PORT), self.mock_socket.sendto.call_args[0][1])
+
+        # Events forwarded without an address, e.g. those sent by the front itself for clients that have stopped
+        # responding, shouldn't register anything.
+        header = json.dumps({"address": None, "lobby_name": None}).encode()
+        packet = json.dumps(UnreadyEvent(EventType.UNREADY, 456, self.TEST_LOBBY_NAME), cls=SaveEncoder).encode()
+        ShardRequestHandler((header + b"\n" + packet, MagicMock()), (SHARD_HOST, 9999), mock_server)
+        self.assertNotIn(456, mock_server.clients_ref)
+
+        # Invalid packets should just be ignored.
+        ShardRequestHandler((b"invalid\nalso invalid", MagicMock()), (SHARD_HOST, 9999), mock_server)
+        self.assertEqual(1, self.mock_socket.sendto.call_count)
+
+    @patch("source.networking.sharding.FrontServer")
+    def test_front_listener(self, front_server_mock: MagicMock):
+        """
+        Ensure that the front listener creates its server on the game server's port, with the router and queue of
+        updates passed down.
+        """
+        with patch("source.networking.event_listener.Thread"):
+            listener: FrontListener = FrontListener(2, self.updates)
+        server: MagicMock = listener.create_server()
+        front_server_mock.assert_called_with(("0.0.0.0", 9999), FrontRequestHandler)
+        self.assertIs(listener.shard_router, server.shard_router_ref)
+        self.assertIs(self.updates, server.shard_updates_ref)
+
+    @patch("source.networking.event_listener.Thread")
+    def test_shard_listener(self, thread_mock: MagicMock):
+        """
+        Ensure that shard listeners don't send keepalives, only listen on the loopback address, and let the front know
+        which port they're listening on, while sending packets to clients from a socket that isn't loopback-bound.
+        :param thread_mock: The mock implementation of the Thread class.
+        """
+        listener: ShardListener = ShardListener(1, self.updates)
+        thread_mock.assert_not_called()
+        self.assertIsInstance(listener.client_registry, ShardClientRegistry)
+        self.assertIsInstance(listener.lobby_directory, ShardLobbyDirectory)
+
+        with listener.create_server() as server:
+            self.assertIsInstance(server, ShardServer)
+            self.assertIs(ShardRequestHandler, server.RequestHandlerClass)
+            self.assertEqual(SHARD_HOST, server.server_address[0])
+            self.assertEqual(ShardUpdate(ShardUpdateType.PORT, 1, port=server.server_address[1]),
+                             self.updates.get_nowait())
+            # A socket bound to the loopback address can't send packets to clients on other hosts.
+            self.assertEqual("0.0.0.0", server.reply_sock_ref.getsockname()[0])
+            self.assertNotEqual(server.server_address[1], server.reply_sock_ref.getsockname()[1])
+        # Closing the server should close the reply socket too.
+        self.assertEqual(-1, server.reply_sock_ref.fileno())
+
+    @patch("source.networking.sharding.ShardListener")
+    def test_run_shard(self, shard_listener_mock: MagicMock):
+        """
+        Ensure that running a shard runs its listener.
+        :param shard_listener_mock: The mock implementation of the ShardListener class.
+        """
+        run_shard(1, self.updates)
+        shard_listener_mock.assert_called_with(1, self.updates)
+        shard_listener_mock.return_value.run.assert_called()
+
+    @patch("source.networking.sharding.FrontListener")
+    @patch("source.networking.sharding.Process")
+    @patch("multiprocessing.Queue")
+    def test_run_sharded_server(self, queue_mock: MagicMock, process_mock: MagicMock, front_listener_mock: MagicMock):
+        """
+        Ensure that running a sharded game server starts a daemonic process for each shard before running the front.
+        :param queue_mock: The mock implementation of the multiprocessing Queue class.
+        :param process_mock: The mock implementation of the Process class.
+        :param front_listener_mock: The mock implementation of the FrontListener class.
+        """
+        run_sharded_server(2)
+        process_mock.assert_any_call(target=run_shard, args=(0, queue_mock.return_value), daemon=True)
+        process_mock.assert_any_call(target=run_shard, args=(1, queue_mock.return_value), daemon=True)
+        self.assertEqual(2, process_mock.return_value.start.call_count)
+        front_listener_mock.assert_called_with(2, queue_mock.return_value)
+        front_listener_mock.return_value.run.assert_called()
+
+    def test_shard_update_picklable(self):
+        """
+        Ensure that the lobby details sent by shards can be pickled, since updates are sent between processes.
+        """
+        # The configs of lobbies created by clients are decoded as ObjectConverter objects rather than GameConfigs.
+        cfg: ObjectConverter = json.loads(json.dumps(self.TEST_GAME_CONFIG, cls=SaveEncoder),
+                                          object_hook=ObjectConverter)
+        lobby: LobbyDetails = LobbyDetails(self.TEST_LOBBY_NAME, [PlayerDetails("Uno", Faction.GODLESS, 1)], cfg, 2)
+        update: ShardUpdate = pickle.loads(pickle.dumps(ShardUpdate(ShardUpdateType.LOBBY, 0, lobby=lobby)))
+        self.assertEqual(Faction.AGRICULTURISTS, update.lobby.cfg.player_faction)
+        self.assertEqual(2, update.lobby.current_turn)
+
+
+if __name__ == '__main__':
+    unittest.main()
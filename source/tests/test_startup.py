@@ -0,0 +1,66 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from source.util.profiler import FrameProfiler
+from source.util.startup import DeferredStartup, FIRST_FRAME_SECTION, STARTUP_SECTION_PREFIX
+
+
+class DeferredStartupTest(unittest.TestCase):
+    """
+    The test class for startup.py.
+    """
+
+    @patch("source.util.startup.PROFILER", new_callable=lambda: FrameProfiler(enabled=True))
+    @patch("time.perf_counter")
+    def test_run_next(self, perf_counter_mock: MagicMock, profiler: FrameProfiler):
+        """
+        Ensure that deferred tasks are only run once the first frame has been drawn, one at a time and in order, and
+        that both the tasks and the time taken to draw the first frame are recorded in the profiler.
+        :param perf_counter_mock: The mock implementation of time.perf_counter().
+        :param profiler: The enabled profiler to record the startup with.
+        """
+        first_task = MagicMock()
+        second_task = MagicMock()
+        startup = DeferredStartup(start_time=10)
+        startup.defer("icon", first_task)
+        startup.defer("listener", second_task)
+
+        # Nothing should run before the first frame has been drawn.
+        startup.run_next()
+        first_task.assert_not_called()
+
+        perf_counter_mock.return_value = 10.5
+        startup.mark_first_frame_drawn()
+        self.assertTrue(startup.first_frame_drawn)
+        self.assertEqual(0.5, profiler.current_sections[FIRST_FRAME_SECTION])
+        # Subsequent frames should not be recorded as the first.
+        perf_counter_mock.return_value = 11
+        startup.mark_first_frame_drawn()
+        self.assertEqual(0.5, profiler.current_sections[FIRST_FRAME_SECTION])
+
+        startup.run_next()
+        first_task.assert_called_once()
+        second_task.assert_not_called()
+        self.assertIn(STARTUP_SECTION_PREFIX + "icon", profiler.current_sections)
+        startup.run_next()
+        second_task.assert_called_once()
+        # Once every task has been run, there should be nothing left to do.
+        startup.run_next()
+        self.assertFalse(startup.tasks)
+        first_task.assert_called_once()
+        second_task.assert_called_once()
+
+    @patch("source.util.startup.PROFILER", new_callable=FrameProfiler)
+    def test_first_frame_not_profiled(self, profiler: FrameProfiler):
+        """
+        Ensure that the first frame is not recorded while the profiler is disabled.
+        :param profiler: The disabled profiler.
+        """
+        startup = DeferredStartup(start_time=0)
+        startup.mark_first_frame_drawn()
+        self.assertTrue(startup.first_frame_drawn)
+        self.assertFalse(profiler.trace_events)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,214 @@
+import json
+import os
+import time
+import unittest
+from tempfile import TemporaryDirectory
+from unittest.mock import patch, MagicMock
+
+from source.display.board import Board
+from source.foundation.catalogue import Namer, ACHIEVEMENTS
+from source.foundation.models import Statistics, VictoryType, Faction, GameConfig, MultiplayerStatus
+from source.game_management.game_state import GameState
+from source.saving.stats_store import StatisticsStore, merge_statistics
+
+
+class StatsStoreTest(unittest.TestCase):
+    """
+    The test class for stats_store.py.
+    """
+    TEST_CONFIG = GameConfig(4, Faction.NOCTURNE, True, True, True, MultiplayerStatus.DISABLED)
+
+    def setUp(self) -> None:
+        """
+        Initialise a temporary directory for the statistics file, as well as a test game state and store.
+        """
+        # We can't use a context manager here since the directory needs to remain for the duration of each test.
+        self.saves_dir = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.stats_file_name = os.path.join(self.saves_dir.name, "statistics.json")
+        self.store = StatisticsStore(self.stats_file_name)
+        self.game_state = GameState()
+        self.game_state.board = Board(self.TEST_CONFIG, Namer(), {})
+        self.game_state.gen_players(self.TEST_CONFIG)
+        self.game_state.player_idx = 0
+
+    def tearDown(self) -> None:
+        """
+        Stop the store's background thread if it was started, and clean up the temporary directory.
+        """
+        self.store.shutdown()
+        self.saves_dir.cleanup()
+
+    def _write_stats(self, stats: dict):
+        """
+        Write the given statistics to the statistics file, as if another running instance of the game had done so.
+        :param stats: The statistics to write.
+        """
+        with open(self.stats_file_name, "w", encoding="utf-8") as stats_file:
+            stats_file.write(json.dumps(stats))
+
+    def _read_stats(self) -> dict:
+        """
+        Read the statistics currently in the statistics file.
+        :return: The statistics from disk.
+        """
+        with open(self.stats_file_name, "r", encoding="utf-8") as stats_file:
+            return json.loads(stats_file.read())
+
+    def test_merge_statistics(self):
+        """
+        Ensure that statistics are correctly combined with a set of changes.
+        """
+        base = Statistics(1.0, 2, {VictoryType.GLUTTONY: 1}, 3, {Faction.NOCTURNE: 2}, {"A"})
+        delta = Statistics(0.5, 1, {VictoryType.GLUTTONY: 1, VictoryType.VIGOUR: 1}, 0, {Faction.INFIDELS: 1}, {"B"})
+        merged = merge_statistics(base, delta)
+        self.assertEqual(Statistics(1.5, 3, {VictoryType.GLUTTONY: 2, VictoryType.VIGOUR: 1}, 3,
+                                    {Faction.NOCTURNE: 2, Faction.INFIDELS: 1}, {"A", "B"}), merged)
+        # Neither of the original objects should have been modified.
+        self.assertEqual({VictoryType.GLUTTONY: 1}, base.victories)
+        self.assertEqual({"A"}, base.achievements)
+
+    def test_get_stats_no_file(self):
+        """
+        Ensure that when there are no statistics on disk, empty statistics are returned.
+        """
+        self.assertEqual(Statistics(0, 0, {}, 0, {}, set()), self.store.get_stats())
+
+    def test_get_stats_is_copy(self):
+        """
+        Ensure that modifying the statistics returned by the store does not modify the store's own statistics.
+        """
+        stats = self.store.get_stats()
+        stats.victories[VictoryType.VIGOUR] = 1
+        self.assertFalse(self.store.get_stats().victories)
+
+    def test_record_no_flush(self):
+        """
+        Ensure that recording statistics without obtaining any achievements only updates them in memory.
+        """
+        self._write_stats({"playtime": 1.0, "turns_played": 1, "victories": {}, "defeats": 0, "factions": {},
+                           "achievements": [a.name for a in ACHIEVEMENTS]})
+        self.assertFalse(self.store.record(self.game_state, playtime=2.0))
+        self.assertEqual(3.0, self.store.get_stats().playtime)
+        self.assertEqual(2, self.store.get_stats().turns_played)
+        self.assertTrue(self.store.dirty)
+        # The file should not have been touched yet.
+        self.assertEqual(1.0, self._read_stats()["playtime"])
+
+    def test_record_achievement_flushes(self):
+        """
+        Ensure that obtaining an achievement causes statistics to be flushed immediately when there is no background
+        thread running.
+        """
+        new_achs = self.store.record(self.game_state, victory_to_add=VictoryType.ELIMINATION)
+        self.assertIn(ACHIEVEMENTS[0], new_achs)
+        self.assertFalse(self.store.dirty)
+        written = self._read_stats()
+        self.assertEqual({VictoryType.ELIMINATION: 1}, written["victories"])
+        self.assertIn(ACHIEVEMENTS[0].name, written["achievements"])
+        # The achievement should not be obtained twice.
+        self.assertNotIn(ACHIEVEMENTS[0], self.store.record(self.game_state, victory_to_add=VictoryType.ELIMINATION))
+
+    def test_flush_merges_with_disk(self):
+        """
+        Ensure that when flushing, changes are applied on top of any statistics written to disk by another running
+        instance of the game in the meantime, and that the in-memory statistics are rebased accordingly.
+        """
+        self.store.record(self.game_state, playtime=5.0, faction_to_add=Faction.NOCTURNE)
+        # Simulate another instance writing its own statistics after ours were loaded.
+        self._write_stats({"playtime": 10.0, "turns_played": 7, "victories": {}, "defeats": 1,
+                           "factions": {Faction.NOCTURNE: 2}, "achievements": ["Other"]})
+        self.store.flush()
+        written = self._read_stats()
+        self.assertEqual(15.0, written["playtime"])
+        self.assertEqual(8, written["turns_played"])
+        self.assertEqual(1, written["defeats"])
+        self.assertEqual({Faction.NOCTURNE: 3}, written["factions"])
+        self.assertIn("Other", written["achievements"])
+        self.assertEqual(15.0, self.store.get_stats().playtime)
+        # The temporary file used for the atomic replacement should not remain.
+        self.assertFalse(os.path.exists(self.stats_file_name + ".tmp"))
+
+    def test_flush_failure_keeps_changes(self):
+        """
+        Ensure that when statistics can't be written to disk, the changes are kept so that they are written with the
+        next flush.
+        """
+        self.store.record(self.game_state, playtime=5.0)
+        with patch("source.saving.stats_store.os.replace", side_effect=OSError):
+            self.assertRaises(OSError, self.store.flush)
+        self.assertFalse(os.path.exists(self.stats_file_name))
+        self.assertTrue(self.store.dirty)
+        self.assertEqual(5.0, self.store.pending.playtime)
+        # Changes made after the failed flush should be written alongside the ones that failed.
+        self.store.record(self.game_state, playtime=2.0)
+        self.store.flush()
+        self.assertEqual(7.0, self._read_stats()["playtime"])
+        self.assertEqual(2, self._read_stats()["turns_played"])
+
+    @patch("source.saving.stats_store.atexit.register", MagicMock())
+    def test_flusher_survives_failure(self):
+        """
+        Ensure that the background thread keeps running when a flush fails.
+        """
+        self.store.flush_interval = 60
+        self.store.start()
+        with patch.object(self.store, "flush", side_effect=OSError) as flush_mock:
+            self.store.request_flush()
+            # Wait for the background thread to pick up the request.
+            for _ in range(100):
+                if flush_mock.called:
+                    break
+                time.sleep(0.01)
+            flush_mock.assert_called()
+            # Give the thread the chance to die, were it going to.
+            time.sleep(0.05)
+            self.assertTrue(self.store.flusher_thread.is_alive())
+
+    @patch("source.saving.stats_store.open")
+    def test_flush_not_dirty(self, open_mock: MagicMock):
+        """
+        Ensure that nothing is written when there are no changes to flush.
+        :param open_mock: The mock implementation of the open() builtin.
+        """
+        self.store.flush()
+        open_mock.assert_not_called()
+
+    @patch("source.saving.stats_store.atexit.register")
+    def test_start_and_shutdown(self, register_mock: MagicMock):
+        """
+        Ensure that starting the store loads statistics and starts the background thread, and that shutting it down
+        stops the thread and flushes any remaining statistics.
+        :param register_mock: The mock implementation of atexit.register().
+        """
+        self.store.flush_interval = 60
+        self.store.start()
+        self.assertIsNotNone(self.store.stats)
+        self.assertTrue(self.store.flusher_thread.is_alive())
+        register_mock.assert_called_with(self.store.shutdown)
+
+        self.store.record(self.game_state, playtime=3.0)
+        self.assertFalse(os.path.exists(self.stats_file_name))
+        self.store.shutdown()
+        self.assertIsNone(self.store.flusher_thread)
+        self.assertEqual(3.0, self._read_stats()["playtime"])
+
+    @patch("source.saving.stats_store.atexit.register", MagicMock())
+    def test_request_flush_background(self):
+        """
+        Ensure that requesting a flush while the background thread is running causes the thread to flush.
+        """
+        self.store.flush_interval = 60
+        self.store.start()
+        self.store.record(self.game_state, playtime=4.0)
+        with patch.object(self.store, "flush", wraps=self.store.flush) as flush_mock:
+            self.store.request_flush()
+            # Wait for the background thread to pick up the request.
+            for _ in range(100):
+                if flush_mock.called:
+                    break
+                time.sleep(0.01)
+            flush_mock.assert_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import unittest
+
+from source.foundation.catalogue import get_heathen_plan
+from source.foundation.models import Player, Faction, Settlement, Quad, Biome, ResourceCollection, Unit, UnitPlan, \
+    Heathen
+from source.util.visibility import VisibilityGrid, VisibilityMaps
+
+
+class VisibilityGridTest(unittest.TestCase):
+    """
+    The test class for the VisibilityGrid class in visibility.py.
+    """
+
+    def test_mark(self):
+        """
+        Ensure that marking quads only affects the quad marked, and that quads off the board are ignored.
+        """
+        grid = VisibilityGrid()
+        grid.mark((5, 6))
+        grid.mark((100, 0))
+        self.assertIn((5, 6), grid)
+        self.assertNotIn((6, 5), grid)
+        self.assertNotIn((100, 0), grid)
+        self.assertNotIn((-1, 6), grid)
+        self.assertEqual(1, sum(grid.cells))
+
+    def test_mark_square(self):
+        """
+        Ensure that marking a square marks every quad within range, clipped to the edges of the board.
+        """
+        grid = VisibilityGrid()
+        grid.mark_square((1, 88), 3)
+        # The square would be 7x7, but only 5 columns and 5 rows of it are on the board.
+        self.assertEqual(25, sum(grid.cells))
+        self.assertIn((0, 85), grid)
+        self.assertIn((4, 89), grid)
+        self.assertNotIn((5, 89), grid)
+        self.assertNotIn((0, 84), grid)
+        # Squares that are entirely off the board should mark nothing.
+        grid.mark_square((-10, 10), 3)
+        grid.mark_square((110, 10), 3)
+        self.assertEqual(25, sum(grid.cells))
+
+
+class VisibilityMapsTest(unittest.TestCase):
+    """
+    The test class for the VisibilityMaps class in visibility.py.
+    """
+
+    def setUp(self) -> None:
+        """
+        Initialise the maps and a player with a settlement and a unit before each test.
+        """
+        self.maps = VisibilityMaps()
+        self.settlement = Settlement("Visible", (20, 20), [], [Quad(Biome.FOREST, 0, 0, 0, 0, (20, 20))],
+                                     ResourceCollection(), [])
+        self.unit = Unit(100, 2, (50, 50), False, UnitPlan(100, 100, 2, "Scout", None, 0))
+        self.player = Player("Tester", Faction.FUNDAMENTALISTS, 0, settlements=[self.settlement], units=[self.unit])
+        self.heathen = Heathen(100, 2, (80, 80), get_heathen_plan(1))
+
+    def test_night_vision(self):
+        """
+        Ensure that players can see a few quads around their settlements and units at nighttime, and that the night
+        vision grid is only recomputed when the player's vision changes.
+        """
+        grid: VisibilityGrid = self.maps.get_night_vision(self.player, [self.heathen])
+        self.assertIn((23, 17), grid)
+        self.assertNotIn((24, 20), grid)
+        self.assertIn((47, 53), grid)
+        self.assertNotIn((46, 50), grid)
+        # Since the player is not of the Infidels faction, they should not share vision with the heathen.
+        self.assertNotIn((80, 80), grid)
+        self.assertIs(grid, self.maps.get_night_vision(self.player, [self.heathen]))
+
+        # Moving the unit should require the grid to be recomputed.
+        self.unit.location = 60, 60
+        grid = self.maps.get_night_vision(self.player, [self.heathen])
+        self.assertIn((60, 60), grid)
+        self.assertNotIn((50, 50), grid)
+        # Acquiring sunstone should also require the grid to be recomputed, with the settlement's vision extended.
+        self.settlement.resources = ResourceCollection(sunstone=1)
+        sunstone_grid: VisibilityGrid = self.maps.get_night_vision(self.player, [self.heathen])
+        self.assertIsNot(grid, sunstone_grid)
+        self.assertIn((26, 14), sunstone_grid)
+
+    def test_night_vision_infidels(self):
+        """
+        Ensure that players of the Infidels faction share night vision with heathens, and that the grid is recomputed
+        when the heathens move.
+        """
+        self.player.faction = Faction.INFIDELS
+        grid: VisibilityGrid = self.maps.get_night_vision(self.player, [self.heathen])
+        self.assertIn((85, 75), grid)
+        self.assertNotIn((86, 80), grid)
+        self.heathen.location = 10, 80
+        grid = self.maps.get_night_vision(self.player, [self.heathen])
+        self.assertIn((10, 80), grid)
+        self.assertNotIn((80, 80), grid)
+
+    def test_sunstone_exclusion(self):
+        """
+        Ensure that heathens are excluded from settlement quads, and from a range around settlements with sunstone
+        resources at nighttime, with the grid only being recomputed when the time of day or settlements change.
+        """
+        grid: VisibilityGrid = self.maps.get_sunstone_exclusion([self.player], True)
+        self.assertIn((20, 20), grid)
+        self.assertNotIn((21, 20), grid)
+        self.assertIs(grid, self.maps.get_sunstone_exclusion([self.player], True))
+
+        self.settlement.resources = ResourceCollection(sunstone=2)
+        grid = self.maps.get_sunstone_exclusion([self.player], True)
+        self.assertIn((29, 11), grid)
+        self.assertNotIn((30, 20), grid)
+        # During the day, sunstone has no effect.
+        grid = self.maps.get_sunstone_exclusion([self.player], False)
+        self.assertIn((20, 20), grid)
+        self.assertNotIn((21, 20), grid)
+
+
+if __name__ == '__main__':
+    unittest.main()
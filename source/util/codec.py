@@ -0,0 +1,429 @@
+import struct
+from copy import copy
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set
+
+from source.foundation.catalogue import BLESSINGS, IMPROVEMENTS, PROJECTS, UNIT_PLANS, FACTION_COLOURS, get_unit_plan
+from source.foundation.models import Quad, Biome, ResourceCollection, Player, Settlement, Unit, UnitPlan, Improvement, \
+    Construction, HarvestStatus, EconomicStatus, Blessing, Faction, VictoryType, OngoingBlessing, AIPlaystyle, \
+    AttackPlaystyle, ExpansionPlaystyle, Project, Heathen, DeployerUnit, Location
+from source.util.calculator import scale_blessing_attributes
+
+"""
+The second generation of the minifier, which encodes game objects as compact bytes rather than delimited strings.
+
+Every record is laid out using the precompiled struct layouts below, with variable-length parts such as names and lists
+being prefixed with their length, so a record is decoded in a single pass over a memoryview of the data without any
+splitting or copying. Improvements, blessings, projects and unit plans are identified by their index in the catalogue,
+and enums by their index in their declaration, rather than by their names. Since these IDs are indices, new entries
+must only ever be appended to the catalogue and enums, as otherwise existing saves would be decoded incorrectly. The IDs
+are pinned in the codec's tests, so that any reordering is caught.
+
+Binary saves and their journals are encoded with this codec.
+
+Objects decoded with this codec are equal to those inflated from the minifier's strings, so the two formats can be
+converted between freely.
+"""
+
+# The layouts for each fixed-size part of a record.
+UINT8: struct.Struct = struct.Struct("<B")
+UINT16: struct.Struct = struct.Struct("<H")
+LOCATION: struct.Struct = struct.Struct("<hh")
+RESOURCES: struct.Struct = struct.Struct("<8i")
+# Biome, wealth, harvest, zeal, fortune, and flags for whether the quad has a resource and whether it is a relic.
+QUAD: struct.Struct = struct.Struct("<6B")
+QUAD_HAS_RESOURCE: int = 1
+QUAD_IS_RELIC: int = 2
+# Quad resources are only ever single units, so they are packed far more tightly than other resource collections.
+QUAD_RESOURCES: struct.Struct = struct.Struct("<8B")
+# Health, remaining stamina, location, plan ID, power, max health, total stamina, cost, whether the unit has acted,
+# whether it is besieging, and whether it is a deployer unit.
+UNIT: struct.Struct = struct.Struct("<dihhBddid???")
+# Strength, max strength, satisfaction, level, harvest reserves, harvest status, economic status, whether the
+# settlement has produced a settler, and whether it is besieged.
+SETTLEMENT_STATUS: struct.Struct = struct.Struct("<dddidBB??")
+# The kind of construction (one of the below), the construction's ID, and the zeal consumed.
+CONSTRUCTION: struct.Struct = struct.Struct("<BBd")
+NO_CONSTRUCTION: int = 0
+IMPROVEMENT_CONSTRUCTION: int = 1
+PROJECT_CONSTRUCTION: int = 2
+UNIT_PLAN_CONSTRUCTION: int = 3
+# Faction and wealth.
+PLAYER_DETAILS: struct.Struct = struct.Struct("<Bd")
+# Imminent victories as a bitmask, whether the player has an ongoing blessing, its ID, the fortune consumed for it,
+# whether the player is an AI, its attacking and expansion playstyles, the jubilation counter, the accumulated wealth,
+# and whether the player has been eliminated.
+PLAYER_STATUS: struct.Struct = struct.Struct("<H?Bd?BBid?")
+# Health, remaining stamina, location, power, max health, total stamina, and whether the heathen has attacked.
+HEATHEN: struct.Struct = struct.Struct("<dihhddi?")
+# Seen quads are stored as pairs of coordinates, each of which is within the board's bounds.
+SEEN_QUAD: struct.Struct = struct.Struct("<BB")
+
+# The IDs for each catalogue entry and enum member.
+BIOMES: List[Biome] = list(Biome)
+BIOME_IDS: Dict[Biome, int] = {biome: idx for idx, biome in enumerate(BIOMES)}
+FACTIONS: List[Faction] = list(Faction)
+FACTION_IDS: Dict[Faction, int] = {faction: idx for idx, faction in enumerate(FACTIONS)}
+HARVEST_STATUSES: List[HarvestStatus] = list(HarvestStatus)
+HARVEST_STATUS_IDS: Dict[HarvestStatus, int] = {status: idx for idx, status in enumerate(HARVEST_STATUSES)}
+ECONOMIC_STATUSES: List[EconomicStatus] = list(EconomicStatus)
+ECONOMIC_STATUS_IDS: Dict[EconomicStatus, int] = {status: idx for idx, status in enumerate(ECONOMIC_STATUSES)}
+VICTORY_TYPES: List[VictoryType] = list(VictoryType)
+ATTACK_PLAYSTYLES: List[AttackPlaystyle] = list(AttackPlaystyle)
+ATTACK_PLAYSTYLE_IDS: Dict[AttackPlaystyle, int] = {style: idx for idx, style in enumerate(ATTACK_PLAYSTYLES)}
+EXPANSION_PLAYSTYLES: List[ExpansionPlaystyle] = list(ExpansionPlaystyle)
+EXPANSION_PLAYSTYLE_IDS: Dict[ExpansionPlaystyle, int] = {style: idx for idx, style in enumerate(EXPANSION_PLAYSTYLES)}
+IMPROVEMENT_IDS: Dict[str, int] = {imp.name: idx for idx, imp in enumerate(IMPROVEMENTS)}
+PROJECT_IDS: Dict[str, int] = {prj.name: idx for idx, prj in enumerate(PROJECTS)}
+BLESSINGS_LIST: List[Blessing] = list(BLESSINGS.values())
+BLESSING_IDS: Dict[str, int] = {bls.name: idx for idx, bls in enumerate(BLESSINGS_LIST)}
+UNIT_PLAN_IDS: Dict[str, int] = {up.name: idx for idx, up in enumerate(UNIT_PLANS)}
+
+
+class Reader:
+    """
+    Reads records from encoded bytes, keeping track of the current position so that no slices need to be made.
+    """
+
+    def __init__(self, data: bytes):
+        """
+        Creates the reader at the start of the given data.
+        :param data: The encoded bytes to read.
+        """
+        self.data: memoryview = memoryview(data)
+        self.offset: int = 0
+
+    def read(self, layout: struct.Struct) -> tuple:
+        """
+        Read the next record with the given layout.
+        :param layout: The layout of the record.
+        :return: The values in the record.
+        """
+        values: tuple = layout.unpack_from(self.data, self.offset)
+        self.offset += layout.size
+        return values
+
+    def read_int(self, layout: struct.Struct) -> int:
+        """
+        Read the next single integer with the given layout, e.g. a length prefix or an ID.
+        :param layout: The layout of the integer.
+        :return: The integer.
+        """
+        value: int = layout.unpack_from(self.data, self.offset)[0]
+        self.offset += layout.size
+        return value
+
+    def read_str(self) -> str:
+        """
+        Read the next length-prefixed UTF-8 string.
+        :return: The string.
+        """
+        length: int = self.read_int(UINT8)
+        value: str = str(self.data[self.offset:self.offset + length], "utf-8")
+        self.offset += length
+        return value
+
+    def at_end(self) -> bool:
+        """
+        Returns whether every record in the data has been read.
+        :return: Whether the reader is at the end of the data.
+        """
+        return self.offset >= len(self.data)
+
+
+def get_resource_values(rc: ResourceCollection) -> tuple:
+    """
+    Get the amount of each resource in the given collection, in the order they are encoded.
+    :param rc: The resource collection.
+    :return: The amount of each resource.
+    """
+    return rc.ore, rc.timber, rc.magma, rc.aurora, rc.bloodstone, rc.obsidian, rc.sunstone, rc.aquamarine
+
+
+def write_str(buffer: bytearray, value: str):
+    """
+    Write the given string to the buffer, prefixed with its length.
+    :param buffer: The buffer to write to.
+    :param value: The string to write.
+    """
+    encoded: bytes = value.encode()
+    buffer += UINT8.pack(len(encoded))
+    buffer += encoded
+
+
+@lru_cache(maxsize=None)
+def get_blessing_template(blessing_id: int, faction: Faction) -> Blessing:
+    """
+    Get the blessing with the given ID, scaled for the given faction. The result is shared, so must be copied before
+    use.
+    :param blessing_id: The ID of the blessing.
+    :param faction: The faction of the player the blessing belongs to.
+    :return: The scaled blessing.
+    """
+    return scale_blessing_attributes(copy(BLESSINGS_LIST[blessing_id]), faction)
+
+
+@lru_cache(maxsize=None)
+def get_unit_plan_template(plan_id: int, faction: Faction) -> UnitPlan:
+    """
+    Get the unit plan with the given ID, scaled for the given faction. The result is shared, so must be copied before
+    use.
+    :param plan_id: The ID of the unit plan.
+    :param faction: The faction of the player the unit plan belongs to.
+    :return: The scaled unit plan.
+    """
+    return get_unit_plan(UNIT_PLANS[plan_id].name, faction)
+
+
+def encode_quads(quads: Iterable[Quad]) -> bytes:
+    """
+    Encode the given quads, in order.
+    :param quads: The quads to encode.
+    :return: The encoded quads.
+    """
+    buffer: bytearray = bytearray()
+    for quad in quads:
+        flags: int = (QUAD_HAS_RESOURCE if quad.resource else 0) | (QUAD_IS_RELIC if quad.is_relic else 0)
+        buffer += QUAD.pack(BIOME_IDS[quad.biome], quad.wealth, quad.harvest, quad.zeal, quad.fortune, flags)
+        if quad.resource:
+            buffer += QUAD_RESOURCES.pack(*get_resource_values(quad.resource))
+    return bytes(buffer)
+
+
+def decode_quads(data: bytes, first_idx: int = 0) -> List[Quad]:
+    """
+    Decode the given encoded quads.
+    :param data: The encoded quads.
+    :param first_idx: The index of the first quad on the board, from which the location of each quad is determined.
+    :return: The decoded quads.
+    """
+    reader: Reader = Reader(data)
+    quads: List[Quad] = []
+    idx: int = first_idx
+    while not reader.at_end():
+        biome_id, wealth, harvest, zeal, fortune, flags = reader.read(QUAD)
+        resource: Optional[ResourceCollection] = \
+            ResourceCollection(*reader.read(QUAD_RESOURCES)) if flags & QUAD_HAS_RESOURCE else None
+        quads.append(Quad(BIOMES[biome_id], wealth, harvest, zeal, fortune, (idx % 100, idx // 100),
+                          resource=resource, is_relic=bool(flags & QUAD_IS_RELIC)))
+        idx += 1
+    return quads
+
+
+def write_unit(buffer: bytearray, unit: Unit):
+    """
+    Write the given unit to the buffer.
+    :param buffer: The buffer to write to.
+    :param unit: The unit to write.
+    """
+    plan: UnitPlan = unit.plan
+    is_deployer: bool = isinstance(unit, DeployerUnit)
+    buffer += UNIT.pack(unit.health, unit.remaining_stamina, unit.location[0], unit.location[1],
+                        UNIT_PLAN_IDS[plan.name], plan.power, plan.max_health, plan.total_stamina, plan.cost,
+                        unit.has_acted, unit.besieging, is_deployer)
+    if is_deployer:
+        buffer += UINT8.pack(len(unit.passengers))
+        for passenger in unit.passengers:
+            write_unit(buffer, passenger)
+
+
+def read_unit(reader: Reader, garrisoned: bool, faction: Faction) -> Unit:
+    """
+    Read the next unit.
+    :param reader: The reader to read from.
+    :param garrisoned: Whether the unit is garrisoned.
+    :param faction: The faction the unit belongs to.
+    :return: The unit.
+    """
+    health, remaining_stamina, x, y, plan_id, power, max_health, total_stamina, cost, has_acted, besieging, \
+        is_deployer = reader.read(UNIT)
+    # As with the minifier, the plan is scaled for the faction, but its power, max health, total stamina, and cost are
+    # replaced with the encoded values, since they may have been further scaled by settlement resources.
+    plan: UnitPlan = copy(get_unit_plan_template(plan_id, faction))
+    if plan.prereq is not None:
+        plan.prereq = copy(plan.prereq)
+    plan.power = power
+    plan.max_health = max_health
+    plan.total_stamina = total_stamina
+    plan.cost = cost
+    if not is_deployer:
+        return Unit(health, remaining_stamina, (x, y), garrisoned, plan, has_acted, besieging)
+    passengers: List[Unit] = [read_unit(reader, garrisoned=False, faction=faction)
+                              for _ in range(reader.read_int(UINT8))]
+    return DeployerUnit(health, remaining_stamina, (x, y), garrisoned, plan, has_acted, besieging, passengers)
+
+
+def write_settlement(buffer: bytearray, settlement: Settlement):
+    """
+    Write the given settlement to the buffer.
+    :param buffer: The buffer to write to.
+    :param settlement: The settlement to write.
+    """
+    write_str(buffer, settlement.name)
+    buffer += LOCATION.pack(*settlement.location)
+    buffer += UINT8.pack(len(settlement.improvements))
+    buffer += bytes(IMPROVEMENT_IDS[imp.name] for imp in settlement.improvements)
+    buffer += UINT8.pack(len(settlement.quads))
+    for quad in settlement.quads:
+        buffer += LOCATION.pack(*quad.location)
+    buffer += RESOURCES.pack(*get_resource_values(settlement.resources))
+    buffer += UINT8.pack(len(settlement.garrison))
+    for unit in settlement.garrison:
+        write_unit(buffer, unit)
+    buffer += SETTLEMENT_STATUS.pack(settlement.strength, settlement.max_strength, settlement.satisfaction,
+                                     settlement.level, settlement.harvest_reserves,
+                                     HARVEST_STATUS_IDS[settlement.harvest_status],
+                                     ECONOMIC_STATUS_IDS[settlement.economic_status], settlement.produced_settler,
+                                     settlement.besieged)
+    if cw := settlement.current_work:
+        match cw.construction:
+            case Improvement():
+                buffer += CONSTRUCTION.pack(IMPROVEMENT_CONSTRUCTION, IMPROVEMENT_IDS[cw.construction.name],
+                                            cw.zeal_consumed)
+            case Project():
+                buffer += CONSTRUCTION.pack(PROJECT_CONSTRUCTION, PROJECT_IDS[cw.construction.name], cw.zeal_consumed)
+            case UnitPlan():
+                buffer += CONSTRUCTION.pack(UNIT_PLAN_CONSTRUCTION, UNIT_PLAN_IDS[cw.construction.name],
+                                            cw.zeal_consumed)
+    else:
+        buffer += CONSTRUCTION.pack(NO_CONSTRUCTION, 0, 0)
+
+
+def read_settlement(reader: Reader, quads: List[List[Quad]], faction: Faction) -> Settlement:
+    """
+    Read the next settlement.
+    :param reader: The reader to read from.
+    :param quads: The quads on the board.
+    :param faction: The faction the settlement belongs to.
+    :return: The settlement.
+    """
+    name: str = reader.read_str()
+    location: Location = reader.read(LOCATION)
+    improvements: List[Improvement] = [IMPROVEMENTS[reader.read_int(UINT8)] for _ in range(reader.read_int(UINT8))]
+    setl_quads: List[Quad] = []
+    for _ in range(reader.read_int(UINT8)):
+        x, y = reader.read(LOCATION)
+        setl_quads.append(quads[y][x])
+    resources: ResourceCollection = ResourceCollection(*reader.read(RESOURCES))
+    garrison: List[Unit] = [read_unit(reader, garrisoned=True, faction=faction)
+                            for _ in range(reader.read_int(UINT8))]
+    strength, max_strength, satisfaction, level, harvest_reserves, harvest_status_id, economic_status_id, \
+        produced_settler, besieged = reader.read(SETTLEMENT_STATUS)
+    construction_kind, construction_id, zeal_consumed = reader.read(CONSTRUCTION)
+    current_work: Optional[Construction] = None
+    if construction_kind == IMPROVEMENT_CONSTRUCTION:
+        current_work = Construction(IMPROVEMENTS[construction_id], zeal_consumed)
+    elif construction_kind == PROJECT_CONSTRUCTION:
+        current_work = Construction(PROJECTS[construction_id], zeal_consumed)
+    elif construction_kind == UNIT_PLAN_CONSTRUCTION:
+        # Unit plans under construction are also scaled by the settlement's resources, so they can't be cached.
+        current_work = Construction(get_unit_plan(UNIT_PLANS[construction_id].name, faction, resources), zeal_consumed)
+    return Settlement(name, location, improvements, setl_quads, resources, garrison, strength, max_strength,
+                      satisfaction, current_work, level, harvest_reserves, HARVEST_STATUSES[harvest_status_id],
+                      ECONOMIC_STATUSES[economic_status_id], produced_settler, besieged)
+
+
+def encode_player(player: Player) -> bytes:
+    """
+    Encode the given player. As with the minifier, the player's seen quads are encoded separately.
+    :param player: The player to encode.
+    :return: The encoded player.
+    """
+    buffer: bytearray = bytearray()
+    write_str(buffer, player.name)
+    buffer += PLAYER_DETAILS.pack(FACTION_IDS[player.faction], player.wealth)
+    buffer += UINT8.pack(len(player.settlements))
+    for setl in player.settlements:
+        write_settlement(buffer, setl)
+    buffer += UINT16.pack(len(player.units))
+    for unit in player.units:
+        write_unit(buffer, unit)
+    buffer += UINT8.pack(len(player.blessings))
+    buffer += bytes(BLESSING_IDS[bls.name] for bls in player.blessings)
+    buffer += RESOURCES.pack(*get_resource_values(player.resources))
+    victories: int = sum(1 << VICTORY_TYPES.index(vic) for vic in player.imminent_victories)
+    ob: Optional[OngoingBlessing] = player.ongoing_blessing
+    aip: Optional[AIPlaystyle] = player.ai_playstyle
+    buffer += PLAYER_STATUS.pack(victories, ob is not None, BLESSING_IDS[ob.blessing.name] if ob else 0,
+                                 ob.fortune_consumed if ob else 0, aip is not None,
+                                 ATTACK_PLAYSTYLE_IDS[aip.attacking] if aip else 0,
+                                 EXPANSION_PLAYSTYLE_IDS[aip.expansion] if aip else 0, player.jubilation_ctr,
+                                 player.accumulated_wealth, player.eliminated)
+    return bytes(buffer)
+
+
+def decode_player(data: bytes, quads: List[List[Quad]]) -> Player:
+    """
+    Decode the given encoded player.
+    :param data: The encoded player.
+    :param quads: The quads on the board.
+    :return: The decoded player.
+    """
+    reader: Reader = Reader(data)
+    name: str = reader.read_str()
+    faction_id, wealth = reader.read(PLAYER_DETAILS)
+    faction: Faction = FACTIONS[faction_id]
+    settlements: List[Settlement] = [read_settlement(reader, quads, faction) for _ in range(reader.read_int(UINT8))]
+    units: List[Unit] = [read_unit(reader, garrisoned=False, faction=faction) for _ in range(reader.read_int(UINT16))]
+    blessings: List[Blessing] = [copy(get_blessing_template(reader.read_int(UINT8), faction))
+                                 for _ in range(reader.read_int(UINT8))]
+    resources: ResourceCollection = ResourceCollection(*reader.read(RESOURCES))
+    victories, has_ongoing_blessing, ob_id, fortune_consumed, is_ai, attacking_id, expansion_id, jubilation_ctr, \
+        accumulated_wealth, eliminated = reader.read(PLAYER_STATUS)
+    imminent_victories: Set[VictoryType] = {vic for idx, vic in enumerate(VICTORY_TYPES) if victories & (1 << idx)}
+    ongoing_blessing: Optional[OngoingBlessing] = \
+        OngoingBlessing(copy(get_blessing_template(ob_id, faction)), fortune_consumed) if has_ongoing_blessing else None
+    ai_playstyle: Optional[AIPlaystyle] = \
+        AIPlaystyle(ATTACK_PLAYSTYLES[attacking_id], EXPANSION_PLAYSTYLES[expansion_id]) if is_ai else None
+    return Player(name, faction, FACTION_COLOURS[faction], wealth, settlements, units, blessings, resources, set(),
+                  imminent_victories, ongoing_blessing, ai_playstyle, jubilation_ctr, accumulated_wealth, eliminated)
+
+
+def encode_quads_seen(quads_seen: Set[Location]) -> bytes:
+    """
+    Encode the given set of seen quads.
+    :param quads_seen: The seen quads to encode.
+    :return: The encoded seen quads.
+    """
+    # As with the minifier, we exclude seen quads with locations including negative values - they shouldn't exist.
+    return b"".join(SEEN_QUAD.pack(x, y) for x, y in quads_seen if x >= 0 and y >= 0)
+
+
+def decode_quads_seen(data: bytes) -> Set[Location]:
+    """
+    Decode the given encoded seen quads.
+    :param data: The encoded seen quads.
+    :return: The decoded set of seen quad locations.
+    """
+    return set(SEEN_QUAD.iter_unpack(data))
+
+
+def encode_heathens(heathens: List[Heathen]) -> bytes:
+    """
+    Encode the given heathens.
+    :param heathens: The heathens to encode.
+    :return: The encoded heathens.
+    """
+    buffer: bytearray = bytearray()
+    for heathen in heathens:
+        hp: UnitPlan = heathen.plan
+        buffer += HEATHEN.pack(heathen.health, heathen.remaining_stamina, heathen.location[0], heathen.location[1],
+                               hp.power, hp.max_health, hp.total_stamina, heathen.has_attacked)
+        write_str(buffer, hp.name)
+    return bytes(buffer)
+
+
+def decode_heathens(data: bytes) -> List[Heathen]:
+    """
+    Decode the given encoded heathens.
+    :param data: The encoded heathens.
+    :return: The decoded heathens.
+    """
+    reader: Reader = Reader(data)
+    heathens: List[Heathen] = []
+    while not reader.at_end():
+        health, remaining_stamina, x, y, power, max_health, total_stamina, has_attacked = reader.read(HEATHEN)
+        # Heathen plans aren't in the catalogue, so they are recreated from the encoded values.
+        plan: UnitPlan = UnitPlan(power, max_health, total_stamina, reader.read_str(), None, 0.0)
+        heathens.append(Heathen(health, remaining_stamina, (x, y), plan, has_attacked))
+    return heathens
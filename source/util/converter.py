@@ -1,7 +1,12 @@
-from typing import Dict, List, Tuple
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Tuple
 
 import pyxel
-from PIL.ImageFile import ImageFile
+
+# Pillow is only needed to type the image being converted, and so isn't otherwise imported until the icon is set.
+if TYPE_CHECKING:
+    from PIL.ImageFile import ImageFile
 
 
 def convert_image_to_pyxel_icon_data(image: ImageFile) -> List[str]:
@@ -37,32 +42,16 @@ def convert_image_to_pyxel_icon_data(image: ImageFile) -> List[str]:
     :param image: The Pillow Image to be converted.
     :return: A list of strings representing the image, in the appropriate format.
     """
-    icon_pixels = image.load()
-    icon_colours: List[str] = []
-    # Rather than determine the correct pyxel colour for every pixel individually, we maintain a dictionary of existing
-    # mappings, so we do not need to reconvert RGB values that have already been converted.
-    rgb_pyxel_mappings: Dict[Tuple[int, int, int], str] = {}
-    for y in range(image.height):
-        # Initialise the row as an empty string, with each character added to it being a pixel in the row.
-        row_colours: str = ""
-        for x in range(image.width):
-            # Handle images with and without alpha channels.
-            if len(pixel := icon_pixels[x, y]) == 3:
-                r, g, b = pixel
-            else:
-                # We ignore the alpha channel here because it is not required.
-                r, g, b, _ = pixel
-            # If we've already determined the colour for these RGB values, just get it from the dictionary.
-            if (r, g, b) in rgb_pyxel_mappings:
-                row_colours += rgb_pyxel_mappings[(r, g, b)]
-            else:
-                # Otherwise, determine which in-built pyxel colour is closest to the RGB values for this pixel.
-                closest_colour: str = convert_rgb_colour_to_pyxel_colour(r, g, b)
-                rgb_pyxel_mappings[(r, g, b)] = closest_colour
-                row_colours += closest_colour
-        # Once every pixel in the row has been converted, add the fully-formed string to the list.
-        icon_colours.append(row_colours)
-    return icon_colours
+    # Any alpha channel is discarded, since it is not required.
+    rgb_image = image.convert("RGB")
+    # Rather than determine the correct pyxel colour for every pixel individually, we determine it once for each
+    # distinct colour in the image, of which icons only have a handful.
+    rgb_pyxel_mappings: Dict[Tuple[int, int, int], str] = \
+        {rgb: convert_rgb_colour_to_pyxel_colour(*rgb)
+         for _, rgb in rgb_image.getcolors(maxcolors=image.width * image.height)}
+    pixel_colours: List[str] = [rgb_pyxel_mappings[rgb] for rgb in rgb_image.get_flattened_data()]
+    # Join each row of pixels into a string, with each character in it being a pixel in the row.
+    return ["".join(pixel_colours[y * image.width:(y + 1) * image.width]) for y in range(image.height)]
 
 
 def convert_rgb_colour_to_pyxel_colour(red: int, green: int, blue: int) -> str:
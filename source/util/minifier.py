@@ -1,11 +1,18 @@
+from base64 import b64encode, b64decode
 from datetime import datetime
-from typing import List, Optional, Set
+from typing import Dict, List, Optional, Set
 
 from source.foundation.catalogue import get_unit_plan, get_improvement, get_project, get_blessing, FACTION_COLOURS, \
     IMPROVEMENTS
 from source.foundation.models import Quad, Biome, ResourceCollection, Player, Settlement, Unit, UnitPlan, Improvement, \
     Construction, HarvestStatus, EconomicStatus, Blessing, Faction, VictoryType, OngoingBlessing, AIPlaystyle, \
     AttackPlaystyle, ExpansionPlaystyle, Project, Heathen, DeployerUnit, SaveDetails, Location
+from source.util.visibility import BOARD_WIDTH, BOARD_HEIGHT
+
+# The prefixes for the compact encodings of seen quads. Seen quads minified as a list of locations have no prefix, since
+# that was the original encoding, and any existing saves must still be able to be inflated.
+QUADS_SEEN_BITMAP_PREFIX: str = "B"
+QUADS_SEEN_RUNS_PREFIX: str = "R"
 
 
 def minify_resource_collection(rc: ResourceCollection) -> str:
@@ -67,6 +74,10 @@ def minify_improvement(improvement: Improvement) -> str:
     return "".join(word[0] for word in improvement.name.split(" "))
 
 
+# Each improvement keyed by its minified representation, so that improvements can be looked up directly when inflating.
+IMPROVEMENTS_BY_MINIFIED: Dict[str, Improvement] = {minify_improvement(imp): imp for imp in IMPROVEMENTS}
+
+
 def minify_settlement(settlement: Settlement) -> str:
     """
     Turn the given settlement object into a minified string representation.
@@ -121,12 +132,33 @@ def minify_player(player: Player) -> str:
 
 def minify_quads_seen(quads_seen: Set[Location]) -> str:
     """
-    Turn the given set of seen quads into a minified string representation.
+    Turn the given set of seen quads into a minified string representation. Whichever of the below encodings is the
+    shortest for the given set is used:
+    - A list of locations, which is the shortest for a few scattered quads.
+    - The lengths of each alternating run of unseen and seen quads, reading the board row by row. This is the shortest
+      for the contiguous areas that players typically explore.
+    - A base64-encoded bitmap of the board, which is never longer than 1,500 characters.
     :param quads_seen: The set of seen quads to minify.
     :return: A minified string representation of the seen quads.
     """
-    # We can just exclude seen quads with locations including negative values - they shouldn't exist anyway.
-    return ",".join(f"{quad_loc[0]}-{quad_loc[1]}" for quad_loc in quads_seen if quad_loc[0] >= 0 and quad_loc[1] >= 0)
+    # We can just exclude seen quads with locations outside the board - they shouldn't exist anyway.
+    quad_idxs: List[int] = sorted(y * BOARD_WIDTH + x for x, y in quads_seen
+                                  if 0 <= x < BOARD_WIDTH and 0 <= y < BOARD_HEIGHT)
+    locations_str: str = ",".join(f"{idx % BOARD_WIDTH}-{idx // BOARD_WIDTH}" for idx in quad_idxs)
+    runs: List[int] = []
+    run_end: int = 0
+    for idx in quad_idxs:
+        if runs and idx == run_end:
+            runs[-1] += 1
+        else:
+            runs.extend((idx - run_end, 1))
+        run_end = idx + 1
+    runs_str: str = QUADS_SEEN_RUNS_PREFIX + ".".join(map(str, runs))
+    bitmap: bytearray = bytearray((BOARD_WIDTH * BOARD_HEIGHT + 7) // 8)
+    for idx in quad_idxs:
+        bitmap[idx >> 3] |= 1 << (idx & 7)
+    bitmap_str: str = QUADS_SEEN_BITMAP_PREFIX + b64encode(bitmap).decode()
+    return min(locations_str, runs_str, bitmap_str, key=len)
 
 
 def minify_heathens(heathens: List[Heathen]) -> str:
@@ -242,7 +274,8 @@ def inflate_unit(unit_str: str, garrisoned: bool, faction: Faction) -> Unit:
     # will evaluate to True. This is because any string that isn't empty is considered to be 'True'.
     unit_has_acted: bool = split_unit[4] == "True"
     unit_is_besieging: bool = split_unit[5] == "True"
-    unit_loc: Location = int(split_unit[2].split("-")[0]), int(split_unit[2].split("-")[1])
+    unit_x, unit_y = split_unit[2].split("-")
+    unit_loc: Location = int(unit_x), int(unit_y)
     # If the minified unit only has six parts, then it is a standard non-deployer unit.
     if len(split_unit) == 6:
         return Unit(unit_health, unit_rem_stamina, unit_loc, garrisoned, inflate_unit_plan(split_unit[3], faction),
@@ -263,8 +296,7 @@ def inflate_improvement(improvement_str: str) -> Improvement:
     :param improvement_str: The minified improvement to inflate.
     :return: An inflated improvement object.
     """
-    # This is one of the more naive functions - we literally just test this string against all of the minified options.
-    return next(imp for imp in IMPROVEMENTS if minify_improvement(imp) == improvement_str)
+    return IMPROVEMENTS_BY_MINIFIED[improvement_str]
 
 
 def inflate_settlement(setl_str: str, quads: List[List[Quad]], faction: Faction) -> Settlement:
@@ -277,14 +309,16 @@ def inflate_settlement(setl_str: str, quads: List[List[Quad]], faction: Faction)
     """
     split_setl: List[str] = setl_str.split(";")
     name: str = split_setl[0]
-    loc: Location = int(split_setl[1].split("-")[0]), int(split_setl[1].split("-")[1])
+    setl_x, setl_y = split_setl[1].split("-")
+    loc: Location = int(setl_x), int(setl_y)
     improvements: List[Improvement] = []
     if split_setl[2]:
         for imp_name in split_setl[2].split("$"):
             improvements.append(inflate_improvement(imp_name))
     setl_quads: List[Quad] = []
     for quad_loc in split_setl[3].split(","):
-        setl_quads.append(quads[int(quad_loc.split("-")[1])][int(quad_loc.split("-")[0])])
+        quad_x, quad_y = quad_loc.split("-")
+        setl_quads.append(quads[int(quad_y)][int(quad_x)])
     resources: ResourceCollection = inflate_resource_collection(split_setl[4])
     garrison: List[Unit] = []
     if split_setl[5]:
@@ -346,12 +380,12 @@ def inflate_player(player_str: str, quads: List[List[Quad]]) -> Player:
             imminent_victories.add(VictoryType(vic))
     ongoing_blessing: Optional[OngoingBlessing] = None
     if split_pl[8]:
-        ongoing_blessing = OngoingBlessing(get_blessing(split_pl[8].split(">")[0], faction),
-                                           float(split_pl[8].split(">")[1]))
+        ob_name, ob_fortune_consumed = split_pl[8].split(">")
+        ongoing_blessing = OngoingBlessing(get_blessing(ob_name, faction), float(ob_fortune_consumed))
     ai_playstyle: Optional[AIPlaystyle] = None
     if split_pl[9]:
-        ai_playstyle = AIPlaystyle(AttackPlaystyle(split_pl[9].split("-")[0]),
-                                   ExpansionPlaystyle(split_pl[9].split("-")[1]))
+        attacking, expansion = split_pl[9].split("-")
+        ai_playstyle = AIPlaystyle(AttackPlaystyle(attacking), ExpansionPlaystyle(expansion))
     jubilation_ctr: int = int(split_pl[10])
     accumulated_wealth: float = float(split_pl[11])
     # We need to do a string comparison against "True" here because if we just do 'is True' here instead, then
@@ -364,12 +398,30 @@ def inflate_player(player_str: str, quads: List[List[Quad]]) -> Player:
 def inflate_quads_seen(qs_str: str) -> Set[Location]:
     """
     Inflate the given minified seen quads string into a set of tuples representing the locations of each seen quad.
-    :param qs_str: The minified set of seen quads to inflate.
+    :param qs_str: The minified set of seen quads to inflate, in any of the encodings produced by minify_quads_seen().
     :return: An inflated set of seen quad location tuples.
     """
     quads_seen: Set[Location] = set()
-    for quad_loc in qs_str.split(","):
-        quads_seen.add((int(quad_loc.split("-")[0]), int(quad_loc.split("-")[1])))
+    if qs_str.startswith(QUADS_SEEN_BITMAP_PREFIX):
+        for byte_idx, byte in enumerate(b64decode(qs_str[1:])):
+            # Most of the board is typically unseen, so empty bytes are skipped entirely.
+            if byte:
+                for bit in range(8):
+                    if byte & (1 << bit):
+                        idx: int = byte_idx * 8 + bit
+                        quads_seen.add((idx % BOARD_WIDTH, idx // BOARD_WIDTH))
+    elif qs_str.startswith(QUADS_SEEN_RUNS_PREFIX):
+        runs: List[int] = [int(run) for run in qs_str[1:].split(".")]
+        idx: int = 0
+        # The runs alternate between unseen and seen quads, starting with unseen ones.
+        for unseen_run, seen_run in zip(runs[::2], runs[1::2]):
+            idx += unseen_run
+            quads_seen.update((i % BOARD_WIDTH, i // BOARD_WIDTH) for i in range(idx, idx + seen_run))
+            idx += seen_run
+    else:
+        for quad_loc in qs_str.split(","):
+            x, y = quad_loc.split("-")
+            quads_seen.add((int(x), int(y)))
     return quads_seen
 
 
@@ -385,7 +437,8 @@ def inflate_heathens(heathens_str: str) -> List[Heathen]:
         split_heathen: List[str] = heathen.split("*")
         health: float = float(split_heathen[0])
         remaining_stamina: int = int(split_heathen[1])
-        location: Location = int(split_heathen[2].split("-")[0]), int(split_heathen[2].split("-")[1])
+        heathen_x, heathen_y = split_heathen[2].split("-")
+        location: Location = int(heathen_x), int(heathen_y)
         # We don't use inflate_unit_plan() here because that will attempt to retrieve the non-heathen plan for this
         # unit, which of course does not exist.
         unit_plan: UnitPlan = UnitPlan(float(split_heathen[3]), float(split_heathen[4]), int(split_heathen[5]),
@@ -1,9 +1,15 @@
 import random
+import time
 import typing
-from time import sleep
 
 import vlc
 
+# The volume at which all music is played.
+VOLUME: int = 70
+# When music is stopped, it is faded out by reducing its volume by this amount at each interval, in seconds.
+FADE_STEP: int = 10
+FADE_STEP_INTERVAL: float = 0.08
+
 
 class MusicPlayer:
     """
@@ -11,56 +17,76 @@ class MusicPlayer:
     """
     def __init__(self):
         """
-        Load in the menu and background in-game music, shuffling them and setting their volumes.
+        Load in the menu music and set its volume, and shuffle the background in-game music. Each in-game track isn't
+        opened until it is about to be played, so that at most two are open at any time.
         """
         self.menu_player: vlc.MediaPlayer = vlc.MediaPlayer("resources/audio/menu.ogg")
-        self.menu_player.audio_set_volume(70)
+        self.menu_player.audio_set_volume(VOLUME)
         random.seed()
-        self.game_players: typing.List[vlc.MediaPlayer] = \
-            [vlc.MediaPlayer(f"resources/audio/background{i}.ogg") for i in range(1, 9)]
-        random.shuffle(self.game_players)
-        for gp in self.game_players:
-            gp.audio_set_volume(70)
+        self.game_tracks: typing.List[str] = [f"resources/audio/background{i}.ogg" for i in range(1, 9)]
+        random.shuffle(self.game_tracks)
+        # Track index -> the player for the track, for each track that is open.
+        self.game_players: typing.Dict[int, vlc.MediaPlayer] = {}
         self.current_idx = 0
+        # Each player that is fading out, mapped to the time at which it started to fade. Fades are driven by the game
+        # loop calling update_fades(), so that stopping music never blocks the caller.
+        self.fades: typing.Dict[vlc.MediaPlayer, float] = {}
+
+    def get_game_player(self, idx: int) -> vlc.MediaPlayer:
+        """
+        Get the player for the in-game track at the given index, opening the track and setting its volume if necessary.
+        :param idx: The index of the track.
+        :return: The player for the track.
+        """
+        if idx not in self.game_players:
+            game_player: vlc.MediaPlayer = vlc.MediaPlayer(self.game_tracks[idx])
+            game_player.audio_set_volume(VOLUME)
+            self.game_players[idx] = game_player
+        return self.game_players[idx]
 
     def play_menu_music(self):
         """
         Play the menu music, setting its volume first.
         """
-        self.menu_player.audio_set_volume(70)
+        self.fades.pop(self.menu_player, None)
+        self.menu_player.audio_set_volume(VOLUME)
         self.menu_player.play()
 
     def stop_menu_music(self):
         """
-        Stop the menu music, fading it out first.
+        Stop the menu music, fading it out first. Note that the player is paused once faded out, so the music will
+        resume when the player returns to the menu.
         """
-        for vol in range(70, 0, -10):
-            sleep(0.08)
-            self.menu_player.audio_set_volume(vol)
-        self.menu_player.pause()  # Note that we pause, so the music will resume when the player returns to the menu.
+        self.fades[self.menu_player] = time.time()
 
     def play_game_music(self):
         """
         Play the current in-game music, setting its volume and restarting it first.
         """
-        self.game_players[self.current_idx].audio_set_volume(70)
-        self.game_players[self.current_idx].play()
+        game_player: vlc.MediaPlayer = self.get_game_player(self.current_idx)
+        self.fades.pop(game_player, None)
+        game_player.audio_set_volume(VOLUME)
+        game_player.play()
+        # Open the next track ahead of time, so that it is ready once this one finishes.
+        self.get_game_player((self.current_idx + 1) % len(self.game_tracks))
 
     def stop_game_music(self):
         """
         Stop the in-game music, fading it out first.
         """
-        for vol in range(70, 0, -10):
-            sleep(0.08)
-            self.game_players[self.current_idx].audio_set_volume(vol)
-        self.game_players[self.current_idx].pause()
+        if self.current_idx in self.game_players:
+            self.fades[self.game_players[self.current_idx]] = time.time()
 
     def next_song(self):
         """
         Skip to the next in-game song.
         """
-        self.game_players[self.current_idx].stop()  # Note that we stop the player so that it will restart on next play.
-        if self.current_idx < len(self.game_players) - 1:
+        # The current track is closed, since every other track will be played before it is played again.
+        if (game_player := self.game_players.pop(self.current_idx, None)) is not None:
+            self.fades.pop(game_player, None)
+            game_player.stop()
+            game_player.release()
+        if self.current_idx < len(self.game_tracks) - 1:
             self.current_idx += 1
         else:
             self.current_idx = 0
@@ -71,7 +97,7 @@ class MusicPlayer:
         Returns whether any in-game song is playing. Used to skip to the next track if the current one has finished.
         :return: Whether an in-game song is playing.
         """
-        return any(mp.is_playing() for mp in self.game_players)
+        return any(mp.is_playing() for mp in list(self.game_players.values()))
 
     def restart_menu_if_necessary(self):
         """
@@ -80,3 +106,18 @@ class MusicPlayer:
         if not self.menu_player.is_playing():
             self.menu_player.stop()
             self.menu_player.play()
+
+    def update_fades(self):
+        """
+        Reduce the volume of each player that is fading out according to how long it has been fading, pausing each one
+        that has faded out completely. This should be called on every update.
+        """
+        current_time: float = time.time()
+        # Music may be stopped from the multiplayer listener thread, so we iterate over a copy of the fades.
+        for player, fade_start in list(self.fades.items()):
+            volume: int = VOLUME - FADE_STEP * int((current_time - fade_start) / FADE_STEP_INTERVAL)
+            if volume > 0:
+                player.audio_set_volume(volume)
+            else:
+                player.pause()
+                self.fades.pop(player, None)
@@ -0,0 +1,178 @@
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from typing import Deque, Dict, Iterator, List, Optional, ContextManager, Tuple
+
+# The environment variable that enables the profiler at startup when set to 1. The profiler can also be toggled in-game.
+PROFILER_ENV_VAR: str = "MICROCOSM_PROFILER"
+# The number of recent frames used to calculate the FPS and 99th-percentile frame time.
+FRAME_WINDOW: int = 120
+# The maximum number of events kept for Chrome traces, so that leaving the profiler enabled doesn't exhaust memory.
+MAX_TRACE_EVENTS: int = 100_000
+# The name of the section timing end turn processing.
+END_TURN_SECTION: str = "end_turn"
+
+# Shared by all sections while the profiler is disabled, so that instrumentation is close to free.
+_NO_OP_SECTION: ContextManager = nullcontext()
+
+
+class FrameProfiler:
+    """
+    Records how long each frame takes, broken down into named sections for each subsystem, e.g. drawing the board or
+    handling input. Sections may also be recorded by other threads, such as the multiplayer listener thread, in which
+    case they are attributed to the frame in which they finish. Recorded sections can be exported as a Chrome trace,
+    which can be viewed in chrome://tracing or Perfetto.
+    """
+
+    def __init__(self, enabled: bool = False):
+        """
+        Creates the profiler.
+        :param enabled: Whether the profiler should record from the start.
+        """
+        self.enabled: bool = enabled
+        # Sections are recorded from multiple threads, so access to the recorded data is synchronised.
+        self.lock: threading.Lock = threading.Lock()
+        self.frame_start: Optional[float] = None
+        # The total time in seconds spent in each section during the current frame.
+        self.current_sections: Dict[str, float] = {}
+        # The section totals, work times, and start times for each of the most recent frames.
+        self.last_sections: Dict[str, float] = {}
+        self.frame_times: Deque[float] = deque(maxlen=FRAME_WINDOW)
+        self.frame_starts: Deque[float] = deque(maxlen=FRAME_WINDOW)
+        self.last_end_turn_time: Optional[float] = None
+        # Events in the Chrome trace event format, with timestamps and durations in microseconds.
+        self.trace_events: Deque[Dict] = deque(maxlen=MAX_TRACE_EVENTS)
+
+    def toggle(self):
+        """
+        Toggle whether the profiler is recording, discarding any partially-recorded frame.
+        """
+        with self.lock:
+            self.enabled = not self.enabled
+            self.frame_start = None
+            self.current_sections = {}
+
+    def section(self, name: str) -> ContextManager:
+        """
+        Get a context manager that times the code run within it as the given section.
+        :param name: The name of the section, e.g. draw.board.
+        :return: The context manager to time the section with.
+        """
+        return self._timed_section(name) if self.enabled else _NO_OP_SECTION
+
+    @contextmanager
+    def _timed_section(self, name: str) -> Iterator[None]:
+        """
+        Time the code run within the context as the given section.
+        :param name: The name of the section.
+        """
+        start: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter() - start)
+
+    def record(self, name: str, start: float, duration: float):
+        """
+        Record a section that has completed.
+        :param name: The name of the section.
+        :param start: When the section started, as returned by time.perf_counter().
+        :param duration: How long the section took, in seconds.
+        """
+        with self.lock:
+            self.current_sections[name] = self.current_sections.get(name, 0) + duration
+            if name == END_TURN_SECTION:
+                self.last_end_turn_time = duration
+            self.trace_events.append({"name": name, "ph": "X", "pid": os.getpid(), "tid": threading.get_ident(),
+                                      "ts": round(start * 1_000_000), "dur": round(duration * 1_000_000)})
+
+    def lap(self, name: str, start: float) -> float:
+        """
+        Record the time since the given start as the given section, allowing a long function to be split into
+        consecutive sections without restructuring it.
+        :param name: The name of the section that has just completed.
+        :param start: When the section started, as returned by time.perf_counter() or a previous lap.
+        :return: The current time, to be used as the start of the next section.
+        """
+        now: float = time.perf_counter()
+        if self.enabled:
+            self.record(name, start, now - start)
+        return now
+
+    def start_frame(self):
+        """
+        Mark the start of a frame, i.e. the beginning of an update.
+        """
+        if self.enabled:
+            self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        """
+        Mark the end of a frame, i.e. the end of a draw, recording how long the frame's work took.
+        """
+        if not self.enabled or self.frame_start is None:
+            return
+        end: float = time.perf_counter()
+        with self.lock:
+            self.frame_times.append(end - self.frame_start)
+            self.frame_starts.append(self.frame_start)
+            self.trace_events.append({"name": "frame", "ph": "X", "pid": os.getpid(), "tid": threading.get_ident(),
+                                      "ts": round(self.frame_start * 1_000_000),
+                                      "dur": round((end - self.frame_start) * 1_000_000)})
+            self.last_sections = self.current_sections
+            self.current_sections = {}
+            self.frame_start = None
+
+    def get_fps(self) -> float:
+        """
+        Get the number of frames per second, based on the most recent frames.
+        :return: The current FPS, or 0 if not enough frames have been recorded.
+        """
+        with self.lock:
+            if len(self.frame_starts) < 2 or self.frame_starts[-1] == self.frame_starts[0]:
+                return 0
+            return (len(self.frame_starts) - 1) / (self.frame_starts[-1] - self.frame_starts[0])
+
+    def get_p99_frame_time(self) -> float:
+        """
+        Get the 99th-percentile time taken by the most recent frames.
+        :return: The 99th-percentile frame time, in seconds, or 0 if no frames have been recorded.
+        """
+        with self.lock:
+            frame_times: List[float] = sorted(self.frame_times)
+        if not frame_times:
+            return 0
+        # The nearest-rank method is used, so the percentile is always one of the recorded times.
+        return frame_times[math.ceil(0.99 * len(frame_times)) - 1]
+
+    def get_summary(self) -> List[str]:
+        """
+        Get a summary of the most recent frames, for display in the profiler overlay.
+        :return: The lines of the summary, containing the FPS, the 99th-percentile frame time, the time spent in each
+                 section in the last frame, and the time taken to process the last end turn, all in milliseconds.
+        """
+        summary: List[str] = [f"FPS {self.get_fps():.1f}, p99 {self.get_p99_frame_time() * 1000:.2f}ms"]
+        with self.lock:
+            sections: List[Tuple[str, float]] = sorted(self.last_sections.items())
+        summary.extend(f"{name} {duration * 1000:.2f}ms" for name, duration in sections)
+        if self.last_end_turn_time is not None:
+            summary.append(f"Last end turn {self.last_end_turn_time * 1000:.2f}ms")
+        return summary
+
+    def dump_chrome_trace(self, path: str):
+        """
+        Write the recorded sections and frames to a file in the Chrome trace event format.
+        :param path: The full path of the file to write.
+        """
+        with self.lock:
+            events: List[Dict] = list(self.trace_events)
+        with open(path, "w", encoding="utf-8") as trace_file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, trace_file)
+
+
+# The profiler for the game.
+PROFILER: FrameProfiler = FrameProfiler(os.environ.get(PROFILER_ENV_VAR) == "1")
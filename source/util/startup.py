@@ -0,0 +1,54 @@
+import time
+from collections import deque
+from typing import Callable, Deque, Tuple
+
+from source.util.profiler import PROFILER
+
+# The prefix for the names of the profiler sections recorded while the game starts up.
+STARTUP_SECTION_PREFIX: str = "startup."
+# The name of the section covering everything from the game starting to its first frame being drawn.
+FIRST_FRAME_SECTION: str = STARTUP_SECTION_PREFIX + "first_frame"
+
+
+class DeferredStartup:
+    """
+    Keeps track of the startup work that isn't required to show the main menu, e.g. loading images that the menu
+    doesn't use or starting the multiplayer listener. This work is deferred until the first frame has been drawn, and is
+    then run one task per update, so that the window appears as soon as possible and no single frame is held up by more
+    than one task. Each task, along with the time taken to draw the first frame, is recorded as a profiler section.
+    """
+
+    def __init__(self, start_time: float):
+        """
+        Creates the deferred startup with no tasks.
+        :param start_time: When the game started, as returned by time.perf_counter().
+        """
+        self.start_time: float = start_time
+        self.first_frame_drawn: bool = False
+        self.tasks: Deque[Tuple[str, Callable[[], None]]] = deque()
+
+    def defer(self, name: str, task: Callable[[], None]):
+        """
+        Defer the given task until after the first frame has been drawn.
+        :param name: The name of the task, used to record it in the profiler.
+        :param task: The task to run.
+        """
+        self.tasks.append((name, task))
+
+    def mark_first_frame_drawn(self):
+        """
+        Mark the first frame as drawn, recording how long it took to draw it since the game started.
+        """
+        if not self.first_frame_drawn:
+            self.first_frame_drawn = True
+            if PROFILER.enabled:
+                PROFILER.record(FIRST_FRAME_SECTION, self.start_time, time.perf_counter() - self.start_time)
+
+    def run_next(self):
+        """
+        Run the next deferred task, if the first frame has been drawn and any tasks remain.
+        """
+        if self.first_frame_drawn and self.tasks:
+            name, task = self.tasks.popleft()
+            with PROFILER.section(STARTUP_SECTION_PREFIX + name):
+                task()
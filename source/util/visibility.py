@@ -0,0 +1,138 @@
+from typing import Dict, List, Optional, Tuple
+
+from source.foundation.models import Player, Heathen, Faction, Location
+
+# The dimensions of the board, in quads.
+BOARD_WIDTH: int = 100
+BOARD_HEIGHT: int = 90
+
+# The details of a player's settlements, units, and any shared vision that their night vision is determined by.
+type NightVisionSignature = Tuple[Tuple[Tuple[int, Tuple[Location, ...]], ...], Tuple[Location, ...],
+                                  Tuple[Location, ...]]
+# Whether it is nighttime, along with the sunstone resources and quads for every settlement.
+type ExclusionSignature = Tuple[bool, Tuple[Tuple[int, Tuple[Location, ...]], ...]]
+
+
+class VisibilityGrid:
+    """
+    A boolean grid covering the board, in which each quad is either marked or not. Grids support the in operator, so
+    they can be used in place of sets of locations.
+    """
+
+    def __init__(self):
+        """
+        Creates the grid, with no quads marked.
+        """
+        self.cells: bytearray = bytearray(BOARD_WIDTH * BOARD_HEIGHT)
+
+    def mark(self, location: Location):
+        """
+        Mark the quad at the given location, if it is on the board.
+        :param location: The location of the quad to mark.
+        """
+        if 0 <= location[0] < BOARD_WIDTH and 0 <= location[1] < BOARD_HEIGHT:
+            self.cells[location[1] * BOARD_WIDTH + location[0]] = 1
+
+    def mark_square(self, centre: Location, radius: int):
+        """
+        Mark every quad on the board within the given radius of the given location, in both directions.
+        :param centre: The location at the centre of the square to mark.
+        :param radius: The number of quads either side of the centre to mark.
+        """
+        start_x: int = max(centre[0] - radius, 0)
+        end_x: int = min(centre[0] + radius + 1, BOARD_WIDTH)
+        if start_x >= end_x:
+            return
+        row: bytes = b"\x01" * (end_x - start_x)
+        # Each row of the square is marked with a single slice assignment, rather than quad by quad.
+        for j in range(max(centre[1] - radius, 0), min(centre[1] + radius + 1, BOARD_HEIGHT)):
+            self.cells[j * BOARD_WIDTH + start_x:j * BOARD_WIDTH + end_x] = row
+
+    def __contains__(self, location: Location) -> bool:
+        """
+        Determine whether the quad at the given location is marked.
+        :param location: The location to check.
+        :return: Whether the quad is on the board and marked.
+        """
+        return 0 <= location[0] < BOARD_WIDTH and 0 <= location[1] < BOARD_HEIGHT and \
+            self.cells[location[1] * BOARD_WIDTH + location[0]] == 1
+
+
+def get_settlements_signature(player: Player) -> Tuple[Tuple[int, Tuple[Location, ...]], ...]:
+    """
+    Get the sunstone resources and quad locations for each of the given player's settlements.
+    :param player: The player whose settlements are being examined.
+    :return: A tuple containing the sunstone resources and quad locations for each settlement.
+    """
+    return tuple((setl.resources.sunstone, tuple(quad.location for quad in setl.quads)) for setl in player.settlements)
+
+
+class VisibilityMaps:
+    """
+    Holds the grids of the quads each player can see at nighttime, and the quads that heathens cannot move to. Each grid
+    is only recomputed when the settlements, units, or heathens it is determined by have changed, which is detected by
+    comparing their locations and sunstone resources with those from when the grid was computed. Note that the quads
+    players can see during the day are already maintained incrementally in their quads_seen sets.
+    """
+
+    def __init__(self):
+        """
+        Creates the maps. No grids are computed until required.
+        """
+        # The night vision grid for each player, keyed by player name, along with the signature it was computed from.
+        self.night_vision: Dict[str, Tuple[NightVisionSignature, VisibilityGrid]] = {}
+        # The grid of quads that heathens cannot move to, along with the signature it was computed from.
+        self.sunstone_exclusion: Optional[Tuple[ExclusionSignature, VisibilityGrid]] = None
+
+    def get_night_vision(self, player: Player, heathens: List[Heathen]) -> VisibilityGrid:
+        """
+        Get the grid of quads the given player can see at nighttime. Players can only see a few quads around their
+        settlements and units, though settlements with one or more sunstone resources have extended vision proportionate
+        to the number of sunstone resources they have.
+        :param player: The player to get the night vision for.
+        :param heathens: The heathens on the board, which players of the Infidels faction share vision with.
+        :return: The player's night vision grid. The same grid is returned until the player's vision changes.
+        """
+        heathen_locations: Tuple[Location, ...] = \
+            tuple(heathen.location for heathen in heathens) if player.faction == Faction.INFIDELS else ()
+        signature: NightVisionSignature = (get_settlements_signature(player),
+                                           tuple(unit.location for unit in player.units),
+                                           heathen_locations)
+        if (cached := self.night_vision.get(player.name)) is not None and cached[0] == signature:
+            return cached[1]
+
+        grid = VisibilityGrid()
+        for setl_sunstone, setl_quad_locations in signature[0]:
+            for setl_quad_location in setl_quad_locations:
+                grid.mark_square(setl_quad_location, 3 * (1 + setl_sunstone))
+        for unit_location in signature[1]:
+            grid.mark_square(unit_location, 3)
+        for heathen_location in heathen_locations:
+            grid.mark_square(heathen_location, 5)
+        self.night_vision[player.name] = signature, grid
+        return grid
+
+    def get_sunstone_exclusion(self, players: List[Player], is_night: bool) -> VisibilityGrid:
+        """
+        Get the grid of quads that heathens cannot move to due to settlements. Heathens can never occupy the same quad
+        as a settlement, and during nighttime, heathens cannot be within a certain number of quads of settlements with
+        sunstone resources. For example, heathens cannot be within 6 quads of a settlement with 1 sunstone resource, and
+        they cannot be within 9 quads of a settlement with 2 sunstone resources.
+        :param players: The players in the game.
+        :param is_night: Whether it is currently nighttime.
+        :return: The exclusion grid. The same grid is returned until the players' settlements change.
+        """
+        signature: ExclusionSignature = \
+            is_night, tuple(setl for player in players for setl in get_settlements_signature(player))
+        if self.sunstone_exclusion is not None and self.sunstone_exclusion[0] == signature:
+            return self.sunstone_exclusion[1]
+
+        grid = VisibilityGrid()
+        for setl_sunstone, setl_quad_locations in signature[1]:
+            for setl_quad_location in setl_quad_locations:
+                if is_night and setl_sunstone:
+                    grid.mark_square(setl_quad_location, 3 * (1 + setl_sunstone))
+                else:
+                    grid.mark(setl_quad_location)
+        self.sunstone_exclusion = signature, grid
+        return grid